@@ -0,0 +1,1033 @@
+"""Benchmark
+
+Micro benchmarks of pysemisecs hot paths.
+
+Usage:
+    python benchmark.py            run all benchmarks
+    python benchmark.py NAME ...   run selected benchmarks
+
+"""
+
+import array
+import asyncio
+import importlib
+import io
+import os
+import secs
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+import tracemalloc
+
+
+def _report(name, count, elapsed, nbytes=None):
+    vv = [
+        '{:<40}'.format(name),
+        '{:>10.3f} ms'.format(elapsed * 1000.0),
+        '{:>14,.0f} /s'.format(count / elapsed if elapsed > 0.0 else 0.0)
+    ]
+    if nbytes is not None:
+        vv.append('{:>10.1f} MB/s'.format(nbytes / elapsed / 1000000.0 if elapsed > 0.0 else 0.0))
+    print(' '.join(vv))
+
+
+def _hsmsss_frame(body_size):
+    body = secs.Secs2BodyBuilder.build('B', bytes(body_size)) if body_size > 0 else None
+    return secs.HsmsSsDataMessage(6, 11, True, body, bytes(4), 10).to_bytes()
+
+
+def _legacy_read_frames(sock, count):
+    # HsmsSsConnection receiving path before HsmsSsFrameReader.
+    qq = secs.WaitingQueuing()
+
+    def _recv():
+        while True:
+            bs = sock.recv(4096)
+            if bs:
+                qq.puts(bs)
+            else:
+                qq.shutdown()
+                return
+
+    threading.Thread(target=_recv, daemon=True).start()
+
+    for _ in range(count):
+        heads = list()
+        pos = 0
+        while pos < 14:
+            pos += qq.put_to_list(heads, pos, 14)
+
+        bodys = list()
+        pos = 0
+        size = (heads[0] << 24 | heads[1] << 16 | heads[2] << 8 | heads[3]) - 10
+        while pos < size:
+            pos += qq.put_to_list(bodys, pos, size)
+
+        bytes(heads) + bytes(bodys)
+
+
+def _frame_reader_read_frames(sock, count):
+    reader = secs.HsmsSsFrameReader(sock)
+    for _ in range(count):
+        reader.read(5.0)
+
+
+def bench_hsmsss_frame_reader():
+    """HsmsSsConnection framing, legacy int-list queuing vs HsmsSsFrameReader."""
+
+    for body_size, count in ((0, 20000), (1024, 2000), (1024 * 1024, 20)):
+
+        frame = _hsmsss_frame(body_size)
+        data = frame * count
+
+        for name, f in (('legacy', _legacy_read_frames), ('frame-reader', _frame_reader_read_frames)):
+
+            a, b = socket.socketpair()
+            try:
+                th = threading.Thread(target=a.sendall, args=(data, ), daemon=True)
+                start = time.perf_counter()
+                th.start()
+                f(b, count)
+                elapsed = time.perf_counter() - start
+                th.join()
+            finally:
+                a.close()
+                b.close()
+
+            _report(
+                'hsmsss-frame ' + name + ' body=' + str(body_size),
+                count, elapsed, len(data))
+
+
+def _timeit(f, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        f()
+    return time.perf_counter() - start
+
+
+def bench_secs2body_numbers():
+    """100k-element U4/F8 items, legacy per-element struct vs bulk pack/unpack."""
+
+    n = 100000
+    count = 10
+
+    for item_type, values in (
+            ('U4', list(range(n))),
+            ('F8', [float(x) * 0.5 for x in range(n)])):
+
+        tt = secs.Secs2BodyBuilder.get_item_type_from_sml(item_type)
+        fmt = '>' + tt[3]
+        size = tt[2]
+        bs = secs.Secs2BodyBuilder.build(item_type, values).to_bytes()
+        value_bs = bs[4:]
+
+        def _legacy_encode():
+            b''.join([struct.pack(fmt, x) for x in values])
+
+        def _legacy_decode():
+            vv = list()
+            for p in range(0, len(value_bs), size):
+                vv.append(struct.unpack(fmt, value_bs[p:(p + size)])[0])
+            return tuple(vv)
+
+        def _encode():
+            secs.Secs2BodyBuilder.build(item_type, values).to_bytes()
+
+        def _decode():
+            secs.Secs2BodyBuilder.from_body_bytes(bs).value
+
+        for name, f in (
+                ('legacy-encode', _legacy_encode),
+                ('encode', _encode),
+                ('legacy-decode', _legacy_decode),
+                ('decode', _decode)):
+            _report(
+                'secs2body ' + item_type + '[' + str(n) + '] ' + name,
+                count, _timeit(f, count), len(bs) * count)
+
+
+def _s6f11_body(reports, values):
+    return secs.Secs2BodyBuilder.build('L', [
+        ('U4', [1]),
+        ('U4', [1001]),
+        ('L', [
+            ('L', [
+                ('U4', [r]),
+                ('L', [
+                    [('U4', [v]), ('A', 'VALUE'), ('F4', [0.5]), ('BOOLEAN', [True])][v % 4]
+                    for v in range(values)
+                ])
+            ])
+            for r in range(reports)
+        ])
+    ])
+
+
+def _count_items(body):
+    n = 0
+    vv = [body]
+    while vv:
+        v = vv.pop()
+        n += 1
+        if v.type == 'L':
+            vv.extend(v.value)
+    return n
+
+
+def bench_secs2body_decode():
+    """Decode list-heavy bodies, items per second."""
+
+    for name, body, count in (
+            ('S6F11 L[20]xL[10]', _s6f11_body(20, 10), 500),
+            ('wide L[10000]', secs.Secs2BodyBuilder.build('L', [
+                ('L', [('U2', [i & 0xFFFF]), ('A', 'ALARM')]) for i in range(10000)
+            ]), 5)):
+
+        bs = body.to_bytes()
+        n = _count_items(body)
+
+        def _eager():
+            secs.Secs2BodyBuilder.from_body_bytes(bs)
+
+        def _lazy():
+            _count_items(secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True))
+
+        _report('decode ' + name + ' items', n * count, _timeit(_eager, count))
+        _report('lazy-decode-all ' + name + ' items', n * count, _timeit(_lazy, count))
+
+
+def bench_secs2body_item_type_lookup():
+    """SML item type lookup, legacy linear scan vs dict, and format byte lookup."""
+
+    items = secs.Secs2BodyBuilder._ITEMS
+    count = 200000
+
+    def _legacy_sml():
+        s = 'U4'.upper()
+        for i in items:
+            if i[0] == s:
+                return i
+
+    def _legacy_format_byte():
+        x = 0xB1 & 0xFC
+        for i in items:
+            if i[1] == x:
+                return i
+
+    def _sml():
+        secs.Secs2BodyBuilder.get_item_type_from_sml('U4')
+
+    def _format_byte():
+        secs.Secs2BodyBuilder._ITEMS_BY_FORMAT_BYTE[0xB1]
+
+    def _build():
+        secs.Secs2BodyBuilder.build('U4', 1)
+
+    for name, f in (
+            ('legacy-sml-scan U4', _legacy_sml),
+            ('sml-dict U4', _sml),
+            ('legacy-format-byte-scan 0xB1', _legacy_format_byte),
+            ('format-byte-table 0xB1', _format_byte),
+            ('build U4', _build)):
+        _report('item-type ' + name, count, _timeit(f, count))
+
+
+def bench_secs2body_template():
+    """S6F11-like body, Secs2BodyBuilder.build from nested tuples vs Secs2BodyTemplate."""
+
+    n = 10
+    count = 20000
+    values = [1, 1001] + [float(i) for i in range(n)]
+
+    tmpl = secs.Secs2BodyTemplate(('L', [
+        ('U4', None),
+        ('U4', None),
+        ('L', [
+            ('L', [
+                ('U4', [100]),
+                ('L', [('F4', None) for _ in range(n)])
+            ])
+        ])
+    ]))
+
+    def _build():
+        secs.Secs2BodyBuilder.build('L', [
+            ('U4', [values[0]]),
+            ('U4', [values[1]]),
+            ('L', [
+                ('L', [
+                    ('U4', [100]),
+                    ('L', [('F4', [v]) for v in values[2:]])
+                ])
+            ])
+        ]).to_bytes()
+
+    def _template():
+        tmpl.to_bytes(values)
+
+    for name, f in (('build', _build), ('template', _template)):
+        _report('secs2body-template S6F11 ' + name, count, _timeit(f, count))
+
+
+def _recursive_decode(bs, pos):
+    # Secs2BodyBuilder decoding before iterative decoder.
+    tt, v_len, p = secs.Secs2BodyBuilder._read_item_header(bs, pos)
+    if tt[6] is None:
+        vv = list()
+        for _ in range(v_len):
+            v, p = _recursive_decode(bs, p)
+            vv.append(v)
+        return secs.Secs2BodyBuilder.build(tt, vv), p
+    return tt[6](tt, bytes(bs[p:(p + v_len)])), (p + v_len)
+
+
+def _recursive_encode(body, buf, offset):
+    # Secs2ListBody encoding before iterative encoder.
+    if body.type == 'L':
+        p = body._encode_header_into(buf, offset, len(body))
+        for x in body.value:
+            p = _recursive_encode(x, buf, p)
+        return p
+    return body.encode_into(buf, offset)
+
+
+def _recursive_to_sml(body):
+    # Secs2ListBody SML rendering before iterative renderer.
+    def _lsf(value, level=''):
+        deep_level = level + '  '
+        vv = list()
+        vv.append(level + '<L [' + str(len(value)) + ']')
+        for x in value:
+            if x.type == 'L':
+                vv.append(_lsf(x.value, deep_level))
+            else:
+                vv.append(deep_level + x.to_sml())
+        vv.append(level + '>')
+        return secs.AbstractSecs2Body._SML_LINESEPARATOR.join(vv)
+    return _lsf(body.value)
+
+
+def bench_secs2body_iterative():
+    """Wide and deep bodies, recursive vs iterative decode, encode, SML render and SML parse."""
+
+    depth = 200
+    deep = secs.Secs2BodyBuilder.build('U4', [1])
+    for _ in range(depth):
+        deep = secs.Secs2BodyBuilder.build('L', [deep, ('A', 'X')])
+
+    wide = secs.Secs2BodyBuilder.build('L', [
+        ('L', [('U2', [i & 0xFFFF]), ('A', 'ALARM')]) for i in range(10000)
+    ])
+
+    for name, body, count in (('wide L[10000]', wide, 5), ('deep L x ' + str(depth), deep, 500)):
+
+        bs = body.to_bytes()
+        sml = body.to_sml()
+        n = len(bs)
+
+        def _recursive_decode_f():
+            _recursive_decode(bs, 0)
+
+        def _decode():
+            secs.Secs2BodyBuilder.from_body_bytes(bs)
+
+        def _recursive_encode_f():
+            _recursive_encode(body, bytearray(n), 0)
+
+        def _encode():
+            body._encode_into(bytearray(n), 0)
+
+        def _recursive_to_sml_f():
+            _recursive_to_sml(body)
+
+        def _to_sml():
+            body._create_to_sml()
+
+        def _parse_sml():
+            secs.SmlParser._parse_body(sml)
+
+        for f_name, f in (
+                ('recursive-decode', _recursive_decode_f),
+                ('decode', _decode),
+                ('recursive-encode', _recursive_encode_f),
+                ('encode', _encode),
+                ('recursive-to-sml', _recursive_to_sml_f),
+                ('to-sml', _to_sml)):
+            _report(f_name + ' ' + name, count, _timeit(f, count), n * count)
+
+        c = max(1, count // 20)
+        _report('parse-sml ' + name, c, _timeit(_parse_sml, c), n * c)
+
+
+def bench_secs2body_path_query():
+    """S6F11 L[20]xL[10] routing by CEID and RPTID, full decode vs lazy decode vs bytes skip-scan."""
+
+    bs = _s6f11_body(20, 10).to_bytes()
+    count = 2000
+
+    def _decode():
+        v = secs.Secs2BodyBuilder.from_body_bytes(bs)
+        v.get_value(1, 0)
+        v.get_value(2, 19, 0, 0)
+
+    def _lazy():
+        v = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True)
+        v.get_value(1, 0)
+        v.get_value(2, 19, 0, 0)
+
+    def _scan():
+        secs.Secs2BodyBuilder.get_value_from_body_bytes(bs, 1, 0)
+        secs.Secs2BodyBuilder.get_value_from_body_bytes(bs, 2, 19, 0, 0)
+
+    for name, f in (('decode', _decode), ('lazy-decode', _lazy), ('skip-scan', _scan)):
+        _report('path-query ' + name, count, _timeit(f, count), len(bs) * count)
+
+
+def bench_secs2body_lazy_index():
+    """L[50000] of records, random access by lazy decode with and without offset index."""
+
+    n = 50000
+    bs = secs.Secs2BodyBuilder.build('L', [
+        ('L', [('U4', [i]), ('A', 'ALARM-' + str(i))]) for i in range(n)
+    ]).to_bytes()
+
+    indices = [(i * 7919) % n for i in range(1000)]
+
+    def _lazy():
+        v = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True)
+        for i in indices[:50]:
+            v.get_value(i, 0, 0)
+
+    def _index():
+        v = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True, index=True)
+        for i in indices:
+            v.get_value(i, 0, 0)
+
+    _report('lazy-list random-access', 50, _timeit(_lazy, 1))
+    _report('lazy-list-index random-access', len(indices), _timeit(_index, 1))
+
+
+def bench_secs2body_array_interop():
+    """100k-element F8 trace, build from list / array.array / numpy, and to list / numpy."""
+
+    n = 100000
+    count = 10
+    values = [float(x) * 0.5 for x in range(n)]
+    arr = array.array('d', values)
+
+    try:
+        np = importlib.import_module('numpy')
+    except ImportError:
+        np = None
+
+    body = secs.Secs2BodyBuilder.build('F8', values)
+
+    vv = [
+        ('build-list', lambda: secs.Secs2BodyBuilder.build('F8', values)),
+        ('build-array', lambda: secs.Secs2BodyBuilder.build('F8', arr)),
+        ('to-list', lambda: list(body.value))
+    ]
+
+    if np is not None:
+        nd = np.array(values)
+        vv.extend([
+            ('build-numpy', lambda: secs.Secs2BodyBuilder.build('F8', nd)),
+            ('legacy-to-numpy', lambda: np.array([x for x in body.value])),
+            ('to-numpy', lambda: body.to_numpy())
+        ])
+
+    for name, f in vv:
+        _report('secs2body F8[' + str(n) + '] ' + name, count, _timeit(f, count), n * 8 * count)
+
+
+def bench_message_memory():
+    """Resident bytes per decoded HSMS-SS S6F11 message held in memory, by tracemalloc."""
+
+    n = 5000
+    frame = secs.HsmsSsDataMessage(6, 11, True, _s6f11_body(5, 4), bytes(4), 10).to_bytes()
+    frames = [(frame[:10] + struct.pack('>L', i) + frame[14:]) for i in range(n)]
+
+    for name, f in (
+            ('decoded', lambda m: None),
+            ('decoded+str', lambda m: str(m))):
+
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        vv = list()
+        for bs in frames:
+            m = secs.HsmsSsMessage.from_bytes(bs)
+            f(m)
+            vv.append(m)
+        used = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+
+        print('{:<40} {:>10,.0f} bytes/message'.format('message-memory ' + name, used / n))
+        del vv
+
+
+
+def bench_cache_policy():
+    """Resident bytes per HSMS-SS S6F11 message held after str() and repr(), by cache policy."""
+
+    n = 5000
+    frame = secs.HsmsSsDataMessage(6, 11, True, _s6f11_body(5, 4), bytes(4), 10).to_bytes()
+    frames = [(frame[:10] + struct.pack('>L', i) + frame[14:]) for i in range(n)]
+
+    for name, policy in (
+            ('ALL', secs.Secs2BodyCachePolicy.ALL),
+            ('ROOT', secs.Secs2BodyCachePolicy.ROOT),
+            ('LRU 1MiB', secs.Secs2BodyLruCachePolicy(1024 * 1024))):
+
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        vv = list()
+        t = time.perf_counter()
+        for bs in frames:
+            m = secs.HsmsSsMessage.from_bytes(bs, cache_policy=policy)
+            str(m)
+            repr(m)
+            vv.append(m)
+        elapsed = time.perf_counter() - t
+        used = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+
+        print('{:<40} {:>10,.0f} bytes/message {:>10,.0f} msg/s'.format(
+            'cache-policy ' + name, used / n, n / elapsed))
+        del vv
+
+
+def bench_sml_parse():
+    """Parse large SML-body strings, items per second."""
+
+    recipe = secs.Secs2BodyBuilder.build('L', [
+        ('L', [('A', 'PARAM_' + str(i)), ('F4', [i * 0.5]), ('U4', [i]), ('BOOLEAN', [i % 2 == 0])])
+        for i in range(2000)
+    ])
+
+    for name, body, count in (
+            ('recipe 2000 params', recipe, 10),
+            ('S6F11 50x200', _s6f11_body(50, 200), 10),
+            ('U4 100k', secs.Secs2BodyBuilder.build('U4', list(range(100000))), 10)):
+
+        sml = body.to_sml()
+        n = _count_items(body) if body.type == 'L' else len(body)
+        elapsed = _timeit((lambda: secs.SmlParser._parse_body(sml)), count)
+        _report('sml-parse ' + name, n * count, elapsed, len(sml) * count)
+
+
+def bench_sml_compile():
+    """send_sml body path, parse each call vs compiled SML cache with placeholders."""
+
+    sml = 'S6F11 W <L <U4 1> <U4 1001> <L ' + ' '.join(
+        ['<L <U4 ' + str(r) + '> <L <U4 $> <A $> <F4 $> <BOOLEAN $> > >' for r in range(10)]) + ' > >.'
+    values = [1, 'VALUE', 0.5, True] * 10
+    fixed = 'S1F2 <L <A "MDLN-A"> <A "000001"> >.'
+    count = 2000
+
+    elapsed = _timeit((lambda: secs.SmlParser.parse(fixed)[3].to_bytes()), count)
+    _report('sml parse fixed', count, elapsed)
+
+    elapsed = _timeit((lambda: secs.SmlParser.compile(fixed).to_bytes()), count)
+    _report('sml compile-cached fixed', count, elapsed)
+
+    elapsed = _timeit((lambda: secs.SmlParser.compile(sml).to_bytes(values)), count)
+    _report('sml compile-cached S6F11 40 values', count, elapsed)
+
+
+def bench_sml_iter_parse():
+    """Stream-parse multi-message SML log with comments, messages per second."""
+
+    n = 2000
+    sml = 'S6F11 W\n' + _s6f11_body(5, 20).to_sml() + '.'
+    text = ''.join([('// message ' + str(i) + '\n' + sml + '\n') for i in range(n)])
+
+    for name, f in (
+            ('str', (lambda: io.StringIO(text))),
+            ('bytes', (lambda: io.BytesIO(text.encode(encoding='utf-8'))))):
+
+        start = time.perf_counter()
+        count = sum([1 for _ in secs.SmlParser.iter_parse(f())])
+        elapsed = time.perf_counter() - start
+        _report('sml-iter-parse ' + name, count, elapsed, len(text))
+
+
+def bench_sml_writer():
+    """str() of messages with 5MB B and 100k-item L, full to_sml vs truncating writer, time and peak memory."""
+
+    for name, body in (
+            ('B 5MB', secs.Secs2BodyBuilder.build('B', bytes(5 * 1024 * 1024))),
+            ('L 100k', secs.Secs2BodyBuilder.build('L', [('U4', [i]) for i in range(100000)]))):
+
+        frame = secs.HsmsSsDataMessage(6, 11, True, body, bytes(4), 10).to_bytes()
+
+        for mode, f in (
+                ('to_sml', (lambda m: m.secs2body.to_sml())),
+                ('str', (lambda m: str(m)))):
+
+            m = secs.HsmsSsMessage.from_bytes(frame, lazy=True)
+            tracemalloc.start()
+            start = time.perf_counter()
+            v = f(m)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print('{:<40} {:>10.3f} ms {:>12,.0f} chars {:>14,.0f} peak bytes'.format(
+                'sml-writer ' + name + ' ' + mode, elapsed * 1000.0, len(v), peak))
+
+
+def bench_sml_wire():
+    """SML straight to HSMS-SS frames for 1000 canned responses, vs parse to Secs2Body, time and retained memory."""
+
+    smls = [
+        ('S6F11 W <L <U4 ' + str(i) + '> <U4 1001> <L <L <U4 1> <L <A "LOT-' + str(i)
+         + '"> <F4 0.5> <U2 1 2 3 4> <BOOLEAN T> > > > >.')
+        for i in range(1000)]
+
+    for name, f in (
+            ('parse', (lambda sml: secs.SmlParser.parse(sml))),
+            ('compile', (lambda sml: secs.SmlMessageTemplate.from_sml(sml)))):
+
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        vv = [f(sml) for sml in smls]
+        elapsed = time.perf_counter() - start
+        used = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+
+        print('{:<40} {:>10.3f} ms {:>10,.0f} bytes/message'.format(
+            'sml-wire ' + name, elapsed * 1000.0, used / len(smls)))
+        del vv
+
+    count = 10000
+    msgs = [secs.SmlParser.parse(sml) for sml in smls[:10]]
+    tmpls = [secs.SmlMessageTemplate.from_sml(sml) for sml in smls[:10]]
+
+    elapsed = _timeit((lambda: [
+        secs.HsmsSsDataMessage(m[0], m[1], m[2], m[3], b'\x00\x00\x00\x01', 10).to_bytes() for m in msgs]), count // 10)
+    _report('sml-wire frame from parsed body', count, elapsed)
+
+    elapsed = _timeit((lambda: [t.to_hsmsss_bytes(b'\x00\x00\x00\x01', 10) for t in tmpls]), count // 10)
+    _report('sml-wire frame from compiled', count, elapsed)
+
+
+def bench_message_deferred_decode():
+    """HSMS-SS from_bytes on reader thread, body decoded on first secs2body access, messages per second."""
+
+    n = 10000
+    frame = secs.HsmsSsDataMessage(6, 11, True, _s6f11_body(5, 20), bytes(4), 10).to_bytes()
+
+    elapsed = _timeit((lambda: secs.HsmsSsMessage.from_bytes(frame)), n)
+    _report('from_bytes header only', n, elapsed, len(frame) * n)
+
+    elapsed = _timeit((lambda: secs.HsmsSsMessage.from_bytes(frame).secs2body), n)
+    _report('from_bytes + secs2body', n, elapsed, len(frame) * n)
+
+
+def bench_hsmsss_control():
+    """Linktest handling, build request, receive and classify, build response frames."""
+
+    count = 100000
+    sys_bytes = bytes([0x00, 0x00, 0x00, 0x01])
+    frame = secs.HsmsSsControlMessage.build_linktest_request(sys_bytes).to_bytes()
+
+    elapsed = _timeit((lambda: secs.HsmsSsControlMessage.build_linktest_request(sys_bytes).to_bytes()), count)
+    _report('control build linktest.req frame', count, elapsed)
+
+    def _recv():
+        msg = secs.HsmsSsMessage.from_bytes(frame)
+        if msg.get_control_type() == secs.HsmsSsControlType.LINKTEST_REQ:
+            return secs.HsmsSsControlMessage.build_linktest_response(msg).to_bytes()
+
+    elapsed = _timeit(_recv, count)
+    _report('control recv linktest.req + rsp frame', count, elapsed)
+
+    elapsed = _timeit((lambda: (
+        secs.HsmsSsControlType.get((0x00, 0x09)),
+        secs.HsmsSsControlType.has_s_type(0x08),
+        secs.HsmsSsSelectStatus.get(0x03),
+        secs.HsmsSsRejectReason.get(0x04))), count)
+    _report('control type lookups x4', count, elapsed)
+
+
+def bench_secs1_blocks():
+    """SECS-I multi-block message, build blocks, verify checksums, join blocks, MB per second."""
+
+    count = 20
+    body = secs.Secs2BodyBuilder.build('B', bytes(range(256)) * 4096)
+    n = body.get_encoded_size()
+
+    def _to_blocks():
+        return secs.Secs1Message(6, 11, True, body, bytes(4), 10, False).to_blocks()
+
+    elapsed = _timeit(_to_blocks, count)
+    _report('secs1 to_blocks 1MB', count, elapsed, n * count)
+
+    blocks = _to_blocks()
+    bbs = [list(x.to_bytes()) for x in blocks]
+    check = getattr(secs.Secs1MessageBlock, '_is_valid_sum', None)
+    if check is None:
+        def check(bb):
+            return (sum(bb[1:-2]) & 0xFFFF) == ((bb[-2] << 8) | bb[-1])
+
+    elapsed = _timeit((lambda: [check(bb) for bb in bbs]), count)
+    _report('secs1 sum check 1MB', count, elapsed, n * count)
+
+    elapsed = _timeit((lambda: secs.Secs1Message.from_blocks(blocks).secs2body), count)
+    _report('secs1 from_blocks 1MB', count, elapsed, n * count)
+
+
+class _LegacyReadSecs1OnPySerialCommunicator(secs.Secs1OnPySerialCommunicator):
+    # Secs1OnPySerialCommunicator reading path before bulk reads, one byte per read().
+
+    def _reading(self, ser):
+        try:
+            while not self.is_closed:
+                bs = ser.read()
+                if bs:
+                    self._put_recv_bytes(bs)
+                else:
+                    return
+        except Exception as e:
+            self._put_error(e)
+
+
+def _pty_null_modem(baudrate):
+    # Two pty pairs crossed by relay thread, paced at baudrate (10 bits per byte) if not None.
+    m1, s1 = os.openpty()
+    m2, s2 = os.openpty()
+    chunk = 4096 if baudrate is None else max(1, baudrate // 10000)
+
+    def _relay():
+        try:
+            while True:
+                rr, _, _ = select.select([m1, m2], [], [])
+                for fd in rr:
+                    bs = os.read(fd, 4096)
+                    dst = m2 if fd == m1 else m1
+                    for i in range(0, len(bs), chunk):
+                        os.write(dst, bs[i:i + chunk])
+                        if baudrate is not None:
+                            time.sleep(len(bs[i:i + chunk]) * 10 / baudrate)
+        except OSError:
+            return
+
+    threading.Thread(target=_relay, daemon=True).start()
+
+    def _close():
+        for fd in (s1, s2, m1, m2):
+            os.close(fd)
+
+    return os.ttyname(s1), os.ttyname(s2), _close
+
+
+def bench_secs1_pyserial():
+    """SECS-I on pySerial over pty null-modem, one-byte reads vs bulk reads, wall and CPU time per message."""
+
+    try:
+        importlib.import_module('serial')
+    except ImportError:
+        print('pyserial not installed, skipped')
+        return
+
+    if not hasattr(os, 'openpty'):
+        print('pty not supported, skipped')
+        return
+
+    for baudrate, size, count in ((9600, 1000, 2), (38400, 4000, 2), (115200, 12000, 2), (None, 256 * 1024, 4)):
+
+        body = ('B', bytes(size))
+
+        for name, cls in (('legacy-read', _LegacyReadSecs1OnPySerialCommunicator), ('bulk-read', secs.Secs1OnPySerialCommunicator)):
+
+            p1, p2, close = _pty_null_modem(baudrate)
+            try:
+                rr = cls(p1, 9600 if baudrate is None else baudrate, 10, True, True)
+                cc = cls(p2, 9600 if baudrate is None else baudrate, 10, False, False)
+
+                with rr, cc:
+                    rr.open_and_wait_until_communicating()
+                    cc.open_and_wait_until_communicating()
+                    cc.send(1, 1, False)
+
+                    start = time.perf_counter()
+                    cpu_start = time.process_time()
+                    for _ in range(count):
+                        cc.send(6, 11, False, body)
+                    cpu_elapsed = time.process_time() - cpu_start
+                    elapsed = time.perf_counter() - start
+            finally:
+                close()
+
+            label = 'secs1-pyserial ' + ('pty' if baudrate is None else str(baudrate)) + ' ' + name
+            _report(label, count, elapsed, size * count)
+            _report(label + ' cpu', count, cpu_elapsed, size * count)
+
+
+async def _async_hsmsss_sessions(sessions, count, port):
+
+    pp = [
+        secs.AsyncHsmsSsPassiveCommunicator('127.0.0.1', port + i, 10, True, timeout_t5=0.1)
+        for i in range(sessions)]
+    aa = [
+        secs.AsyncHsmsSsActiveCommunicator('127.0.0.1', port + i, 10, False, timeout_t5=0.1)
+        for i in range(sessions)]
+
+    for p in pp:
+        p.add_recv_primary_msg_listener(
+            lambda primary, comm: asyncio.ensure_future(
+                comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body)))
+
+    async def _session(a):
+        for i in range(count):
+            await a.send(6, 11, True, ('U4', [i]))
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*[c.open_and_wait_until_communicating() for c in (pp + aa)])
+        connected = time.perf_counter() - start
+
+        threads = threading.active_count()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[_session(a) for a in aa])
+        elapsed = time.perf_counter() - start
+
+    finally:
+        await asyncio.gather(*[c.close() for c in (aa + pp)])
+
+    return connected, elapsed, threads
+
+
+def _thread_hsmsss_sessions(sessions, count, port):
+
+    pp = [
+        secs.HsmsSsPassiveCommunicator('127.0.0.1', port + i, 10, True, timeout_t5=0.1)
+        for i in range(sessions)]
+    aa = [
+        secs.HsmsSsActiveCommunicator('127.0.0.1', port + i, 10, False, timeout_t5=0.1)
+        for i in range(sessions)]
+
+    for p in pp:
+        p.add_recv_primary_msg_listener(
+            lambda primary, comm: comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body))
+
+    def _session(a):
+        for i in range(count):
+            a.send(6, 11, True, ('U4', [i]))
+
+    try:
+        start = time.perf_counter()
+        for c in (pp + aa):
+            c.open()
+        for c in (pp + aa):
+            c.open_and_wait_until_communicating()
+        connected = time.perf_counter() - start
+
+        threads = threading.active_count()
+
+        ths = [threading.Thread(target=_session, args=(a, ), daemon=True) for a in aa]
+        start = time.perf_counter()
+        for th in ths:
+            th.start()
+        for th in ths:
+            th.join()
+        elapsed = time.perf_counter() - start
+
+    finally:
+        for c in (aa + pp):
+            c.close()
+
+    return connected, elapsed, threads
+
+
+def bench_hsmsss_async_sessions():
+    """Many HSMS-SS sessions over loopback, asyncio communicators in one event loop vs thread communicators, W-bit round trips."""
+
+    count = 50
+
+    for name, sessions, f in (
+            ('async', 50, lambda n, c, p: asyncio.run(_async_hsmsss_sessions(n, c, p))),
+            ('async', 200, lambda n, c, p: asyncio.run(_async_hsmsss_sessions(n, c, p))),
+            ('thread', 50, _thread_hsmsss_sessions)):
+
+        connected, elapsed, threads = f(sessions, count, 26000)
+
+        label = 'hsmsss-sessions ' + name + ' x' + str(sessions)
+        _report(label + ' select', sessions, connected)
+        _report(label + ' round-trip', sessions * count, elapsed)
+        print('{:<40} {:>10d} threads'.format(label, threads))
+
+
+def bench_send_many():
+    """Pipelined send_many vs one-by-one send, HSMS-SS and SECS-I on TCP/IP loopback, W-bit round trips."""
+
+    def _echo(primary, comm):
+        comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body)
+
+    count = 1000
+    msgs = [(1, 3, True, ('L', [('U4', [i])])) for i in range(count)]
+
+    p = secs.HsmsSsPassiveCommunicator('127.0.0.1', 26500, 10, True)
+    a = secs.HsmsSsActiveCommunicator('127.0.0.1', 26500, 10, False, timeout_t5=0.1)
+    p.add_recv_primary_msg_listener(_echo)
+
+    with p, a:
+        p.open()
+        a.open_and_wait_until_communicating()
+        p.open_and_wait_until_communicating()
+
+        _report('hsmsss send', count, _timeit(lambda: [a.send(*m) for m in msgs], 1))
+        for n in (1, 16, 64, None):
+            _report('hsmsss send_many ' + str(n), count, _timeit(lambda: a.send_many(msgs, n), 1))
+
+    count = 100
+    msgs = msgs[0:count]
+
+    e = secs.Secs1OnTcpIpCommunicator('127.0.0.1', 26501, 10, True, True)
+    h = secs.Secs1OnTcpIpReceiverCommunicator('127.0.0.1', 26501, 10, False, False)
+    e.add_recv_primary_msg_listener(_echo)
+
+    with h, e:
+        h.open()
+        e.open_and_wait_until_communicating()
+        h.open_and_wait_until_communicating()
+
+        _report('secs1 send', count, _timeit(lambda: [h.send(*m) for m in msgs], 1))
+        _report('secs1 send_many 16', count, _timeit(lambda: h.send_many(msgs, 16), 1))
+
+
+class _CountingSocket:
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.writes = 0
+
+    def sendall(self, bs):
+        self.writes += 1
+        return self.sock.sendall(bs)
+
+    def sendmsg(self, buffers):
+        self.writes += 1
+        return self.sock.sendmsg(buffers)
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+class _LegacyWriteHsmsSsConnection:
+
+    def __init__(self, sock):
+        self.__sock = sock
+        self.__lock = threading.Lock()
+
+    def send(self, msg):
+        with self.__lock:
+            self.__sock.sendall(msg.to_bytes())
+
+
+def _drain(sock):
+    try:
+        while sock.recv(0x100000):
+            pass
+    except OSError:
+        pass
+
+
+def _hsmsss_write(legacy, threads, count, body, window):
+    comm = secs.HsmsSsPassiveCommunicator('127.0.0.1', 26600, 10, True, coalesce_window=window)
+
+    a, b = socket.socketpair()
+    threading.Thread(target=_drain, args=(b, ), daemon=True).start()
+
+    sock = _CountingSocket(a)
+    if legacy:
+        conn = _LegacyWriteHsmsSsConnection(sock)
+    else:
+        conn = secs.HsmsSsConnection(sock, comm, lambda m, c: None, lambda m: None, lambda m: None, lambda e: None)
+
+    def _send():
+        for _ in range(count):
+            conn.send(secs.HsmsSsDataMessage(6, 11, False, body, bytes(4), 10))
+
+    ths = [threading.Thread(target=_send) for _ in range(threads)]
+    try:
+        start = time.perf_counter()
+        for th in ths:
+            th.start()
+        for th in ths:
+            th.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if not legacy:
+            conn.shutdown()
+        a.close()
+        b.close()
+
+    return elapsed, sock.writes
+
+
+def bench_hsmsss_writer():
+    """HSMS-SS outbound writes over socketpair, legacy sendall(to_bytes) vs scatter/gather, and coalescing window of concurrent senders."""
+
+    small = secs.Secs2BodyBuilder.build('L', [('U4', [1]), ('A', 'ALARM TEXT')])
+    large = secs.Secs2BodyBuilder.build('B', bytes(0x100000))
+
+    # warm up
+    _hsmsss_write(True, 1, 1000, small, 0.0)
+
+    for name, threads, count, body, window in (
+            ('small x1', 1, 20000, small, 0.0),
+            ('small x8', 8, 5000, small, 0.0),
+            ('small x64', 64, 625, small, 0.0),
+            ('small x64 window 50us', 64, 625, small, 0.00005),
+            ('small x64 window 200us', 64, 625, small, 0.0002),
+            ('1MiB x1', 1, 200, large, 0.0)):
+
+        for legacy in ((True, False) if window == 0.0 else (False, )):
+            elapsed, writes = _hsmsss_write(legacy, threads, count, body, window)
+            label = 'hsmsss-writer ' + ('legacy ' if legacy else '') + name
+            _report(label, threads * count, elapsed)
+            print('{:<40} {:>10d} writes'.format(label, writes))
+
+
+BENCHMARKS = {
+    'hsmsss_frame_reader': bench_hsmsss_frame_reader,
+    'secs2body_numbers': bench_secs2body_numbers,
+    'secs2body_decode': bench_secs2body_decode,
+    'secs2body_item_type_lookup': bench_secs2body_item_type_lookup,
+    'secs2body_template': bench_secs2body_template,
+    'secs2body_iterative': bench_secs2body_iterative,
+    'secs2body_path_query': bench_secs2body_path_query,
+    'secs2body_lazy_index': bench_secs2body_lazy_index,
+    'secs2body_array_interop': bench_secs2body_array_interop,
+    'message_memory': bench_message_memory,
+    'cache_policy': bench_cache_policy,
+    'sml_parse': bench_sml_parse,
+    'sml_compile': bench_sml_compile,
+    'sml_iter_parse': bench_sml_iter_parse,
+    'sml_writer': bench_sml_writer,
+    'sml_wire': bench_sml_wire,
+    'message_deferred_decode': bench_message_deferred_decode,
+    'hsmsss_control': bench_hsmsss_control,
+    'secs1_blocks': bench_secs1_blocks,
+    'secs1_pyserial': bench_secs1_pyserial,
+    'hsmsss_async_sessions': bench_hsmsss_async_sessions,
+    'send_many': bench_send_many,
+    'hsmsss_writer': bench_hsmsss_writer,
+}
+
+
+if __name__ == '__main__':
+
+    names = sys.argv[1:] if len(sys.argv) > 1 else list(BENCHMARKS.keys())
+
+    for n in names:
+        print('# ' + n + ': ' + BENCHMARKS[n].__doc__)
+        BENCHMARKS[n]()
+        print()
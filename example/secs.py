@@ -1,11 +1,24 @@
-import socket
+import io
+import array
+import sys
+import concurrent.futures
+import asyncio
 import re
+import importlib
+import selectors
+import weakref
+import codecs
+import collections
 import threading
-import inspect
+import heapq
+import time
+import socket
+import itertools
+import bisect
 import datetime
-import importlib
-import os
 import struct
+import inspect
+import os
 
 
 class Secs2BodyParseError(Exception):
@@ -20,6 +33,115 @@ class Secs2BodyBytesParseError(Secs2BodyParseError):
         super(Secs2BodyBytesParseError, self).__init__(msg)
 
 
+class Secs2BodyCachePolicy:
+    """Cache policy of to_bytes(), to_sml() and repr() results.
+
+    Secs2BodyCachePolicy.ALL caches on each item, including child items rendered in L.
+    Secs2BodyCachePolicy.ROOT caches on the item called only, child items are rendered without cache.
+    Secs2BodyLruCachePolicy caches in bounded LRU instead of items.
+
+    Set globally by Secs2BodyBuilder.cache_policy, or per communicator by cache_policy.
+    """
+
+    def __init__(self, cache_children):
+        self.__cache_children = bool(cache_children)
+
+    @property
+    def cache_children(self):
+        pass
+
+    @cache_children.getter
+    def cache_children(self):
+        """True if cache child items while rendering L.
+
+        Returns:
+            bool: cache_children
+        """
+        return self.__cache_children
+
+    def _get(self, obj, key):
+        return obj._get_own_cache(key)
+
+    def _set(self, obj, key, v):
+        obj._set_own_cache(key, v)
+
+
+Secs2BodyCachePolicy.ALL = Secs2BodyCachePolicy(True)
+Secs2BodyCachePolicy.ROOT = Secs2BodyCachePolicy(False)
+
+
+class Secs2BodyLruCachePolicy(Secs2BodyCachePolicy):
+    """Cache in bounded LRU by total length of cached values.
+
+    Cached objects are weak referenced, and entries are dropped when objects are collected.
+    Child items are rendered without cache.
+    """
+
+    def __init__(self, max_size=16 * 1024 * 1024):
+        """Constructor.
+
+        Args:
+            max_size (int): max total length of cached bytes and str. Defaults to 16MiB.
+        """
+        super(Secs2BodyLruCachePolicy, self).__init__(False)
+        self.__max_size = int(max_size)
+        self.__size = 0
+        self.__items = collections.OrderedDict()    # (id(obj), key) -> (weakref, value, size)
+        self.__dead = list()                        # (key, weakref) of collected objects
+        self.__lock = threading.Lock()
+
+    @property
+    def size(self):
+        pass
+
+    @size.getter
+    def size(self):
+        """Total length of cached values.
+
+        Returns:
+            int: size
+        """
+        return self.__size
+
+    def _get(self, obj, key):
+        k = (id(obj), key)
+        with self.__lock:
+            x = self.__items.get(k)
+            if x is None or x[0]() is not obj:
+                return None
+            self.__items.move_to_end(k)
+            return x[1]
+
+    def _set(self, obj, key, v):
+        size = len(v)
+        if size > self.__max_size:
+            return
+
+        k = (id(obj), key)
+        dead = self.__dead
+        ref = weakref.ref(obj, (lambda r: dead.append((k, r))))
+
+        with self.__lock:
+
+            while dead:
+                dk, dr = dead.pop()
+                x = self.__items.get(dk)
+                if x is not None and x[0] is dr:
+                    del self.__items[dk]
+                    self.__size -= x[2]
+
+            x = self.__items.pop(k, None)
+            if x is not None:
+                self.__size -= x[2]
+
+            self.__items[k] = (ref, v, size)
+            self.__size += size
+
+            while self.__size > self.__max_size:
+                x = (self.__items.popitem(last=False))[1]
+                self.__size -= x[2]
+
+
 class AbstractSecs2Body:
 
     _BYTES_LEN_3 = 2**16
@@ -28,20 +150,28 @@ class AbstractSecs2Body:
     _SML_VALUESEPARATOR = ' '
     _SML_LINESEPARATOR = os.linesep
 
+    # _cache is None, or list of [sml, repr, bytes] created on first cached in item
+    # _cache_policy is None if Secs2BodyBuilder.cache_policy
+    __slots__ = ('_type', '_value', '_cache', '_cache_policy', '__weakref__')
+
+    _CACHE_SML = 0
+    _CACHE_REPR = 1
+    _CACHE_BYTES = 2
+
     def __init__(self, item_type, value):
         self._type = item_type
         self._value = value
-        self.__cache_sml = None
-        self.__cache_repr = None
-        self.__cache_bytes = None
+        self._cache = None
+        self._cache_policy = None
 
     def __str__(self):
         return self.to_sml()
 
     def __repr__(self):
-        if self.__cache_repr is None:
-            self.__cache_repr = str((self._type[0], self._value))
-        return self.__cache_repr
+        v = self._get_cache(self._CACHE_REPR)
+        if v is None:
+            v = self._set_cache(self._CACHE_REPR, self._create_repr())
+        return v
 
     def __len__(self):
         return len(self._value)
@@ -127,19 +257,32 @@ class AbstractSecs2Body:
             raise Secs2BodyParseError(e)
 
         if isinstance(v, AbstractSecs2Body):
-            return v._value
+            return v.value
         else:
             return v
 
+    def iter_values(self, start=0, stop=None):
+        """values iterator in range, without creating all values.
+
+        Args:
+            start (int): start index. Defaults to 0.
+            stop (int): stop index. Defaults to None, length.
+
+        Returns:
+            iterator: values of value[start:stop]
+        """
+        return iter(self.value[start:stop])
+
     def to_sml(self):
         """SML getter.
 
         Returns:
             str: SML
         """
-        if self.__cache_sml is None:
-            self.__cache_sml = self._create_to_sml()
-        return self.__cache_sml
+        v = self._get_cache(self._CACHE_SML)
+        if v is None:
+            v = self._set_cache(self._CACHE_SML, self._create_to_sml())
+        return v
 
     def to_bytes(self):
         """bytes getter.
@@ -147,9 +290,103 @@ class AbstractSecs2Body:
         Returns:
             bytes: bytes
         """
-        if self.__cache_bytes is None:
-            self.__cache_bytes = self._create_to_bytes()
-        return self.__cache_bytes
+        v = self._get_cache(self._CACHE_BYTES)
+        if v is None:
+            v = self._set_cache(self._CACHE_BYTES, self._create_to_bytes())
+        return v
+
+    def get_encoded_size(self):
+        """Encoded bytes length getter.
+
+        Returns:
+            int: length of item-header and value bytes, including child items if L.
+        """
+        c = self._cache
+        if c is not None and c[self._CACHE_BYTES] is not None:
+            return len(c[self._CACHE_BYTES])
+        return self._get_encoded_size()
+
+    def encode_into(self, buf, offset=0):
+        """Write encoded bytes into buffer.
+
+        buf must have get_encoded_size() bytes from offset.
+
+        Args:
+            buf (bytearray or memoryview): writable buffer.
+            offset (int): start position. Defaults to 0.
+
+        Returns:
+            int: end position.
+        """
+        c = self._cache
+        if c is not None and c[self._CACHE_BYTES] is not None:
+            v = c[self._CACHE_BYTES]
+            end = offset + len(v)
+            buf[offset:end] = v
+            return end
+        return self._encode_into(buf, offset)
+
+    def set_cache_policy(self, cache_policy):
+        """Set cache policy of this item and child items.
+
+        Cached values are cleared.
+
+        Args:
+            cache_policy (Secs2BodyCachePolicy): cache policy, None if Secs2BodyBuilder.cache_policy.
+        """
+        stack = [self]
+        while stack:
+            x = stack.pop()
+            x._cache_policy = cache_policy
+            x._cache = None
+            vv = x._get_child_items()
+            if vv is not None:
+                stack.extend(vv)
+            elif isinstance(x, Secs2LazyListBody) and x._children is not None:
+                stack.extend([c for c in x._children if c is not None])
+
+    def _get_cache_policy(self):
+        p = self._cache_policy
+        return Secs2BodyBuilder.cache_policy if p is None else p
+
+    def _get_cache(self, index):
+        c = self._cache
+        if c is not None:
+            return c[index]
+        return self._get_cache_policy()._get(self, index)
+
+    def _set_cache(self, index, v):     # return v
+        self._get_cache_policy()._set(self, index, v)
+        return v
+
+    def _get_child_cache(self, child, index, create):   # cache of child item while rendering
+        if self._get_cache_policy().cache_children:
+            v = child._get_cache(index)
+            return child._set_cache(index, create()) if v is None else v
+        else:
+            v = child._get_cache(index)
+            return create() if v is None else v
+
+    def _get_own_cache(self, index):
+        c = self._cache
+        return None if c is None else c[index]
+
+    def _set_own_cache(self, index, v):
+        if self._cache is None:
+            self._cache = [None, None, None]
+        self._cache[index] = v
+
+    def _get_encode_items(self):    # return child items if encoded by walking them, None if encode itself
+        c = self._cache
+        if c is None or c[self._CACHE_BYTES] is None:
+            return self._get_child_items()
+        return None
+
+    def _get_child_items(self):
+        return None
+
+    def _create_repr(self):
+        return str((self._type[0], self.value))
 
     def _create_to_sml(self):
         l, v = self._create_to_sml_value()
@@ -159,15 +396,48 @@ class AbstractSecs2Body:
         return 0, ''
 
     def _create_to_bytes(self):
+        buf = bytearray(self._get_encoded_size())
+        self._encode_into(buf, 0)
+        return bytes(buf)
+
+    def _get_encoded_size(self):
+        v_len = self._get_value_bytes_length()
+        return self._get_header_size(v_len) + v_len
+
+    def _get_value_bytes_length(self):
+        return len(self._create_to_bytes_value())
+
+    def _encode_into(self, buf, offset):
         bs_vv = self._create_to_bytes_value()
-        v_len = len(bs_vv)
-        bs_len = struct.pack('>L', v_len)
+        p = self._encode_header_into(buf, offset, len(bs_vv))
+        end = p + len(bs_vv)
+        buf[p:end] = bs_vv
+        return end
+
+    def _get_header_size(self, v_len):
         if v_len >= self._BYTES_LEN_3:
-            return struct.pack('>B', (self._type[1] | 0x03)) + bs_len[1:4] + bs_vv
+            return 4
         elif v_len >= self._BYTES_LEN_2:
-            return struct.pack('>B', (self._type[1] | 0x02)) + bs_len[2:4] + bs_vv
+            return 3
         else:
-            return struct.pack('>B', (self._type[1] | 0x01)) + bs_len[3:4] + bs_vv
+            return 2
+
+    def _encode_header_into(self, buf, offset, v_len):
+        if v_len >= self._BYTES_LEN_3:
+            buf[offset] = self._type[1] | 0x03
+            buf[offset + 1] = (v_len >> 16) & 0xFF
+            buf[offset + 2] = (v_len >> 8) & 0xFF
+            buf[offset + 3] = v_len & 0xFF
+            return offset + 4
+        elif v_len >= self._BYTES_LEN_2:
+            buf[offset] = self._type[1] | 0x02
+            buf[offset + 1] = (v_len >> 8) & 0xFF
+            buf[offset + 2] = v_len & 0xFF
+            return offset + 3
+        else:
+            buf[offset] = self._type[1] | 0x01
+            buf[offset + 1] = v_len
+            return offset + 2
 
     def _create_to_bytes_value(self):
         return self._value
@@ -194,13 +464,58 @@ class AbstractSecs2Body:
             v_min = 0
 
         if v > v_max or v < v_min:
-            raise ValueError("value is from " + str(min) + " to " + str(max) + ", value is " + str(v))
+            raise ValueError("value is from " + str(v_min) + " to " + str(v_max) + ", value is " + str(v))
 
         return v
 
+    # array.array typecode -> numpy dtype kind
+    _ARRAY_KINDS = {
+        'b': 'i', 'h': 'i', 'i': 'i', 'l': 'i', 'q': 'i',
+        'B': 'u', 'H': 'u', 'I': 'u', 'L': 'u', 'Q': 'u',
+        'f': 'f', 'd': 'f'
+    }
+
+    @staticmethod
+    def _array_kind(item_type):    # return numpy dtype kind of number item_type
+        if item_type[4] is None:
+            return 'f'
+        elif item_type[4]:
+            return 'i'
+        else:
+            return 'u'
+
+    @classmethod
+    def _array_to_bytes(cls, item_type, value):
+        # return big-endian bytes if value is numpy array or array.array of same kind and size as item_type,
+        # otherwise None. numpy is not imported here, value is numpy only if numpy is already imported.
+
+        kind = cls._array_kind(item_type)
+
+        if isinstance(value, array.array):
+            if value.itemsize == item_type[2] and cls._ARRAY_KINDS.get(value.typecode) == kind:
+                if sys.byteorder == 'little' and value.itemsize > 1:
+                    value = array.array(value.typecode, value.tobytes())
+                    value.byteswap()
+                return value.tobytes()
+            return None
+
+        np = sys.modules.get('numpy')
+        if np is not None and isinstance(value, (np.ndarray, np.generic)):
+            dt = value.dtype
+            if dt.itemsize == item_type[2] and dt.kind == kind:
+                return np.ascontiguousarray(value, dtype=dt.newbyteorder('>')).tobytes()
+
+        return None
+
+    @staticmethod
+    def _import_numpy():
+        return importlib.import_module('numpy')
+
 
 class Secs2AsciiBody(AbstractSecs2Body):
 
+    __slots__ = ()
+
     def __init__(self, item_type, value):
         super(Secs2AsciiBody, self).__init__(item_type, str(value))
 
@@ -210,40 +525,99 @@ class Secs2AsciiBody(AbstractSecs2Body):
     def _create_to_bytes_value(self):
         return self._value.encode(encoding='ascii')
 
+    def _get_value_bytes_length(self):
+        return len(self._value)
+
     @staticmethod
     def build(item_type, value):
         return Secs2AsciiBody(item_type, value)
 
+    @staticmethod
+    def from_value_bytes(item_type, bs):
+        return Secs2AsciiBody(item_type, str(bs, encoding='ascii'))
+
 
 class Secs2BooleanBody(AbstractSecs2Body):
+    """BOOLEAN item.
+
+    value is held as bytes, 0x00 is False, 0xFF is True.
+    """
+
+    __slots__ = ()
+
+    __TO_BOOLEAN_BYTES = bytes([0x00] + [0xFF] * 255)
 
     def __init__(self, item_type, value):
         tv = type(value)
-        if tv is tuple or tv is list:
-            super(Secs2BooleanBody, self).__init__(
-                item_type,
-                tuple([bool(x) for x in value])
-                )
+        np = sys.modules.get('numpy')
+        if tv is tuple or tv is list or isinstance(value, array.array):
+            bs = bytes(map(bool, value))
+        elif np is not None and isinstance(value, (np.ndarray, np.generic)):
+            bs = np.ascontiguousarray(value, dtype=bool).tobytes()
         else:
-            super(Secs2BooleanBody, self).__init__(
-                item_type,
-                tuple([bool(value)])
-                )
+            bs = bytes([bool(value)])
+        super(Secs2BooleanBody, self).__init__(item_type, bs.translate(self.__TO_BOOLEAN_BYTES))
+
+    def __getitem__(self, item):
+        if type(item) is slice:
+            return self.value[item]
+        try:
+            return self._value[item] != 0x00
+        except IndexError as e:
+            raise Secs2BodyParseError(e)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Returns:
+            tuple: bool values
+        """
+        return tuple(map(bool, self._value))
+
+    def iter_values(self, start=0, stop=None):
+        return map(bool, self._value[start:stop])
 
     def _create_to_sml_value(self):
         vv = [("TRUE" if x else "FALSE") for x in self._value]
         return len(vv), self._SML_VALUESEPARATOR.join(vv)
 
-    def _create_to_bytes_value(self):
-        return bytes([(0xFF if v else 0x00) for v in self._value])
+    def to_numpy(self):
+        """NumPy array getter.
+
+        BOOLEAN bytes (0x00, 0xFF) are converted to bool, so array is a copy.
+
+        Raises:
+            ImportError: if numpy is not installed.
+
+        Returns:
+            numpy.ndarray: bool values
+        """
+        np = self._import_numpy()
+        return np.frombuffer(self._value, dtype='u1') != 0
 
     @staticmethod
     def build(item_type, value):
         return Secs2BooleanBody(item_type, value)
 
+    @classmethod
+    def from_value_bytes(cls, item_type, bs):
+        v = cls.__new__(cls)
+        AbstractSecs2Body.__init__(v, item_type, bytes(bs).translate(cls.__TO_BOOLEAN_BYTES))
+        return v
+
 
 class Secs2BinaryBody(AbstractSecs2Body):
 
+    __slots__ = ()
+
     def __init__(self, item_type, value):
         tv = type(value)
         if tv is bytes:
@@ -251,52 +625,168 @@ class Secs2BinaryBody(AbstractSecs2Body):
         elif tv is bytearray:
             super(Secs2BinaryBody, self).__init__(item_type, bytes(value))
         elif tv is tuple or tv is list:
-            super(Secs2BinaryBody, self).__init__(
-                item_type,
-                bytes([self._tiof(x, item_type[2], item_type[4]) for x in value])
-                )
+            try:
+                bs = bytes(value)
+            except (TypeError, ValueError):
+                bs = bytes([self._tiof(x, item_type[2], item_type[4]) for x in value])
+            super(Secs2BinaryBody, self).__init__(item_type, bs)
         else:
-            super(Secs2BinaryBody, self).__init__(
-                item_type,
-                bytes([self._tiof(value, item_type[2], item_type[4])])
-                )
+            bs = self._array_to_bytes(item_type, value)
+            if bs is None:
+                if hasattr(value, 'tolist'):     # numpy array or array.array
+                    bs = Secs2BinaryBody(item_type, value.tolist())._value
+                else:
+                    bs = bytes([self._tiof(value, item_type[2], item_type[4])])
+            super(Secs2BinaryBody, self).__init__(item_type, bs)
 
     def _create_to_sml_value(self):
         vv = [('0x' + '{:02X}'.format(x)) for x in self._value]
         return len(vv), self._SML_VALUESEPARATOR.join(vv)
 
+    def to_numpy(self):
+        """NumPy array getter.
+
+        Array is a read-only view over value bytes without copying.
+
+        Raises:
+            ImportError: if numpy is not installed.
+
+        Returns:
+            numpy.ndarray: uint8 values
+        """
+        np = self._import_numpy()
+        return np.frombuffer(self._value, dtype='u1')
+
     @staticmethod
     def build(item_type, value):
         return Secs2BinaryBody(item_type, value)
 
+    @staticmethod
+    def from_value_bytes(item_type, bs):
+        return Secs2BinaryBody(item_type, bytes(bs))
+
 
 class AbstractSecs2NumberBody(AbstractSecs2Body):
+    """Number item.
+
+    value is held as big-endian bytes (or memoryview), and packed/unpacked in bulk.
+    """
+
+    __slots__ = ()
+
+    # count of values unpacked at a time in iter_values
+    _ITER_CHUNK_ITEMS = 4096
 
     def __init__(self, item_type, value):
-        super(AbstractSecs2NumberBody, self).__init__(item_type, tuple(value))
+        super(AbstractSecs2NumberBody, self).__init__(item_type, value)
+
+    def __len__(self):
+        return len(self._value) // self._type[2]
+
+    def __getitem__(self, item):
+        if type(item) is slice:
+            return self.value[item]
+        n = len(self)
+        i = item + n if item < 0 else item
+        if i < 0 or i >= n:
+            raise Secs2BodyParseError(IndexError("tuple index out of range"))
+        return (struct.unpack_from(('>' + self._type[3]), self._value, (i * self._type[2])))[0]
+
+    def __iter__(self):
+        return iter(self.value)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Returns:
+            tuple: number values
+        """
+        return struct.unpack(('>' + str(len(self)) + self._type[3]), self._value)
+
+    def iter_values(self, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(len(self))
+        t = self._type
+
+        def _f():
+            for i in range(start, stop, self._ITER_CHUNK_ITEMS):
+                c = min(self._ITER_CHUNK_ITEMS, stop - i)
+                yield struct.unpack_from(('>' + str(c) + t[3]), self._value, (i * t[2]))
+
+        return itertools.chain.from_iterable(_f())
 
     def _create_to_sml_value(self):
-        vv = [str(x) for x in self._value]
+        vv = [str(x) for x in self.value]
         return len(vv), self._SML_VALUESEPARATOR.join(vv)
 
     def _create_to_bytes_value(self):
-        return b''.join([struct.pack(('>' + self._type[3]), x) for x in self._value])
+        return bytes(self._value)
 
+    def _get_value_bytes_length(self):
+        return len(self._value)
 
-class Secs2IntegerBody(AbstractSecs2NumberBody):
+    def to_numpy(self):
+        """NumPy array getter.
 
-    def __init__(self, item_type, value):
+        Array is a read-only view over value bytes without copying,
+        dtype is big-endian (e.g. '>u4', '>f8').
+
+        Raises:
+            ImportError: if numpy is not installed.
+
+        Returns:
+            numpy.ndarray: number values
+        """
+        np = self._import_numpy()
+        return np.frombuffer(
+            self._value,
+            dtype=('>' + self._array_kind(self._type) + str(self._type[2])))
+
+    def _encode_into(self, buf, offset):
+        v_len = len(self._value)
+        p = self._encode_header_into(buf, offset, v_len)
+        end = p + v_len
+        buf[p:end] = self._value
+        return end
+
+    @staticmethod
+    def _to_values(value):
         tv = type(value)
         if tv is tuple or tv is list:
-            super(Secs2IntegerBody, self).__init__(
-                item_type,
-                [self._tiof(x, item_type[2], item_type[4]) for x in value]
-                )
+            return value
+        elif hasattr(value, 'tolist'):     # numpy array or array.array
+            v = value.tolist()
+            return v if type(v) is list else (v, )
         else:
-            super(Secs2IntegerBody, self).__init__(
-                item_type,
-                [self._tiof(value, item_type[2], item_type[4])]
-                )
+            return (value, )
+
+    @classmethod
+    def from_value_bytes(cls, item_type, bs):
+        if len(bs) % item_type[2] != 0:
+            raise ValueError(item_type[0] + " value length " + str(len(bs)) + " is not multiple of " + str(item_type[2]))
+        v = cls.__new__(cls)
+        AbstractSecs2Body.__init__(v, item_type, bs)
+        return v
+
+
+class Secs2IntegerBody(AbstractSecs2NumberBody):
+
+    __slots__ = ()
+
+    def __init__(self, item_type, value):
+        bs = self._array_to_bytes(item_type, value)
+        if bs is None:
+            vv = self._to_values(value)
+            fmt = '>' + str(len(vv)) + item_type[3]
+            try:
+                bs = struct.pack(fmt, *vv)
+            except struct.error:
+                bs = struct.pack(fmt, *[self._tiof(x, item_type[2], item_type[4]) for x in vv])
+        super(Secs2IntegerBody, self).__init__(item_type, bs)
 
     @staticmethod
     def build(item_type, value):
@@ -304,21 +794,79 @@ class Secs2IntegerBody(AbstractSecs2NumberBody):
 
 
 class Secs2FloatBody(AbstractSecs2NumberBody):
+    """Float item.
+
+    F4 built from Python values keeps the values as given for value, SML and repr,
+    not rounded through float32. Encoded bytes are float32 as before.
+    """
+
+    # _values is tuple of float if F4 built from Python values, otherwise None
+    __slots__ = ('_values', )
 
     def __init__(self, item_type, value):
-        tv = type(value)
-        if tv is tuple or tv is list:
-            super(Secs2FloatBody, self).__init__(item_type, [float(x) for x in value])
-        else:
-            super(Secs2FloatBody, self).__init__(item_type, [float(value)])
+        self._values = None
+        bs = self._array_to_bytes(item_type, value)
+        if bs is None:
+            vv = self._to_values(value)
+            fmt = '>' + str(len(vv)) + item_type[3]
+            try:
+                try:
+                    bs = struct.pack(fmt, *vv)
+                except struct.error:
+                    vv = [float(x) for x in vv]
+                    bs = struct.pack(fmt, *vv)
+            except OverflowError as e:
+                raise ValueError(e)
+            if item_type[2] == 4:
+                self._values = tuple([float(x) for x in vv])
+        super(Secs2FloatBody, self).__init__(item_type, bs)
+
+    def __getitem__(self, item):
+        vv = self._values
+        if vv is None:
+            return super(Secs2FloatBody, self).__getitem__(item)
+        try:
+            return vv[item]
+        except IndexError as e:
+            raise Secs2BodyParseError(e)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Returns:
+            tuple: number values, F4 values as given if built from Python values
+        """
+        vv = self._values
+        if vv is None:
+            return struct.unpack(('>' + str(len(self)) + self._type[3]), self._value)
+        return vv
+
+    def iter_values(self, start=0, stop=None):
+        vv = self._values
+        if vv is None:
+            return super(Secs2FloatBody, self).iter_values(start, stop)
+        return iter(vv[start:stop])
 
     @staticmethod
     def build(item_type, value):
         return Secs2FloatBody(item_type, value)
 
+    @classmethod
+    def from_value_bytes(cls, item_type, bs):
+        v = super(Secs2FloatBody, cls).from_value_bytes(item_type, bs)
+        v._values = None
+        return v
+
 
 class Secs2ListBody(AbstractSecs2Body):
 
+    __slots__ = ()
+
     def __init__(self, item_type, value):
 
         tv = type(value)
@@ -341,56 +889,277 @@ class Secs2ListBody(AbstractSecs2Body):
             raise TypeError("L values require tuple or list")
 
     def _create_to_sml(self):
-
-        def _lsf(value, level=''):  # create_list_sml_string
+        vv = ['<L [' + str(len(self)) + ']']
+        stack = [(iter(self.value), '')]
+        while stack:
+            it, level = stack[-1]
             deep_level = level + self._SML_TAB
-            vv = list()
-            vv.append(level + '<L [' + str(len(value)) + ']')
-            for x in value:
+            for x in it:
                 if x.type == 'L':
-                    vv.append(_lsf(x.value, deep_level))
+                    vv.append(deep_level + '<L [' + str(len(x)) + ']')
+                    stack.append((iter(x.value), deep_level))
+                    break
                 else:
-                    vv.append(deep_level + x.to_sml())
-            vv.append(level + '>')
-            return self._SML_LINESEPARATOR.join(vv)
-
-        return _lsf(self._value)
+                    vv.append(deep_level + self._get_child_cache(x, self._CACHE_SML, x._create_to_sml))
+            else:
+                stack.pop()
+                vv.append(level + '>')
+        return self._SML_LINESEPARATOR.join(vv)
+
+    def _create_repr(self):
+        vv = ["('L', ("]
+        stack = [(iter(self.value), len(self), [0])]
+        while stack:
+            it, size, n = stack[-1]
+            for x in it:
+                if n[0] > 0:
+                    vv.append(', ')
+                n[0] += 1
+                if x.type == 'L' and x._get_cache(self._CACHE_REPR) is None:
+                    vv.append("('L', (")
+                    stack.append((iter(x.value), len(x), [0]))
+                    break
+                else:
+                    vv.append(self._get_child_cache(x, self._CACHE_REPR, x._create_repr))
+            else:
+                stack.pop()
+                vv.append(',))' if size == 1 else '))')
+        return ''.join(vv)
 
-    def _create_to_bytes(self):
-        v_len = len(self._value)
-        bs_len = struct.pack('>L', v_len)
-        bs_vv = b''.join([x.to_bytes() for x in self._value])
-        if v_len >= self._BYTES_LEN_3:
-            return struct.pack('>B', (self._type[1] | 0x03)) + bs_len[1:4] + bs_vv
-        elif v_len >= self._BYTES_LEN_2:
-            return struct.pack('>B', (self._type[1] | 0x02)) + bs_len[2:4] + bs_vv
-        else:
-            return struct.pack('>B', (self._type[1] | 0x01)) + bs_len[3:4] + bs_vv
+    def _get_child_items(self):
+        return self._value
+
+    def _get_encoded_size(self):
+        n = self._get_header_size(len(self._value))
+        stack = [self._value]
+        while stack:
+            for x in stack.pop():
+                vv = x._get_encode_items()
+                if vv is None:
+                    n += x.get_encoded_size()
+                else:
+                    n += x._get_header_size(len(vv))
+                    stack.append(vv)
+        return n
+
+    def _encode_into(self, buf, offset):
+        p = self._encode_header_into(buf, offset, len(self._value))
+        stack = [iter(self._value)]
+        while stack:
+            for x in stack[-1]:
+                vv = x._get_encode_items()
+                if vv is None:
+                    p = x.encode_into(buf, p)
+                else:
+                    p = x._encode_header_into(buf, p, len(vv))
+                    stack.append(iter(vv))
+                    break
+            else:
+                stack.pop()
+        return p
 
     @staticmethod
     def build(item_type, value):
         return Secs2ListBody(item_type, value)
 
+    @staticmethod
+    def _from_items(item_type, items):   # build from decoded Secs2Body items without checking
+        v = Secs2ListBody.__new__(Secs2ListBody)
+        AbstractSecs2Body.__init__(v, item_type, tuple(items))
+        return v
+
+
+class Secs2LazyListBody(Secs2ListBody):
+    """L item decoded lazily over memoryview of SECS-II body bytes.
+
+    Child items are decoded on first access, and cached.
+    If index, child item positions are indexed in one pass on first access,
+    and random access does not walk siblings.
+    """
+
+    __slots__ = (
+        '_body_view', '_max_depth', '_index', '_offsets', '_item_pos', '_value_pos', '_size',
+        '_children', '_seek_index', '_seek_pos', '_end_pos', '_lock'
+    )
+
+    def __init__(self, item_type, body_view, item_pos, value_pos, size, max_depth, index=False):
+        AbstractSecs2Body.__init__(self, item_type, None)
+        self._body_view = body_view
+        self._max_depth = max_depth     # max nesting depth of child items
+        self._index = index
+        self._offsets = None            # array('I') of child item positions if indexed
+        self._item_pos = item_pos
+        self._value_pos = value_pos
+        self._size = size
+        self._children = None
+        self._seek_index = 0
+        self._seek_pos = value_pos
+        self._end_pos = None
+        self._lock = threading.Lock()     # guards seek position and children cache
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return tuple([self._child(i) for i in range(*item.indices(self._size))])
+
+        i = item + self._size if item < 0 else item
+        if i < 0 or i >= self._size:
+            raise Secs2BodyParseError(IndexError("tuple index out of range"))
+
+        return self._child(i)
+
+    def __iter__(self):
+        if self._value is not None:
+            return iter(self._value)
+        return iter(self.value)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Decodes all child items.
+
+        Returns:
+            tuple: child items
+        """
+        if self._value is None:
+            self._value = tuple([self._child(i) for i in range(self._size)])
+        return self._value
+
+    def _child(self, index):
+
+        vv = self._children
+        if vv is not None:
+            v = vv[index]
+            if v is not None:
+                return v
+
+        with self._lock:
+            return self.__locked_child(index)
+
+    def __locked_child(self, index):
+
+        if self._children is None:
+            self._children = [None] * self._size
+
+        v = self._children[index]
+        if v is not None:
+            return v
+
+        try:
+            if self._index:
+                if self._offsets is None:
+                    self._build_offsets()
+                return self._child_from_offsets(index)
+
+            if index < self._seek_index:
+                self._seek_index = 0
+                self._seek_pos = self._value_pos
+
+            while self._seek_index < index:
+                self._seek_pos = self.__child_end(self._seek_index, self._seek_pos)
+                self._seek_index += 1
+
+            v = self._children[index]
+            if v is None:
+                v = Secs2BodyBuilder._decode_item(self._body_view, self._seek_pos, self._max_depth, self._index)
+                v._cache_policy = self._cache_policy
+                self._children[index] = v
+
+            return v
+
+        except Secs2BodyParseError as e:
+            raise e
+        except (ValueError, TypeError, IndexError, struct.error) as e:
+            raise Secs2BodyBytesParseError(e)
+
+    def _build_offsets(self):
+        vv = array.array('I')
+        pos = self._value_pos
+        for _ in range(self._size):
+            vv.append(pos)
+            pos = Secs2BodyBuilder._seek_item_end(self._body_view, pos)
+        self._offsets = vv
+        self._end_pos = pos
+
+    def _child_from_offsets(self, index):
+        v = Secs2BodyBuilder._decode_item(self._body_view, self._offsets[index], self._max_depth, True)
+        v._cache_policy = self._cache_policy
+        if isinstance(v, Secs2LazyListBody):
+            n = index + 1
+            v._end_pos = self._offsets[n] if n < self._size else self._end_pos
+        self._children[index] = v
+        return v
+
+    def __child_end(self, index, pos):
+        v = self._children[index]
+        if isinstance(v, Secs2LazyListBody):
+            return v._get_end_pos()
+        else:
+            return Secs2BodyBuilder._seek_item_end(self._body_view, pos)
+
+    def _get_child_items(self):
+        return None
+
+    def _get_end_pos(self):
+        if self._end_pos is None:
+            self._end_pos = Secs2BodyBuilder._seek_item_end(self._body_view, self._item_pos)
+        return self._end_pos
+
+    def _get_encoded_size(self):
+        try:
+            return self._get_end_pos() - self._item_pos
+        except (ValueError, TypeError, IndexError) as e:
+            raise Secs2BodyBytesParseError(e)
+
+    def _encode_into(self, buf, offset):
+        end = offset + self._get_encoded_size()
+        buf[offset:end] = self._body_view[self._item_pos:self._get_end_pos()]
+        return end
+
+    def _create_to_bytes(self):
+        return bytes(self._body_view[self._item_pos:(self._item_pos + self._get_encoded_size())])
+
 
 class Secs2BodyBuilder:
 
     _ITEMS = (
-        ('L',       0x00, -1, None, None,   Secs2ListBody.build),
-        ('B',       0x20,  1, 'c',  False,  Secs2BinaryBody.build),
-        ('BOOLEAN', 0x24,  1, '?',  None,   Secs2BooleanBody.build),
-        ('A',       0x40, -1, None, None,   Secs2AsciiBody.build),
-        ('I8',      0x60,  8, 'q',  True,   Secs2IntegerBody.build),
-        ('I1',      0x64,  1, 'b',  True,   Secs2IntegerBody.build),
-        ('I2',      0x68,  2, 'h',  True,   Secs2IntegerBody.build),
-        ('I4',      0x70,  4, 'l',  True,   Secs2IntegerBody.build),
-        ('F8',      0x80,  8, 'd',  None,   Secs2FloatBody.build),
-        ('F4',      0x90,  4, 'f',  None,   Secs2FloatBody.build),
-        ('U8',      0xA0,  8, 'Q',  False,  Secs2IntegerBody.build),
-        ('U1',      0xA4,  1, 'B',  False,  Secs2IntegerBody.build),
-        ('U2',      0xA8,  2, 'H',  False,  Secs2IntegerBody.build),
-        ('U4',      0xB0,  4, 'L',  False,  Secs2IntegerBody.build)
+        ('L',       0x00, -1, None, None,   Secs2ListBody.build,    None),
+        ('B',       0x20,  1, 'c',  False,  Secs2BinaryBody.build,  Secs2BinaryBody.from_value_bytes),
+        ('BOOLEAN', 0x24,  1, '?',  None,   Secs2BooleanBody.build, Secs2BooleanBody.from_value_bytes),
+        ('A',       0x40, -1, None, None,   Secs2AsciiBody.build,   Secs2AsciiBody.from_value_bytes),
+        ('I8',      0x60,  8, 'q',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('I1',      0x64,  1, 'b',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('I2',      0x68,  2, 'h',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('I4',      0x70,  4, 'l',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('F8',      0x80,  8, 'd',  None,   Secs2FloatBody.build,   Secs2FloatBody.from_value_bytes),
+        ('F4',      0x90,  4, 'f',  None,   Secs2FloatBody.build,   Secs2FloatBody.from_value_bytes),
+        ('U8',      0xA0,  8, 'Q',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('U1',      0xA4,  1, 'B',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('U2',      0xA8,  2, 'H',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('U4',      0xB0,  4, 'L',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes)
     )
 
+    # SML item name -> item_type
+    _ITEMS_BY_SML = dict([(i[0], i) for i in _ITEMS])
+
+    # format byte (format code | number of length bytes) -> item_type, None if not exist
+    _ITEMS_BY_FORMAT_BYTE = tuple(map(
+        dict([((i[1] | lb), i) for i in _ITEMS for lb in (0x01, 0x02, 0x03)]).get,
+        range(256)))
+
+    # max nesting depth of items on decode and SML parse, root item is depth 1
+    max_depth = 256
+
+    # default cache policy of items
+    cache_policy = Secs2BodyCachePolicy.ALL
+
     @classmethod
     def build(cls, item_type, value):
 
@@ -410,83 +1179,52 @@ class Secs2BodyBuilder:
 
     @classmethod
     def get_item_type_from_sml(cls, sml_item_type):
-        str_upper = sml_item_type.upper()
-        for i in cls._ITEMS:
-            if i[0] == str_upper:
-                return i
-        raise ValueError("'" + sml_item_type + "' not found")
+        v = cls._ITEMS_BY_SML.get(sml_item_type)
+        if v is None:
+            v = cls._ITEMS_BY_SML.get(sml_item_type.upper())
+            if v is None:
+                raise ValueError("'" + sml_item_type + "' not found")
+        return v
 
     @classmethod
-    def from_body_bytes(cls, body_bytes):
-
-        def _itr(b):    # get_item_type
-            x = b & 0xFC
-            for i in cls._ITEMS:
-                if i[1] == x:
-                    return i
-            raise ValueError('0x' + '{:02X}'.format(b) + " not found")
-
-        def _xr(bs, pos):   # get (item_type, value_length, shift_position)
-
-            b = bs[pos]
-            t = _itr(b)
-            len_bit = b & 0x3
-
-            if len_bit == 3:
-                len_bs = (bs[pos+1] << 16) | (bs[pos+2] << 8) | bs[pos+3]
-            elif len_bit == 2:
-                len_bs = (bs[pos+1] << 8) | bs[pos+2]
-            else:
-                len_bs = bs[pos+1]
-
-            return t, len_bs, (len_bit + 1)
-
-        def _f(bs, pos):
-
-            r = _xr(bs, pos)
-            tt, v_len, b_len = _xr(bs, pos)
-            start_index = pos + b_len
-            end_index = pos + b_len + v_len
+    def from_body_bytes(cls, body_bytes, lazy=False, max_depth=None, index=False, cache_policy=None):
+        """Build from SECS-II body bytes.
 
-            if tt[0] == 'L':
-                vv = list()
-                p = start_index
-                for _ in range(r[1]):
-                    v, p = _f(bs, p)
-                    vv.append(v)
-                return tt[5](tt, vv), p
-
-            elif tt[0] == 'BOOLEAN':
-                vv = [(b != 0x00) for b in bs[start_index:end_index]]
-                return tt[5](tt, vv), end_index
+        If lazy, L items are views over memoryview of body_bytes,
+        and child items are decoded on first access.
+        Malformed bytes in not-accessed items are not detected until accessed.
 
-            elif tt[0] == 'A':
-                v = bs[start_index:end_index].decode(encoding='ascii')
-                return tt[5](tt, v), end_index
-
-            elif tt[0] == 'B':
-                vv = bs[start_index:end_index]
-                return tt[5](tt, vv), end_index
+        Args:
+            body_bytes (bytes): SECS-II body bytes.
+            lazy (bool): True if decode L items lazily. Defaults to False.
+            max_depth (int): max nesting depth of items. Defaults to Secs2BodyBuilder.max_depth.
+            index (bool): True if lazy L items index child item positions for random access. Defaults to False.
+            cache_policy (Secs2BodyCachePolicy): cache policy of items. Defaults to Secs2BodyBuilder.cache_policy.
 
-            elif tt[0] in ('I1', 'I2', 'I4', 'I8', 'F8', 'F4', 'U1', 'U2', 'U4', 'U8'):
-                vv = list()
-                p = start_index
-                for _ in range(0, v_len, tt[2]):
-                    prev = p
-                    p += tt[2]
-                    v = struct.unpack(('>' + tt[3]), bs[prev:p])
-                    vv.append(v[0])
-                return tt[5](tt, vv), end_index
+        Raises:
+            Secs2BodyBytesParseError: if parse failed.
 
+        Returns:
+            AbstractSecs2Body: Secs2Body, None if body_bytes is empty.
+        """
         try:
             if len(body_bytes) == 0:
                 return None
 
-            lr, lp = _f(body_bytes, 0)
+            if max_depth is None:
+                max_depth = cls.max_depth
+
+            if lazy:
+                lr = cls._decode_item(memoryview(body_bytes), 0, max_depth, index)
+                lr._cache_policy = cache_policy     # child items follow on decode
+                return lr
+
+            lr, lp = cls._decode_items(body_bytes, 0, max_depth)
             len_body = len(body_bytes)
 
             if lp == len_body:
-                lr._cache_bytes = bytes(body_bytes)
+                if cache_policy is not None:
+                    lr.set_cache_policy(cache_policy)
                 return lr
             else:
                 raise Secs2BodyBytesParseError("not reach bytes end, reach=" + str(lp) + ", length=" + str(len_body))
@@ -497,1264 +1235,1529 @@ class Secs2BodyBuilder:
             raise Secs2BodyBytesParseError(e)
         except IndexError as e:
             raise Secs2BodyBytesParseError(e)
+        except struct.error as e:
+            raise Secs2BodyBytesParseError(e)
 
+    @classmethod
+    def get_value_from_body_bytes(cls, body_bytes, *indices):
+        """value getter from SECS-II body bytes without building Secs2Body tree.
 
-class SmlParseError(Exception):
-
-    def __init__(self, msg):
-        super(SmlParseError, self).__init__(msg)
-
+        Skip sibling items by item header length bytes, and decode addressed item only.
 
-class Secs2BodySmlParseError(SmlParseError):
+        Args:
+            body_bytes (bytes): SECS-II body bytes.
+            indices (int): index path, same as get_value(*indices).
 
-    def __init__(self, msg):
-        super(Secs2BodySmlParseError, self).__init__(msg)
+        Raises:
+            Secs2BodyBytesParseError: if parse failed.
+            Secs2BodyParseError: if IndexError or TypeError.
 
+        Returns:
+            Any: seek value.
+        """
+        try:
+            tt, v_len, pos, p, n = cls._seek_path(body_bytes, indices)
+            if tt[6] is None:   # L
+                v = (cls._decode_items(body_bytes, pos, cls.max_depth))[0]
+            else:
+                end = p + v_len
+                if end > len(body_bytes):
+                    raise ValueError("not reach bytes end, reach=" + str(end) + ", length=" + str(len(body_bytes)))
+                v = tt[6](tt, bytes(body_bytes[p:end]))
 
-class SmlParser:
+        except (IndexError, TypeError) as e:
+            raise Secs2BodyParseError(e)
+        except (ValueError, struct.error) as e:
+            raise Secs2BodyBytesParseError(e)
 
-    _SML_PATTERN = '[Ss]([0-9]{1,3})[Ff]([0-9]{1,3})\\s*([Ww]?)\\s*((<.*>)?)\\s*\\.$'
-    _SML_PROG = re.compile(_SML_PATTERN)
+        return v.get_value(*indices[n:])
 
     @classmethod
-    def parse(cls, sml_str):
-        """parse from SML to Tuple
+    def get_offset_from_body_bytes(cls, body_bytes, *indices):
+        """Item positions getter from SECS-II body bytes without building Secs2Body tree.
 
         Args:
-            sml_str (str): SML string.
+            body_bytes (bytes): SECS-II body bytes.
+            indices (int): index path of L items.
 
         Raises:
-            Secs2BodySmlParseError: raise if Secs2body parse failed.
-            SmlParseError: raise if SML parse failed.
+            Secs2BodyBytesParseError: if parse failed.
+            Secs2BodyParseError: if IndexError or TypeError, or index of not L item.
 
         Returns:
-            tuple: (
-                int: Stream-Number,
-                int: Function-Number,
-                bool: W-Bit,
-                AbstractSecs2Body: secs2body or None
-            )
+            tuple: (offset, length) of root item and each addressed item on index path,
+                length is item header and value bytes, including child items if L.
+                last is addressed item.
+
+        Examples:
+            offset, length = Secs2BodyBuilder.get_offset_from_body_bytes(bs, 2, 0, 1)[-1]
+            rptid_bytes = bs[offset:(offset + length)]
         """
-        s = sml_str.replace('\n', ' ').strip()
-        if not s.endswith("."):
-            raise SmlParseError("SML not endswith '.'")
+        path = list()
+        try:
+            tt, v_len, pos, p, n = cls._seek_path(body_bytes, indices, path)
 
-        x = cls._SML_PROG.match(s)
-        if x is None:
-            raise SmlParseError("SML not match")
+            if n < len(indices):
+                raise Secs2BodyParseError(tt[0] + " is not L, index=" + str(indices[n]))
 
-        body = x.group(4)
+            return tuple([(x, cls._seek_item_end(body_bytes, x) - x) for x in path])
 
-        return (
-            int(x.group(1)),
-            int(x.group(2)),
-            len(x.group(3)) > 0,
-            cls._parse_body(body) if len(body) > 0 else None
-        )
+        except (IndexError, TypeError) as e:
+            raise Secs2BodyParseError(e)
+        except (ValueError, struct.error) as e:
+            raise Secs2BodyBytesParseError(e)
 
     @classmethod
-    def _parse_body(cls, sml_str):
+    def _seek_path(cls, bs, indices, path=None):
+        # return (item_type, value_length, item_position, value_position, count of used indices)
+        # stop at not L item, remaining indices are for value.
+        # item positions of root and each indexed item are appended to path if not None.
 
-        def _is_ws(v):  # is_white_space
-            return (v.encode(encoding='ascii'))[0] <= 0x20
+        pos = 0
+        tt, v_len, p = cls._read_item_header(bs, pos)
+        if path is not None:
+            path.append(pos)
 
-        def _seek_next(s, from_pos, *args):
-            p = from_pos
-            if len(args) > 0:
-                while True:
-                    v = s[p]
-                    for a in args:
-                        if type(a) is str:
-                            if v == a:
-                                return v, p
-                        else:
-                            if a(v):
-                                return v, p
-                    p += 1
-            else:
-                while True:
-                    v = s[p]
-                    if _is_ws(v):
-                        p += 1
-                    else:
-                        return v, p
+        for n, i in enumerate(indices):
 
-        def _ssbkt(s, from_pos):    # seek size_start_bracket'[' position, return position, -1 if not exist
-            v, p = _seek_next(s, from_pos)
-            return p if v == '[' else -1
+            if tt[6] is not None:   # not L
+                return tt, v_len, pos, p, n
 
-        def _sebkt(s, from_pos):    # seek size_end_bracket']' position, return position
-            return (_seek_next(s, from_pos, ']'))[1]
+            x = i + v_len if i < 0 else i
+            if x < 0 or x >= v_len:
+                raise IndexError("list index out of range, index=" + str(i) + ", size=" + str(v_len))
 
-        def _isbkt(s, from_pos):    # seek item_start_bracket'<' position, return position, -1 if not exist
-            v, p = _seek_next(s, from_pos)
-            return p if v == '<' else -1
+            pos = p
+            for _ in range(x):
+                pos = cls._seek_item_end(bs, pos)
 
-        def _iebkt(s, from_pos):    # seek item_end_bracket'>' position, return position
-            return (_seek_next(s, from_pos, '>'))[1]
+            tt, v_len, p = cls._read_item_header(bs, pos)
+            if path is not None:
+                path.append(pos)
 
-        def _seek_item(s, from_pos):  # seek item_type, return (item_type, shifted_position)
-            p_start = (_seek_next(s, from_pos))[1]
-            p_end = (_seek_next(s, (p_start + 1), '[', '"', '<', '>', _is_ws))[1]
-            return Secs2BodyBuilder.get_item_type_from_sml(s[p_start:p_end]), p_end
+        return tt, v_len, pos, p, len(indices)
 
-        def _f(s, from_pos):
+    @classmethod
+    def _read_item_header(cls, bs, pos):    # return (item_type, value_length, value_position)
 
-            p = _isbkt(s, from_pos)
+        b = bs[pos]
+        t = cls._ITEMS_BY_FORMAT_BYTE[b]
 
-            if p < 0:
-                raise Secs2BodySmlParseError("Not start < bracket")
+        if t is None:
+            if (b & 0x03) == 0:
+                raise ValueError('0x' + '{:02X}'.format(b) + " has no length bytes")
+            raise ValueError('0x' + '{:02X}'.format(b) + " not found")
 
-            tt, p = _seek_item(s, (p + 1))
+        len_bit = b & 0x03
 
-            r = _ssbkt(s, p)
-            if r >= 0:
-                p = _sebkt(s, (r + 1)) + 1
+        if len_bit == 1:
+            return t, bs[pos+1], (pos + 2)
+        elif len_bit == 2:
+            return t, ((bs[pos+1] << 8) | bs[pos+2]), (pos + 3)
+        else:
+            return t, ((bs[pos+1] << 16) | (bs[pos+2] << 8) | bs[pos+3]), (pos + 4)
 
-            if tt[0] == 'L':
-                vv = list()
-                while True:
-                    v, p = _seek_next(s, p)
-                    if v == '>':
-                        return tt[5](tt, vv), (p + 1)
+    @classmethod
+    def _seek_item_end(cls, bs, pos):   # skip item headers, return item end position
+        # same as _read_item_header, inlined for skipping many siblings
+        items = cls._ITEMS_BY_FORMAT_BYTE
+        remaining = 1
+        while remaining > 0:
+            b = bs[pos]
+            tt = items[b]
+            if tt is None:
+                cls._read_item_header(bs, pos)  # raise ValueError
+            len_bit = b & 0x03
+            if len_bit == 1:
+                v_len = bs[pos + 1]
+            elif len_bit == 2:
+                v_len = (bs[pos + 1] << 8) | bs[pos + 2]
+            else:
+                v_len = (bs[pos + 1] << 16) | (bs[pos + 2] << 8) | bs[pos + 3]
+            pos += len_bit + 1
+            remaining -= 1
+            if tt[6] is None:   # L
+                remaining += v_len
+            else:
+                if tt[2] > 1 and v_len % tt[2] != 0:
+                    raise ValueError(tt[0] + " length is not multiple of " + str(tt[2]) + ", length=" + str(v_len))
+                pos += v_len
+        if pos > len(bs):
+            raise ValueError("not reach bytes end, reach=" + str(pos) + ", length=" + str(len(bs)))
+        return pos
 
-                    elif v == '<':
-                        r, p = _f(s, p)
-                        vv.append(r)
+    @classmethod
+    def _decode_items(cls, bs, pos, max_depth):     # return (Secs2Body, end_position)
 
-                    else:
-                        raise Secs2BodySmlParseError("Not reach LIST end")
+        read_header = cls._read_item_header
+        from_items = Secs2ListBody._from_items
+        len_bs = len(bs)
 
-            elif tt[0] == 'BOOLEAN':
-                r = _iebkt(s, p)
-                vv = list()
-                for x in s[p:r].strip().split():
-                    ux = x.upper()
-                    if ux == 'TRUE' or ux == 'T':
-                        vv.append(True)
-                    elif ux == 'FALSE' or ux == 'F':
-                        vv.append(False)
-                    else:
-                        raise Secs2BodySmlParseError("Not accept, BOOLEAN require TRUE or FALSE")
-                return tt[5](tt, vv), (r + 1)
+        stack = list()  # (item_type, remaining, items) of outer L items
+        ltt = None      # item_type of L item not reach end
+        remaining = 0   # count of remaining items of ltt
+        vv = None       # decoded items of ltt, None if root
 
-            elif tt[0] == 'A':
-                vv = list()
-                while True:
-                    v, p_start = _seek_next(s, p)
-                    if v == '>':
-                        return tt[5](tt, ''.join(vv)), (p_start + 1)
+        while True:
 
-                    elif v == '"':
-                        v, p_end = _seek_next(s, (p_start + 1), '"')
-                        vv.append(s[(p_start+1):p_end])
-                        p = p_end + 1
+            tt, v_len, p = read_header(bs, pos)
 
-                    elif v == '0':
-                        if s[p_start + 1] not in ('X', 'x'):
-                            raise Secs2BodySmlParseError("Ascii not accept 0xNN")
-                        v, p = _seek_next(s, (p_start+2), '"', '>', _is_ws)
-                        vv.append(bytes([int(s[(p_start+2):p], 16)]).decode(encoding='ascii'))
+            if tt[6] is None:   # L
+                pos = p
+                if v_len > 0:
+                    stack.append((ltt, remaining, vv))
+                    if len(stack) >= max_depth:
+                        raise ValueError("depth exceeds max_depth " + str(max_depth))
+                    ltt = tt
+                    remaining = v_len
+                    vv = list()
+                    continue
+                v = from_items(tt, ())
 
-                    else:
-                        raise Secs2BodySmlParseError("Ascii not reach end")
+            else:
+                pos = p + v_len
+                if pos > len_bs:
+                    raise ValueError("not reach bytes end, reach=" + str(pos) + ", length=" + str(len_bs))
+                v = tt[6](tt, bytes(bs[p:pos]))
 
-            elif tt[0] in ('B', 'I1', 'I2', 'I4', 'I8', 'F4', 'F8', 'U1', 'U2', 'U4', 'U8'):
-                r = _iebkt(s, p)
-                return tt[5](tt, s[p:r].strip().split()), (r + 1)
+            while True:
+                if vv is None:
+                    return v, pos
+                vv.append(v)
+                remaining -= 1
+                if remaining > 0:
+                    break
+                v = from_items(ltt, vv)
+                ltt, remaining, vv = stack.pop()
 
-        try:
-            if sml_str is None:
-                raise Secs2BodySmlParseError("Not accept None")
+    @classmethod
+    def _decode_item(cls, bs, pos, max_depth, index=False):     # return Secs2Body, L is decoded lazily
 
-            ss = str(sml_str).strip()
-            lr, lp = _f(ss, 0)
-            if len(ss[lp:]) > 0:
-                raise Secs2BodySmlParseError("Not reach end, end=" + str(lp) + ", length=" + str(len(ss)))
-            return lr
+        if max_depth < 1:
+            raise ValueError("depth exceeds max_depth")
 
-        except TypeError as e:
-            raise Secs2BodySmlParseError(str(e))
-        except ValueError as e:
-            raise Secs2BodySmlParseError(str(e))
-        except IndexError as e:
-            raise Secs2BodySmlParseError(str(e))
+        tt, v_len, start_index = cls._read_item_header(bs, pos)
 
+        if tt[6] is None:   # L
+            return Secs2LazyListBody(tt, bs, pos, start_index, v_len, (max_depth - 1), index)
 
-class SecsMessageParseError(Exception):
+        end_index = start_index + v_len
 
-    def __init__(self, msg):
-        super(SecsMessageParseError, self).__init__(msg)
+        if end_index > len(bs):
+            raise ValueError("not reach bytes end, reach=" + str(end_index) + ", length=" + str(len(bs)))
 
+        return tt[6](tt, bs[start_index:end_index])
 
-class SecsMessage:
 
-    _STR_LINESEPARATOR = os.linesep
+class SmlParseError(Exception):
 
-    def __init__(self, strm, func, wbit, secs2body):
+    # offset is position of failed token in parsed SML string, or None
+    def __init__(self, msg, line=None, column=None, offset=None):
+        if line is not None:
+            msg = 'line ' + str(line) + ', column ' + str(column) + ': ' + str(msg)
+        super(SmlParseError, self).__init__(msg)
+        self.line = line
+        self.column = column
+        self.offset = offset
 
-        if strm < 0 or strm > 127:
-            raise SecsMessageParseError("Stream is from 0 to 127")
 
-        if func < 0 or func > 255:
-            raise SecsMessageParseError("Function is from 0 to 255")
+class Secs2BodySmlParseError(SmlParseError):
 
-        self.__strm = int(strm)
-        self.__func = int(func)
-        self.__wbit = bool(wbit)
-        self.__secs2body = secs2body
-        self.__cache_header10bytes_str = None
+    def __init__(self, msg, line=None, column=None, offset=None):
+        super(Secs2BodySmlParseError, self).__init__(msg, line, column, offset)
 
-    @property
-    def strm(self):
-        pass
 
-    @strm.getter
-    def strm(self):
-        """Stream-Number getter.
+class SmlParser:
 
-        Returns:
-            int: Stream-Number
-        """
-        return self.__strm
+    _SML_PATTERN = '[Ss]([0-9]{1,3})[Ff]([0-9]{1,3})\\s*([Ww]?)\\s*((<.*>)?)\\s*\\.$'
+    _SML_PROG = re.compile(_SML_PATTERN)
 
-    def get_stream(self):
-        """Stream-Number getter.
+    # whitespace is 0x00-0x20
+    _WS = '[\\x00-\\x20]*'
 
-        Alias of self.strm
+    # '<' item-type optional-size, or '>' of L end
+    _SML_ITEM_PROG = re.compile(_WS + '(?:<' + _WS + '([^\\x00-\\x20\\[\\]"<>]+)' + _WS + '(?:\\[[^\\]]*\\])?|(>))')
 
-        Returns:
-            int: Stream-Number
-        """
-        return self.strm
+    # '"string"', '0xNN' or '>' in A item
+    _SML_ASCII_PROG = re.compile(_WS + '(?:"([^"]*)"|0[Xx]([^\\x00-\\x20"<>]*)|(>))')
 
-    @property
-    def func(self):
-        pass
+    # '$name>' placeholder
+    _SML_PLACEHOLDER_PROG = re.compile(_WS + '\\$([^>]*)>')
 
-    @func.getter
-    def func(self):
-        """Function-Number getter.
+    _SML_BOOLEANS = {'TRUE': True, 'T': True, 'FALSE': False, 'F': False}
 
-        Returns:
-            int: Function-Number
-        """
-        return self.__func
+    # '"', '.' and '/' of comment start in stream, depth of '<' '>' counted between
+    _SML_STREAM_PROG = re.compile('["./]')
+    _SML_NOT_WS_PROG = re.compile('[^\\x00-\\x20]')
 
-    def get_function(self):
-        """Function-Number getter.
+    # max count of compiled SML in LRU cache, 0 if not cache
+    cache_size = 256
 
-        Alias of self.func
+    _compiled = collections.OrderedDict()
+    _compiled_lock = threading.Lock()
 
-        Returns:
-            int: Function-Number
-        """
-        return self.func
+    @classmethod
+    def parse(cls, sml_str):
+        """parse from SML to Tuple
 
-    @property
-    def wbit(self):
-        pass
+        Args:
+            sml_str (str): SML string.
 
-    @wbit.getter
-    def wbit(self):
-        """W-Bit getter
+        Raises:
+            Secs2BodySmlParseError: raise if Secs2body parse failed.
+            SmlParseError: raise if SML parse failed.
 
         Returns:
-            bool: True if has W-Bit
+            tuple: (
+                int: Stream-Number,
+                int: Function-Number,
+                bool: W-Bit,
+                AbstractSecs2Body: secs2body or None
+            )
         """
-        return self.__wbit
+        strm, func, wbit, body = cls._parse_header(sml_str)
+        if len(body) == 0:
+            return strm, func, wbit, None
 
-    def has_wbit(self):
-        """W-Bit getter
+        try:
+            return strm, func, wbit, cls._parse_body(body)
+        except Secs2BodySmlParseError as e:
+            if e.offset is None:
+                raise
+            # body starts at first '<', header has no '<'
+            raise Secs2BodySmlParseError(str(e), offset=(e.offset + str(sml_str).find('<')))
 
-        Alias of self.wbit
+    @classmethod
+    def iter_parse(cls, stream, chunk_size=65536):
+        """parse messages from stream of SML, generator.
 
-        Returns:
-            bool: True if has W-Bit
-        """
-        return self.wbit
+        Reads chunk_size at a time, and holds one message at most.
+        Messages are separated by period(.) out of items.
+        '// line comment' and '/* block comment */' out of strings are skipped.
 
-    @property
-    def secs2body(self):
-        pass
+        Args:
+            stream (io.TextIOBase or io.BufferedIOBase or mmap.mmap): read(n) returns str, or bytes decoded as UTF-8.
+            chunk_size (int): read size. Defaults to 65536.
 
-    @secs2body.getter
-    def secs2body(self):
-        """Secs2Body getter.
+        Raises:
+            Secs2BodySmlParseError: raise if Secs2body parse failed, with line and column of failed token.
+            SmlParseError: raise if SML parse failed, with line and column.
 
-        Returns:
-            AbstractSecs2Body: Secs2Body
+        Yields:
+            tuple: (
+                int: Stream-Number,
+                int: Function-Number,
+                bool: W-Bit,
+                AbstractSecs2Body: secs2body or None
+            )
+
+        Examples:
+            with open('messages.sml') as f:
+                for strm, func, wbit, body in SmlParser.iter_parse(f):
+                    ...
         """
-        return self.__secs2body
+        search = cls._SML_STREAM_PROG.search
+        search_not_ws = cls._SML_NOT_WS_PROG.search
+        decoder = None
+
+        NORMAL, QUOTE, LINE_COMMENT, BLOCK_COMMENT = 0, 1, 2, 3
+
+        state = NORMAL
+        depth = 0
+        pieces = list()     # current message without comments
+        marks = list()      # (offset in message, line, column) of each piece start
+        m_len = 0           # length of current message
+        start = None        # (line, column) of current message start
+        state_start = None  # (line, column) of current quote or comment start
+
+        buf = ''
+        line, column = 1, 1     # of buf[lc_pos]
+        lc_pos = 0
+        eof = False
+
+        def _lc(i):     # advance line and column to buf[i]
+            nonlocal line, column, lc_pos
+            n = buf.count('\n', lc_pos, i)
+            if n > 0:
+                line += n
+                column = i - buf.rfind('\n', lc_pos, i)
+            else:
+                column += i - lc_pos
+            lc_pos = i
+            return line, column
+
+        def _piece(v, lc):
+            nonlocal m_len
+            marks.append((m_len, lc[0], lc[1]))
+            pieces.append(v)
+            m_len += len(v)
+
+        def _append(a, b, items=True):
+            nonlocal start, depth
+            if a < b:
+                lc = _lc(a)
+                if items:
+                    d = depth
+                    depth += buf.count('<', a, b) - buf.count('>', a, b)
+                    if depth < 0:
+                        for i in range(a, b):   # seek unmatched '>'
+                            d += (buf[i] == '<') - (buf[i] == '>')
+                            if d < 0:
+                                raise SmlParseError("Not start < bracket", *_lc(i))
+
+                if start is None:
+                    m = search_not_ws(buf, a, b)
+                    if m is None:
+                        return
+                    start = _lc(m.start())
+                _piece(buf[a:b], lc)
+
+        while not eof:
+
+            v = stream.read(chunk_size)
+
+            if type(v) is not str:
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                v = decoder.decode(bytes(v), final=(len(v) == 0))
+
+            if len(v) == 0:
+                eof = True
+
+            buf += v
+            pos = 0
+            len_buf = len(buf)
 
-    def get_secs2body(self):
-        """Secs2Body getter.
+            while pos < len_buf:
 
-        Alias of self.secs2body
+                if state == QUOTE:
+                    i = buf.find('"', pos)
+                    if i < 0:
+                        _append(pos, len_buf, False)
+                        pos = len_buf
+                    else:
+                        _append(pos, i + 1, False)
+                        pos = i + 1
+                        state = NORMAL
+
+                elif state == LINE_COMMENT:
+                    i = buf.find('\n', pos)
+                    if i < 0:
+                        pos = len_buf
+                    else:
+                        pos = i
+                        state = NORMAL
+
+                elif state == BLOCK_COMMENT:
+                    i = buf.find('*/', pos)
+                    if i < 0:
+                        pos = max(pos, len_buf - 1)     # keep '*' of chunk end
+                        break
+                    _piece(' ', _lc(i))
+                    pos = i + 2
+                    state = NORMAL
 
-        Returns:
-            AbstractSecs2Body: Secs2Body
-        """
-        return self.secs2body
+                else:
+                    m = search(buf, pos)
+                    if m is None:
+                        _append(pos, len_buf)
+                        pos = len_buf
+                        break
+
+                    i = m.start()
+                    c = buf[i]
+
+                    if c == '/':
+                        if i + 1 >= len_buf and not eof:
+                            _append(pos, i)
+                            pos = i     # wait next chunk
+                            break
+                        n = buf[(i + 1):(i + 2)]
+                        if n == '/' or n == '*':
+                            _append(pos, i)
+                            state_start = _lc(i)
+                            state = LINE_COMMENT if n == '/' else BLOCK_COMMENT
+                            pos = i + 2
+                        else:
+                            _append(pos, i + 1)
+                            pos = i + 1
+
+                    elif c == '"':
+                        _append(pos, i + 1)
+                        state_start = _lc(i)
+                        state = QUOTE
+                        pos = i + 1
+
+                    else:   # '.'
+                        _append(pos, i + 1)
+                        pos = i + 1
+                        if depth == 0:
+                            yield cls.__parse_message(''.join(pieces), start, marks)
+                            pieces = list()
+                            marks = list()
+                            m_len = 0
+                            start = None
+
+            _lc(pos)
+            buf = buf[pos:]
+            lc_pos = 0
+
+        if state == QUOTE:
+            raise SmlParseError("Not reach string end", *state_start)
+        if state == BLOCK_COMMENT:
+            raise SmlParseError("Not reach comment end", *state_start)
+        if start is not None:
+            raise SmlParseError("SML not endswith '.'", *start)
 
-    @property
-    def device_id(self):
-        pass
+    @classmethod
+    def __parse_message(cls, sml_str, start, marks):
+        try:
+            return cls.parse(sml_str)
+        except SmlParseError as e:
+            lc = start if e.offset is None else cls.__offset_to_lc(sml_str, marks, e.offset)
+            if isinstance(e, Secs2BodySmlParseError):
+                raise Secs2BodySmlParseError(str(e), *lc)
+            raise SmlParseError(str(e), *lc)
 
-    @device_id.getter
-    def device_id(self):
-        """Device-ID getter.
+    @staticmethod
+    def __offset_to_lc(sml_str, marks, offset):   # return (line, column) of offset in message
+        i = bisect.bisect_right(marks, (offset, float('inf'))) - 1
+        p, line, column = marks[max(i, 0)]
+        n = sml_str.count('\n', p, offset)
+        if n > 0:
+            return line + n, offset - sml_str.rfind('\n', p, offset)
+        return line, column + offset - p
 
-        Returns:
-            int: Device-ID
-        """
-        return self._device_id()
+    @classmethod
+    def compile(cls, sml_str):
+        """Compile SML to SmlMessageTemplate, cached in LRU.
 
-    def _device_id(self):
-        # prototype
-        raise NotImplementedError()
+        Placeholders '<U4 $name>' are bound by SmlMessageTemplate.to_bytes(values).
 
-    @property
-    def system_bytes(self):
-        pass
+        Args:
+            sml_str (str): SML string.
 
-    @system_bytes.getter
-    def system_bytes(self):
-        """ system-4-bytes getter.
+        Raises:
+            Secs2BodySmlParseError: raise if Secs2body parse failed.
+            SmlParseError: raise if SML parse failed.
 
         Returns:
-            bytes: system-4-bytes, header10bytes[6:10]
+            SmlMessageTemplate: compiled SML
         """
-        return (self._header10bytes())[6:10]
+        if sml_str is None:
+            raise SmlParseError("Not accept None")
 
-    @property
-    def header10bytes(self):
-        pass
+        key = cls._normalize(sml_str)
 
-    @header10bytes.getter
-    def header10bytes(self):
-        """ header-10-bytes getter.
+        with cls._compiled_lock:
+            v = cls._compiled.get(key)
+            if v is not None:
+                cls._compiled.move_to_end(key)
+                return v
 
-        Returns:
-            bytes: header-10-bytes
-        """
-        return self._header10bytes()
+        v = SmlMessageTemplate.from_sml(key)
 
-    def _header10bytes(self):
-        # prototype
-        # return bytes(10)
-        raise NotImplementedError()
+        with cls._compiled_lock:
+            if cls.cache_size > 0:
+                cls._compiled[key] = v
+                while len(cls._compiled) > cls.cache_size:
+                    cls._compiled.popitem(last=False)
 
-    def get_header10bytes_str(self):
+        return v
 
-        if self.__cache_header10bytes_str is None:
+    @staticmethod
+    def _normalize(sml_str):
+        return str(sml_str).replace('\n', ' ').strip()
 
-            x = self._header10bytes()
-            self.__cache_header10bytes_str = (
-                '[' + '{:02X}'.format(x[0])
-                + ' ' + '{:02X}'.format(x[1])
-                + '|' + '{:02X}'.format(x[2])
-                + ' ' + '{:02X}'.format(x[3])
-                + '|' + '{:02X}'.format(x[4])
-                + ' ' + '{:02X}'.format(x[5])
-                + '|' + '{:02X}'.format(x[6])
-                + ' ' + '{:02X}'.format(x[7])
-                + ' ' + '{:02X}'.format(x[8])
-                + ' ' + '{:02X}'.format(x[9])
-                + ']')
+    @classmethod
+    def _parse_header(cls, sml_str):    # return (strm, func, wbit, SML-body-string)
+        s = cls._normalize(sml_str)
+        lead = len(str(sml_str)) - len(str(sml_str).lstrip())
+        if not s.endswith("."):
+            raise SmlParseError("SML not endswith '.'", offset=(lead + max(len(s) - 1, 0)))
 
-        return self.__cache_header10bytes_str
+        x = cls._SML_PROG.match(s)
+        if x is None:
+            raise SmlParseError("SML not match", offset=lead)
 
+        return (
+            int(x.group(1)),
+            int(x.group(2)),
+            len(x.group(3)) > 0,
+            x.group(4)
+        )
 
-class HsmsSsMessageParseError(SecsMessageParseError):
+    @classmethod
+    def _parse_body(cls, sml_str, build=None, placeholders=None, max_depth=None):
+        # build(item_type, value) creates each item, defaults to item_type build.
+        # If placeholders is list, accept '<U4 $name>' item and append name, value is None.
+        # max_depth defaults to Secs2BodyBuilder.max_depth.
+
+        if max_depth is None:
+            max_depth = Secs2BodyBuilder.max_depth
+
+        if build is None:
+            def build(tt, v):
+                return tt[5](tt, v)
+
+        item_match = cls._SML_ITEM_PROG.match
+        ascii_match = cls._SML_ASCII_PROG.match
+        placeholder_match = cls._SML_PLACEHOLDER_PROG.match
+        booleans = cls._SML_BOOLEANS
+        get_item_type = Secs2BodyBuilder.get_item_type_from_sml
+        not_ws_search = cls._SML_NOT_WS_PROG.search
+
+        def _not_ws(s, p):  # position of first not whitespace from p
+            m = not_ws_search(s, p)
+            return len(s) if m is None else m.start()
+
+        def _iebkt(s, p):   # seek item_end_bracket'>' position
+            r = s.find('>', p)
+            if r < 0:
+                raise Secs2BodySmlParseError("Not reach item end", offset=_not_ws(s, p))
+            return r
 
-    def __init__(self, msg):
-        super(HsmsSsMessageParseError, self).__init__(msg)
+        def _tokens(s, p, r):   # (token, position) of values between p and r
+            for x in s[p:r].split():
+                p = s.find(x, p)
+                yield x, p
+                p += len(x)
 
+        def _ascii(s, p, tt):
+            vv = list()
+            while True:
+                m = ascii_match(s, p)
+                if m is None:
+                    raise Secs2BodySmlParseError("Ascii not reach end", offset=_not_ws(s, p))
+                p = m.end()
+                if m.lastindex == 1:
+                    vv.append(m.group(1))
+                elif m.lastindex == 2:
+                    vv.append(bytes([int(m.group(2), 16)]).decode(encoding='ascii'))
+                else:
+                    return build(tt, ''.join(vv)), p
 
-class HsmsSsControlType:
+        def _boolean(s, p, tt):
+            r = _iebkt(s, p)
+            vv = list()
+            for x, q in _tokens(s, p, r):
+                v = booleans.get(x.upper())
+                if v is None:
+                    raise Secs2BodySmlParseError("Not accept, BOOLEAN require TRUE or FALSE", offset=q)
+                vv.append(v)
+            return build(tt, vv), (r + 1)
 
-    UNDEFINED = (0xFF, 0xFF)
+        def _values(s, p, tt):  # B and numbers
+            r = _iebkt(s, p)
+            try:
+                return build(tt, s[p:r].split()), (r + 1)
+            except (TypeError, ValueError) as e:
+                # locate failed value, only when failed
+                for x, q in _tokens(s, p, r):
+                    try:
+                        build(tt, [x])
+                    except (TypeError, ValueError):
+                        raise Secs2BodySmlParseError(str(e), offset=q)
+                raise
 
-    DATA = (0x00, 0x00)
-    SELECT_REQ = (0x00, 0x01)
-    SELECT_RSP = (0x00, 0x02)
-    DESELECT_REQ = (0x00, 0x03)
-    DESELECT_RSP = (0x00, 0x04)
-    LINKTEST_REQ = (0x00, 0x05)
-    LINKTEST_RSP = (0x00, 0x06)
-    REJECT_REQ = (0x00, 0x07)
-    SEPARATE_REQ = (0x00, 0x09)
+        leafs = {'A': _ascii, 'BOOLEAN': _boolean}
 
-    __ITEMS = (
-        DATA,
-        SELECT_REQ, SELECT_RSP,
-        DESELECT_REQ, DESELECT_RSP,
-        LINKTEST_REQ, LINKTEST_RSP,
-        REJECT_REQ,
-        SEPARATE_REQ
-    )
+        def _f(s):
 
-    @classmethod
-    def get(cls, v):
-        for x in cls.__ITEMS:
-            if x[0] == v[0] and x[1] == v[1]:
-                return x
-        return cls.UNDEFINED
+            stack = list()  # (item_type, items) of L items not reach end
+            p = 0
 
-    @classmethod
-    def has_s_type(cls, b):
-        for x in cls.__ITEMS:
-            if x[1] == b:
-                return True
-        return False
+            while True:
 
+                m = item_match(s, p)
 
-class HsmsSsSelectStatus:
+                if m is None:
+                    if stack:
+                        raise Secs2BodySmlParseError("Not reach LIST end", offset=_not_ws(s, p))
+                    raise Secs2BodySmlParseError("Not start < bracket", offset=_not_ws(s, p))
 
-    UNKNOWN = 0xFF
+                q = m.start()   # failed item is from first not whitespace of q
+                p = m.end()
 
-    SUCCESS = 0x00
-    ACTIVED = 0x01
-    NOT_READY = 0x02
-    ALREADY_USED = 0x03
+                if m.lastindex == 1:    # item start
 
-    __ITEMS = (
-        SUCCESS,
-        ACTIVED,
-        NOT_READY,
-        ALREADY_USED
-    )
+                    if len(stack) >= max_depth:
+                        raise Secs2BodySmlParseError("depth exceeds max_depth " + str(max_depth), offset=_not_ws(s, q))
 
-    @classmethod
-    def get(cls, b):
-        for x in cls.__ITEMS:
-            if x == b:
-                return x
-        return cls.UNKNOWN
+                    try:
+                        tt = get_item_type(m.group(1))
+                    except ValueError as e:
+                        raise Secs2BodySmlParseError(str(e), offset=m.start(1))
 
+                    if tt[0] == 'L':
+                        stack.append((tt, list()))
+                        continue
 
-class HsmsSsRejectReason:
+                    x = None if placeholders is None else placeholder_match(s, p)
+                    try:
+                        if x is None:
+                            r, p = leafs.get(tt[0], _values)(s, p, tt)
+                        else:
+                            placeholders.append(x.group(1).strip())
+                            r, p = build(tt, None), x.end()
+                    except (TypeError, ValueError, IndexError) as e:
+                        raise Secs2BodySmlParseError(str(e), offset=_not_ws(s, q))
 
-    UNKNOWN = 0xFF
+                else:   # L end
 
-    NOT_SUPPORT_TYPE_S = 0x01
-    NOT_SUPPORT_TYPE_P = 0x02
-    TRANSACTION_NOT_OPEN = 0x03
-    NOT_SELECTED = 0x04
+                    if not stack:
+                        raise Secs2BodySmlParseError("Not start < bracket", offset=_not_ws(s, q))
 
-    __ITEMS = (
-        NOT_SUPPORT_TYPE_S,
-        NOT_SUPPORT_TYPE_P,
-        TRANSACTION_NOT_OPEN,
-        NOT_SELECTED
-    )
+                    tt, vv = stack.pop()
+                    try:
+                        r = build(tt, vv)
+                    except (TypeError, ValueError, IndexError) as e:
+                        raise Secs2BodySmlParseError(str(e), offset=_not_ws(s, q))
 
-    @classmethod
-    def get(cls, b):
-        for x in cls.__ITEMS:
-            if x == b:
-                return x
-        return cls.UNKNOWN
+                if not stack:
+                    return r, p
 
+                stack[-1][1].append(r)
 
-class HsmsSsMessage(SecsMessage):
+        try:
+            if sml_str is None:
+                raise Secs2BodySmlParseError("Not accept None")
 
-    def __init__(self, strm, func, wbit, secs2body, system_bytes, control_type):
-        super(HsmsSsMessage, self).__init__(strm, func, wbit, secs2body)
-        self._system_bytes = system_bytes
-        self._control_type = control_type
-        self._cache_msg_length = None
-        self._cache_str = None
-        self._cache_repr = None
-        self._cache_bytes = None
+            ss = str(sml_str).strip()
+            lead = len(str(sml_str)) - len(str(sml_str).lstrip())
+            try:
+                lr, lp = _f(ss)
+                if len(ss[lp:]) > 0:
+                    raise Secs2BodySmlParseError(
+                        "Not reach end, end=" + str(lp) + ", length=" + str(len(ss)), offset=_not_ws(ss, lp))
+                return lr
+            except SmlParseError as e:
+                if e.offset is None:
+                    raise
+                raise Secs2BodySmlParseError(str(e), offset=(e.offset + lead))
 
-    def __str__(self):
-        if self._cache_str is None:
-            vv = [self.get_header10bytes_str(), ' length:', str(self._msg_length())]
-            if self._control_type == HsmsSsControlType.DATA:
-                vv.extend([
-                    self._STR_LINESEPARATOR,
-                    'S', str(self.strm),
-                    'F', str(self.func)
-                ])
-                if self.wbit:
-                    vv.append(' W')
-                if self.secs2body is not None:
-                    vv.extend([
-                        self._STR_LINESEPARATOR,
-                        self.secs2body.to_sml()
-                    ])
-                vv.append('.')
-            self._cache_str = ''.join(vv)
-        return self._cache_str
+        except TypeError as e:
+            raise Secs2BodySmlParseError(str(e))
+        except ValueError as e:
+            raise Secs2BodySmlParseError(str(e))
+        except IndexError as e:
+            raise Secs2BodySmlParseError(str(e))
 
-    def __repr__(self):
-        if self._cache_repr is None:
-            vv = ["{'header':", str(self._header10bytes())]
-            if self._control_type == HsmsSsControlType.DATA:
-                vv.extend([
-                    ",'strm':", str(self.strm),
-                    ",'func':", str(self.func),
-                    ",'wbit':", str(self.wbit)
-                ])
-                if self.secs2body is not None:
-                    vv.extend([",'secs2body':", repr(self.secs2body)])
-            vv.append("}")
-            self._cache_repr = ''.join(vv)
-        return self._cache_repr
 
-    def _msg_length(self):
-        if self._cache_msg_length is None:
-            i = len(self._header10bytes())
-            if self.secs2body is not None:
-                i += len(self.secs2body.to_bytes())
-            self._cache_msg_length = i
+class Secs2BodyTemplate:
+    """Compiled SECS-II body shape.
 
-        return self._cache_msg_length
+    Fixed items are encoded once at compile, placeholder items are filled
+    from a flat sequence of values in document order.
 
-    def _device_id(self):
-        # prototype
-        raise NotImplementedError()
+    Placeholders of number items (I1-I8, U1-U8, F4, F8) take one value,
+    and are packed with a precompiled struct format together with
+    the surrounding fixed bytes.
+    Placeholders of A, B and BOOLEAN take a value of build.
 
-    def _header10bytes(self):
-        # prototype
-        # return bytes(10)
-        raise NotImplementedError()
+    Examples:
+        tmpl = Secs2BodyTemplate.from_sml('<L <U4 $DATAID> <U4 $CEID> <L <A $TEXT> > >')
+        bs = tmpl.to_bytes((1, 1001, 'ON FIRE'))
+        communicator.send(6, 11, True, bs)
+    """
 
-    def get_control_type(self):
-        return self._control_type
+    def __init__(self, spec, names=None):
+        """Compile from tuple spec.
 
-    def get_p_type(self):
-        return self._control_type[0]
+        Args:
+            spec (tuple or list): (item_type, value) as Secs2BodyBuilder.build, value None is placeholder.
+            names (list): names of placeholders. Defaults to None.
 
-    def get_s_type(self):
-        return self._control_type[1]
+        Raises:
+            TypeError: if spec is invalid.
+            ValueError: if fixed value is invalid or L is placeholder.
+        """
+        segs = list()
+        self.__compile(spec, segs)
+
+        ops = list()
+        cc = [b'']
+        tts = list()
+
+        def _flush():
+            fmt = '>' + ''.join([(str(len(c)) + 's' + (tts[i][3] if i < len(tts) else ''))
+                                 for i, c in enumerate(cc)])
+            ops.append((struct.Struct(fmt), tuple(cc), tuple(tts)))
+
+        for x in segs:
+            if type(x) is bytes:
+                cc[-1] += x
+            elif x[2] > 0 and x[3] not in ('?', 'c'):
+                tts.append(x)
+                cc.append(b'')
+            else:
+                _flush()
+                ops.append((None, None, x))
+                cc = [b'']
+                tts = list()
 
-    def get_select_status(self):
-        return HsmsSsSelectStatus.get((self._header10bytes())[3])
+        _flush()
 
-    def get_reject_reason(self):
-        return HsmsSsRejectReason.get((self._header10bytes())[3])
+        self.__ops = tuple([op for op in ops if op[0] is None or op[0].size > 0])
+        self.__count = len([x for x in segs if type(x) is not bytes])
+        self.__names = tuple(names) if names is not None else tuple([None] * self.__count)
 
-    def to_bytes(self):
-        if self._cache_bytes is None:
-            msg_len = self._msg_length()
-            vv = [
-                bytes([
-                    (msg_len >> 24) & 0xFF,
-                    (msg_len >> 16) & 0xFF,
-                    (msg_len >> 8) & 0xFF,
-                    msg_len & 0xFF
-                ]),
-                self._header10bytes(),
-                b'' if self.secs2body is None else self.secs2body.to_bytes()
-            ]
-            self._cache_bytes = b''.join(vv)
-        return self._cache_bytes
+        if len(self.__names) != self.__count:
+            raise ValueError("names length is not placeholders count")
 
     @classmethod
-    def from_bytes(cls, bs):
+    def from_sml(cls, sml_str):
+        """Compile from SML-body with placeholders '<U4 $name>'.
 
-        h10bs = bs[4:14]
-        sys_bs = h10bs[6:10]
+        Fixed items are encoded straight from SML, without building Secs2Body.
 
-        ctrl_type = HsmsSsControlType.get(h10bs[4:6])
+        Args:
+            sml_str (str): SML-body-string.
 
-        if ctrl_type == HsmsSsControlType.DATA:
+        Raises:
+            Secs2BodySmlParseError: if parse failed.
 
-            dev_id = (h10bs[0] << 8) | h10bs[1]
-            strm = h10bs[2] & 0x7F
-            func = h10bs[3]
-            wbit = (h10bs[2] & 0x80) == 0x80
+        Returns:
+            Secs2BodyTemplate: template.
+        """
 
-            if len(bs) > 14:
-                s2b = Secs2BodyBuilder.from_body_bytes(bs[14:])
-                v = HsmsSsDataMessage(strm, func, wbit, s2b, sys_bs, dev_id)
-            else:
-                v = HsmsSsDataMessage(strm, func, wbit, None, sys_bs, dev_id)
+        def _build(tt, v):
+            if v is None:   # placeholder
+                return tt, v
+            if tt[6] is None:   # L
+                if all([type(x) is bytes for x in v]):
+                    return cls._header_bytes(tt, len(v)) + b''.join(v)
+                return tt, v
+            return cls._encode_sml_values(tt, v)
+
+        names = list()
+        spec = SmlParser._parse_body(sml_str, build=_build, placeholders=names)
+        try:
+            return cls(spec, [(n if n else None) for n in names])
+        except (TypeError, ValueError) as e:
+            raise Secs2BodySmlParseError(str(e))
 
-        else:
+    @property
+    def names(self):
+        pass
 
-            v = HsmsSsControlMessage(sys_bs, ctrl_type)
-            v._p_type = h10bs[2]
-            v._s_type = h10bs[3]
+    @names.getter
+    def names(self):
+        """Placeholder names getter.
 
-        v._cache_bytes = bs
-        v._cache_header10bytes = h10bs
+        Returns:
+            tuple: names in document order, None if not named.
+        """
+        return self.__names
 
-        return v
+    def __len__(self):
+        return self.__count
 
+    def to_bytes(self, values=()):
+        """Encode body bytes.
 
-class HsmsSsDataMessage(HsmsSsMessage):
+        Args:
+            values (tuple or list): placeholder values in document order.
 
-    def __init__(self, strm, func, wbit, secs2body, system_bytes, session_id):
-        super(HsmsSsDataMessage, self).__init__(strm, func, wbit, secs2body, system_bytes, HsmsSsControlType.DATA)
-        self.__session_id = session_id
-        self.__cache_header10bytes = None
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
 
-    def _header10bytes(self):
-        if self.__cache_header10bytes is None:
-            b2 = self.strm
-            if self.wbit:
-                b2 |= 0x80
+        Returns:
+            bytes: SECS-II body bytes.
+        """
+        vv = tuple(values)
+        if len(vv) != self.__count:
+            raise ValueError("values count is " + str(self.__count) + ", value is " + str(len(vv)))
+
+        bb = list()
+        p = 0
+        for st, cc, tts in self.__ops:
+            if st is None:
+                try:
+                    bb.append(Secs2BodyBuilder.build(tts, vv[p]).to_bytes())
+                except TypeError as e:
+                    raise ValueError(e)
+                p += 1
+            else:
+                n = len(tts)
+                args = [None] * (n * 2 + 1)
+                args[0::2] = cc
+                args[1::2] = vv[p:(p + n)]
+                try:
+                    bb.append(st.pack(*args))
+                except struct.error:
+                    args[1::2] = [self.__to_value(tt, v) for tt, v in zip(tts, vv[p:(p + n)])]
+                    try:
+                        bb.append(st.pack(*args))
+                    except struct.error as e:
+                        raise ValueError(e)
+                p += n
 
-            self.__cache_header10bytes = bytes([
-                (self.session_id >> 8) & 0x7F,
-                self.session_id & 0xFF,
-                b2, self.func,
-                self._control_type[0], self._control_type[1],
-                self._system_bytes[0], self._system_bytes[1],
-                self._system_bytes[2], self._system_bytes[3]
-                ])
+        if len(bb) == 1:
+            return bb[0]
+        else:
+            return b''.join(bb)
 
-        return self.__cache_header10bytes
+    def build(self, values=()):
+        """Build Secs2Body.
 
-    @property
-    def session_id(self):
-        pass
+        Args:
+            values (tuple or list): placeholder values in document order.
 
-    @session_id.getter
-    def session_id(self):
-        return self.__session_id
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
 
-    def _device_id(self):
-        return self.session_id
+        Returns:
+            AbstractSecs2Body: Secs2Body decoding lazily from encoded bytes.
+        """
+        return Secs2BodyBuilder.from_body_bytes(self.to_bytes(values), lazy=True)
 
+    @staticmethod
+    def __to_value(item_type, value):
+        # value not scalar is ValueError as other invalid values
+        try:
+            if item_type[4] is None:
+                return float(value)
+            else:
+                return AbstractSecs2Body._tiof(value, item_type[2], item_type[4])
+        except (TypeError, OverflowError) as e:
+            raise ValueError(e)
 
-class HsmsSsControlMessage(HsmsSsMessage):
+    @classmethod
+    def __compile(cls, spec, segs):
 
-    def __init__(self, system_bytes, control_type):
-        super(HsmsSsControlMessage, self).__init__(0, 0, False, None, system_bytes, control_type)
-        self.__cache_header10bytes = None
+        tt = type(spec)
+        if tt is bytes:     # encoded item
+            segs.append(spec)
+            return
 
-    CONTROL_DEVICE_ID = -1
+        if not ((tt is list or tt is tuple) and len(spec) == 2):
+            raise TypeError('Secs2Body is tuple or list, and length == 2')
 
-    def _device_id(self):
-        return self.CONTROL_DEVICE_ID
+        item_type, value = spec
+        if type(item_type) is str:
+            item_type = Secs2BodyBuilder.get_item_type_from_sml(item_type)
+        elif type(item_type) is not tuple:
+            raise TypeError("Require str or tuple")
 
-    def _header10bytes(self):
-        if self.__cache_header10bytes is None:
-            self.__cache_header10bytes = bytes([
-                0xFF, 0xFF,
-                0x00, 0x00,
-                self._control_type[0], self._control_type[1],
-                self._system_bytes[0], self._system_bytes[1],
-                self._system_bytes[2], self._system_bytes[3]
-                ])
+        if item_type[6] is None:
+            if value is None:
+                raise ValueError("L is not accept placeholder")
+            vv = list(value)
+            segs.append(cls._header_bytes(item_type, len(vv)))
+            for v in vv:
+                cls.__compile(v, segs)
 
-        return self.__cache_header10bytes
+        elif value is None:
+            if item_type[2] > 0 and item_type[3] not in ('?', 'c'):
+                segs.append(cls._header_bytes(item_type, item_type[2]))
+            segs.append(item_type)
 
-    @classmethod
-    def build_select_request(cls, system_bytes):
-        return HsmsSsControlMessage(system_bytes, HsmsSsControlType.SELECT_REQ)
+        else:
+            segs.append(Secs2BodyBuilder.build(item_type, value).to_bytes())
 
     @classmethod
-    def build_select_response(cls, primary_msg, select_status):
-        ctrl_type = HsmsSsControlType.SELECT_RSP
-        sys_bytes = primary_msg.system_bytes
-        r = HsmsSsControlMessage(sys_bytes, ctrl_type)
-        r._cache_header10bytes = bytes([
-            0xFF, 0xFF,
-            0x00, select_status,
-            ctrl_type[0], ctrl_type[1],
-            sys_bytes[0], sys_bytes[1],
-            sys_bytes[2], sys_bytes[3]
-            ])
-        return r
+    def _encode_sml_values(cls, item_type, values):  # encode not L item from SML values
+        name = item_type[0]
+        if name == 'A':
+            bs = values.encode(encoding='ascii')
+        elif name == 'BOOLEAN':
+            bs = bytes([(0xFF if v else 0x00) for v in values])
+        elif name == 'B':
+            bs = bytes([AbstractSecs2Body._tiof(v, 1, False) for v in values])
+        else:
+            vv = [cls.__to_value(item_type, v) for v in values]
+            try:
+                bs = struct.pack(('>' + str(len(vv)) + item_type[3]), *vv)
+            except (struct.error, OverflowError) as e:
+                raise ValueError(e)
+        return cls._header_bytes(item_type, len(bs)) + bs
 
-    @classmethod
-    def build_linktest_request(cls, system_bytes):
-        return HsmsSsControlMessage(system_bytes, HsmsSsControlType.LINKTEST_REQ)
+    @staticmethod
+    def _header_bytes(item_type, v_len):
+        if v_len >= 0x10000:
+            return bytes([item_type[1] | 0x03, (v_len >> 16) & 0xFF, (v_len >> 8) & 0xFF, v_len & 0xFF])
+        elif v_len >= 0x100:
+            return bytes([item_type[1] | 0x02, (v_len >> 8) & 0xFF, v_len & 0xFF])
+        else:
+            return bytes([item_type[1] | 0x01, v_len])
 
-    @classmethod
-    def build_linktest_response(cls, primary_msg):
-        return HsmsSsControlMessage(
-            primary_msg.system_bytes,
-            HsmsSsControlType.LINKTEST_RSP)
 
-    @classmethod
-    def build_reject_request(cls, primary_msg, reject_reason):
-        ctrl_type = HsmsSsControlType.REJECT_REQ
-        h10bytes = primary_msg.header10bytes
-        b2 = h10bytes[4] if reject_reason == HsmsSsRejectReason.NOT_SUPPORT_TYPE_P else h10bytes[5]
-        sys_bytes = h10bytes[6:10]
-        r = HsmsSsControlMessage(sys_bytes, ctrl_type)
-        r._cache_header10bytes = bytes([
-            0xFF, 0xFF,
-            b2, reject_reason,
-            ctrl_type[0], ctrl_type[1],
-            sys_bytes[0], sys_bytes[1],
-            sys_bytes[2], sys_bytes[3]
-            ])
-        return r
+class SmlMessageTemplate:
+    """Compiled SML message, body is Secs2BodyTemplate.
 
-    @classmethod
-    def build_separate_request(cls, system_bytes):
-        return HsmsSsControlMessage(system_bytes, HsmsSsControlType.SEPARATE_REQ)
+    Immutable, and safe to share across threads.
+    Body bytes without placeholders are encoded once.
 
+    Examples:
+        tmpl = SmlMessageTemplate.from_sml('S1F3 W <L <U4 $svid> >.')
+        communicator.send(tmpl.strm, tmpl.func, tmpl.wbit, tmpl.to_bytes({'svid': 1001}))
 
-class Secs1MessageParseError(SecsMessageParseError):
+        frame = SmlParser.compile('S1F2 <L <A "MDLN"> <A "REV"> >.').to_hsmsss_bytes(system_bytes, session_id)
+    """
 
-    def __init__(self, msg):
-        super(Secs1MessageParseError, self).__init__(msg)
+    __slots__ = ('__strm', '__func', '__wbit', '__body', '__body_bytes')
 
+    def __init__(self, strm, func, wbit, body=None):
+        """Constructor.
 
-class Secs1Message(SecsMessage):
+        Args:
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            body (Secs2BodyTemplate): body template, None if no body. Defaults to None.
+        """
+        self.__strm = strm
+        self.__func = func
+        self.__wbit = wbit
+        self.__body = body
+        self.__body_bytes = body.to_bytes() if body is not None and len(body) == 0 else None
 
-    def __init__(self, strm, func, wbit, secs2body, system_bytes, device_id, rbit):
-        super(Secs1Message, self).__init__(strm, func, wbit, secs2body)
-        self._system_bytes = system_bytes
-        self.__device_id = int(device_id)
-        self.__rbit = bool(rbit)
-        self.__cache_header10bytes = None
-        self.__cache_str = None
-        self.__cache_repr = None
-        self.__cache_blocks = None
+    @classmethod
+    def from_sml(cls, sml_str):
+        """Compile from SML with placeholders '<U4 $name>'.
 
-    def __str__(self):
-        if self.__cache_str is None:
-            vv = [
-                self.get_header10bytes_str(),
-                self._STR_LINESEPARATOR,
-                'S', str(self.strm),
-                'F', str(self.func)
-            ]
-            if self.wbit:
-                vv.append(' W')
-            if self.secs2body is not None:
-                vv.append(self._STR_LINESEPARATOR)
-                vv.append(self.secs2body.to_sml())
-            vv.append('.')
-            self.__cache_str = ''.join(vv)
-        return self.__cache_str
+        Args:
+            sml_str (str): SML-string.
 
-    def __repr__(self):
-        if self.__cache_repr is None:
-            vv = [
-                "{'header':", str(self._header10bytes()),
-                ",'strm':", str(self.strm),
-                ",'func':", str(self.func),
-                ",'wbit':", str(self.wbit)
-            ]
-            if self.secs2body is not None:
-                vv.append(",'secs2body':")
-                vv.append(repr(self.secs2body))
-            vv.append("}")
-            self.__cache_repr = ''.join(vv)
-        return self.__cache_repr
+        Raises:
+            Secs2BodySmlParseError: if Secs2body parse failed.
+            SmlParseError: if SML parse failed.
 
-    def _header10bytes(self):
-        if self.__cache_header10bytes is None:
-            b0 = (self.device_id >> 8) & 0x7F
-            if self.rbit:
-                b0 |= 0x80
-            b1 = self.device_id & 0xFF
-            b2 = self.strm & 0x7F
-            if self.wbit:
-                b2 |= 0x80
-            b3 = self.func & 0xFF
-            self.__cache_header10bytes = bytes([
-                b0, b1,
-                b2, b3,
-                0x00, 0x00,
-                self._system_bytes[0], self._system_bytes[1],
-                self._system_bytes[2], self._system_bytes[3]
-            ])
-        return self.__cache_header10bytes
+        Returns:
+            SmlMessageTemplate: template.
+        """
+        strm, func, wbit, body = SmlParser._parse_header(sml_str)
+        return cls(strm, func, wbit, (Secs2BodyTemplate.from_sml(body) if len(body) > 0 else None))
 
-    def _device_id(self):
-        return self.__device_id
+    @property
+    def strm(self):
+        pass
+
+    @strm.getter
+    def strm(self):
+        """Stream-Number getter.
+
+        Returns:
+            int: Stream-Number
+        """
+        return self.__strm
 
     @property
-    def rbit(self):
+    def func(self):
         pass
 
-    @rbit.getter
-    def rbit(self):
-        return self.__rbit
+    @func.getter
+    def func(self):
+        """Function-Number getter.
 
-    def to_blocks(self):
+        Returns:
+            int: Function-Number
+        """
+        return self.__func
 
-        def _bb(bs, from_pos):
-            m = len(bs)
-            x = m - from_pos
-            if x > 244:
-                return bs[from_pos:(from_pos + 244)], 244, False
-            else:
-                return bs[from_pos:m], x, True
-
-        def _hh(l_hh, num, l_ebit):
-            b4 = (num >> 8) & 0x7F
-            if l_ebit:
-                b4 |= 0x80
-            b5 = num & 0xFF
-            return bytes([
-                l_hh[0], l_hh[1], l_hh[2], l_hh[3],
-                b4, b5,
-                l_hh[6], l_hh[7], l_hh[8], l_hh[9]
-            ])
+    @property
+    def wbit(self):
+        pass
 
-        def _sum(l_hh, l_bb):
-            x = sum([i for i in l_hh]) + sum([i for i in l_bb])
-            return bytes([((x >> 8) & 0xFF), (x & 0xFF)])
+    @wbit.getter
+    def wbit(self):
+        """W-Bit getter.
 
-        if self.__cache_blocks is None:
+        Returns:
+            bool: W-Bit
+        """
+        return self.__wbit
 
-            h10bs = self._header10bytes()
-            if self.secs2body is None:
-                body_bs = bytes()
-            else:
-                body_bs = self.secs2body.to_bytes()
+    @property
+    def names(self):
+        pass
 
-            blocks = []
-            pos = 0
-            block_num = 0
+    @names.getter
+    def names(self):
+        """Placeholder names getter.
 
-            while True:
-                block_num += 1
+        Returns:
+            tuple: names in document order, None if not named.
+        """
+        return () if self.__body is None else self.__body.names
 
-                if block_num > 0x7FFF:
-                    raise Secs1MessageParseError("blocks overflow")
+    def __len__(self):
+        return 0 if self.__body is None else len(self.__body)
 
-                bb, shift, ebit = _bb(body_bs, pos)
-                hh = _hh(h10bs, block_num, ebit)
-                ss = _sum(hh, bb)
+    def to_bytes(self, values=()):
+        """Encode body bytes.
 
-                v = Secs1MessageBlock(bytes([shift + 10]) + hh + bb + ss)
-                blocks.append(v)
+        Args:
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
 
-                if ebit:
-                    break
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
 
-                pos += shift
+        Returns:
+            bytes: SECS-II body bytes, None if no body.
+        """
+        if values is None:
+            values = ()
+        elif isinstance(values, dict):
+            try:
+                values = [values[n] for n in self.names]
+            except KeyError as e:
+                raise ValueError("value of placeholder " + str(e) + " not found")
 
-            self.__cache_blocks = tuple(blocks)
+        if self.__body is None or self.__body_bytes is not None:
+            if len(values) > 0:
+                raise ValueError("values count is 0, value is " + str(len(values)))
+            return self.__body_bytes
 
-        return self.__cache_blocks
+        return self.__body.to_bytes(values)
 
-    @classmethod
-    def from_blocks(cls, blocks):
+    def to_hsmsss_bytes(self, system_bytes, session_id, values=()):
+        """Encode HSMS-SS data message frame.
 
-        if blocks is None or len(blocks) == 0:
-            raise Secs1MessageParseError("No blocks")
+        Args:
+            system_bytes (bytes): 4-bytes system-bytes.
+            session_id (int): Session-ID.
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
 
-        bs = b''.join([(x.to_bytes())[11:-2] for x in blocks])
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
 
-        try:
-            v = Secs1Message(
-                blocks[0].strm,
-                blocks[0].func,
-                blocks[0].wbit,
-                Secs2BodyBuilder.from_body_bytes(bs) if bs else None,
-                blocks[0].get_system_bytes(),
-                blocks[0].device_id,
-                blocks[0].rbit
-            )
-            v.__cache_blocks = tuple(blocks)
-            return v
+        Returns:
+            bytes: 4-bytes-length + 10-bytes-header + body
+        """
+        bs = self.to_bytes(values)
+        n = 10 if bs is None else (10 + len(bs))
+        return b''.join((
+            bytes([
+                (n >> 24) & 0xFF, (n >> 16) & 0xFF, (n >> 8) & 0xFF, n & 0xFF,
+                (session_id >> 8) & 0x7F, session_id & 0xFF,
+                (self.__strm | 0x80) if self.__wbit else self.__strm, self.__func,
+                0x00, 0x00]),
+            bytes(system_bytes),
+            b'' if bs is None else bs))
+
+    def to_secs1_blocks(self, system_bytes, device_id, rbit, values=()):
+        """Encode SECS-I blocks.
 
-        except Secs2BodyParseError as e:
-            raise Secs1MessageParseError(e)
+        Args:
+            system_bytes (bytes): 4-bytes system-bytes.
+            device_id (int): Device-ID.
+            rbit (bool): R-Bit.
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
 
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
 
-class Secs1MessageBlock:
+        Returns:
+            tuple: Secs1MessageBlock
+        """
+        bs = self.to_bytes(values)
+        return Secs1Message(
+            self.__strm, self.__func, self.__wbit,
+            Secs2BodyBuilder.from_body_bytes(bs, lazy=True) if bs is not None else None,
+            system_bytes, device_id, rbit).to_blocks()
 
-    def __init__(self, block_bytes):
-        self.__bytes = block_bytes
-        self.__cache_str = None
-        self.__cache_repr = None
+    def build(self, values=()):
+        """Build message parts.
 
-    def __str__(self):
-        if self.__cache_str is None:
-            self._cache_str = (
-                '[' + '{:02X}'.format(self.__bytes[1])
-                + ' ' + '{:02X}'.format(self.__bytes[2])
-                + '|' + '{:02X}'.format(self.__bytes[3])
-                + ' ' + '{:02X}'.format(self.__bytes[4])
-                + '|' + '{:02X}'.format(self.__bytes[5])
-                + ' ' + '{:02X}'.format(self.__bytes[6])
-                + '|' + '{:02X}'.format(self.__bytes[7])
-                + ' ' + '{:02X}'.format(self.__bytes[8])
-                + ' ' + '{:02X}'.format(self.__bytes[9])
-                + ' ' + '{:02X}'.format(self.__bytes[10])
-                + '] length: ' + str(self.__bytes[0])
-                )
-        return self._cache_str
+        Args:
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
 
-    def __repr__(self):
-        if self.__cache_repr is None:
-            self.__cache_repr = str(self.__bytes)
-        return self.__cache_repr
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
 
-    def to_bytes(self):
-        return self.__bytes
+        Returns:
+            tuple: (
+                int: Stream-Number,
+                int: Function-Number,
+                bool: W-Bit,
+                AbstractSecs2Body: secs2body or None
+            )
+        """
+        bs = self.to_bytes(values)
+        return (
+            self.__strm,
+            self.__func,
+            self.__wbit,
+            Secs2BodyBuilder.from_body_bytes(bs, lazy=True) if bs is not None else None)
 
-    @property
-    def device_id(self):
-        pass
 
-    @device_id.getter
-    def device_id(self):
-        """Device-ID getter
+class SmlWriter:
+    """Streaming SML writer of Secs2Body, with truncation for logging.
 
-        Returns:
-            int: Device-ID
-        """
-        bs = self.__bytes[1:3]
-        return ((bs[0] << 8) & 0x7F00) | bs[1]
+    Writes line by line into write() target, without building or caching full SML.
+    Truncated parts are replaced with ellipsis, size [n] shows not truncated size.
+    If no limits, writes same SML as to_sml().
 
-    @property
-    def strm(self):
-        pass
+    Examples:
+        writer = SmlWriter(max_items=100, max_value_bytes=256, max_depth=8)
+        writer.write(msg.secs2body, sys.stdout)
+    """
 
-    @strm.getter
-    def strm(self):
-        """Stream-Number getter.
+    ELLIPSIS = '...'
 
-        Returns:
-            int: Stream-Number
+    _SML_TAB = '  '
+    _SML_VALUESEPARATOR = ' '
+    _SML_LINESEPARATOR = os.linesep
+
+    # count of number values formatted at once
+    _CHUNK_ITEMS = 4096
+
+    def __init__(self, max_items=None, max_value_bytes=None, max_depth=None):
+        """Constructor.
+
+        Args:
+            max_items (int): max items per L, and max values per number and BOOLEAN item. Defaults to None, not limit.
+            max_value_bytes (int): max bytes per A and B item. Defaults to None, not limit.
+            max_depth (int): max depth of written L items, root item is depth 1. Defaults to None, not limit.
         """
-        return self.__bytes[3] & 0x7F
+        self.__max_items = self.__limit(max_items)
+        self.__max_value_bytes = self.__limit(max_value_bytes)
+        self.__max_depth = self.__limit(max_depth)
+
+    @staticmethod
+    def __limit(v):
+        if v is None:
+            return None
+        v = int(v)
+        if v < 0:
+            raise ValueError("limit require >= 0")
+        return v
 
     @property
-    def func(self):
+    def max_items(self):
         pass
 
-    @func.getter
-    def func(self):
-        """Function-Number getter.
+    @max_items.getter
+    def max_items(self):
+        """Max items per L, and max values per number and BOOLEAN item getter.
 
         Returns:
-            int: Function-Number
+            int: max items, None if not limit
         """
-        return self.__bytes[4]
+        return self.__max_items
 
     @property
-    def rbit(self):
+    def max_value_bytes(self):
         pass
 
-    @rbit.getter
-    def rbit(self):
-        """R-Bit getter
+    @max_value_bytes.getter
+    def max_value_bytes(self):
+        """Max bytes per A and B item getter.
 
         Returns:
-            bool: True if has R-Bit
+            int: max bytes, None if not limit
         """
-        return (self.__bytes[1] & 0x80) == 0x80
+        return self.__max_value_bytes
 
     @property
-    def wbit(self):
+    def max_depth(self):
         pass
 
-    @wbit.getter
-    def wbit(self):
-        """W-Bit getter
+    @max_depth.getter
+    def max_depth(self):
+        """Max depth of written L items getter.
 
         Returns:
-            bool: True if has W-Bit
+            int: max depth, None if not limit
         """
-        return (self.__bytes[3] & 0x80) == 0x80
+        return self.__max_depth
 
-    @property
-    def ebit(self):
-        pass
+    def to_sml(self, secs2body):
+        """SML-body-string getter.
 
-    @ebit.getter
-    def ebit(self):
-        """E-Bit getter.
+        Args:
+            secs2body (AbstractSecs2Body): Secs2Body.
 
         Returns:
-            bool: True if has E-Bit
+            str: SML-body-string.
         """
-        return (self.__bytes[5] & 0x80) == 0x80
+        out = io.StringIO()
+        self.write(secs2body, out)
+        return out.getvalue()
 
-    def get_block_number(self):
-        bs = self.__bytes[5:7]
-        return ((bs[0] << 8) & 0x7F00) | bs[1]
+    def write_message(self, msg, out):
+        """Write SML-message, 'SxFy W' line, body and period(.)
 
-    def get_system_bytes(self):
-        return self.__bytes[7:11]
+        Args:
+            msg (SecsMessage): message.
+            out: target has write(str).
+        """
+        out.write('S' + str(msg.strm) + 'F' + str(msg.func) + (' W' if msg.wbit else ''))
+        if msg.secs2body is not None:
+            out.write(self._SML_LINESEPARATOR)
+            self.write(msg.secs2body, out)
+        out.write('.')
 
-    def is_next_block(self, block):
-        bs = block.to_bytes()
-        return (
-            bs[1] == self.__bytes[1]
-            and bs[2] == self.__bytes[2]
-            and bs[3] == self.__bytes[3]
-            and bs[4] == self.__bytes[4]
-            and bs[7] == self.__bytes[7]
-            and bs[8] == self.__bytes[8]
-            and bs[9] == self.__bytes[9]
-            and bs[10] == self.__bytes[10]
-            and block.get_block_number() == (self.get_block_number() + 1)
-        )
+    def write(self, secs2body, out):
+        """Write SML-body.
 
-    def is_same_block(self, block):
-        bs = block.to_bytes()
-        return (
-            bs[1] == self.__bytes[1]
-            and bs[2] == self.__bytes[2]
-            and bs[3] == self.__bytes[3]
-            and bs[4] == self.__bytes[4]
-            and bs[5] == self.__bytes[5]
-            and bs[6] == self.__bytes[6]
-            and bs[7] == self.__bytes[7]
-            and bs[8] == self.__bytes[8]
-            and bs[9] == self.__bytes[9]
-            and bs[10] == self.__bytes[10]
-        )
+        Args:
+            secs2body (AbstractSecs2Body): Secs2Body.
+            out: target has write(str).
+        """
+        write = out.write
+        max_items = self.__max_items
+        max_depth = self.__max_depth
 
+        if secs2body.type != 'L':
+            self._write_item(secs2body, write)
+            return
 
-class SecsCommunicatorError(Exception):
+        stack = list()  # (iterator, level, truncated) of L items not reach end
+        x, level = secs2body, ''
 
-    def __init__(self, msg):
-        super(SecsCommunicatorError, self).__init__(msg)
+        while True:
 
-    def __str__(self):
-        return repr(self)
+            if x is not None:
+                n = len(x)
+                if max_depth is not None and len(stack) >= max_depth:
+                    write(level + '<L [' + str(n) + '] ' + self.ELLIPSIS + ' >')
+                else:
+                    write(level + '<L [' + str(n) + ']')
+                    m = n if max_items is None else min(n, max_items)
+                    stack.append((iter(x[0:m] if m < n else x), level, m < n))
+
+            while stack:
+                it, l, truncated = stack[-1]
+                deep_level = l + self._SML_TAB
+                x = next(it, None)
+                if x is None:
+                    stack.pop()
+                    if truncated:
+                        write(self._SML_LINESEPARATOR + deep_level + self.ELLIPSIS)
+                    write(self._SML_LINESEPARATOR + l + '>')
+                    continue
+                write(self._SML_LINESEPARATOR)
+                if x.type == 'L':
+                    level = deep_level
+                    break
+                write(deep_level)
+                self._write_item(x, write)
+            else:
+                return
 
+    def _write_item(self, x, write):     # not L item
+        tt = x.type
+        n = len(x)
+        write('<' + tt + ' [' + str(n) + '] ')
 
-class SecsWithReferenceMessageError(SecsCommunicatorError):
+        if tt == 'A':
+            m = n if self.__max_value_bytes is None else min(n, self.__max_value_bytes)
+            write('"' + x.value[0:m] + '"')
 
-    def __init__(self, msg, ref_msg):
-        super(SecsWithReferenceMessageError, self).__init__(msg)
-        self._msg = msg
-        self._ref_msg = ref_msg
+        elif tt == 'B':
+            m = n if self.__max_value_bytes is None else min(n, self.__max_value_bytes)
+            self.__write_values(write, [('0x' + '{:02X}'.format(v)) for v in x.iter_values(0, m)])
 
-    def get_reference_message(self):
-        return self._ref_msg
+        elif tt == 'BOOLEAN':
+            m = n if self.__max_items is None else min(n, self.__max_items)
+            self.__write_values(write, [("TRUE" if v else "FALSE") for v in x.iter_values(0, m)])
 
-    def __str__(self):
-        return (self.__class__.__name__ + '('
-                + repr(self._msg) + ','
-                + self._ref_msg.get_header10bytes_str()
-                + ')')
+        else:
+            m = n if self.__max_items is None else min(n, self.__max_items)
+            it = x.iter_values(0, m)
+            for i in range(0, m, self._CHUNK_ITEMS):
+                if i > 0:
+                    write(self._SML_VALUESEPARATOR)
+                self.__write_values(write, [str(v) for v in itertools.islice(it, self._CHUNK_ITEMS)])
 
-    def __repr__(self):
-        return (self.__class__.__name__ + '('
-                + repr(self._msg) + ','
-                + repr(self._ref_msg.header10bytes)
-                + ')')
+        if m < n:
+            write(' ' + self.ELLIPSIS)
 
+        write(' >')
 
-class SecsSendMessageError(SecsWithReferenceMessageError):
+    def __write_values(self, write, vv):
+        write(self._SML_VALUESEPARATOR.join(vv))
 
-    def __init__(self, msg, ref_msg):
-        super(SecsSendMessageError, self).__init__(msg, ref_msg)
 
+class SecsMessageParseError(Exception):
 
-class SecsWaitReplyMessageError(SecsWithReferenceMessageError):
+    def __init__(self, msg):
+        super(SecsMessageParseError, self).__init__(msg)
 
-    def __init__(self, msg, ref_msg):
-        super(SecsWaitReplyMessageError, self).__init__(msg, ref_msg)
 
+class SecsMessage:
 
-class AbstractQueuing:
+    _STR_LINESEPARATOR = os.linesep
 
-    def __init__(self):
-        self.__terminated = False
-        self._vv = list()
-        self._v_cdt = threading.Condition()
+    # writes body of __str__, truncates large body for logging
+    str_sml_writer = SmlWriter(max_items=1000, max_value_bytes=4096, max_depth=64)
 
-    def __enter__(self):
-        return self
+    # _cache is None, or dict of cached values created on first cached
+    # _secs2body_source is (body_bytes, lazy, cache_policy) not decoded yet, or None
+    __slots__ = ('__strm', '__func', '__wbit', '__secs2body', '_secs2body_source', '_cache', '__weakref__')
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self.shutdown()
+    # sets decoded body, decode itself is out of lock
+    __decode_lock = threading.Lock()
 
-    def shutdown(self):
-        with self._v_cdt:
-            self.__terminated = True
-            self._v_cdt.notify_all()
+    def __init__(self, strm, func, wbit, secs2body):
 
-    def _is_terminated(self):
-        with self._v_cdt:
-            return self.__terminated
+        if strm < 0 or strm > 127:
+            raise SecsMessageParseError("Stream is from 0 to 127")
 
-    def await_termination(self, timeout=None):
-        with self._v_cdt:
-            return self._v_cdt.wait_for(self._is_terminated, timeout)
+        if func < 0 or func > 255:
+            raise SecsMessageParseError("Function is from 0 to 255")
 
-    def put(self, value):
-        with self._v_cdt:
-            if value is not None and not self._is_terminated():
-                self._vv.append(value)
-                self._v_cdt.notify_all()
+        self.__strm = int(strm)
+        self.__func = int(func)
+        self.__wbit = bool(wbit)
+        self.__secs2body = secs2body
+        self._secs2body_source = None
+        self._cache = None
 
-    def puts(self, values):
-        with self._v_cdt:
-            if values and not self._is_terminated():
-                self._vv.extend([v for v in values])
-                self._v_cdt.notify_all()
+    @property
+    def strm(self):
+        pass
 
-    def _poll_vv(self):
-        with self._v_cdt:
-            if self._vv:
-                return self._vv.pop(0)
-            else:
-                return None
+    @strm.getter
+    def strm(self):
+        """Stream-Number getter.
 
+        Returns:
+            int: Stream-Number
+        """
+        return self.__strm
 
-class CallbackQueuing(AbstractQueuing):
+    def get_stream(self):
+        """Stream-Number getter.
 
-    def __init__(self, callback):
-        super(CallbackQueuing, self).__init__()
-        self._cb = callback
+        Alias of self.strm
 
-        def _f():
-            with self._v_cdt:
-                while True:
-                    v = self._poll_vv()
-                    if v is None:
-                        self._v_cdt.wait()
+        Returns:
+            int: Stream-Number
+        """
+        return self.strm
 
-                        if self._is_terminated():
-                            self._cb(None)
-                            return
+    @property
+    def func(self):
+        pass
 
-                    else:
-                        self._cb(v)
+    @func.getter
+    def func(self):
+        """Function-Number getter.
 
-        threading.Thread(target=_f, daemon=True).start()
+        Returns:
+            int: Function-Number
+        """
+        return self.__func
 
+    def get_function(self):
+        """Function-Number getter.
 
-class WaitingQueuing(AbstractQueuing):
+        Alias of self.func
 
-    def __init__(self):
-        super(WaitingQueuing, self).__init__()
+        Returns:
+            int: Function-Number
+        """
+        return self.func
 
-    def poll(self, timeout=None):
+    @property
+    def wbit(self):
+        pass
 
-        with self._v_cdt:
-
-            if self._is_terminated():
-                return None
-
-            v = self._poll_vv()
-            if v is not None:
-                return v
-
-            self._v_cdt.wait(timeout)
-
-            if self._is_terminated():
-                return None
-
-            return self._poll_vv()
-
-    def put_to_list(self, values, pos, size, timeout=None):
-
-        def _f(vv, p, m):
-            vv_size = len(self._vv)
-            if vv_size > 0:
-                r = m - p
-                if vv_size > r:
-                    vv.extend(self._vv[0:r])
-                    del self._vv[0:r]
-                    return r
-                else:
-                    vv.extend(self._vv)
-                    self._vv.clear()
-                    return vv_size
-            else:
-                return -1
-
-        with self._v_cdt:
-
-            if self._is_terminated():
-                return -1
-
-            rr = _f(values, pos, size)
-            if rr > 0:
-                return rr
-
-            self._v_cdt.wait(timeout)
-
-            if self._is_terminated():
-                return -1
-
-            return _f(values, pos, size)
-
-
-class AbstractSecsCommunicator:
-
-    __DEFAULT_TIMEOUT_T1 = 1.0
-    __DEFAULT_TIMEOUT_T2 = 15.0
-    __DEFAULT_TIMEOUT_T3 = 45.0
-    __DEFAULT_TIMEOUT_T4 = 45.0
-    __DEFAULT_TIMEOUT_T5 = 10.0
-    __DEFAULT_TIMEOUT_T6 = 5.0
-    __DEFAULT_TIMEOUT_T7 = 10.0
-    __DEFAULT_TIMEOUT_T8 = 5.0
-
-    def __init__(self, device_id, is_equip, **kwargs):
-
-        self.__gem = Gem(self)
-
-        self.device_id = device_id
-        self.is_equip = is_equip
+    @wbit.getter
+    def wbit(self):
+        """W-Bit getter
 
-        self.name = kwargs.get('name', None)
-        self.timeout_t1 = kwargs.get('timeout_t1', self.__DEFAULT_TIMEOUT_T1)
-        self.timeout_t2 = kwargs.get('timeout_t2', self.__DEFAULT_TIMEOUT_T2)
-        self.timeout_t3 = kwargs.get('timeout_t3', self.__DEFAULT_TIMEOUT_T3)
-        self.timeout_t4 = kwargs.get('timeout_t4', self.__DEFAULT_TIMEOUT_T4)
-        self.timeout_t5 = kwargs.get('timeout_t5', self.__DEFAULT_TIMEOUT_T5)
-        self.timeout_t6 = kwargs.get('timeout_t6', self.__DEFAULT_TIMEOUT_T6)
-        self.timeout_t7 = kwargs.get('timeout_t7', self.__DEFAULT_TIMEOUT_T7)
-        self.timeout_t8 = kwargs.get('timeout_t8', self.__DEFAULT_TIMEOUT_T8)
+        Returns:
+            bool: True if has W-Bit
+        """
+        return self.__wbit
 
-        gem_mdln = kwargs.get('gem_mdln', None)
-        if gem_mdln is not None:
-            self.gem.mdln = gem_mdln
+    def has_wbit(self):
+        """W-Bit getter
 
-        gem_softrev = kwargs.get('gem_softrev', None)
-        if gem_softrev is not None:
-            self.gem.softrev = gem_softrev
+        Alias of self.wbit
 
-        gem_clock_type = kwargs.get('gem_clock_type', None)
-        if gem_clock_type is not None:
-            self.gem.clock_type = gem_clock_type
+        Returns:
+            bool: True if has W-Bit
+        """
+        return self.wbit
 
-        self._sys_num = 0
+    @property
+    def secs2body(self):
+        pass
 
-        self.__communicating = False
-        self.__comm_cdt = threading.Condition()
+    @secs2body.getter
+    def secs2body(self):
+        """Secs2Body getter.
 
-        self.__recv_primary_msg_lstnrs = list()
-        self.__communicate_lstnrs = list()
-        self.__error_lstnrs = list()
-        self.__recv_all_msg_lstnrs = list()
-        self.__sended_msg_lstnrs = list()
+        If received, body bytes are decoded on first access.
 
-        recv_pri_msg_lstnr = kwargs.get('recv_primary_msg', None)
-        if recv_pri_msg_lstnr is not None:
-            self.add_recv_primary_msg_listener(recv_pri_msg_lstnr)
+        Raises:
+            Secs2BodyBytesParseError: if decode failed.
 
-        err_lstnr = kwargs.get('error', None)
-        if err_lstnr is not None:
-            self.add_error_listener(err_lstnr)
+        Returns:
+            AbstractSecs2Body: Secs2Body
+        """
+        v = self.__secs2body
+        if v is None and self._secs2body_source is not None:
+            return self._decode_secs2body()
+        return v
 
-        comm_lstnr = kwargs.get('communicate', None)
-        if comm_lstnr is not None:
-            self.add_communicate_listener(comm_lstnr)
+    def _set_secs2body_source(self, body_bytes, lazy=False, cache_policy=None):
+        # decode body_bytes on first access to secs2body
+        if len(body_bytes) > 0:
+            self._secs2body_source = (body_bytes, lazy, cache_policy)
+
+    def _decode_secs2body(self):
+        src = self._secs2body_source
+        if src is None:     # decoded by other thread
+            return self.__secs2body
+        bs, lazy, cache_policy = src
+        if not lazy and type(bs) is memoryview:
+            bs = bytes(bs)  # eager decode is faster on bytes
+        v = Secs2BodyBuilder.from_body_bytes(bs, lazy, cache_policy=cache_policy)
+        with self.__decode_lock:
+            if self._secs2body_source is None:  # decoded by other thread while decoding
+                return self.__secs2body
+            self.__secs2body = v
+            self._secs2body_source = None
+        return v
 
-        self.__opened = False
-        self.__closed = False
-        self._open_close_rlock = threading.RLock()
+    def __getstate__(self):
+        # slots of all classes, body bytes of received is memoryview of frame,
+        # and lazy L item is over memoryview, so stored as bytes.
+        state = dict()
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name == '__weakref__':
+                    continue
+                if name.startswith('__'):
+                    name = '_' + cls.__name__.lstrip('_') + name
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+
+        src = self._secs2body_source
+        v = self.__secs2body
+        if src is not None:
+            state['_secs2body_source'] = (bytes(src[0]), src[1], src[2])
+        elif isinstance(v, Secs2LazyListBody):
+            state['_SecsMessage__secs2body'] = None
+            state['_secs2body_source'] = (v.to_bytes(), True, v._cache_policy)
+
+        c = self._cache
+        if c is not None:
+            state['_cache'] = dict([
+                (k, (bytes(x) if type(x) is memoryview else x)) for k, x in c.items()])
+
+        return state
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            object.__setattr__(self, k, v)
 
-    @property
-    def gem(self):
-        pass
+    def get_secs2body(self):
+        """Secs2Body getter.
 
-    @gem.getter
-    def gem(self):
-        """GEM getter
+        Alias of self.secs2body
 
         Returns:
-            Gem: GEM-instance
+            AbstractSecs2Body: Secs2Body
         """
-        return self.__gem
+        return self.secs2body
 
     @property
     def device_id(self):
@@ -1767,1857 +2770,4631 @@ class AbstractSecsCommunicator:
         Returns:
             int: Device-ID
         """
-        return self.__device_id
-
-    @device_id.setter
-    def device_id(self, val):
-        """Device-ID setter.
+        return self._device_id()
 
-        Args:
-            val (int): Device_ID
-        """
-        self.__device_id = val
+    def _device_id(self):
+        # prototype
+        raise NotImplementedError()
 
     @property
-    def is_equip(self):
+    def system_bytes(self):
         pass
 
-    @is_equip.setter
-    def is_equip(self, val):
-        """is-Equipment setter.
-
-        Args:
-            val (bool): is-Equipment
-        """
-        self.__is_equip = bool(val)
-
-    @is_equip.getter
-    def is_equip(self):
-        """is-Equipment getter.
+    @system_bytes.getter
+    def system_bytes(self):
+        """ system-4-bytes getter.
 
         Returns:
-            bool: True if Equipment
+            bytes: system-4-bytes, header10bytes[6:10]
         """
-        return self.__is_equip
+        return (self._header10bytes())[6:10]
 
     @property
-    def name(self):
+    def header10bytes(self):
         pass
 
-    @name.setter
-    def name(self, val):
-        """Communicator-Name setter.
-
-        Args:
-            val (str or None): Communicator-Name
-        """
-        self.__name = val if val is None else str(val)
-
-    @name.getter
-    def name(self):
-        """Communicator-Name getter.
+    @header10bytes.getter
+    def header10bytes(self):
+        """ header-10-bytes getter.
 
         Returns:
-            str: Communicator-Name
+            bytes: header-10-bytes
         """
-        return self.__name
-
-    @staticmethod
-    def _try_gt_zero(v):
-        """test-set-timeout-tx
+        return self._header10bytes()
 
-        Args:
-            v (int or float): timeout-time-seconds.
+    def _header10bytes(self):
+        # prototype
+        # return bytes(10)
+        raise NotImplementedError()
 
-        Raises:
-            TypeError: raise if v is None.
-            ValueError: raise if v is not greater than 0.0.
+    def _get_cache(self, key):
+        c = self._cache
+        return None if c is None else c.get(key)
 
-        Returns:
-            float: tested value
-        """
-        if v is None:
-            raise TypeError("Timeout-value require not None")
-        if v > 0.0:
-            return float(v)
-        else:
-            raise ValueError("Timeout-value require > 0.0")
+    def _set_cache(self, key, v):   # return v
+        if self._cache is None:
+            self._cache = dict()
+        self._cache[key] = v
+        return v
 
-    @property
-    def timeout_t1(self):
-        pass
+    def _str_body(self):    # SML of body for __str__, not cache full SML of body
+        return self.str_sml_writer.to_sml(self.secs2body)
 
-    @timeout_t1.getter
-    def timeout_t1(self):
-        """Timeout-T1 getter.
+    def _get_cache_policy(self):
+        s2b = self.__secs2body
+        if s2b is None:
+            src = self._secs2body_source
+            if src is not None and src[2] is not None:
+                return src[2]
+            return Secs2BodyBuilder.cache_policy
+        return s2b._get_cache_policy()
 
-        Returns:
-            float: Timeout-T1
-        """
-        return self.__timeout_t1
+    def _get_text_cache(self, key):     # str and repr, cached by cache policy of body
+        return self._get_cache_policy()._get(self, key)
 
-    @timeout_t1.setter
-    def timeout_t1(self, val):
-        """Timeout-T1 setter.
+    def _set_text_cache(self, key, v):  # return v
+        self._get_cache_policy()._set(self, key, v)
+        return v
 
-        Args:
-            val (int or float): Timeout-T1 value.
+    def _get_own_cache(self, key):
+        return self._get_cache(key)
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t1 = self._try_gt_zero(val)
+    def _set_own_cache(self, key, v):
+        self._set_cache(key, v)
 
-    @property
-    def timeout_t2(self):
-        pass
+    def get_header10bytes_str(self):
 
-    @timeout_t2.getter
-    def timeout_t2(self):
-        """Timeout-T2 getter.
+        v = self._get_cache('header10bytes_str')
 
-        Returns:
-            float: Timeout-T2
-        """
-        return self.__timeout_t2
+        if v is None:
 
-    @timeout_t2.setter
-    def timeout_t2(self, val):
-        """Timeout-T2 setter.
+            x = self._header10bytes()
+            v = self._set_cache('header10bytes_str', (
+                '[' + '{:02X}'.format(x[0])
+                + ' ' + '{:02X}'.format(x[1])
+                + '|' + '{:02X}'.format(x[2])
+                + ' ' + '{:02X}'.format(x[3])
+                + '|' + '{:02X}'.format(x[4])
+                + ' ' + '{:02X}'.format(x[5])
+                + '|' + '{:02X}'.format(x[6])
+                + ' ' + '{:02X}'.format(x[7])
+                + ' ' + '{:02X}'.format(x[8])
+                + ' ' + '{:02X}'.format(x[9])
+                + ']'))
 
-        Args:
-            val (int or float): Timeout-T2 value.
+        return v
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t2 = self._try_gt_zero(val)
 
-    @property
-    def timeout_t3(self):
-        pass
+class HsmsSsMessageParseError(SecsMessageParseError):
 
-    @timeout_t3.getter
-    def timeout_t3(self):
-        """Timeout-T3 getter.
+    def __init__(self, msg):
+        super(HsmsSsMessageParseError, self).__init__(msg)
 
-        Returns:
-            float: Timeout-T3
-        """
-        return self.__timeout_t3
 
-    @timeout_t3.setter
-    def timeout_t3(self, val):
-        """Timeout-T3 setter.
+class HsmsSsControlType:
 
-        Args:
-            val (int or float): Timeout-T3 value.
+    UNDEFINED = (0xFF, 0xFF)
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t3 = self._try_gt_zero(val)
+    DATA = (0x00, 0x00)
+    SELECT_REQ = (0x00, 0x01)
+    SELECT_RSP = (0x00, 0x02)
+    DESELECT_REQ = (0x00, 0x03)
+    DESELECT_RSP = (0x00, 0x04)
+    LINKTEST_REQ = (0x00, 0x05)
+    LINKTEST_RSP = (0x00, 0x06)
+    REJECT_REQ = (0x00, 0x07)
+    SEPARATE_REQ = (0x00, 0x09)
 
-    @property
-    def timeout_t4(self):
-        pass
+    __ITEMS = (
+        DATA,
+        SELECT_REQ, SELECT_RSP,
+        DESELECT_REQ, DESELECT_RSP,
+        LINKTEST_REQ, LINKTEST_RSP,
+        REJECT_REQ,
+        SEPARATE_REQ
+    )
 
-    @timeout_t4.getter
-    def timeout_t4(self):
-        """Timeout-T4 getter.
+    # s-type -> control type of p-type 0x00, UNDEFINED if not exist
+    __BY_S_TYPE = tuple(map(dict([(x[1], x) for x in __ITEMS]).get, range(256), (UNDEFINED,) * 256))
 
-        Returns:
-            float: Timeout-T4
-        """
-        return self.__timeout_t4
+    @classmethod
+    def get(cls, v):
+        if v[0] == 0x00 and 0x00 <= v[1] <= 0xFF:
+            return cls.__BY_S_TYPE[v[1]]
+        return cls.UNDEFINED
 
-    @timeout_t4.setter
-    def timeout_t4(self, val):
-        """Timeout-T4 setter.
+    @classmethod
+    def has_s_type(cls, b):
+        return 0x00 <= b <= 0xFF and cls.__BY_S_TYPE[b] is not cls.UNDEFINED
 
-        Args:
-            val (int or float): Timeout-T4 value.
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t4 = self._try_gt_zero(val)
+class HsmsSsSelectStatus:
 
-    @property
-    def timeout_t5(self):
-        pass
+    UNKNOWN = 0xFF
 
-    @timeout_t5.getter
-    def timeout_t5(self):
-        """Timeout-T5 getter.
+    SUCCESS = 0x00
+    ACTIVED = 0x01
+    NOT_READY = 0x02
+    ALREADY_USED = 0x03
 
-        Returns:
-            float: Timeout-T5
-        """
-        return self.__timeout_t5
+    __ITEMS = (
+        SUCCESS,
+        ACTIVED,
+        NOT_READY,
+        ALREADY_USED
+    )
 
-    @timeout_t5.setter
-    def timeout_t5(self, val):
-        """Timeout-T5 setter.
+    # byte -> select status, UNKNOWN if not exist
+    __BY_BYTE = tuple(map(dict([(x, x) for x in __ITEMS]).get, range(256), (UNKNOWN,) * 256))
 
-        Args:
-            val (int or float): Timeout-T5 value.
+    @classmethod
+    def get(cls, b):
+        return cls.__BY_BYTE[b] if 0x00 <= b <= 0xFF else cls.UNKNOWN
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t5 = self._try_gt_zero(val)
 
-    @property
-    def timeout_t6(self):
-        pass
+class HsmsSsRejectReason:
 
-    @timeout_t6.getter
-    def timeout_t6(self):
-        """Timeout-T6 getter.
+    UNKNOWN = 0xFF
 
-        Returns:
-            float: Timeout-T6
-        """
-        return self.__timeout_t6
+    NOT_SUPPORT_TYPE_S = 0x01
+    NOT_SUPPORT_TYPE_P = 0x02
+    TRANSACTION_NOT_OPEN = 0x03
+    NOT_SELECTED = 0x04
 
-    @timeout_t6.setter
-    def timeout_t6(self, val):
-        """Timeout-T6 setter.
+    __ITEMS = (
+        NOT_SUPPORT_TYPE_S,
+        NOT_SUPPORT_TYPE_P,
+        TRANSACTION_NOT_OPEN,
+        NOT_SELECTED
+    )
 
-        Args:
-            val (int or float): Timeout-T6 value.
+    # byte -> reject reason, UNKNOWN if not exist
+    __BY_BYTE = tuple(map(dict([(x, x) for x in __ITEMS]).get, range(256), (UNKNOWN,) * 256))
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t6 = self._try_gt_zero(val)
+    @classmethod
+    def get(cls, b):
+        return cls.__BY_BYTE[b] if 0x00 <= b <= 0xFF else cls.UNKNOWN
 
-    @property
-    def timeout_t7(self):
-        pass
 
-    @timeout_t7.getter
-    def timeout_t7(self):
-        """Timeout-T7 getter.
+class HsmsSsMessage(SecsMessage):
 
-        Returns:
-            float: Timeout-T7
-        """
-        return self.__timeout_t7
+    __slots__ = ('_system_bytes', '_control_type')
 
-    @timeout_t7.setter
-    def timeout_t7(self, val):
-        """Timeout-T7 setter.
+    def __init__(self, strm, func, wbit, secs2body, system_bytes, control_type):
+        super(HsmsSsMessage, self).__init__(strm, func, wbit, secs2body)
+        self._system_bytes = system_bytes
+        self._control_type = control_type
 
-        Args:
-            val (int or float): Timeout-T7 value.
+    def __str__(self):
+        v = self._get_text_cache('str')
+        if v is None:
+            vv = [self.get_header10bytes_str(), ' length:', str(self._msg_length())]
+            if self._control_type == HsmsSsControlType.DATA:
+                vv.extend([
+                    self._STR_LINESEPARATOR,
+                    'S', str(self.strm),
+                    'F', str(self.func)
+                ])
+                if self.wbit:
+                    vv.append(' W')
+                if self.secs2body is not None:
+                    vv.extend([
+                        self._STR_LINESEPARATOR,
+                        self._str_body()
+                    ])
+                vv.append('.')
+            v = self._set_text_cache('str', ''.join(vv))
+        return v
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t7 = self._try_gt_zero(val)
+    def __repr__(self):
+        v = self._get_text_cache('repr')
+        if v is None:
+            vv = ["{'header':", str(self._header10bytes())]
+            if self._control_type == HsmsSsControlType.DATA:
+                vv.extend([
+                    ",'strm':", str(self.strm),
+                    ",'func':", str(self.func),
+                    ",'wbit':", str(self.wbit)
+                ])
+                if self.secs2body is not None:
+                    vv.extend([",'secs2body':", repr(self.secs2body)])
+            vv.append("}")
+            v = self._set_text_cache('repr', ''.join(vv))
+        return v
 
-    @property
-    def timeout_t8(self):
-        pass
+    def _msg_length(self):
+        i = self._get_cache('msg_length')
+        if i is None:
+            bs = self._get_cache('bytes')
+            if bs is not None:
+                return self._set_cache('msg_length', len(bs) - 4)
+            i = len(self._header10bytes())
+            if self.secs2body is not None:
+                i += self.secs2body.get_encoded_size()
+            self._set_cache('msg_length', i)
 
-    @timeout_t8.getter
-    def timeout_t8(self):
-        """Timeout-T8 getter.
+        return i
 
-        Returns:
-            float: Timeout-T8
-        """
-        return self.__timeout_t8
+    def _device_id(self):
+        # prototype
+        raise NotImplementedError()
 
-    @timeout_t8.setter
-    def timeout_t8(self, val):
-        """Timeout-T8 setter.
+    def _header10bytes(self):
+        # prototype
+        # return bytes(10)
+        raise NotImplementedError()
 
-        Args:
-            val (int or float): Timeout-T8 value.
+    def get_control_type(self):
+        return self._control_type
 
-        Raises:
-            TypeError: if value is None.
-            ValueError: if value is not greater than 0.0.
-        """
-        self.__timeout_t8 = self._try_gt_zero(val)
+    def get_p_type(self):
+        return (self._header10bytes())[4]
 
-    def open(self):
-        """Open communicator
-        """
-        self._open()
+    def get_s_type(self):
+        return (self._header10bytes())[5]
 
-    def _open(self):
-        # prototype-pattern
-        raise NotImplementedError()
+    def get_select_status(self):
+        return HsmsSsSelectStatus.get((self._header10bytes())[3])
 
-    def close(self):
-        """Close communicator
-        """
-        self._close()
+    def get_reject_reason(self):
+        return HsmsSsRejectReason.get((self._header10bytes())[3])
 
-    def _close(self):
-        # prototype-pattern
-        raise NotImplementedError()
+    def to_bytes(self):
+        v = self._get_cache('bytes')
+        if v is None:
+            msg_len = self._msg_length()
+            buf = bytearray(4 + msg_len)
+            buf[0:4] = bytes([
+                (msg_len >> 24) & 0xFF,
+                (msg_len >> 16) & 0xFF,
+                (msg_len >> 8) & 0xFF,
+                msg_len & 0xFF
+            ])
+            buf[4:14] = self._header10bytes()
+            if self.secs2body is not None:
+                self.secs2body.encode_into(buf, 14)
+            v = self._set_cache('bytes', bytes(buf))
+        return v
 
-    def open_and_wait_until_communicating(self, timeout=None):
+    def to_buffers(self):
+        """Buffers of HSMS-SS message bytes, for scatter/gather write.
 
-        if not self.is_open:
-            self._open()
+        Body is not copied into frame, if frame bytes is not cached.
 
-        with self.__comm_cdt:
+        Returns:
+            list: buffers, 4-bytes-length + 10-bytes-header, and body if exist.
+        """
+        v = self._get_cache('bytes')
+        if v is not None:
+            return [v]
+        h10bs = self._header10bytes()
+        if self.secs2body is None:
+            return [self._msg_length().to_bytes(4, 'big') + h10bs]
+        bs = self.secs2body.to_bytes()
+        return [(len(h10bs) + len(bs)).to_bytes(4, 'big') + h10bs, bs]
 
-            def _p():
-                return self.is_closed or self.is_communicating
+    @classmethod
+    def from_bytes(cls, bs, lazy=False, cache_policy=None):
+        """Build from HSMS-SS message bytes.
 
-            r = self.__comm_cdt.wait_for(_p, timeout)
-            if r:
-                if self.is_closed:
-                    raise SecsCommunicatorError("Communicator closed")
-            return r
+        Args:
+            bs (bytes): 4-bytes-length + 10-bytes-header + body
+            lazy (bool): True if decode L items of body lazily over bs. Defaults to False.
+            cache_policy (Secs2BodyCachePolicy): cache policy of body. Defaults to Secs2BodyBuilder.cache_policy.
 
-    @property
-    def is_open(self):
-        pass
+        Body is decoded on first access to secs2body, header fields are available immediately.
 
-    @is_open.getter
-    def is_open(self):
-        with self._open_close_rlock:
-            return self.__opened and not self.__closed
+        Returns:
+            HsmsSsMessage: message
+        """
 
-    @property
-    def is_closed(self):
-        pass
+        h10bs = bs[4:14]
+        sys_bs = h10bs[6:10]
 
-    @is_closed.getter
-    def is_closed(self):
-        with self._open_close_rlock:
-            return self.__closed
+        ctrl_type = HsmsSsControlType.get(h10bs[4:6])
 
-    def _set_opened(self):
-        with self._open_close_rlock:
-            self.__opened = True
+        if ctrl_type == HsmsSsControlType.DATA:
 
-    def _set_closed(self):
-        with self._open_close_rlock:
-            self.__closed = True
-            with self.__comm_cdt:
-                self.__comm_cdt.notify_all()
+            dev_id = (h10bs[0] << 8) | h10bs[1]
+            strm = h10bs[2] & 0x7F
+            func = h10bs[3]
+            wbit = (h10bs[2] & 0x80) == 0x80
 
-    def __enter__(self):
-        return self
+            v = HsmsSsDataMessage(strm, func, wbit, None, sys_bs, dev_id)
+            v._set_secs2body_source(memoryview(bs)[14:], lazy, cache_policy)
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self._close()
+        else:
 
-    def __del__(self):
-        self._close()
+            v = HsmsSsControlMessage(sys_bs, ctrl_type)
 
-    def send(self, strm, func, wbit, secs2body=None):
-        """Send primary message
+        v._set_cache('bytes', bs)
+        v._set_cache('header10bytes', h10bs)
 
-        Args:
-            strm (int): Stream-Number.
-            func (int): Function-Number.
-            wbit (bool): W-Bit.
-            secs2body (tuple or list or AbstractSecs2Body): SECS-II-body. Defaults to None.
+        return v
 
-        Raises:
-            SecsCommunicatorError: if communicator not opened.
-            SecsSendMessageError: if send failed.
-            SecsWaitReplyError: if reply not received.
 
-        Returns:
-            SecsMessage: Reply-Message if exist, otherwise None.
+class HsmsSsDataMessage(HsmsSsMessage):
 
-        Examples:
-            if send 'S1F1 W.',
-            send(1, 1, True)
+    __slots__ = ('__session_id', )
 
-            if send
-            'S5F1 W
-            <L
-              <B  0x01>
-              <U2 1001>
-              <A  "ON FIRE">
-            >.',
-            send(
-                5, 1, True,
-                ('L', [
-                    ('B', [0x01]),
-                    ('U2', [1001]),
-                    ('A', "ON FIRE")
-                ])
-                )
-        """
-        return self._send(
-            strm, func, wbit,
-            self._create_secs2body(secs2body),
-            self._create_system_bytes(),
-            self.device_id)
+    def __init__(self, strm, func, wbit, secs2body, system_bytes, session_id):
+        super(HsmsSsDataMessage, self).__init__(strm, func, wbit, secs2body, system_bytes, HsmsSsControlType.DATA)
+        self.__session_id = session_id
 
-    def send_sml(self, sml_str):
-        """Send primary message by SML
+    def _header10bytes(self):
+        v = self._get_cache('header10bytes')
+        if v is None:
+            b2 = self.strm
+            if self.wbit:
+                b2 |= 0x80
 
-        Args:
-            sml_str (str): SML-string.
+            v = self._set_cache('header10bytes', bytes([
+                (self.session_id >> 8) & 0x7F,
+                self.session_id & 0xFF,
+                b2, self.func,
+                self._control_type[0], self._control_type[1],
+                self._system_bytes[0], self._system_bytes[1],
+                self._system_bytes[2], self._system_bytes[3]
+                ]))
 
-        Raises:
-            SecsCommunicatorError: if communicator not opened.
-            SecsSendMessageError: if send failed.
-            SecsWaitReplyError: if reply not received.
-            Secs2BodySmlParseError: if Secs2body parse failed.
-            SmlParseError: if SML parse failed.
+        return v
 
-        Returns:
-            SecsMessage: Reply-Message if exist, otherwise None.
-        """
-        strm, func, wbit, s2b = SmlParser.parse(sml_str)
-        return self.send(strm, func, wbit, s2b)
+    @property
+    def session_id(self):
+        pass
 
-    def reply(self, primary, strm, func, wbit, secs2body=None):
-        """Send reply message
+    @session_id.getter
+    def session_id(self):
+        return self.__session_id
 
-        Args:
-            primary (SecsMessage): Primary-Message.
-            strm (int): Stream-Number.
-            func (int): Function-Number.
-            wbit (bool: W-Bit.
-            secs2body (tuple or list or AbstractSecs2Body): SECS-II-body. Defaults to None.
+    def _device_id(self):
+        return self.session_id
 
-        Raises:
-            SecsCommunicatorError: if communicator not opened.
-            SecsSendMessageError: if send failed.
 
-        Returns:
-            None: None
+class HsmsSsControlMessage(HsmsSsMessage):
 
-        Examples:
-            if reply 'S1F18 <B 0x0>.',
-            reply(2, 18, False, ('B', [0x0]))
-        """
-        return self._send(
-            strm, func, wbit,
-            self._create_secs2body(secs2body),
-            primary.system_bytes,
-            self.device_id)
+    __slots__ = ()
 
-    def reply_sml(self, primary, sml_str):
-        """Send reply message by SML
+    # 4-bytes-length of control message frame
+    _FRAME_LENGTH_BYTES = bytes([0x00, 0x00, 0x00, 0x0A])
 
-        Args:
-            primary (SecsMessage): Primary-Message
-            sml_str (str): SML-String
+    # control type -> pre-encoded header before system-bytes
+    _HEADER_PREFIXES = dict([
+        (x, bytes([0xFF, 0xFF, 0x00, 0x00, x[0], x[1]]))
+        for x in (
+            HsmsSsControlType.SELECT_REQ, HsmsSsControlType.SELECT_RSP,
+            HsmsSsControlType.DESELECT_REQ, HsmsSsControlType.DESELECT_RSP,
+            HsmsSsControlType.LINKTEST_REQ, HsmsSsControlType.LINKTEST_RSP,
+            HsmsSsControlType.REJECT_REQ,
+            HsmsSsControlType.SEPARATE_REQ)])
 
-        Raises:
-            SecsCommunicatorError: if communicator not opened.
-            SecsSendMessageError: if send failed.
-            Secs2BodySmlParseError: if Secs2body parse failed.
-            SmlParseError: if SML parse failed.
+    def __init__(self, system_bytes, control_type):
+        super(HsmsSsControlMessage, self).__init__(0, 0, False, None, system_bytes, control_type)
 
-        Returns:
-            None: None
-        """
-        strm, func, wbit, s2b = SmlParser.parse(sml_str)
-        return self.reply(
-            primary,
-            strm, func, wbit,
-            self._create_secs2body(s2b))
+    CONTROL_DEVICE_ID = -1
 
-    def _create_system_bytes(self):
-        self._sys_num = (self._sys_num + 1) & 0xFFFF
-        n = self._sys_num
-        d = self.device_id if self.is_equip else 0
-        return bytes([
-            (d >> 8) & 0x7F,
-            d & 0xFF,
-            (n >> 8) & 0xFF,
-            n & 0xFF
-        ])
+    def _device_id(self):
+        return self.CONTROL_DEVICE_ID
 
-    @staticmethod
-    def _create_secs2body(v):
+    def _header10bytes(self):
+        v = self._get_cache('header10bytes')
         if v is None:
-            return None
-        elif isinstance(v, AbstractSecs2Body):
-            return v
-        else:
-            tt = type(v)
-            if (tt is list or tt is tuple) and len(v) == 2:
-                return Secs2BodyBuilder.build(v[0], v[1])
-            else:
-                raise TypeError('Secs2Body is tuple or list, and length == 2')
-
-    def _send(self, strm, func, wbit, secs2body, system_bytes, device_id):
-        """prototype-pattern send
+            prefix = self._HEADER_PREFIXES.get(self._control_type)
+            if prefix is None:
+                prefix = bytes([0xFF, 0xFF, 0x00, 0x00, self._control_type[0], self._control_type[1]])
+            v = self._set_cache('header10bytes', prefix + bytes(self._system_bytes))
 
-        Args:
-            strm (int): Stream-Number.
-            func (int): Function-Number.
-            wbit (bool): W-Bit.
-            secs2body (tuple or list or AbstractSecs2Body): SECS-II-body.
-            system_bytes (bytes): System-4-bytes.
-            device_id (int): Device-ID.
+        return v
 
-        Raises:
-            SecsCommunicatorError: if communicator not opened.
-            SecsSendMessageError: if send failed.
-            SecsWaitReplyError: if reply not received.
+    def _msg_length(self):
+        return 10
 
-        Returns:
-            SecsMessage: Reply-Message if exist, otherwise None
-        """
-        raise NotImplementedError()
+    def to_bytes(self):
+        v = self._get_cache('bytes')
+        if v is None:
+            v = self._set_cache('bytes', self._FRAME_LENGTH_BYTES + self._header10bytes())
+        return v
 
-    @staticmethod
-    def _is_single_args_listener(listener):
-        n = len(inspect.signature(listener).parameters)
-        return n == 1
+    def to_buffers(self):
+        return [self.to_bytes()]
 
-    def add_recv_primary_msg_listener(self, listener):
-        """Add receive-primary-message listener
+    @classmethod
+    def build_select_request(cls, system_bytes):
+        return HsmsSsControlMessage(system_bytes, HsmsSsControlType.SELECT_REQ)
 
-        If listener-arguments is 1, put receive-primary-message.
-        If listener-arguments is 2, put receive-primary-message and self-communicator-instance.
-        receive-primary-message is instance of `SecsMessage`.
-        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+    @classmethod
+    def build_select_response(cls, primary_msg, select_status):
+        ctrl_type = HsmsSsControlType.SELECT_RSP
+        sys_bytes = primary_msg.system_bytes
+        r = HsmsSsControlMessage(sys_bytes, ctrl_type)
+        r._set_cache('header10bytes', bytes([
+            0xFF, 0xFF,
+            0x00, select_status,
+            ctrl_type[0], ctrl_type[1],
+            sys_bytes[0], sys_bytes[1],
+            sys_bytes[2], sys_bytes[3]
+            ]))
+        return r
 
-        Args:
-            listener (function): listener
+    @classmethod
+    def build_linktest_request(cls, system_bytes):
+        return HsmsSsControlMessage(system_bytes, HsmsSsControlType.LINKTEST_REQ)
 
-        Returns:
-            None
-        """
-        self.__recv_primary_msg_lstnrs.append(listener)
+    @classmethod
+    def build_linktest_response(cls, primary_msg):
+        return HsmsSsControlMessage(
+            primary_msg.system_bytes,
+            HsmsSsControlType.LINKTEST_RSP)
 
-    def remove_recv_primary_msg_listener(self, listener):
-        """Remove receive-primary-message-listener.
+    @classmethod
+    def build_reject_request(cls, primary_msg, reject_reason):
+        ctrl_type = HsmsSsControlType.REJECT_REQ
+        h10bytes = primary_msg.header10bytes
+        b2 = h10bytes[4] if reject_reason == HsmsSsRejectReason.NOT_SUPPORT_TYPE_P else h10bytes[5]
+        sys_bytes = h10bytes[6:10]
+        r = HsmsSsControlMessage(sys_bytes, ctrl_type)
+        r._set_cache('header10bytes', bytes([
+            0xFF, 0xFF,
+            b2, reject_reason,
+            ctrl_type[0], ctrl_type[1],
+            sys_bytes[0], sys_bytes[1],
+            sys_bytes[2], sys_bytes[3]
+            ]))
+        return r
 
-        Args:
-            listener (function): Receive-Primary-Message-Listener
+    @classmethod
+    def build_separate_request(cls, system_bytes):
+        return HsmsSsControlMessage(system_bytes, HsmsSsControlType.SEPARATE_REQ)
+
+
+class Secs1MessageParseError(SecsMessageParseError):
+
+    def __init__(self, msg):
+        super(Secs1MessageParseError, self).__init__(msg)
+
+
+class Secs1Message(SecsMessage):
+
+    __slots__ = ('_system_bytes', '__device_id', '__rbit')
+
+    def __init__(self, strm, func, wbit, secs2body, system_bytes, device_id, rbit):
+        super(Secs1Message, self).__init__(strm, func, wbit, secs2body)
+        self._system_bytes = system_bytes
+        self.__device_id = int(device_id)
+        self.__rbit = bool(rbit)
+
+    def __str__(self):
+        v = self._get_text_cache('str')
+        if v is None:
+            vv = [
+                self.get_header10bytes_str(),
+                self._STR_LINESEPARATOR,
+                'S', str(self.strm),
+                'F', str(self.func)
+            ]
+            if self.wbit:
+                vv.append(' W')
+            if self.secs2body is not None:
+                vv.append(self._STR_LINESEPARATOR)
+                vv.append(self._str_body())
+            vv.append('.')
+            v = self._set_text_cache('str', ''.join(vv))
+        return v
+
+    def __repr__(self):
+        v = self._get_text_cache('repr')
+        if v is None:
+            vv = [
+                "{'header':", str(self._header10bytes()),
+                ",'strm':", str(self.strm),
+                ",'func':", str(self.func),
+                ",'wbit':", str(self.wbit)
+            ]
+            if self.secs2body is not None:
+                vv.append(",'secs2body':")
+                vv.append(repr(self.secs2body))
+            vv.append("}")
+            v = self._set_text_cache('repr', ''.join(vv))
+        return v
+
+    def _header10bytes(self):
+        v = self._get_cache('header10bytes')
+        if v is None:
+            b0 = (self.device_id >> 8) & 0x7F
+            if self.rbit:
+                b0 |= 0x80
+            b1 = self.device_id & 0xFF
+            b2 = self.strm & 0x7F
+            if self.wbit:
+                b2 |= 0x80
+            b3 = self.func & 0xFF
+            v = self._set_cache('header10bytes', bytes([
+                b0, b1,
+                b2, b3,
+                0x00, 0x00,
+                self._system_bytes[0], self._system_bytes[1],
+                self._system_bytes[2], self._system_bytes[3]
+            ]))
+        return v
+
+    def _device_id(self):
+        return self.__device_id
+
+    @property
+    def rbit(self):
+        pass
+
+    @rbit.getter
+    def rbit(self):
+        return self.__rbit
+
+    # max body bytes per block
+    _BLOCK_BODY_SIZE = 244
+
+    def __getstate__(self):
+        # blocks are memoryviews of received buffer, built again from body
+        state = super(Secs1Message, self).__getstate__()
+        c = state.get('_cache')
+        if c is not None:
+            c.pop('blocks', None)
+        return state
+
+    def to_blocks(self):
+        """SECS-I blocks getter.
+
+        All blocks are encoded into one buffer, and each block is a read-only memoryview of it.
+        Body is encoded directly at each block body position, without intermediate body buffer.
+
+        Raises:
+            Secs1MessageParseError: if blocks overflow.
 
         Returns:
-            None
+            tuple: Secs1MessageBlock
         """
-        self.__recv_primary_msg_lstnrs.remove(listener)
+        v = self._get_cache('blocks')
 
-    def _put_recv_primary_msg(self, recv_msg):
-        if recv_msg is not None:
-            for ls in self.__recv_primary_msg_lstnrs:
-                if self._is_single_args_listener(ls):
-                    ls(recv_msg)
-                else:
-                    ls(recv_msg, self)
+        if v is None:
 
-    def add_recv_all_msg_listener(self, listener):
-        """Add receive-all-message listener
+            h10bs = self._header10bytes()
+            body_len = 0 if self.secs2body is None else self.secs2body.get_encoded_size()
 
-        receive-all-message is Primary and Reply Messages.
-        If listener-arguments is 1, put receive-all-message.
-        If listener-arguments is 2, put receive-all-message and self-communicator-instance.
-        receive-all-message is instance of `SecsMessage`.
-        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+            size = self._BLOCK_BODY_SIZE
+            n = max(1, (body_len + size - 1) // size)
+
+            if n > 0x7FFF:
+                raise Secs1MessageParseError("blocks overflow")
+
+            # [length-byte, 10-bytes-header, body, 2-bytes-sum] * n
+            buf = bytearray(body_len + n * 13)
 
+            if body_len > 0:
+                self.secs2body.encode_into(_Secs1BlocksBodyWriter(buf), 0)
+
+            h_sum = sum(h10bs) - h10bs[4] - h10bs[5]
+            view = memoryview(buf).toreadonly()
+            blocks = []
+            p = 0
+
+            for i in range(n):
+                pos = i * size
+                shift = min(size, body_len - pos)
+                num = i + 1
+                b4 = ((num >> 8) & 0x7F) | (0x80 if num == n else 0x00)
+                b5 = num & 0xFF
+
+                buf[p] = shift + 10
+                buf[(p + 1):(p + 11)] = h10bs
+                buf[p + 5] = b4
+                buf[p + 6] = b5
+
+                x = h_sum + b4 + b5
+                q = p + 11
+                if shift > 0:
+                    x += sum(buf[q:(q + shift)])  # faster than sum of memoryview
+                    q += shift
+
+                buf[q] = (x >> 8) & 0xFF
+                buf[q + 1] = x & 0xFF
+                q += 2
+
+                blocks.append(Secs1MessageBlock(view[p:q]))
+                p = q
+
+            v = self._set_cache('blocks', tuple(blocks))
+
+        return v
+
+    @classmethod
+    def from_blocks(cls, blocks, lazy=False, cache_policy=None):
+        """Build from SECS-I blocks.
+
+        Body is decoded on first access to secs2body, header fields are available immediately.
 
         Args:
-            listener (function): Receive-All-Message-Listener
+            blocks (list): Secs1MessageBlock
+            lazy (bool): True if decode L items of body lazily. Defaults to False.
+            cache_policy (Secs2BodyCachePolicy): cache policy of body. Defaults to Secs2BodyBuilder.cache_policy.
+
+        Raises:
+            Secs1MessageParseError: if blocks is empty.
 
         Returns:
-            None
+            Secs1Message: message
         """
-        self.__recv_all_msg_lstnrs.append(listener)
 
-    def remove_recv_all_msg_listener(self, listener):
-        """Remove receive-all-message-listener.
+        if blocks is None or len(blocks) == 0:
+            raise Secs1MessageParseError("No blocks")
 
-        Args:
-            listener (function): Receive-All-Message-Listener
+        bs = b''.join([x._get_body_part() for x in blocks])
+
+        v = Secs1Message(
+            blocks[0].strm,
+            blocks[0].func,
+            blocks[0].wbit,
+            None,
+            blocks[0].get_system_bytes(),
+            blocks[0].device_id,
+            blocks[0].rbit
+        )
+        v._set_secs2body_source(bs, lazy, cache_policy)
+        v._set_cache('blocks', tuple(blocks))
+        return v
+
+
+class _Secs1BlocksBodyWriter:
+    """Writable buffer of body bytes, mapped to body position of each block in blocks buffer.
+
+    Supports index and slice assignment, as Secs2Body.encode_into writes.
+    """
+
+    # [length-byte, 10-bytes-header, 244-bytes-body, 2-bytes-sum]
+    _BLOCK_BODY_SIZE = 244
+    _BLOCK_SIZE = 257
+
+    # __lo, __hi is body range of present block, __d is shift to blocks buffer position
+    __slots__ = ('__buf', '__lo', '__hi', '__d')
+
+    def __init__(self, buf):
+        self.__buf = buf
+        self.__seek(0)
+
+    def __seek(self, pos):
+        q = pos // self._BLOCK_BODY_SIZE
+        self.__lo = q * self._BLOCK_BODY_SIZE
+        self.__hi = self.__lo + self._BLOCK_BODY_SIZE
+        self.__d = q * self._BLOCK_SIZE + 11 - self.__lo
+
+    def __setitem__(self, key, value):
+        if type(key) is slice:
+            start = key.start
+            end = key.stop
+            if start < self.__lo or start >= self.__hi:
+                self.__seek(start)
+            if end <= self.__hi:    # in one block
+                d = self.__d
+                self.__buf[(start + d):(end + d)] = value
+                return
+            v = memoryview(value).cast('B')
+            i = -start
+            while start < end:
+                if start >= self.__hi:
+                    self.__seek(start)
+                n = min(self.__hi, end)
+                d = self.__d
+                self.__buf[(start + d):(n + d)] = v[(start + i):(n + i)]
+                start = n
+        else:
+            if key < self.__lo or key >= self.__hi:
+                self.__seek(key)
+            self.__buf[key + self.__d] = value
+
+
+class Secs1MessageBlock:
+
+    # __bytes is bytes, or read-only memoryview of blocks buffer
+    __slots__ = ('__bytes', '__cache_str', '__cache_repr')
+
+    def __init__(self, block_bytes):
+        self.__bytes = block_bytes
+        self.__cache_str = None
+        self.__cache_repr = None
+
+    def __str__(self):
+        if self.__cache_str is None:
+            self.__cache_str = (
+                '[' + '{:02X}'.format(self.__bytes[1])
+                + ' ' + '{:02X}'.format(self.__bytes[2])
+                + '|' + '{:02X}'.format(self.__bytes[3])
+                + ' ' + '{:02X}'.format(self.__bytes[4])
+                + '|' + '{:02X}'.format(self.__bytes[5])
+                + ' ' + '{:02X}'.format(self.__bytes[6])
+                + '|' + '{:02X}'.format(self.__bytes[7])
+                + ' ' + '{:02X}'.format(self.__bytes[8])
+                + ' ' + '{:02X}'.format(self.__bytes[9])
+                + ' ' + '{:02X}'.format(self.__bytes[10])
+                + '] length: ' + str(self.__bytes[0])
+                )
+        return self.__cache_str
+
+    def __repr__(self):
+        if self.__cache_repr is None:
+            self.__cache_repr = str(self.to_bytes())
+        return self.__cache_repr
+
+    def to_bytes(self):
+        bs = self.__bytes
+        return bs if type(bs) is bytes else bytes(bs)
+
+    def to_memoryview(self):
+        """Block bytes getter without copy.
 
         Returns:
-            None
+            memoryview: read-only block bytes.
         """
-        self.__recv_all_msg_lstnrs.remove(listener)
+        return memoryview(self.__bytes)
 
-    def _put_recv_all_msg(self, recv_msg):
-        if recv_msg is not None:
-            for ls in self.__recv_all_msg_lstnrs:
-                if self._is_single_args_listener(ls):
-                    ls(recv_msg)
-                else:
-                    ls(recv_msg, self)
+    def _get_body_part(self):   # body bytes-like of this block without copy
+        return self.__bytes[11:-2]
 
-    def add_sended_msg_listener(self, listener):
-        """Add sended-message-listener.
+    @staticmethod
+    def _is_valid_sum(bb):  # bb is block bytes or list of ints
+        return ((sum(bb) - bb[0] - bb[-2] - bb[-1]) & 0xFFFF) == ((bb[-2] << 8) | bb[-1])
 
-        If listener-arguments is 1, put sended-message.
-        If listener-arguments is 2, put sended-message and self-communicator-instance.
-        sended-message is instance of `SecsMessage`.
-        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+    @property
+    def device_id(self):
+        pass
 
-        Args:
-            listener (function): Sended-Message-Listener
+    @device_id.getter
+    def device_id(self):
+        """Device-ID getter
 
         Returns:
-            None
+            int: Device-ID
         """
-        self.__sended_msg_lstnrs.append(listener)
+        bs = self.__bytes[1:3]
+        return ((bs[0] << 8) & 0x7F00) | bs[1]
 
-    def remove_sended_msg_listener(self, listener):
-        """Remove sended-message-listener.
+    @property
+    def strm(self):
+        pass
 
-        Args:
-            listener (function): Sended-Message-Listener
+    @strm.getter
+    def strm(self):
+        """Stream-Number getter.
 
         Returns:
-            None
+            int: Stream-Number
         """
-        self.__sended_msg_lstnrs.remove(listener)
+        return self.__bytes[3] & 0x7F
 
-    def _put_sended_msg(self, sended_msg):
-        if sended_msg is not None:
-            for ls in self.__sended_msg_lstnrs:
-                if self._is_single_args_listener(ls):
-                    ls(sended_msg)
-                else:
-                    ls(sended_msg, self)
+    @property
+    def func(self):
+        pass
+
+    @func.getter
+    def func(self):
+        """Function-Number getter.
+
+        Returns:
+            int: Function-Number
+        """
+        return self.__bytes[4]
+
+    @property
+    def rbit(self):
+        pass
+
+    @rbit.getter
+    def rbit(self):
+        """R-Bit getter
+
+        Returns:
+            bool: True if has R-Bit
+        """
+        return (self.__bytes[1] & 0x80) == 0x80
+
+    @property
+    def wbit(self):
+        pass
+
+    @wbit.getter
+    def wbit(self):
+        """W-Bit getter
+
+        Returns:
+            bool: True if has W-Bit
+        """
+        return (self.__bytes[3] & 0x80) == 0x80
+
+    @property
+    def ebit(self):
+        pass
+
+    @ebit.getter
+    def ebit(self):
+        """E-Bit getter.
+
+        Returns:
+            bool: True if has E-Bit
+        """
+        return (self.__bytes[5] & 0x80) == 0x80
+
+    def get_block_number(self):
+        bs = self.__bytes[5:7]
+        return ((bs[0] << 8) & 0x7F00) | bs[1]
+
+    def get_system_bytes(self):
+        return bytes(self.__bytes[7:11])
+
+    def is_next_block(self, block):
+        bs = block.to_memoryview()
+        return (
+            bs[1] == self.__bytes[1]
+            and bs[2] == self.__bytes[2]
+            and bs[3] == self.__bytes[3]
+            and bs[4] == self.__bytes[4]
+            and bs[7] == self.__bytes[7]
+            and bs[8] == self.__bytes[8]
+            and bs[9] == self.__bytes[9]
+            and bs[10] == self.__bytes[10]
+            and block.get_block_number() == (self.get_block_number() + 1)
+        )
+
+    def is_same_block(self, block):
+        bs = block.to_memoryview()
+        return (
+            bs[1] == self.__bytes[1]
+            and bs[2] == self.__bytes[2]
+            and bs[3] == self.__bytes[3]
+            and bs[4] == self.__bytes[4]
+            and bs[5] == self.__bytes[5]
+            and bs[6] == self.__bytes[6]
+            and bs[7] == self.__bytes[7]
+            and bs[8] == self.__bytes[8]
+            and bs[9] == self.__bytes[9]
+            and bs[10] == self.__bytes[10]
+        )
+
+
+class SecsCommunicatorError(Exception):
+
+    def __init__(self, msg):
+        super(SecsCommunicatorError, self).__init__(msg)
+
+    def __str__(self):
+        return repr(self)
+
+
+class SecsWithReferenceMessageError(SecsCommunicatorError):
+
+    def __init__(self, msg, ref_msg):
+        super(SecsWithReferenceMessageError, self).__init__(msg)
+        self._msg = msg
+        self._ref_msg = ref_msg
+
+    def get_reference_message(self):
+        return self._ref_msg
+
+    def __str__(self):
+        return (self.__class__.__name__ + '('
+                + repr(self._msg) + ','
+                + self._ref_msg.get_header10bytes_str()
+                + ')')
+
+    def __repr__(self):
+        return (self.__class__.__name__ + '('
+                + repr(self._msg) + ','
+                + repr(self._ref_msg.header10bytes)
+                + ')')
+
+
+class SecsSendMessageError(SecsWithReferenceMessageError):
+
+    def __init__(self, msg, ref_msg):
+        super(SecsSendMessageError, self).__init__(msg, ref_msg)
+
+
+class SecsWaitReplyMessageError(SecsWithReferenceMessageError):
+
+    def __init__(self, msg, ref_msg):
+        super(SecsWaitReplyMessageError, self).__init__(msg, ref_msg)
+
+
+class AbstractQueuing:
+
+    def __init__(self):
+        self.__terminated = False
+        self._vv = list()
+        self._v_cdt = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self):
+        with self._v_cdt:
+            self.__terminated = True
+            self._v_cdt.notify_all()
+
+    def _is_terminated(self):
+        with self._v_cdt:
+            return self.__terminated
+
+    def await_termination(self, timeout=None):
+        with self._v_cdt:
+            return self._v_cdt.wait_for(self._is_terminated, timeout)
+
+    def put(self, value):
+        with self._v_cdt:
+            if value is not None and not self._is_terminated():
+                self._vv.append(value)
+                self._v_cdt.notify_all()
+
+    def puts(self, values):
+        with self._v_cdt:
+            if values and not self._is_terminated():
+                self._vv.extend([v for v in values])
+                self._v_cdt.notify_all()
+
+    def _poll_vv(self):
+        with self._v_cdt:
+            if self._vv:
+                return self._vv.pop(0)
+            else:
+                return None
+
+    def _has_vv(self):
+        with self._v_cdt:
+            return bool(self._vv)
+
+    def _wait_vv(self, timeout):
+        # wait until value or terminated, not return by notify of other reason
+        self._v_cdt.wait_for(
+            (lambda: self._is_terminated() or self._has_vv()),
+            timeout)
+
+
+class CallbackQueuing(AbstractQueuing):
+
+    def __init__(self, callback):
+        super(CallbackQueuing, self).__init__()
+        self._cb = callback
+
+        def _f():
+            while True:
+                # callback out of lock, callback may wait for other putters
+                with self._v_cdt:
+                    v = self._poll_vv()
+                    while v is None and not self._is_terminated():
+                        self._v_cdt.wait()
+                        v = self._poll_vv()
+
+                if v is None:
+                    self._cb(None)
+                    return
+
+                self._cb(v)
+
+        threading.Thread(target=_f, daemon=True).start()
+
+
+class WaitingQueuing(AbstractQueuing):
+
+    def __init__(self):
+        super(WaitingQueuing, self).__init__()
+
+    def poll(self, timeout=None):
+
+        with self._v_cdt:
+
+            if self._is_terminated():
+                return None
+
+            v = self._poll_vv()
+            if v is not None:
+                return v
+
+            self._wait_vv(timeout)
+
+            if self._is_terminated():
+                return None
+
+            return self._poll_vv()
+
+    def put_to_list(self, values, pos, size, timeout=None):
+
+        def _f(vv, p, m):
+            vv_size = len(self._vv)
+            if vv_size > 0:
+                r = m - p
+                if vv_size > r:
+                    vv.extend(self._vv[0:r])
+                    del self._vv[0:r]
+                    return r
+                else:
+                    vv.extend(self._vv)
+                    self._vv.clear()
+                    return vv_size
+            else:
+                return -1
+
+        with self._v_cdt:
+
+            if self._is_terminated():
+                return -1
+
+            rr = _f(values, pos, size)
+            if rr > 0:
+                return rr
+
+            self._wait_vv(timeout)
+
+            if self._is_terminated():
+                return -1
+
+            return _f(values, pos, size)
+
+
+class TimeoutTimer:
+    """Runs callbacks at deadlines on one thread.
+
+    Thread is started on first schedule. Used for timeouts of many transactions in flight.
+    """
+
+    def __init__(self):
+        self.__heap = list()
+        self.__seq = 0
+        self.__cancelled = 0
+        self.__cdt = threading.Condition()
+        self.__terminated = False
+        self.__th = None
+
+    def schedule(self, timeout, callback):
+        """Schedule callback.
+
+        Args:
+            timeout (float): seconds.
+            callback (function): called without arguments on timer thread.
+
+        Returns:
+            list: entry to cancel.
+        """
+        with self.__cdt:
+            self.__seq += 1
+            entry = [time.monotonic() + timeout, self.__seq, callback]
+            heapq.heappush(self.__heap, entry)
+
+            if self.__th is None:
+                self.__th = threading.Thread(target=self.__loop, daemon=True)
+                self.__th.start()
+
+            # wake timer thread only if earliest deadline changed
+            if self.__heap[0] is entry:
+                self.__cdt.notify_all()
+
+            return entry
+
+    def cancel(self, entry):
+        with self.__cdt:
+            if entry[2] is not None:
+                entry[2] = None
+                self.__cancelled += 1
+
+                # drop cancelled entries if majority
+                if self.__cancelled > 1024 and self.__cancelled * 2 > len(self.__heap):
+                    self.__heap = [x for x in self.__heap if x[2] is not None]
+                    heapq.heapify(self.__heap)
+                    self.__cancelled = 0
+
+    def shutdown(self):
+        with self.__cdt:
+            self.__terminated = True
+            del self.__heap[:]
+            self.__cdt.notify_all()
+
+    def __loop(self):
+        while True:
+            with self.__cdt:
+                while True:
+                    if self.__terminated:
+                        return
+
+                    if self.__heap:
+                        t = self.__heap[0][0] - time.monotonic()
+                        if t <= 0.0:
+                            cb = heapq.heappop(self.__heap)[2]
+                            if cb is not None:
+                                break
+                            self.__cancelled -= 1
+                            continue
+                    else:
+                        t = None
+
+                    self.__cdt.wait(t)
+
+            cb()
+
+
+class AbstractSecsCommunicator:
+
+    __DEFAULT_TIMEOUT_T1 = 1.0
+    __DEFAULT_TIMEOUT_T2 = 15.0
+    __DEFAULT_TIMEOUT_T3 = 45.0
+    __DEFAULT_TIMEOUT_T4 = 45.0
+    __DEFAULT_TIMEOUT_T5 = 10.0
+    __DEFAULT_TIMEOUT_T6 = 5.0
+    __DEFAULT_TIMEOUT_T7 = 10.0
+    __DEFAULT_TIMEOUT_T8 = 5.0
+
+    def __init__(self, device_id, is_equip, **kwargs):
+
+        self.__gem = Gem(self)
+
+        self.device_id = device_id
+        self.is_equip = is_equip
+
+        self.name = kwargs.get('name', None)
+        self.timeout_t1 = kwargs.get('timeout_t1', self.__DEFAULT_TIMEOUT_T1)
+        self.timeout_t2 = kwargs.get('timeout_t2', self.__DEFAULT_TIMEOUT_T2)
+        self.timeout_t3 = kwargs.get('timeout_t3', self.__DEFAULT_TIMEOUT_T3)
+        self.timeout_t4 = kwargs.get('timeout_t4', self.__DEFAULT_TIMEOUT_T4)
+        self.timeout_t5 = kwargs.get('timeout_t5', self.__DEFAULT_TIMEOUT_T5)
+        self.timeout_t6 = kwargs.get('timeout_t6', self.__DEFAULT_TIMEOUT_T6)
+        self.timeout_t7 = kwargs.get('timeout_t7', self.__DEFAULT_TIMEOUT_T7)
+        self.timeout_t8 = kwargs.get('timeout_t8', self.__DEFAULT_TIMEOUT_T8)
+
+        self.lazy_decode = kwargs.get('lazy_decode', False)
+        self.cache_policy = kwargs.get('cache_policy', None)
+
+        self.__in_flight = 0
+        self.__in_flight_queue = collections.deque()
+        self.__in_flight_lock = threading.Lock()
+        self.__in_flight_closed = False
+        self.__in_flight_sender = None
+        self.max_in_flight = kwargs.get('max_in_flight', None)
+
+        gem_mdln = kwargs.get('gem_mdln', None)
+        if gem_mdln is not None:
+            self.gem.mdln = gem_mdln
+
+        gem_softrev = kwargs.get('gem_softrev', None)
+        if gem_softrev is not None:
+            self.gem.softrev = gem_softrev
+
+        gem_clock_type = kwargs.get('gem_clock_type', None)
+        if gem_clock_type is not None:
+            self.gem.clock_type = gem_clock_type
+
+        self._sys_num = 0
+
+        self.__communicating = False
+        self.__comm_cdt = threading.Condition()
+
+        self.__recv_primary_msg_lstnrs = list()
+        self.__communicate_lstnrs = list()
+        self.__error_lstnrs = list()
+        self.__recv_all_msg_lstnrs = list()
+        self.__sended_msg_lstnrs = list()
+
+        recv_pri_msg_lstnr = kwargs.get('recv_primary_msg', None)
+        if recv_pri_msg_lstnr is not None:
+            self.add_recv_primary_msg_listener(recv_pri_msg_lstnr)
+
+        err_lstnr = kwargs.get('error', None)
+        if err_lstnr is not None:
+            self.add_error_listener(err_lstnr)
+
+        comm_lstnr = kwargs.get('communicate', None)
+        if comm_lstnr is not None:
+            self.add_communicate_listener(comm_lstnr)
+
+        self.__opened = False
+        self.__closed = False
+        self._open_close_rlock = threading.RLock()
+
+    @property
+    def gem(self):
+        pass
+
+    @gem.getter
+    def gem(self):
+        """GEM getter
+
+        Returns:
+            Gem: GEM-instance
+        """
+        return self.__gem
+
+    @property
+    def device_id(self):
+        pass
+
+    @device_id.getter
+    def device_id(self):
+        """Device-ID getter.
+
+        Returns:
+            int: Device-ID
+        """
+        return self.__device_id
+
+    @device_id.setter
+    def device_id(self, val):
+        """Device-ID setter.
+
+        Args:
+            val (int): Device_ID
+        """
+        self.__device_id = val
+
+    @property
+    def is_equip(self):
+        pass
+
+    @is_equip.setter
+    def is_equip(self, val):
+        """is-Equipment setter.
+
+        Args:
+            val (bool): is-Equipment
+        """
+        self.__is_equip = bool(val)
+
+    @is_equip.getter
+    def is_equip(self):
+        """is-Equipment getter.
+
+        Returns:
+            bool: True if Equipment
+        """
+        return self.__is_equip
+
+    @property
+    def name(self):
+        pass
+
+    @name.setter
+    def name(self, val):
+        """Communicator-Name setter.
+
+        Args:
+            val (str or None): Communicator-Name
+        """
+        self.__name = val if val is None else str(val)
+
+    @name.getter
+    def name(self):
+        """Communicator-Name getter.
+
+        Returns:
+            str: Communicator-Name
+        """
+        return self.__name
+
+    @property
+    def lazy_decode(self):
+        pass
+
+    @lazy_decode.setter
+    def lazy_decode(self, val):
+        """lazy-decode setter.
+
+        If True, L items of received message are decoded on first access.
+
+        Args:
+            val (bool): lazy-decode
+        """
+        self.__lazy_decode = bool(val)
+
+    @lazy_decode.getter
+    def lazy_decode(self):
+        """lazy-decode getter.
+
+        Returns:
+            bool: True if decode received message lazily
+        """
+        return self.__lazy_decode
+
+    @property
+    def cache_policy(self):
+        pass
+
+    @cache_policy.setter
+    def cache_policy(self, val):
+        """Cache policy setter.
+
+        Applied to bodies of received messages, and bodies built from tuple or bytes on send.
+
+        Args:
+            val (Secs2BodyCachePolicy): cache policy, None if Secs2BodyBuilder.cache_policy
+        """
+        if val is not None and not isinstance(val, Secs2BodyCachePolicy):
+            raise TypeError("Require Secs2BodyCachePolicy")
+        self.__cache_policy = val
+
+    @cache_policy.getter
+    def cache_policy(self):
+        """Cache policy getter.
+
+        Returns:
+            Secs2BodyCachePolicy: cache policy, None if Secs2BodyBuilder.cache_policy
+        """
+        return self.__cache_policy
+
+    @property
+    def max_in_flight(self):
+        pass
+
+    @max_in_flight.setter
+    def max_in_flight(self, val):
+        """Max in-flight transactions of send_async setter.
+
+        Transactions beyond max are queued, and sent when in-flight transaction is done.
+
+        Args:
+            val (int): max in-flight transactions, None if not limit
+
+        Raises:
+            ValueError: if value is less than 1.
+        """
+        if val is not None:
+            val = int(val)
+            if val < 1:
+                raise ValueError("max_in_flight require >= 1")
+        self.__max_in_flight = val
+
+    @max_in_flight.getter
+    def max_in_flight(self):
+        """Max in-flight transactions of send_async getter.
+
+        Returns:
+            int: max in-flight transactions, None if not limit
+        """
+        return self.__max_in_flight
+
+    @staticmethod
+    def _try_gt_zero(v):
+        """test-set-timeout-tx
+
+        Args:
+            v (int or float): timeout-time-seconds.
+
+        Raises:
+            TypeError: raise if v is None.
+            ValueError: raise if v is not greater than 0.0.
+
+        Returns:
+            float: tested value
+        """
+        if v is None:
+            raise TypeError("Timeout-value require not None")
+        if v > 0.0:
+            return float(v)
+        else:
+            raise ValueError("Timeout-value require > 0.0")
+
+    @property
+    def timeout_t1(self):
+        pass
+
+    @timeout_t1.getter
+    def timeout_t1(self):
+        """Timeout-T1 getter.
+
+        Returns:
+            float: Timeout-T1
+        """
+        return self.__timeout_t1
+
+    @timeout_t1.setter
+    def timeout_t1(self, val):
+        """Timeout-T1 setter.
+
+        Args:
+            val (int or float): Timeout-T1 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t1 = self._try_gt_zero(val)
+
+    @property
+    def timeout_t2(self):
+        pass
+
+    @timeout_t2.getter
+    def timeout_t2(self):
+        """Timeout-T2 getter.
+
+        Returns:
+            float: Timeout-T2
+        """
+        return self.__timeout_t2
+
+    @timeout_t2.setter
+    def timeout_t2(self, val):
+        """Timeout-T2 setter.
+
+        Args:
+            val (int or float): Timeout-T2 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t2 = self._try_gt_zero(val)
+
+    @property
+    def timeout_t3(self):
+        pass
+
+    @timeout_t3.getter
+    def timeout_t3(self):
+        """Timeout-T3 getter.
+
+        Returns:
+            float: Timeout-T3
+        """
+        return self.__timeout_t3
+
+    @timeout_t3.setter
+    def timeout_t3(self, val):
+        """Timeout-T3 setter.
+
+        Args:
+            val (int or float): Timeout-T3 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t3 = self._try_gt_zero(val)
+
+    @property
+    def timeout_t4(self):
+        pass
+
+    @timeout_t4.getter
+    def timeout_t4(self):
+        """Timeout-T4 getter.
+
+        Returns:
+            float: Timeout-T4
+        """
+        return self.__timeout_t4
+
+    @timeout_t4.setter
+    def timeout_t4(self, val):
+        """Timeout-T4 setter.
+
+        Args:
+            val (int or float): Timeout-T4 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t4 = self._try_gt_zero(val)
+
+    @property
+    def timeout_t5(self):
+        pass
+
+    @timeout_t5.getter
+    def timeout_t5(self):
+        """Timeout-T5 getter.
+
+        Returns:
+            float: Timeout-T5
+        """
+        return self.__timeout_t5
+
+    @timeout_t5.setter
+    def timeout_t5(self, val):
+        """Timeout-T5 setter.
+
+        Args:
+            val (int or float): Timeout-T5 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t5 = self._try_gt_zero(val)
+
+    @property
+    def timeout_t6(self):
+        pass
+
+    @timeout_t6.getter
+    def timeout_t6(self):
+        """Timeout-T6 getter.
+
+        Returns:
+            float: Timeout-T6
+        """
+        return self.__timeout_t6
+
+    @timeout_t6.setter
+    def timeout_t6(self, val):
+        """Timeout-T6 setter.
+
+        Args:
+            val (int or float): Timeout-T6 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t6 = self._try_gt_zero(val)
+
+    @property
+    def timeout_t7(self):
+        pass
+
+    @timeout_t7.getter
+    def timeout_t7(self):
+        """Timeout-T7 getter.
+
+        Returns:
+            float: Timeout-T7
+        """
+        return self.__timeout_t7
+
+    @timeout_t7.setter
+    def timeout_t7(self, val):
+        """Timeout-T7 setter.
+
+        Args:
+            val (int or float): Timeout-T7 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t7 = self._try_gt_zero(val)
+
+    @property
+    def timeout_t8(self):
+        pass
+
+    @timeout_t8.getter
+    def timeout_t8(self):
+        """Timeout-T8 getter.
+
+        Returns:
+            float: Timeout-T8
+        """
+        return self.__timeout_t8
+
+    @timeout_t8.setter
+    def timeout_t8(self, val):
+        """Timeout-T8 setter.
+
+        Args:
+            val (int or float): Timeout-T8 value.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is not greater than 0.0.
+        """
+        self.__timeout_t8 = self._try_gt_zero(val)
+
+    def open(self):
+        """Open communicator
+        """
+        self._open()
+
+    def _open(self):
+        # prototype-pattern
+        raise NotImplementedError()
+
+    def close(self):
+        """Close communicator
+        """
+        self._close()
+
+    def _close(self):
+        # prototype-pattern
+        raise NotImplementedError()
+
+    def open_and_wait_until_communicating(self, timeout=None):
+
+        if not self.is_open:
+            self._open()
+
+        with self.__comm_cdt:
+
+            def _p():
+                return self.is_closed or self.is_communicating
+
+            r = self.__comm_cdt.wait_for(_p, timeout)
+            if r:
+                if self.is_closed:
+                    raise SecsCommunicatorError("Communicator closed")
+            return r
+
+    @property
+    def is_open(self):
+        pass
+
+    @is_open.getter
+    def is_open(self):
+        with self._open_close_rlock:
+            return self.__opened and not self.__closed
+
+    @property
+    def is_closed(self):
+        pass
+
+    @is_closed.getter
+    def is_closed(self):
+        with self._open_close_rlock:
+            return self.__closed
+
+    def _set_opened(self):
+        with self._open_close_rlock:
+            self.__opened = True
+
+    def _set_closed(self):
+        with self._open_close_rlock:
+            self.__closed = True
+            with self.__comm_cdt:
+                self.__comm_cdt.notify_all()
+
+        with self.__in_flight_lock:
+            self.__in_flight_closed = True
+            if self.__in_flight_sender is not None:
+                self.__in_flight_sender.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._close()
+
+    def __del__(self):
+        self._close()
+
+    def send(self, strm, func, wbit, secs2body=None):
+        """Send primary message
+
+        Args:
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            secs2body (tuple or list or AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
+
+        Raises:
+            SecsCommunicatorError: if communicator not opened.
+            SecsSendMessageError: if send failed.
+            SecsWaitReplyError: if reply not received.
+
+        Returns:
+            SecsMessage: Reply-Message if exist, otherwise None.
+
+        Examples:
+            if send 'S1F1 W.',
+            send(1, 1, True)
+
+            if send
+            'S5F1 W
+            <L
+              <B  0x01>
+              <U2 1001>
+              <A  "ON FIRE">
+            >.',
+            send(
+                5, 1, True,
+                ('L', [
+                    ('B', [0x01]),
+                    ('U2', [1001]),
+                    ('A', "ON FIRE")
+                ])
+                )
+        """
+        return self._send(
+            strm, func, wbit,
+            self._create_secs2body(secs2body),
+            self._create_system_bytes(),
+            self.device_id)
+
+    def send_sml(self, sml_str, values=None):
+        """Send primary message by SML
+
+        Parsed SML is cached by SmlParser.compile.
+
+        Args:
+            sml_str (str): SML-string, accept placeholders '<U4 $name>'.
+            values (tuple or list or dict): placeholder values in document order, or dict by name. Defaults to None.
+
+        Raises:
+            SecsCommunicatorError: if communicator not opened.
+            SecsSendMessageError: if send failed.
+            SecsWaitReplyError: if reply not received.
+            Secs2BodySmlParseError: if Secs2body parse failed.
+            SmlParseError: if SML parse failed.
+            ValueError: if values is invalid.
+
+        Returns:
+            SecsMessage: Reply-Message if exist, otherwise None.
+
+        Examples:
+            send_sml('S1F3 W <L <U4 $svid> >.', {'svid': 1001})
+        """
+        tmpl = SmlParser.compile(sml_str)
+        return self.send(tmpl.strm, tmpl.func, tmpl.wbit, tmpl.to_bytes(values))
+
+    def send_async(self, strm, func, wbit, secs2body=None):
+        """Send primary message without blocking.
+
+        Sent at once if in-flight transactions are less than max_in_flight, otherwise queued.
+        Future is resolved by receiving thread when reply received.
+
+        Args:
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            secs2body (tuple or list or AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
+
+        Returns:
+            concurrent.futures.Future: result is Reply-Message if exist, otherwise None.
+                exception is same as send.
+
+        Examples:
+            futures = [comm.send_async(1, 3, True, ('L', [('U4', [svid])])) for svid in svids]
+            replies = [f.result() for f in futures]
+        """
+        secs2body = self._create_secs2body(secs2body)
+
+        def _f():
+            return self._send_async(
+                strm, func, wbit,
+                secs2body,
+                self._create_system_bytes(),
+                self.device_id)
+
+        fut = concurrent.futures.Future()
+
+        with self.__in_flight_lock:
+            if self.__max_in_flight is None or self.__in_flight < self.__max_in_flight:
+                self.__in_flight += 1
+            else:
+                self.__in_flight_queue.append((_f, fut))
+                return fut
+
+        self.__run_in_flight(_f, fut)
+        return fut
+
+    def __run_in_flight(self, f, fut):
+        while f is not None:
+
+            if fut.set_running_or_notify_cancel():
+                try:
+                    inner = f()
+                except Exception as e:
+                    inner = concurrent.futures.Future()
+                    inner.set_exception(e)
+
+                if not inner.done():
+                    inner.add_done_callback(lambda x, outer=fut: self.__done_in_flight(x, outer))
+                    return
+
+                self.__set_future_result(inner, fut)
+
+            f, fut = self.__next_in_flight()
+
+    def __done_in_flight(self, inner, outer):
+        # called by thread resolving inner (receiving thread),
+        # queued transaction is sent by sender thread, not to block receiving.
+        # sender thread is created at first queued transaction sent.
+        self.__set_future_result(inner, outer)
+
+        f, fut = self.__next_in_flight()
+        if f is not None:
+            with self.__in_flight_lock:
+                if not self.__in_flight_closed:
+                    if self.__in_flight_sender is None:
+                        self.__in_flight_sender = CallbackQueuing(self.__send_queued_in_flight)
+                    self.__in_flight_sender.put((f, fut))
+                    return
+
+            # closed, fails without blocking
+            self.__run_in_flight(f, fut)
+
+    def __send_queued_in_flight(self, item):
+        if item is not None:
+            self.__run_in_flight(*item)
+
+    @staticmethod
+    def __set_future_result(inner, outer):
+        try:
+            outer.set_result(inner.result())
+        except Exception as e:
+            outer.set_exception(e)
+
+    def __next_in_flight(self):
+        with self.__in_flight_lock:
+            if self.__in_flight_queue and (
+                    self.__max_in_flight is None or self.__in_flight <= self.__max_in_flight):
+                return self.__in_flight_queue.popleft()
+            else:
+                self.__in_flight -= 1
+                return None, None
+
+    def send_many(self, messages, max_in_flight=None):
+        """Send primary messages pipelined, and wait all replies.
+
+        Args:
+            messages (iterable): SecsMessage, or tuple of (strm, func, wbit) or (strm, func, wbit, secs2body).
+            max_in_flight (int): max in-flight transactions. Defaults to None, max_in_flight of communicator.
+
+        Blocks calling thread, awaitable on asyncio communicators.
+
+        Raises:
+            ValueError: if max_in_flight is less than 1.
+
+        Returns:
+            list: Reply-Message or None or exception of each message, in order of messages.
+
+        Examples:
+            replies = comm.send_many(
+                [(1, 3, True, ('L', [('U4', [svid])])) for svid in svids],
+                max_in_flight=16)
+        """
+        n = self.max_in_flight if max_in_flight is None else int(max_in_flight)
+        if n is not None and n < 1:
+            raise ValueError("max_in_flight require >= 1")
+
+        it = iter(messages)
+        results = list()
+        pending = dict()
+        done_qq = WaitingQueuing()
+
+        while True:
+
+            batch = list()
+
+            while n is None or (len(pending) + len(batch)) < n:
+                try:
+                    m = next(it)
+                except StopIteration:
+                    break
+
+                results.append(None)
+
+                try:
+                    batch.append((len(results) - 1, self._create_send_args(m)))
+                except Exception as e:
+                    results[-1] = e
+
+            if batch:
+                futures = self._send_many_async([args for _, args in batch])
+                for (i, _), f in zip(batch, futures):
+                    pending[i] = f
+                    f.add_done_callback(lambda x, i=i: done_qq.put(i))
+
+            if not pending:
+                return results
+
+            # take all done, and refill by one batch
+            i = None
+            while i is None:
+                i = done_qq.poll()
+
+            while i is not None:
+                f = pending.pop(i)
+                try:
+                    results[i] = f.result()
+                except Exception as e:
+                    results[i] = e
+                i = done_qq.poll(0.0)
+
+    def _create_send_args(self, m):
+        if isinstance(m, SecsMessage):
+            strm, func, wbit, secs2body = m.strm, m.func, m.wbit, m.secs2body
+        else:
+            strm, func, wbit = m[0], m[1], m[2]
+            secs2body = self._create_secs2body(m[3] if len(m) > 3 else None)
+
+        return (
+            strm, func, wbit,
+            secs2body,
+            self._create_system_bytes(),
+            self.device_id)
+
+    def _send_many_async(self, args_list):
+        """prototype-pattern send messages without blocking
+
+        Default sends each by _send_async.
+
+        Args:
+            args_list (list): tuples of _send arguments.
+
+        Returns:
+            list: concurrent.futures.Future of each message.
+        """
+        return [self._send_async(*args) for args in args_list]
+
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        """prototype-pattern send without blocking
+
+        Default runs _send on new thread, one thread per outstanding transaction.
+        Subclasses override this to pipeline without threads.
+
+        Returns:
+            concurrent.futures.Future: result is Reply-Message if exist, otherwise None.
+        """
+        fut = concurrent.futures.Future()
+
+        def _f():
+            try:
+                fut.set_result(self._send(strm, func, wbit, secs2body, system_bytes, device_id))
+            except Exception as e:
+                fut.set_exception(e)
+
+        threading.Thread(target=_f, daemon=True).start()
+        return fut
+
+    def reply(self, primary, strm, func, wbit, secs2body=None):
+        """Send reply message
+
+        Args:
+            primary (SecsMessage): Primary-Message.
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool: W-Bit.
+            secs2body (tuple or list or AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
+
+        Raises:
+            SecsCommunicatorError: if communicator not opened.
+            SecsSendMessageError: if send failed.
+
+        Returns:
+            None: None
+
+        Examples:
+            if reply 'S1F18 <B 0x0>.',
+            reply(2, 18, False, ('B', [0x0]))
+        """
+        return self._send(
+            strm, func, wbit,
+            self._create_secs2body(secs2body),
+            primary.system_bytes,
+            self.device_id)
+
+    def reply_async(self, primary, strm, func, wbit, secs2body=None):
+        """Send reply message without blocking.
+
+        Not limited by max_in_flight.
+
+        Args:
+            primary (SecsMessage): Primary-Message.
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            secs2body (tuple or list or AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
+
+        Returns:
+            concurrent.futures.Future: result is None when sent.
+        """
+        return self._send_async(
+            strm, func, wbit,
+            self._create_secs2body(secs2body),
+            primary.system_bytes,
+            self.device_id)
+
+    def reply_sml(self, primary, sml_str, values=None):
+        """Send reply message by SML
+
+        Parsed SML is cached by SmlParser.compile.
+
+        Args:
+            primary (SecsMessage): Primary-Message
+            sml_str (str): SML-String, accept placeholders '<U4 $name>'.
+            values (tuple or list or dict): placeholder values in document order, or dict by name. Defaults to None.
+
+        Raises:
+            SecsCommunicatorError: if communicator not opened.
+            SecsSendMessageError: if send failed.
+            Secs2BodySmlParseError: if Secs2body parse failed.
+            SmlParseError: if SML parse failed.
+            ValueError: if values is invalid.
+
+        Returns:
+            None: None
+        """
+        tmpl = SmlParser.compile(sml_str)
+        return self.reply(
+            primary,
+            tmpl.strm, tmpl.func, tmpl.wbit,
+            tmpl.to_bytes(values))
+
+    def _create_system_bytes(self):
+        self._sys_num = (self._sys_num + 1) & 0xFFFF
+        n = self._sys_num
+        d = self.device_id if self.is_equip else 0
+        return bytes([
+            (d >> 8) & 0x7F,
+            d & 0xFF,
+            (n >> 8) & 0xFF,
+            n & 0xFF
+        ])
+
+    def _create_secs2body(self, v):
+        if v is None:
+            return None
+        elif isinstance(v, AbstractSecs2Body):
+            return v
+        elif isinstance(v, (bytes, bytearray, memoryview)):
+            bs = bytes(v)
+            try:
+                r = Secs2BodyBuilder.from_body_bytes(
+                    bs, lazy=True, cache_policy=self.cache_policy)
+
+                # lazy root is not decoded, item headers are checked to reach end
+                if r is not None and r.get_encoded_size() != len(bs):
+                    raise ValueError(
+                        "not reach bytes end, reach=" + str(r.get_encoded_size()) + ", length=" + str(len(bs)))
+
+                return r
+            except Secs2BodyParseError as e:
+                raise ValueError(e)
+        else:
+            tt = type(v)
+            if (tt is list or tt is tuple) and len(v) == 2:
+                r = Secs2BodyBuilder.build(v[0], v[1])
+                if self.cache_policy is not None:
+                    r.set_cache_policy(self.cache_policy)
+                return r
+            else:
+                raise TypeError('Secs2Body is tuple or list, and length == 2')
+
+    def _send(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        """prototype-pattern send
+
+        Args:
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            secs2body (tuple or list or AbstractSecs2Body): SECS-II-body.
+            system_bytes (bytes): System-4-bytes.
+            device_id (int): Device-ID.
+
+        Raises:
+            SecsCommunicatorError: if communicator not opened.
+            SecsSendMessageError: if send failed.
+            SecsWaitReplyError: if reply not received.
+
+        Returns:
+            SecsMessage: Reply-Message if exist, otherwise None
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def _is_single_args_listener(listener):
+        n = len(inspect.signature(listener).parameters)
+        return n == 1
+
+    def add_recv_primary_msg_listener(self, listener):
+        """Add receive-primary-message listener
+
+        If listener-arguments is 1, put receive-primary-message.
+        If listener-arguments is 2, put receive-primary-message and self-communicator-instance.
+        receive-primary-message is instance of `SecsMessage`.
+        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+
+        Args:
+            listener (function): listener
+
+        Returns:
+            None
+        """
+        self.__recv_primary_msg_lstnrs.append(listener)
+
+    def remove_recv_primary_msg_listener(self, listener):
+        """Remove receive-primary-message-listener.
+
+        Args:
+            listener (function): Receive-Primary-Message-Listener
+
+        Returns:
+            None
+        """
+        self.__recv_primary_msg_lstnrs.remove(listener)
+
+    def _put_recv_primary_msg(self, recv_msg):
+        if recv_msg is not None:
+            for ls in self.__recv_primary_msg_lstnrs:
+                if self._is_single_args_listener(ls):
+                    ls(recv_msg)
+                else:
+                    ls(recv_msg, self)
+
+    def add_recv_all_msg_listener(self, listener):
+        """Add receive-all-message listener
+
+        receive-all-message is Primary and Reply Messages.
+        If listener-arguments is 1, put receive-all-message.
+        If listener-arguments is 2, put receive-all-message and self-communicator-instance.
+        receive-all-message is instance of `SecsMessage`.
+        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+
+
+        Args:
+            listener (function): Receive-All-Message-Listener
+
+        Returns:
+            None
+        """
+        self.__recv_all_msg_lstnrs.append(listener)
+
+    def remove_recv_all_msg_listener(self, listener):
+        """Remove receive-all-message-listener.
+
+        Args:
+            listener (function): Receive-All-Message-Listener
+
+        Returns:
+            None
+        """
+        self.__recv_all_msg_lstnrs.remove(listener)
+
+    def _put_recv_all_msg(self, recv_msg):
+        if recv_msg is not None:
+            for ls in self.__recv_all_msg_lstnrs:
+                if self._is_single_args_listener(ls):
+                    ls(recv_msg)
+                else:
+                    ls(recv_msg, self)
+
+    def add_sended_msg_listener(self, listener):
+        """Add sended-message-listener.
+
+        If listener-arguments is 1, put sended-message.
+        If listener-arguments is 2, put sended-message and self-communicator-instance.
+        sended-message is instance of `SecsMessage`.
+        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+
+        Args:
+            listener (function): Sended-Message-Listener
+
+        Returns:
+            None
+        """
+        self.__sended_msg_lstnrs.append(listener)
+
+    def remove_sended_msg_listener(self, listener):
+        """Remove sended-message-listener.
+
+        Args:
+            listener (function): Sended-Message-Listener
+
+        Returns:
+            None
+        """
+        self.__sended_msg_lstnrs.remove(listener)
+
+    def _put_sended_msg(self, sended_msg):
+        if sended_msg is not None:
+            for ls in self.__sended_msg_lstnrs:
+                if self._is_single_args_listener(ls):
+                    ls(sended_msg)
+                else:
+                    ls(sended_msg, self)
+
+    def add_communicate_listener(self, listener):
+        """Add communicate-state-change-listener.
+
+        If listener-arguments is 1, put is-communicating.
+        If listener-arguments is 2, put is-communicating and self-communicator-instance.
+        is-communicating is True if self-communicator is communicate-state.
+        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+
+        Args:
+            listener (function): Communicate-State-Change-Listener
+
+        Returns:
+            None
+        """
+        with self.__comm_cdt:
+            self.__communicate_lstnrs.append(listener)
+            if self._is_single_args_listener(listener):
+                listener(self.__communicating)
+            else:
+                listener(self.__communicating, self)
+
+    def remove_communicate_listener(self, listener):
+        """Remove communicate-state-change-listener.
+
+        Args:
+            listener (function): Communicate-State-Change-Listener
+
+        Returns:
+            None
+        """
+        with self.__comm_cdt:
+            self.__communicate_lstnrs.remove(listener)
+
+    def _put_communicated(self, communicating):
+        with self.__comm_cdt:
+            if communicating != self.__communicating:
+                self.__communicating = communicating
+                for ls in self.__communicate_lstnrs:
+                    if self._is_single_args_listener(ls):
+                        ls(self.__communicating)
+                    else:
+                        ls(self.__communicating, self)
+                self.__comm_cdt.notify_all()
+
+    @property
+    def is_communicating(self):
+        pass
+
+    @is_communicating.getter
+    def is_communicating(self):
+        """is-communicating.
+
+        Returns:
+            True if Self-Communicator is communicating.
+        """
+        with self.__comm_cdt:
+            return self.__communicating
+
+    def add_error_listener(self, listener):
+        """Add error-listener.
+
+        If listener-arguments is 1, put error.
+        If listener-arguments is 2, put error and self-communicator-instance.
+        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+
+        Args:
+            listener (function): Error-Listener
+
+        Returns:
+            None
+        """
+        self.__error_lstnrs.append(listener)
+
+    def remove_error_listener(self, listener):
+        """Remove error-listener.
+
+        Args:
+            listener (function): Error-Listener
+
+        Returns:
+            None
+        """
+        self.__error_lstnrs.remove(listener)
+
+    def _put_error(self, e):
+        if e is not None:
+            for ls in self.__error_lstnrs:
+                if self._is_single_args_listener(ls):
+                    ls(e)
+                else:
+                    ls(e, self)
+
+
+class HsmsSsCommunicatorError(SecsCommunicatorError):
+
+    def __init__(self, msg):
+        super(HsmsSsCommunicatorError, self).__init__(msg)
+
+
+class HsmsSsSendMessageError(SecsSendMessageError):
+
+    def __init__(self, msg, ref_msg):
+        super(HsmsSsSendMessageError, self).__init__(msg, ref_msg)
+
+
+class HsmsSsWaitReplyMessageError(SecsWaitReplyMessageError):
+
+    def __init__(self, msg, ref_msg):
+        super(HsmsSsWaitReplyMessageError, self).__init__(msg, ref_msg)
+
+
+class HsmsSsTimeoutT3Error(HsmsSsWaitReplyMessageError):
+
+    def __init__(self, msg, ref_msg):
+        super(HsmsSsTimeoutT3Error, self).__init__(msg, ref_msg)
+
+
+class HsmsSsTimeoutT6Error(HsmsSsWaitReplyMessageError):
+
+    def __init__(self, msg, ref_msg):
+        super(HsmsSsTimeoutT6Error, self).__init__(msg, ref_msg)
+
+
+class HsmsSsRejectMessageError(HsmsSsWaitReplyMessageError):
+
+    def __init__(self, msg, ref_msg):
+        super(HsmsSsRejectMessageError, self).__init__(msg, ref_msg)
+
+
+class HsmsSsCommunicateState:
+
+    NOT_CONNECT = 'not_connect'
+    CONNECTED = 'connected'
+    SELECTED = 'selected'
+
+
+class SendReplyHsmsSsMessagePack:
+
+    def __init__(self, msg):
+        self.__msg = msg
+        self.__reply_msg_cdt = threading.Condition()
+        self.__reply_msg = None
+        self.__terminated = False
+
+    def shutdown(self):
+        with self.__reply_msg_cdt:
+            self.__terminated = True
+            self.__reply_msg_cdt.notify_all()
+
+    def __is_terminated(self):
+        with self.__reply_msg_cdt:
+            return self.__terminated
+
+    def get_system_bytes(self):
+        return self.__msg.system_bytes
+
+    def put_reply_msg(self, reply_msg):
+        with self.__reply_msg_cdt:
+            self.__reply_msg = reply_msg
+            self.__reply_msg_cdt.notify_all()
+
+    def wait_reply_msg(self, timeout):
+
+        with self.__reply_msg_cdt:
+
+            if self.__is_terminated():
+                return None
+
+            if self.__reply_msg is not None:
+                return self.__reply_msg
+
+            self.__reply_msg_cdt.wait(timeout)
+
+            return self.__reply_msg
+
+
+class SendReplyHsmsSsMessageFuturePack:
+    """Pack of sended message, resolves future by reply message, timeout or shutdown."""
+
+    def __init__(self, msg, future):
+        self.__msg = msg
+        self.__future = future
+        self.__lock = threading.Lock()
+
+    def __resolve(self, result=None, exception=None):
+        with self.__lock:
+            if self.__future.done():
+                return False
+            if exception is None:
+                self.__future.set_result(result)
+            else:
+                self.__future.set_exception(exception)
+            return True
+
+    def shutdown(self):
+        self.__resolve(exception=HsmsSsCommunicatorError("HsmsSsConnection terminated"))
+
+    def get_system_bytes(self):
+        return self.__msg.system_bytes
+
+    def put_reply_msg(self, reply_msg):
+        if reply_msg.get_control_type() == HsmsSsControlType.REJECT_REQ:
+            self.__resolve(exception=HsmsSsRejectMessageError("HsmsSs-Reject-Message", self.__msg))
+        else:
+            self.__resolve(result=reply_msg)
+
+    def put_except(self, e):
+        return self.__resolve(exception=e)
+
+
+class SendReplyHsmsSsMessagePackPool:
+
+    def __init__(self):
+        self.__pool = dict()
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self):
+        # packs are called out of lock, futures run callbacks on this thread
+        with self.__lock:
+            packs = list(self.__pool.values())
+        for pack in packs:
+            pack.shutdown()
+
+    def entry(self, pack):
+        with self.__lock:
+            self.__pool[pack.get_system_bytes()] = pack
+
+    def remove(self, pack):
+        with self.__lock:
+            key = pack.get_system_bytes()
+            if self.__pool.get(key, None) is pack:
+                del self.__pool[key]
+
+    def put_reply_msg(self, reply_msg):
+        with self.__lock:
+            pack = self.__pool.get(reply_msg.system_bytes, None)
+        if pack is None:
+            return False
+        else:
+            pack.put_reply_msg(reply_msg)
+            return True
+
+
+class HsmsSsFrameReader:
+    """HSMS-SS frame reader.
+
+    Receives socket bytes by recv_into to one growable buffer,
+    and cuts out each frame (4-bytes-length + 10-bytes-header + body) as one contiguous bytes.
+    """
+
+    __DEFAULT_BUFFER_SIZE = 65536
+
+    def __init__(self, sock, buffer_size=None):
+        self.__sock = sock
+        self.__buffer_size = self.__DEFAULT_BUFFER_SIZE if buffer_size is None else int(buffer_size)
+        self.__buf = bytearray(self.__buffer_size)
+        self.__view = memoryview(self.__buf)
+        self.__head = 0
+        self.__tail = 0
+        self.__selector = None
+
+    def close(self):
+        """Close selector of Timeout-T8, not close socket.
+        """
+        if self.__selector is not None:
+            self.__selector.close()
+            self.__selector = None
+
+    def read(self, timeout_t8=None):
+        """Read next frame.
+
+        Timeout-T8 is applied while a frame is partially received.
+
+        Args:
+            timeout_t8 (float or None): Timeout-T8 seconds, None if not timeout.
+
+        Raises:
+            HsmsSsCommunicatorError: if T8-Timeout, socket terminated, or size < 10.
+
+        Returns:
+            bytes: 4-bytes-length + 10-bytes-header + body
+        """
+        self.__fill(4, timeout_t8)
+
+        h = self.__head
+        bs = self.__buf
+        size = (bs[h] << 24 | bs[h + 1] << 16 | bs[h + 2] << 8 | bs[h + 3])
+
+        if size < 10:
+            raise HsmsSsCommunicatorError("Receive message size < 10")
+
+        size += 4
+
+        self.__fill(size, timeout_t8)
+
+        h = self.__head
+        frame = bytes(self.__view[h:(h + size)])
+        self.__consume(size)
+        return frame
+
+    def __fill(self, size, timeout):
+        while (self.__tail - self.__head) < size:
+
+            if (self.__head + size) > len(self.__buf):
+                self.__reserve(size)
+
+            if timeout is not None and self.__tail > self.__head:
+                if not self.__wait_readable(timeout):
+                    raise HsmsSsCommunicatorError("T8-Timeout")
+
+            n = self.__sock.recv_into(self.__view[self.__tail:])
+            if n:
+                self.__tail += n
+            else:
+                raise HsmsSsCommunicatorError("Terminate detect")
+
+    def __wait_readable(self, timeout):
+        # selectors, not limited by FD_SETSIZE like select.select
+        if self.__selector is None:
+            self.__selector = selectors.DefaultSelector()
+            self.__selector.register(self.__sock, selectors.EVENT_READ)
+        return bool(self.__selector.select(timeout))
+
+    def __reserve(self, size):
+        pending = self.__view[self.__head:self.__tail]
+        if size > len(self.__buf):
+            buf = bytearray(size)
+            buf[0:len(pending)] = pending
+            self.__replace(buf)
+        else:
+            self.__buf[0:len(pending)] = bytes(pending)
+        self.__tail -= self.__head
+        self.__head = 0
+
+    def __consume(self, size):
+        self.__head += size
+        if self.__head == self.__tail:
+            self.__head = 0
+            self.__tail = 0
+            if len(self.__buf) > self.__buffer_size:
+                self.__replace(bytearray(self.__buffer_size))
+
+    def __replace(self, buf):
+        self.__view.release()
+        self.__buf = buf
+        self.__view = memoryview(buf)
+
+
+class HsmsSsConnection:
+
+    __IOV_MAX = 1024
+    __GATHER_MIN = 0x10000
+
+    def __init__(
+            self, sock, comm,
+            recv_primary_msg_put_callback,
+            recv_all_msg_put_callback,
+            sended_msg_put_callback,
+            error_put_callback):
+
+        self.__sock = sock
+        self.__comm = comm
+        self.__put_recv_primary_msg = recv_primary_msg_put_callback
+        self.__put_recv_all_msg = recv_all_msg_put_callback
+        self.__put_sended_msg = sended_msg_put_callback
+        self.__put_error = error_put_callback
+
+        self.__terminated_cdt = threading.Condition()
+        self.__terminated = False
+
+        self.__frame_reader = HsmsSsFrameReader(sock)
+
+        self.__send_reply_pool = SendReplyHsmsSsMessagePackPool()
+
+        self.__send_lock = threading.Lock()
+        self.__write_lock = threading.Lock()
+        self.__send_queue = list()
+        self.__writing = False
+
+        self.__timer = TimeoutTimer()
+
+        threading.Thread(target=self.__reading_msg, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self):
+        with self.__terminated_cdt:
+
+            if not self.__is_terminated():
+
+                self.__terminated = True
+
+                self.__terminated_cdt.notify_all()
+
+        self.__timer.shutdown()
+        self.__send_reply_pool.shutdown()
+
+    def __is_terminated(self):
+        with self.__terminated_cdt:
+            return self.__terminated
+
+    def await_termination(self, timeout=None):
+        with self.__terminated_cdt:
+            self.__terminated_cdt.wait_for(self.__is_terminated, timeout)
+
+    def __reading_msg(self):
+        try:
+            while not self.__is_terminated():
+
+                msg = HsmsSsMessage.from_bytes(
+                    self.__frame_reader.read(self.__comm.timeout_t8),
+                    self.__comm.lazy_decode,
+                    self.__comm.cache_policy)
+
+                self.__put_recv_all_msg(msg)
+
+                if not self.__send_reply_pool.put_reply_msg(msg):
+                    self.__put_recv_primary_msg(msg, self)
+
+        except HsmsSsCommunicatorError as e:
+            if not self.__is_terminated():
+                self.__put_error(e)
+        except OSError as e:
+            if not self.__is_terminated():
+                self.__put_error(HsmsSsCommunicatorError(e))
+        except Exception as e:
+            if not self.__is_terminated():
+                self.__put_error(e)
+
+        finally:
+            self.__frame_reader.close()
+            self.shutdown()
+
+    def __get_timeout_tx(self, msg):
+        # timeout seconds of waiting reply, -1.0 if not wait
+        ctrl_type = msg.get_control_type()
+
+        if ctrl_type == HsmsSsControlType.DATA:
+            if msg.wbit:
+                return self.__comm.timeout_t3
+
+        elif (ctrl_type == HsmsSsControlType.SELECT_REQ
+              or ctrl_type == HsmsSsControlType.LINKTEST_REQ):
+
+            return self.__comm.timeout_t6
+
+        return -1.0
+
+    def __send_bytes(self, msg):
+        e = self.__write([msg])
+        if e is not None:
+            raise HsmsSsSendMessageError(e, msg)
+
+    def __write(self, msgs):
+        # Write messages in order, and return exception if failed, otherwise None.
+        window = self.__comm.coalesce_window
+        if window <= 0.0:
+            entry = [msgs, None, None]
+            with self.__write_lock:
+                self.__write_batch([entry])
+            return entry[1]
+
+        # Coalescing, writer writes messages queued by other threads while writing too, at once.
+        # If queued after write, writer waits coalesce_window to batch more.
+        with self.__send_lock:
+            if self.__writing:
+                waiter = threading.Lock()
+                waiter.acquire()
+                entry = [msgs, None, waiter]
+                self.__send_queue.append(entry)
+            else:
+                self.__writing = True
+                entry = None
+
+        if entry is not None:
+            # released by writer
+            waiter.acquire()
+            return entry[1]
+
+        entry = [msgs, None, None]
+        batch = [entry]
+
+        try:
+            while True:
+                with self.__write_lock:
+                    self.__write_batch(batch)
+
+                with self.__send_lock:
+                    if not self.__send_queue:
+                        self.__writing = False
+                        return entry[1]
+
+                time.sleep(window)
+
+                with self.__send_lock:
+                    batch = self.__send_queue
+                    self.__send_queue = list()
+
+        except BaseException as e:
+            with self.__send_lock:
+                self.__writing = False
+                batch = self.__send_queue
+                self.__send_queue = list()
+            for ent in batch:
+                ent[1] = e
+                ent[2].release()
+            raise
+
+    def __write_batch(self, batch):
+        bufs = list()
+        sends = list()
+        for ent in batch:
+            try:
+                vv = list()
+                for msg in ent[0]:
+                    vv.extend(msg.to_buffers())
+            except Exception as e:
+                ent[1] = e
+            else:
+                bufs.extend(vv)
+                sends.append(ent)
+
+        try:
+            self.__send_buffers(bufs)
+            e = None
+        except Exception as ex:
+            e = ex
+
+        for ent in sends:
+            if e is None:
+                for msg in ent[0]:
+                    self.__put_sended_msg(msg)
+            ent[1] = e
+
+        for ent in batch:
+            if ent[2] is not None:
+                ent[2].release()
+
+    def __send_buffers(self, bufs):
+        # join small buffers, scatter/gather large buffers not to copy
+        if len(bufs) == 1:
+            self.__sock.sendall(bufs[0])
+            return
+
+        if sum(map(len, bufs)) < self.__GATHER_MIN or not hasattr(self.__sock, 'sendmsg'):
+            self.__sock.sendall(b''.join(bufs))
+            return
+
+        vv = [memoryview(b).cast('B') for b in bufs]
+        i = 0
+        while i < len(vv):
+            n = self.__sock.sendmsg(vv[i:i + self.__IOV_MAX])
+            while n > 0:
+                m = len(vv[i])
+                if n >= m:
+                    n -= m
+                    i += 1
+                else:
+                    vv[i] = vv[i][n:]
+                    n = 0
+
+    def send_async(self, msg):
+        """Send message, and not wait reply.
+
+        Future is resolved by reading thread when reply received,
+        or by timer thread when Timeout-T3/T6.
+
+        Args:
+            msg (HsmsSsMessage): message.
+
+        Returns:
+            concurrent.futures.Future: result is Reply-Message if exist, otherwise None.
+        """
+        return self.send_many_async([msg])[0]
+
+    def send_many_async(self, msgs):
+        """Send messages by one socket write, and not wait replies.
+
+        Args:
+            msgs (list): HsmsSsMessage list.
+
+        Returns:
+            list: concurrent.futures.Future of each message, result is Reply-Message if exist, otherwise None.
+        """
+        futures = list()
+        sends = list()
+
+        for msg in msgs:
+
+            fut = concurrent.futures.Future()
+            futures.append(fut)
+
+            timeout_tx = self.__get_timeout_tx(msg)
+
+            if timeout_tx < 0.0:
+                sends.append((msg, fut, None))
+                continue
+
+            pack = SendReplyHsmsSsMessageFuturePack(msg, fut)
+
+            def _timeout(msg=msg, pack=pack):
+                if msg.get_control_type() == HsmsSsControlType.DATA:
+                    pack.put_except(HsmsSsTimeoutT3Error("HsmsSs-Timeout-T3", msg))
+                elif pack.put_except(HsmsSsTimeoutT6Error("HsmsSs-Timeout-T6", msg)):
+                    self.shutdown()
+
+            self.__send_reply_pool.entry(pack)
+            fut.add_done_callback(lambda f, pack=pack: self.__send_reply_pool.remove(pack))
+
+            if self.__is_terminated():
+                pack.shutdown()
+
+            else:
+                entry = self.__timer.schedule(timeout_tx, _timeout)
+                fut.add_done_callback(lambda f, entry=entry: self.__timer.cancel(entry))
+                sends.append((msg, fut, pack))
+
+        if sends:
+            e = self.__write([msg for msg, _, _ in sends])
+
+            for msg, fut, pack in sends:
+                if e is not None:
+                    if pack is None:
+                        fut.set_exception(HsmsSsSendMessageError(e, msg))
+                    else:
+                        pack.put_except(HsmsSsSendMessageError(e, msg))
+                elif pack is None:
+                    fut.set_result(None)
+
+        return futures
+
+    def send(self, msg):
+
+        ctrl_type = msg.get_control_type()
+
+        timeout_tx = self.__get_timeout_tx(msg)
+
+        def _send():
+            self.__send_bytes(msg)
+
+        if timeout_tx >= 0.0:
+
+            pack = SendReplyHsmsSsMessagePack(msg)
+
+            try:
+                self.__send_reply_pool.entry(pack)
+
+                _send()
+
+                rsp = pack.wait_reply_msg(timeout_tx)
+
+                if rsp is None:
+
+                    if self.__is_terminated():
+
+                        raise HsmsSsCommunicatorError("HsmsSsConnection terminated")
+
+                    else:
+
+                        if ctrl_type == HsmsSsControlType.DATA:
+
+                            raise HsmsSsTimeoutT3Error("HsmsSs-Timeout-T3", msg)
+
+                        else:
+                            self.shutdown()
+                            raise HsmsSsTimeoutT6Error("HsmsSs-Timeout-T6", msg)
+
+                else:
+
+                    if rsp.get_control_type() == HsmsSsControlType.REJECT_REQ:
+
+                        raise HsmsSsRejectMessageError("HsmsSs-Reject-Message", msg)
+
+                    else:
+                        return rsp
+
+            finally:
+                self.__send_reply_pool.remove(pack)
+
+        else:
+            _send()
+            return None
+
+
+class AbstractHsmsSsCommunicator(AbstractSecsCommunicator):
+
+    def __init__(self, session_id, is_equip, **kwargs):
+        super(AbstractHsmsSsCommunicator, self).__init__(session_id, is_equip, **kwargs)
+
+        self._hsmsss_connection = None
+        self._hsmsss_connection_lock = threading.Lock()
+
+        self._hsmsss_comm = HsmsSsCommunicateState.NOT_CONNECT
+        self._hsmsss_comm_lock = threading.Lock()
+        self._hsmsss_comm_lstnrs = list()
+
+        self.__recv_all_msg_putter = CallbackQueuing(self._put_recv_all_msg)
+        self.__sended_msg_putter = CallbackQueuing(self._put_sended_msg)
+        self.__error_putter = CallbackQueuing(super()._put_error)
+
+        self.coalesce_window = kwargs.get('coalesce_window', 0.0)
+
+        hsmsss_comm_lstnr = kwargs.get('hsmsss_communicate', None)
+        if hsmsss_comm_lstnr is not None:
+            self.add_hsmsss_communicate_listener(hsmsss_comm_lstnr)
+
+    def __str__(self):
+        ipaddr = self._get_ipaddress()
+        return str({
+            'protocol': self._get_protocol(),
+            'ip_address': (ipaddr[0]) + ':' + str(ipaddr[1]),
+            'session_id': self.session_id,
+            'is_equip': self.is_equip,
+            'communicate_state': self.get_hsmsss_communicate_state(),
+            'name': self.name
+        })
+
+    def __repr__(self):
+        return repr({
+            'protocol': self._get_protocol(),
+            'ip_address': self._get_ipaddress(),
+            'session_id': self.session_id,
+            'is_equip': self.is_equip,
+            'communicate_state': self.get_hsmsss_communicate_state(),
+            'name': self.name
+        })
+
+    def _get_protocol(self):
+        # prototype
+        raise NotImplementedError()
+
+    def _get_ipaddress(self):
+        # prototype
+        raise NotImplementedError()
+
+    @property
+    def session_id(self):
+        pass
+
+    @session_id.setter
+    def session_id(self, val):
+        """SESSION-ID setter.
+
+        Args:
+            val (int): SESSION_ID
+        """
+        self.device_id = val
+
+    @session_id.getter
+    def session_id(self):
+        """SESSION-ID getter.
+
+        Returns:
+            int: SESSION_ID
+        """
+        return self.device_id
+
+    @property
+    def coalesce_window(self):
+        pass
+
+    @coalesce_window.setter
+    def coalesce_window(self, val):
+        """Coalescing window seconds of sending setter.
+
+        If messages are queued while writing, writer waits window seconds
+        and writes all queued messages at once. Idle sending is not delayed.
+
+        Args:
+            val (int or float): seconds, 0.0 if not wait.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is less than 0.0.
+        """
+        if val is None:
+            raise TypeError("coalesce_window require not None")
+        val = float(val)
+        if val < 0.0:
+            raise ValueError("coalesce_window require >= 0.0")
+        self.__coalesce_window = val
+
+    @coalesce_window.getter
+    def coalesce_window(self):
+        """Coalescing window seconds of sending getter.
+
+        Returns:
+            float: seconds
+        """
+        return self.__coalesce_window
+
+    def _put_error(self, e):
+        self.__error_putter.put(e)
+
+    def _open(self):
+        with self._open_close_rlock:
+            if self.is_closed:
+                raise RuntimeError("Already closed")
+            if self.is_open:
+                raise RuntimeError("Already opened")
+
+        self._set_opened()
+
+    def _close(self):
+        with self._open_close_rlock:
+            if self.is_closed:
+                return
+
+        self._set_closed()
+
+        self.__recv_all_msg_putter.shutdown()
+        self.__sended_msg_putter.shutdown()
+        self.__error_putter.shutdown()
+
+    def _build_hsmsss_connection(self, sock, recv_primary_msg_callback):
+        return HsmsSsConnection(
+            sock,
+            self,
+            recv_primary_msg_callback,
+            self.__recv_all_msg_putter.put,
+            self.__sended_msg_putter.put,
+            self.__error_putter.put)
+
+    def _set_hsmsss_connection(self, conn, callback=None):
+        with self._hsmsss_connection_lock:
+            if self._hsmsss_connection is None:
+                self._hsmsss_connection = conn
+                if callback is not None:
+                    callback()
+                return True
+            else:
+                return False
+
+    def _unset_hsmsss_connection(self, callback=None):
+        with self._hsmsss_connection_lock:
+            if self._hsmsss_connection is not None:
+                self._hsmsss_connection = None
+                if callback is not None:
+                    callback()
+
+    def _send(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        return self.send_hsmsss_msg(
+            HsmsSsDataMessage(strm, func, wbit, secs2body, system_bytes, device_id))
+
+    def send_hsmsss_msg(self, msg):
+        def _f():
+            with self._hsmsss_connection_lock:
+                if self._hsmsss_connection is None:
+                    raise HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg)
+                else:
+                    return self._hsmsss_connection
+
+        return _f().send(msg)
+
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        return self.send_hsmsss_msg_async(
+            HsmsSsDataMessage(strm, func, wbit, secs2body, system_bytes, device_id))
+
+    def _send_many_async(self, args_list):
+
+        # build each message own, failed item is failed future.
+        futures = list()
+        msgs = list()
+
+        for args in args_list:
+            try:
+                msgs.append(HsmsSsDataMessage(*args))
+                futures.append(None)
+            except Exception as e:
+                fut = concurrent.futures.Future()
+                fut.set_exception(e)
+                futures.append(fut)
+
+        with self._hsmsss_connection_lock:
+            conn = self._hsmsss_connection
+
+        if conn is None:
+            sended = list()
+            for msg in msgs:
+                fut = concurrent.futures.Future()
+                fut.set_exception(HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg))
+                sended.append(fut)
+        else:
+            sended = conn.send_many_async(msgs) if msgs else list()
+
+        it = iter(sended)
+        return [next(it) if fut is None else fut for fut in futures]
+
+    def send_hsmsss_msg_async(self, msg):
+        with self._hsmsss_connection_lock:
+            conn = self._hsmsss_connection
+
+        if conn is None:
+            fut = concurrent.futures.Future()
+            fut.set_exception(HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg))
+            return fut
+
+        return conn.send_async(msg)
+
+    def build_select_req(self):
+        return HsmsSsControlMessage.build_select_request(
+            self._create_system_bytes())
+
+    @staticmethod
+    def build_select_rsp(primary, status):
+        return HsmsSsControlMessage.build_select_response(
+            primary,
+            status)
+
+    def build_linktest_req(self):
+        return HsmsSsControlMessage.build_linktest_request(
+            self._create_system_bytes())
+
+    @staticmethod
+    def build_linktest_rsp(primary):
+        return HsmsSsControlMessage.build_linktest_response(primary)
+
+    @staticmethod
+    def build_reject_req(primary, reason):
+        return HsmsSsControlMessage.build_reject_request(primary, reason)
+
+    def build_separate_req(self):
+        return HsmsSsControlMessage.build_separate_request(
+            self._create_system_bytes())
+
+    def send_select_req(self):
+        msg = self.build_select_req()
+        return self.send_hsmsss_msg(msg)
+
+    def send_select_rsp(self, primary, status):
+        msg = self.build_select_rsp(primary, status)
+        return self.send_hsmsss_msg(msg)
+
+    def send_linktest_req(self):
+        msg = self.build_linktest_req()
+        return self.send_hsmsss_msg(msg)
+
+    def send_linktest_rsp(self, primary):
+        msg = self.build_linktest_rsp(primary)
+        return self.send_hsmsss_msg(msg)
+
+    def send_reject_req(self, primary, reason):
+        msg = self.build_reject_req(primary, reason)
+        return self.send_hsmsss_msg(msg)
+
+    def send_separate_req(self):
+        msg = self.build_separate_req()
+        return self.send_hsmsss_msg(msg)
+
+    def get_hsmsss_communicate_state(self):
+        with self._hsmsss_comm_lock:
+            return self._hsmsss_comm
+
+    def add_hsmsss_communicate_listener(self, listener):
+        """Add HSMS-SS-Communicate-state-change-listener.
+
+        If listener-arguments is 1, put HSMS-SS-Communicate-State.
+        If listener-arguments is 2, put HSMS-SS-Communicate-State and self-communicator-instance.
+        HSMS-SS-Communicate-State is instance of `HsmsSsCommunicateState`.
+        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+
+        Args:
+            listener (function): HSMS-SS-Communicate-state-change-listener
+
+        Returns:
+            None
+        """
+        with self._hsmsss_comm_lock:
+            self._hsmsss_comm_lstnrs.append(listener)
+            listener(self._hsmsss_comm, self)
+
+    def remove_hsmsss_communicate_listener(self, listener):
+        """Remove HSMS-SS-Communicate-state-change-listener.
+
+        Args:
+            listener (function): HSMS-SS-Communicate-state-change-listener
+
+        Returns:
+            None
+        """
+        with self._hsmsss_comm_lock:
+            self._hsmsss_comm_lstnrs.remove(listener)
+
+    def _put_hsmsss_comm_state(self, state, callback=None):
+        with self._hsmsss_comm_lock:
+            if state != self._hsmsss_comm:
+                self._hsmsss_comm = state
+                for ls in self._hsmsss_comm_lstnrs:
+                    if self._is_single_args_listener(ls):
+                        ls(self._hsmsss_comm)
+                    else:
+                        ls(self._hsmsss_comm, self)
+                self._put_communicated(state == HsmsSsCommunicateState.SELECTED)
+                if callback is not None:
+                    callback()
+
+    def _put_hsmsss_comm_state_to_not_connected(self, callback=None):
+        self._put_hsmsss_comm_state(
+            HsmsSsCommunicateState.NOT_CONNECT,
+            callback)
+
+    def _put_hsmsss_comm_state_to_connected(self, callback=None):
+        self._put_hsmsss_comm_state(
+            HsmsSsCommunicateState.CONNECTED,
+            callback)
+
+    def _put_hsmsss_comm_state_to_selected(self, callback=None):
+        self._put_hsmsss_comm_state(
+            HsmsSsCommunicateState.SELECTED,
+            callback)
+
+
+class HsmsSsActiveCommunicator(AbstractHsmsSsCommunicator):
+
+    __PROTOCOL = 'HSMS-SS-ACTIVE'
+
+    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
+        super(HsmsSsActiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
+
+        self.__ipaddr = (ip_address, port)
+
+        self.__circuit_cdt = threading.Condition()
+
+        self.__cdts = list()
+        self.__cdts.append(self.__circuit_cdt)
+
+        self.__ths = list()
+
+        self.__recv_primary_msg_putter = CallbackQueuing(self._put_recv_primary_msg)
+
+    def _get_protocol(self):
+        return self.__PROTOCOL
+
+    def _get_ipaddress(self):
+        return self.__ipaddr
+
+    def _open(self):
+
+        with self._open_close_rlock:
+            if self.is_closed:
+                raise RuntimeError("Already closed")
+            if self.is_open:
+                raise RuntimeError("Already opened")
+
+            th = threading.Thread(target=self.__loop, daemon=True)
+            self.__ths.append(th)
+            th.start()
+
+            super()._open()
+
+            self._set_opened()
+
+    def __loop(self):
+        cdt = threading.Condition()
+        try:
+            self.__cdts.append(cdt)
+            while not self.is_closed:
+                self.__connect()
+                if self.is_closed:
+                    return
+                with cdt:
+                    cdt.wait(self.timeout_t5)
+        finally:
+            self.__cdts.remove(cdt)
+
+    def __connect(self):
+
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+
+                sock.connect(self._get_ipaddress())
+
+                with self._build_hsmsss_connection(sock, self.__receiving_msg) as conn:
+
+                    def _f():
+                        conn.await_termination()
+                        with self.__circuit_cdt:
+                            self.__circuit_cdt.notify_all()
+
+                    th = threading.Thread(target=_f, daemon=True)
+
+                    try:
+                        self.__ths.append(th)
+                        th.start()
+
+                        self._put_hsmsss_comm_state_to_connected()
+
+                        rsp = conn.send(self.build_select_req())
+
+                        if rsp is not None:
+
+                            ss = rsp.get_select_status()
+
+                            if (ss == HsmsSsSelectStatus.SUCCESS
+                                    or ss == HsmsSsSelectStatus.ACTIVED):
+
+                                self._set_hsmsss_connection(
+                                    conn,
+                                    self._put_hsmsss_comm_state_to_selected)
+
+                                with self.__circuit_cdt:
+                                    self.__circuit_cdt.wait()
+
+                    finally:
+                        self._unset_hsmsss_connection(
+                            self._put_hsmsss_comm_state_to_not_connected)
+
+                        self.__ths.remove(th)
+
+                        try:
+                            sock.shutdown(socket.SHUT_RDWR)
+                        except Exception as e:
+                            if not self.is_closed:
+                                self._put_error(e)
+
+        except ConnectionError as e:
+            if not self.is_closed:
+                self._put_error(HsmsSsCommunicatorError(e))
+        except HsmsSsCommunicatorError as e:
+            if not self.is_closed:
+                self._put_error(e)
+        except HsmsSsSendMessageError as e:
+            if not self.is_closed:
+                self._put_error(e)
+        except HsmsSsWaitReplyMessageError as e:
+            if not self.is_closed:
+                self._put_error(e)
 
-    def add_communicate_listener(self, listener):
-        """Add communicate-state-change-listener.
+    def __receiving_msg(self, recv_msg, conn):
 
-        If listener-arguments is 1, put is-communicating.
-        If listener-arguments is 2, put is-communicating and self-communicator-instance.
-        is-communicating is True if self-communicator is communicate-state.
-        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+        def _f():
 
-        Args:
-            listener (function): Communicate-State-Change-Listener
+            if recv_msg is None:
+                with self.__circuit_cdt:
+                    self.__circuit_cdt.notify_all()
+                    return
 
-        Returns:
-            None
-        """
-        with self.__comm_cdt:
-            self.__communicate_lstnrs.append(listener)
-            if self._is_single_args_listener(listener):
-                listener(self.__communicating)
-            else:
-                listener(self.__communicating, self)
+            ctrl_type = recv_msg.get_control_type()
 
-    def remove_communicate_listener(self, listener):
-        """Remove communicate-state-change-listener.
+            try:
+                if ctrl_type == HsmsSsControlType.DATA:
 
-        Args:
-            listener (function): Communicate-State-Change-Listener
+                    if self.get_hsmsss_communicate_state() == HsmsSsCommunicateState.SELECTED:
 
-        Returns:
-            None
-        """
-        with self.__comm_cdt:
-            self.__communicate_lstnrs.remove(listener)
+                        self.__recv_primary_msg_putter.put(recv_msg)
 
-    def _put_communicated(self, communicating):
-        with self.__comm_cdt:
-            if communicating != self.__communicating:
-                self.__communicating = communicating
-                for ls in self.__communicate_lstnrs:
-                    if self._is_single_args_listener(ls):
-                        ls(self.__communicating)
                     else:
-                        ls(self.__communicating, self)
-                self.__comm_cdt.notify_all()
+                        conn.send(
+                            self.build_select_rsp(
+                                recv_msg,
+                                HsmsSsRejectReason.NOT_SELECTED))
 
-    @property
-    def is_communicating(self):
-        pass
+                elif ctrl_type == HsmsSsControlType.LINKTEST_REQ:
 
-    @is_communicating.getter
-    def is_communicating(self):
-        """is-communicating.
+                    conn.send(self.build_linktest_rsp(recv_msg))
 
-        Returns:
-            True if Self-Communicator is communicating.
-        """
-        with self.__comm_cdt:
-            return self.__communicating
+                elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
 
-    def add_error_listener(self, listener):
-        """Add error-listener.
+                    with self.__circuit_cdt:
+                        self.__circuit_cdt.notify_all()
 
-        If listener-arguments is 1, put error.
-        If listener-arguments is 2, put error and self-communicator-instance.
-        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+                elif ctrl_type == HsmsSsControlType.SELECT_REQ:
 
-        Args:
-            listener (function): Error-Listener
+                    conn.send(
+                        self.build_reject_req(
+                            recv_msg,
+                            HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
 
-        Returns:
-            None
-        """
-        self.__error_lstnrs.append(listener)
+                elif (ctrl_type == HsmsSsControlType.SELECT_RSP
+                      or ctrl_type == HsmsSsControlType.LINKTEST_RSP):
 
-    def remove_error_listener(self, listener):
-        """Remove error-listener.
+                    conn.send(
+                        self.build_reject_req(
+                            recv_msg,
+                            HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
 
-        Args:
-            listener (function): Error-Listener
+                elif ctrl_type == HsmsSsControlType.REJECT_REQ:
 
-        Returns:
-            None
-        """
-        self.__error_lstnrs.remove(listener)
+                    # Nothing
+                    pass
 
-    def _put_error(self, e):
-        if e is not None:
-            for ls in self.__error_lstnrs:
-                if self._is_single_args_listener(ls):
-                    ls(e)
                 else:
-                    ls(e, self)
 
+                    if HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
 
-class HsmsSsCommunicatorError(SecsCommunicatorError):
+                        conn.send(
+                            self.build_reject_req(
+                                recv_msg,
+                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
 
-    def __init__(self, msg):
-        super(HsmsSsCommunicatorError, self).__init__(msg)
+                    else:
 
+                        conn.send(
+                            self.build_reject_req(
+                                recv_msg,
+                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
 
-class HsmsSsSendMessageError(SecsSendMessageError):
+            except HsmsSsSendMessageError as e:
+                self._put_error(e)
+            except HsmsSsWaitReplyMessageError as e:
+                self._put_error(e)
+            except HsmsSsCommunicatorError as e:
+                self._put_error(e)
 
-    def __init__(self, msg, ref_msg):
-        super(HsmsSsSendMessageError, self).__init__(msg, ref_msg)
+        th = threading.Thread(target=_f, daemon=True)
+        try:
+            self.__ths.append(th)
+            th.start()
+        finally:
+            self.__ths.remove(th)
 
+    def _close(self):
 
-class HsmsSsWaitReplyMessageError(SecsWaitReplyMessageError):
+        if self.is_closed:
+            return
 
-    def __init__(self, msg, ref_msg):
-        super(HsmsSsWaitReplyMessageError, self).__init__(msg, ref_msg)
+        super()._close()
 
+        self._set_closed()
 
-class HsmsSsTimeoutT3Error(HsmsSsWaitReplyMessageError):
+        self.__recv_primary_msg_putter.shutdown()
 
-    def __init__(self, msg, ref_msg):
-        super(HsmsSsTimeoutT3Error, self).__init__(msg, ref_msg)
+        for cdt in self.__cdts:
+            with cdt:
+                cdt.notify_all()
 
+        for th in self.__ths:
+            if th.is_alive():
+                th.join(0.1)
 
-class HsmsSsTimeoutT6Error(HsmsSsWaitReplyMessageError):
 
-    def __init__(self, msg, ref_msg):
-        super(HsmsSsTimeoutT6Error, self).__init__(msg, ref_msg)
+class HsmsSsPassiveCommunicator(AbstractHsmsSsCommunicator):
 
+    __PROTOCOL = 'HSMS-SS-PASSIVE'
+    __TIMEOUT_REBIND = 5.0
 
-class HsmsSsRejectMessageError(HsmsSsWaitReplyMessageError):
+    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
+        super(HsmsSsPassiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
 
-    def __init__(self, msg, ref_msg):
-        super(HsmsSsRejectMessageError, self).__init__(msg, ref_msg)
+        self.__ipaddr = (ip_address, port)
 
+        self.__cdts = list()
+        self.__ths = list()
 
-class HsmsSsCommunicateState:
+        self.__recv_primary_msg_putter = CallbackQueuing(self._put_recv_primary_msg)
 
-    NOT_CONNECT = 'not_connect'
-    CONNECTED = 'connected'
-    SELECTED = 'selected'
+        self.timeout_rebind = kwargs.get('timeout_rebind', self.__TIMEOUT_REBIND)
 
+    def _get_protocol(self):
+        return self.__PROTOCOL
 
-class SendReplyHsmsSsMessagePack:
+    def _get_ipaddress(self):
+        return self.__ipaddr
 
-    def __init__(self, msg):
-        self.__msg = msg
-        self.__reply_msg_cdt = threading.Condition()
-        self.__reply_msg = None
-        self.__terminated = False
+    @property
+    def timeout_rebind(self):
+        pass
 
-    def shutdown(self):
-        with self.__reply_msg_cdt:
-            self.__terminated = True
-            self.__reply_msg_cdt.notify_all()
+    @timeout_rebind.setter
+    def timeout_rebind(self, val):
+        self.__timeout_rebind = self._try_gt_zero(val)
 
-    def __is_terminated(self):
-        with self.__reply_msg_cdt:
-            return self.__terminated
+    @timeout_rebind.getter
+    def timeout_rebind(self):
+        return self.__timeout_rebind
 
-    def get_system_bytes(self):
-        return self.__msg.system_bytes
+    def _open(self):
 
-    def put_reply_msg(self, reply_msg):
-        with self.__reply_msg_cdt:
-            self.__reply_msg = reply_msg
-            self.__reply_msg_cdt.notify_all()
+        with self._open_close_rlock:
+            if self.is_closed:
+                raise RuntimeError("Already closed")
+            if self.is_open:
+                raise RuntimeError("Already opened")
 
-    def wait_reply_msg(self, timeout):
+            th = threading.Thread(target=self.__loop, daemon=True)
+            self.__ths.append(th)
+            th.start()
 
-        with self.__reply_msg_cdt:
+            super()._open()
 
-            if self.__is_terminated():
-                return None
+            self._set_opened()
+
+    def __loop(self):
+        cdt = threading.Condition()
+        try:
+            self.__cdts.append(cdt)
+            while not self.is_closed:
+                self.__open_server()
+                if self.is_closed:
+                    return
+                with cdt:
+                    cdt.wait(self.timeout_rebind)
+        finally:
+            self.__cdts.remove(cdt)
+
+    def __open_server(self):
+        cdt = threading.Condition()
+        try:
+            self.__cdts.append(cdt)
+
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+
+                server.bind(self._get_ipaddress())
+                server.listen()
+
+                def _f():
+
+                    def _f_sock(s):
+                        with s:
+                            try:
+                                self.__accept_socket(s)
+                            except Exception as e3:
+                                if not self.is_closed:
+                                    self._put_error(e3)
+                            finally:
+                                try:
+                                    s.shutdown(socket.SHUT_RDWR)
+                                except Exception as e4:
+                                    if not self.is_closed:
+                                        self._put_error(e4)
 
-            if self.__reply_msg is not None:
-                return self.__reply_msg
+                    try:
+                        while not self.is_closed:
+                            sock = (server.accept())[0]
 
-            self.__reply_msg_cdt.wait(timeout)
+                            threading.Thread(
+                                target=_f_sock,
+                                args=(sock, ),
+                                daemon=True
+                                ).start()
 
-            return self.__reply_msg
+                    except Exception as e2:
+                        if not self.is_closed:
+                            self._put_error(HsmsSsCommunicatorError(e2))
 
+                    finally:
+                        with cdt:
+                            cdt.notify_all()
 
-class SendReplyHsmsSsMessagePackPool:
+                th = threading.Thread(target=_f, daemon=True)
 
-    def __init__(self):
-        self.__pool = dict()
-        self.__lock = threading.Lock()
+                try:
+                    self.__ths.append(th)
+                    th.start()
 
-    def __enter__(self):
-        return self
+                    with cdt:
+                        cdt.wait()
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self.shutdown()
+                finally:
+                    self.__ths.remove(th)
 
-    def shutdown(self):
-        with self.__lock:
-            for pack in self.__pool.values():
-                pack.shutdown()
+                    try:
+                        server.shutdown(socket.SHUT_RDWR)
+                    except Exception as es:
+                        if not self.is_closed:
+                            self._put_error(es)
 
-    def entry(self, pack):
-        with self.__lock:
-            self.__pool[pack.get_system_bytes()] = pack
+        except Exception as e:
+            if not self.is_closed:
+                self._put_error(HsmsSsCommunicatorError(e))
 
-    def remove(self, pack):
-        with self.__lock:
-            del self.__pool[pack.get_system_bytes()]
+        finally:
+            self.__cdts.remove(cdt)
 
-    def put_reply_msg(self, reply_msg):
-        with self.__lock:
-            key = reply_msg.system_bytes
-            if key in self.__pool:
-                self.__pool[key].put_reply_msg(reply_msg)
-                return True
-            else:
-                return False
+    def __accept_socket(self, sock):
 
+        qq = WaitingQueuing()
 
-class HsmsSsConnection:
+        cdt = threading.Condition()
 
-    def __init__(
-            self, sock, comm,
-            recv_primary_msg_put_callback,
-            recv_all_msg_put_callback,
-            sended_msg_put_callback,
-            error_put_callback):
+        try:
+            self.__cdts.append(cdt)
 
-        self.__sock = sock
-        self.__comm = comm
-        self.__put_recv_primary_msg = recv_primary_msg_put_callback
-        self.__put_recv_all_msg = recv_all_msg_put_callback
-        self.__put_sended_msg = sended_msg_put_callback
-        self.__put_error = error_put_callback
+            def _put_to_qq(recv_msg, c):
+                qq.put((recv_msg, c))
 
-        self.__terminated_cdt = threading.Condition()
-        self.__terminated = False
+            with self._build_hsmsss_connection(sock, _put_to_qq) as conn:
 
-        self.__bbqq = WaitingQueuing()
+                def _comm():
+                    conn.await_termination()
+                    with cdt:
+                        cdt.notify_all()
 
-        self.__send_reply_pool = SendReplyHsmsSsMessagePackPool()
+                def _receiving():
 
-        self.__send_lock = threading.Lock()
+                    if self.__receiving_msg_until_selected(qq):
 
-        threading.Thread(target=self.__receiving_socket_bytes, daemon=True).start()
-        threading.Thread(target=self.__reading_msg, daemon=True).start()
+                        try:
+                            self.__receiving_msg(qq)
+                        finally:
+                            self._unset_hsmsss_connection(
+                                self._put_hsmsss_comm_state_to_not_connected)
 
-    def __enter__(self):
-        return self
+                    with cdt:
+                        cdt.notify_all()
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self.shutdown()
+                threading.Thread(target=_comm, daemon=True).start()
+                threading.Thread(target=_receiving, daemon=True).start()
 
-    def shutdown(self):
-        with self.__terminated_cdt:
+                with cdt:
+                    cdt.wait()
 
-            if not self.__is_terminated():
+        finally:
+            self.__cdts.remove(cdt)
+            qq.shutdown()
 
-                self.__terminated = True
+    def __receiving_msg_until_selected(self, qq):
 
-                self.__bbqq.shutdown()
-                self.__send_reply_pool.shutdown()
+        while not self.is_closed:
 
-                self.__terminated_cdt.notify_all()
+            tt = qq.poll(self.timeout_t7)
 
-    def __is_terminated(self):
-        with self.__terminated_cdt:
-            return self.__terminated
+            if tt is None:
+                return False
 
-    def await_termination(self, timeout=None):
-        with self.__terminated_cdt:
-            self.__terminated_cdt.wait_for(self.__is_terminated, timeout)
+            recv_msg = tt[0]
+            conn = tt[1]
 
-    def __receiving_socket_bytes(self):
-        try:
-            while not self.__is_terminated():
-                bs = self.__sock.recv(4096)
-                if bs:
-                    self.__bbqq.puts(bs)
-                else:
-                    raise HsmsSsCommunicatorError("Terminate detect")
+            ctrl_type = recv_msg.get_control_type()
 
-        except HsmsSsCommunicatorError as e:
-            if not self.__is_terminated():
-                self.__put_error(e)
-        except Exception as e:
-            if not self.__is_terminated():
-                self.__put_error(HsmsSsCommunicatorError(e))
+            try:
+                if ctrl_type == HsmsSsControlType.DATA:
 
-        finally:
-            self.shutdown()
+                    conn.send(
+                        self.build_select_rsp(
+                            recv_msg,
+                            HsmsSsRejectReason.NOT_SELECTED))
 
-    def __reading_msg(self):
-        try:
-            while not self.__is_terminated():
+                elif ctrl_type == HsmsSsControlType.LINKTEST_REQ:
 
-                heads = list()
-                pos = 0
-                size = 14
+                    conn.send(self.build_linktest_rsp(recv_msg))
 
-                r = self.__bbqq.put_to_list(heads, pos, size)
-                if r < 0:
-                    return
+                elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
 
-                pos += r
+                    return False
 
-                while pos < size:
-                    r = self.__bbqq.put_to_list(
-                        heads, pos, size,
-                        self.__comm.timeout_t8)
+                elif ctrl_type == HsmsSsControlType.SELECT_REQ:
 
-                    if r < 0:
-                        raise HsmsSsCommunicatorError("T8-Timeout")
-                    else:
-                        pos += r
+                    r = self._set_hsmsss_connection(
+                        conn,
+                        self._put_hsmsss_comm_state_to_selected)
 
-                bodys = list()
-                pos = 0
-                size = (heads[0] << 24
-                        | heads[1] << 16
-                        | heads[2] << 8
-                        | heads[3]) - 10
+                    if r:
 
-                if size < 0:
-                    raise HsmsSsCommunicatorError("Receive message size < 10")
+                        conn.send(
+                            self.build_select_rsp(
+                                recv_msg,
+                                HsmsSsSelectStatus.SUCCESS))
 
-                while pos < size:
-                    r = self.__bbqq.put_to_list(
-                        bodys, pos, size,
-                        self.__comm.timeout_t8)
+                        return True
 
-                    if r < 0:
-                        raise HsmsSsCommunicatorError("T8-Timeout")
                     else:
-                        pos += r
-
-                msg = HsmsSsMessage.from_bytes(bytes(heads) + bytes(bodys))
-
-                self.__put_recv_all_msg(msg)
-
-                if not self.__send_reply_pool.put_reply_msg(msg):
-                    self.__put_recv_primary_msg(msg, self)
-
-        except Exception as e:
-            if not self.__is_terminated():
-                self.__put_error(e)
-
-        finally:
-            self.shutdown()
 
-    def send(self, msg):
+                        conn.send(
+                            self.build_select_rsp(
+                                recv_msg,
+                                HsmsSsSelectStatus.ALREADY_USED))
 
-        timeout_tx = -1.0
+                elif (ctrl_type == HsmsSsControlType.SELECT_RSP
+                      or ctrl_type == HsmsSsControlType.LINKTEST_RSP):
 
-        ctrl_type = msg.get_control_type()
+                    conn.send(
+                        self.build_reject_req(
+                            recv_msg,
+                            HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
 
-        if ctrl_type == HsmsSsControlType.DATA:
-            if msg.wbit:
-                timeout_tx = self.__comm.timeout_t3
+                elif ctrl_type == HsmsSsControlType.REJECT_REQ:
 
-        elif (ctrl_type == HsmsSsControlType.SELECT_REQ
-              or ctrl_type == HsmsSsControlType.LINKTEST_REQ):
+                    # Nothing
+                    pass
 
-            timeout_tx = self.__comm.timeout_t6
+                else:
 
-        def _send():
-            with self.__send_lock:
-                try:
-                    self.__sock.sendall(msg.to_bytes())
-                    self.__put_sended_msg(msg)
-                except Exception as e:
-                    raise HsmsSsSendMessageError(e, msg)
+                    if HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
 
-        if timeout_tx >= 0.0:
+                        conn.send(
+                            self.build_reject_req(
+                                recv_msg,
+                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
 
-            pack = SendReplyHsmsSsMessagePack(msg)
+                    else:
 
-            try:
-                self.__send_reply_pool.entry(pack)
+                        conn.send(
+                            self.build_reject_req(
+                                recv_msg,
+                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
 
-                _send()
+            except HsmsSsSendMessageError as e:
+                self._put_error(e)
+            except HsmsSsWaitReplyMessageError as e:
+                self._put_error(e)
+            except HsmsSsCommunicatorError as e:
+                self._put_error(e)
 
-                rsp = pack.wait_reply_msg(timeout_tx)
+        return False
 
-                if rsp is None:
+    def __receiving_msg(self, qq):
 
-                    if self.__is_terminated():
+        while not self.is_closed:
 
-                        raise HsmsSsCommunicatorError("HsmsSsConnection terminated")
+            tt = qq.poll()
 
-                    else:
+            if tt is None:
+                return False
 
-                        if ctrl_type == HsmsSsControlType.DATA:
+            recv_msg = tt[0]
+            conn = tt[1]
 
-                            raise HsmsSsTimeoutT3Error("HsmsSs-Timeout-T3", msg)
+            ctrl_type = recv_msg.get_control_type()
 
-                        else:
-                            self.shutdown()
-                            raise HsmsSsTimeoutT6Error("HsmsSs-Timeout-T6", msg)
+            try:
+                if ctrl_type == HsmsSsControlType.DATA:
 
-                else:
+                    self.__recv_primary_msg_putter.put(recv_msg)
 
-                    if rsp.get_control_type() == HsmsSsControlType.REJECT_REQ:
+                elif ctrl_type == HsmsSsControlType.LINKTEST_REQ:
 
-                        raise HsmsSsRejectMessageError("HsmsSs-Reject-Message", msg)
+                    conn.send(self.build_linktest_rsp(recv_msg))
 
-                    else:
-                        return rsp
+                elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
 
-            finally:
-                self.__send_reply_pool.remove(pack)
+                    return False
 
-        else:
-            _send()
-            return None
+                elif ctrl_type == HsmsSsControlType.SELECT_REQ:
 
+                    conn.send(
+                        self.build_select_rsp(
+                            recv_msg,
+                            HsmsSsSelectStatus.ACTIVED))
 
-class AbstractHsmsSsCommunicator(AbstractSecsCommunicator):
+                elif (ctrl_type == HsmsSsControlType.SELECT_RSP
+                      or ctrl_type == HsmsSsControlType.LINKTEST_RSP):
 
-    def __init__(self, session_id, is_equip, **kwargs):
-        super(AbstractHsmsSsCommunicator, self).__init__(session_id, is_equip, **kwargs)
+                    conn.send(
+                        self.build_reject_req(
+                            recv_msg,
+                            HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
 
-        self._hsmsss_connection = None
-        self._hsmsss_connection_lock = threading.Lock()
+                elif ctrl_type == HsmsSsControlType.REJECT_REQ:
 
-        self._hsmsss_comm = HsmsSsCommunicateState.NOT_CONNECT
-        self._hsmsss_comm_lock = threading.Lock()
-        self._hsmsss_comm_lstnrs = list()
+                    # Nothing
+                    pass
 
-        self.__recv_all_msg_putter = CallbackQueuing(self._put_recv_all_msg)
-        self.__sended_msg_putter = CallbackQueuing(self._put_sended_msg)
-        self.__error_putter = CallbackQueuing(super()._put_error)
+                else:
 
-        hsmsss_comm_lstnr = kwargs.get('hsmsss_communicate', None)
-        if hsmsss_comm_lstnr is not None:
-            self.add_hsmsss_communicate_listener(hsmsss_comm_lstnr)
+                    if HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
 
-    def __str__(self):
-        ipaddr = self._get_ipaddress()
-        return str({
-            'protocol': self._get_protocol(),
-            'ip_address': (ipaddr[0]) + ':' + str(ipaddr[1]),
-            'session_id': self.session_id,
-            'is_equip': self.is_equip,
-            'communicate_state': self.get_hsmsss_communicate_state(),
-            'name': self.name
-        })
+                        conn.send(
+                            self.build_reject_req(
+                                recv_msg,
+                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
 
-    def __repr__(self):
-        return repr({
-            'protocol': self._get_protocol(),
-            'ip_address': self._get_ipaddress(),
-            'session_id': self.session_id,
-            'is_equip': self.is_equip,
-            'communicate_state': self.get_hsmsss_communicate_state(),
-            'name': self.name
-        })
+                    else:
 
-    def _get_protocol(self):
-        # prototype
-        raise NotImplementedError()
+                        conn.send(
+                            self.build_reject_req(
+                                recv_msg,
+                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
 
-    def _get_ipaddress(self):
-        # prototype
-        raise NotImplementedError()
+            except HsmsSsSendMessageError as e:
+                self._put_error(e)
+            except HsmsSsWaitReplyMessageError as e:
+                self._put_error(e)
+            except HsmsSsCommunicatorError as e:
+                self._put_error(e)
 
-    @property
-    def session_id(self):
-        pass
+        return False
 
-    @session_id.setter
-    def session_id(self, val):
-        """SESSION-ID setter.
+    def _close(self):
 
-        Args:
-            val (int): SESSION_ID
-        """
-        self.device_id = val
+        if self.is_closed:
+            return
 
-    @session_id.getter
-    def session_id(self):
-        """SESSION-ID getter.
+        super()._close()
 
-        Returns:
-            int: SESSION_ID
-        """
-        return self.device_id
+        self._set_closed()
 
-    def _put_error(self, e):
-        self.__error_putter.put(e)
+        for cdt in self.__cdts:
+            with cdt:
+                cdt.notify_all()
 
-    def _open(self):
-        with self._open_close_rlock:
-            if self.is_closed:
-                raise RuntimeError("Already closed")
-            if self.is_open:
-                raise RuntimeError("Already opened")
+        for th in self.__ths:
+            if th.is_alive():
+                th.join(0.1)
 
-        self._set_opened()
 
-    def _close(self):
-        with self._open_close_rlock:
-            if self.is_closed:
-                return
+class AsyncHsmsSsConnection:
+    """HSMS-SS connection on asyncio streams.
 
-        self._set_closed()
+    Reads frames by one task in running event loop, and waits reply messages by futures.
+    """
 
-        self.__recv_all_msg_putter.shutdown()
-        self.__sended_msg_putter.shutdown()
-        self.__error_putter.shutdown()
+    def __init__(
+            self, reader, writer, comm,
+            recv_primary_msg_put_callback,
+            recv_all_msg_put_callback,
+            sended_msg_put_callback,
+            error_put_callback):
 
-    def _build_hsmsss_connection(self, sock, recv_primary_msg_callback):
-        return HsmsSsConnection(
-            sock,
-            self,
-            recv_primary_msg_callback,
-            self.__recv_all_msg_putter.put,
-            self.__sended_msg_putter.put,
-            self.__error_putter.put)
+        self.__reader = reader
+        self.__writer = writer
+        self.__comm = comm
+        self.__put_recv_primary_msg = recv_primary_msg_put_callback
+        self.__put_recv_all_msg = recv_all_msg_put_callback
+        self.__put_sended_msg = sended_msg_put_callback
+        self.__put_error = error_put_callback
 
-    def _set_hsmsss_connection(self, conn, callback=None):
-        with self._hsmsss_connection_lock:
-            if self._hsmsss_connection is None:
-                self._hsmsss_connection = conn
-                if callback is not None:
-                    callback()
-                return True
-            else:
-                return False
+        self.__terminated = False
+        self.__terminated_event = asyncio.Event()
 
-    def _unset_hsmsss_connection(self, callback=None):
-        with self._hsmsss_connection_lock:
-            if self._hsmsss_connection is not None:
-                self._hsmsss_connection = None
-                if callback is not None:
-                    callback()
+        self.__reply_futures = dict()
 
-    def _send(self, strm, func, wbit, secs2body, system_bytes, device_id):
-        return self.send_hsmsss_msg(
-            HsmsSsDataMessage(strm, func, wbit, secs2body, system_bytes, device_id))
+        self.__drain_lock = asyncio.Lock()
 
-    def send_hsmsss_msg(self, msg):
-        def _f():
-            with self._hsmsss_connection_lock:
-                if self._hsmsss_connection is None:
-                    raise HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg)
-                else:
-                    return self._hsmsss_connection
+        self.__reading_task = asyncio.ensure_future(self.__reading_msg())
 
-        return _f().send(msg)
+    def shutdown(self):
+        if self.__terminated:
+            return
 
-    def build_select_req(self):
-        return HsmsSsControlMessage.build_select_request(
-            self._create_system_bytes())
+        self.__terminated = True
 
-    @staticmethod
-    def build_select_rsp(primary, status):
-        return HsmsSsControlMessage.build_select_response(
-            primary,
-            status)
+        for fut in self.__reply_futures.values():
+            if not fut.done():
+                fut.set_result(None)
 
-    def build_linktest_req(self):
-        return HsmsSsControlMessage.build_linktest_request(
-            self._create_system_bytes())
+        self.__writer.close()
 
-    @staticmethod
-    def build_linktest_rsp(primary):
-        return HsmsSsControlMessage.build_linktest_response(primary)
+        if self.__reading_task is not asyncio.current_task():
+            self.__reading_task.cancel()
 
-    @staticmethod
-    def build_reject_req(primary, reason):
-        return HsmsSsControlMessage.build_reject_request(primary, reason)
+        self.__terminated_event.set()
 
-    def build_separate_req(self):
-        return HsmsSsControlMessage.build_separate_request(
-            self._create_system_bytes())
+    def is_terminated(self):
+        return self.__terminated
 
-    def send_select_req(self):
-        msg = self.build_select_req()
-        return self.send_hsmsss_msg(msg)
+    async def await_termination(self):
+        await self.__terminated_event.wait()
 
-    def send_select_rsp(self, primary, status):
-        msg = self.build_select_rsp(primary, status)
-        return self.send_hsmsss_msg(msg)
+    async def __read_frame(self):
 
-    def send_linktest_req(self):
-        msg = self.build_linktest_req()
-        return self.send_hsmsss_msg(msg)
+        reader = self.__reader
 
-    def send_linktest_rsp(self, primary):
-        msg = self.build_linktest_rsp(primary)
-        return self.send_hsmsss_msg(msg)
+        head = await reader.readexactly(4)
 
-    def send_reject_req(self, primary, reason):
-        msg = self.build_reject_req(primary, reason)
-        return self.send_hsmsss_msg(msg)
+        size = (head[0] << 24 | head[1] << 16 | head[2] << 8 | head[3])
 
-    def send_separate_req(self):
-        msg = self.build_separate_req()
-        return self.send_hsmsss_msg(msg)
+        if size < 10:
+            raise HsmsSsCommunicatorError("Receive message size < 10")
 
-    def get_hsmsss_communicate_state(self):
-        with self._hsmsss_comm_lock:
-            return self._hsmsss_comm
+        # Timeout-T8 is applied to each chunk while a frame is partially received
+        timeout_t8 = self.__comm.timeout_t8
+        parts = [head]
 
-    def add_hsmsss_communicate_listener(self, listener):
-        """Add HSMS-SS-Communicate-state-change-listener.
+        while size > 0:
+            try:
+                bs = await asyncio.wait_for(reader.read(size), timeout_t8)
+            except asyncio.TimeoutError:
+                raise HsmsSsCommunicatorError("T8-Timeout")
 
-        If listener-arguments is 1, put HSMS-SS-Communicate-State.
-        If listener-arguments is 2, put HSMS-SS-Communicate-State and self-communicator-instance.
-        HSMS-SS-Communicate-State is instance of `HsmsSsCommunicateState`.
-        self-communicator-instance is instance of `AbstractSecsCommunicator`.
+            if not bs:
+                raise HsmsSsCommunicatorError("Terminate detect")
 
-        Args:
-            listener (function): HSMS-SS-Communicate-state-change-listener
+            parts.append(bs)
+            size -= len(bs)
 
-        Returns:
-            None
-        """
-        with self._hsmsss_comm_lock:
-            self._hsmsss_comm_lstnrs.append(listener)
-            listener(self._hsmsss_comm, self)
+        return b''.join(parts)
 
-    def remove_hsmsss_communicate_listener(self, listener):
-        """Remove HSMS-SS-Communicate-state-change-listener.
+    async def __reading_msg(self):
+        try:
+            while not self.__terminated:
 
-        Args:
-            listener (function): HSMS-SS-Communicate-state-change-listener
+                msg = HsmsSsMessage.from_bytes(
+                    await self.__read_frame(),
+                    self.__comm.lazy_decode,
+                    self.__comm.cache_policy)
 
-        Returns:
-            None
-        """
-        with self._hsmsss_comm_lock:
-            self._hsmsss_comm_lstnrs.remove(listener)
+                self.__put_recv_all_msg(msg)
 
-    def _put_hsmsss_comm_state(self, state, callback=None):
-        with self._hsmsss_comm_lock:
-            if state != self._hsmsss_comm:
-                self._hsmsss_comm = state
-                for ls in self._hsmsss_comm_lstnrs:
-                    if self._is_single_args_listener(ls):
-                        ls(self._hsmsss_comm)
-                    else:
-                        ls(self._hsmsss_comm, self)
-                self._put_communicated(state == HsmsSsCommunicateState.SELECTED)
-                if callback is not None:
-                    callback()
+                fut = self.__reply_futures.get(msg.system_bytes, None)
+                if fut is not None and not fut.done():
+                    fut.set_result(msg)
+                else:
+                    self.__put_recv_primary_msg(msg, self)
+
+        except asyncio.CancelledError:
+            pass
+        except asyncio.IncompleteReadError:
+            if not self.__terminated:
+                self.__put_error(HsmsSsCommunicatorError("Terminate detect"))
+        except HsmsSsCommunicatorError as e:
+            if not self.__terminated:
+                self.__put_error(e)
+        except OSError as e:
+            if not self.__terminated:
+                self.__put_error(HsmsSsCommunicatorError(e))
+        except Exception as e:
+            if not self.__terminated:
+                self.__put_error(e)
 
-    def _put_hsmsss_comm_state_to_not_connected(self, callback=None):
-        self._put_hsmsss_comm_state(
-            HsmsSsCommunicateState.NOT_CONNECT,
-            callback)
+        finally:
+            self.shutdown()
 
-    def _put_hsmsss_comm_state_to_connected(self, callback=None):
-        self._put_hsmsss_comm_state(
-            HsmsSsCommunicateState.CONNECTED,
-            callback)
+    def send_nowait(self, msg):
+        """Write message without waiting drain and reply.
 
-    def _put_hsmsss_comm_state_to_selected(self, callback=None):
-        self._put_hsmsss_comm_state(
-            HsmsSsCommunicateState.SELECTED,
-            callback)
+        For responses of control messages in receive callback.
 
+        Args:
+            msg (HsmsSsMessage): message.
 
-class HsmsSsActiveCommunicator(AbstractHsmsSsCommunicator):
+        Raises:
+            HsmsSsSendMessageError: if connection terminated or write failed.
+        """
+        if self.__terminated:
+            raise HsmsSsSendMessageError("HsmsSsConnection terminated", msg)
 
-    __PROTOCOL = 'HSMS-SS-ACTIVE'
+        try:
+            self.__writer.writelines(msg.to_buffers())
+            self.__put_sended_msg(msg)
+        except Exception as e:
+            raise HsmsSsSendMessageError(e, msg)
 
-    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
-        super(HsmsSsActiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
+    async def __send(self, msg):
+        if self.__terminated:
+            raise HsmsSsSendMessageError("HsmsSsConnection terminated", msg)
 
-        self.__ipaddr = (ip_address, port)
+        try:
+            self.__writer.writelines(msg.to_buffers())
+            async with self.__drain_lock:
+                await self.__writer.drain()
+            self.__put_sended_msg(msg)
+        except Exception as e:
+            raise HsmsSsSendMessageError(e, msg)
 
-        self.__circuit_cdt = threading.Condition()
+    async def send(self, msg):
+        """Send message, and wait reply if W-Bit data message or select/linktest request.
 
-        self.__cdts = list()
-        self.__cdts.append(self.__circuit_cdt)
+        Args:
+            msg (HsmsSsMessage): message.
 
-        self.__ths = list()
+        Raises:
+            HsmsSsCommunicatorError: if connection terminated while waiting reply.
+            HsmsSsSendMessageError: if send failed.
+            HsmsSsTimeoutT3Error: if Timeout-T3.
+            HsmsSsTimeoutT6Error: if Timeout-T6.
+            HsmsSsRejectMessageError: if reply is reject.
 
-        self.__recv_primary_msg_putter = CallbackQueuing(self._put_recv_primary_msg)
+        Returns:
+            HsmsSsMessage: Reply-Message if exist, otherwise None.
+        """
 
-    def _get_protocol(self):
-        return self.__PROTOCOL
+        timeout_tx = -1.0
 
-    def _get_ipaddress(self):
-        return self.__ipaddr
+        ctrl_type = msg.get_control_type()
 
-    def _open(self):
+        if ctrl_type == HsmsSsControlType.DATA:
+            if msg.wbit:
+                timeout_tx = self.__comm.timeout_t3
 
-        with self._open_close_rlock:
-            if self.is_closed:
-                raise RuntimeError("Already closed")
-            if self.is_open:
-                raise RuntimeError("Already opened")
+        elif (ctrl_type == HsmsSsControlType.SELECT_REQ
+              or ctrl_type == HsmsSsControlType.LINKTEST_REQ):
 
-            th = threading.Thread(target=self.__loop, daemon=True)
-            self.__ths.append(th)
-            th.start()
+            timeout_tx = self.__comm.timeout_t6
 
-            super()._open()
+        if timeout_tx < 0.0:
+            await self.__send(msg)
+            return None
 
-            self._set_opened()
+        key = msg.system_bytes
+        fut = asyncio.get_running_loop().create_future()
 
-    def __loop(self):
-        cdt = threading.Condition()
         try:
-            self.__cdts.append(cdt)
-            while not self.is_closed:
-                self.__connect()
-                if self.is_closed:
-                    return
-                with cdt:
-                    cdt.wait(self.timeout_t5)
-        finally:
-            self.__cdts.remove(cdt)
+            self.__reply_futures[key] = fut
 
-    def __connect(self):
+            await self.__send(msg)
 
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                rsp = await asyncio.wait_for(fut, timeout_tx)
+            except asyncio.TimeoutError:
+                rsp = None
 
-                sock.connect(self._get_ipaddress())
+            if rsp is None:
 
-                with self._build_hsmsss_connection(sock, self.__receiving_msg) as conn:
+                if self.__terminated:
 
-                    def _f():
-                        conn.await_termination()
-                        with self.__circuit_cdt:
-                            self.__circuit_cdt.notify_all()
+                    raise HsmsSsCommunicatorError("HsmsSsConnection terminated")
 
-                    th = threading.Thread(target=_f, daemon=True)
+                elif ctrl_type == HsmsSsControlType.DATA:
 
-                    try:
-                        self.__ths.append(th)
-                        th.start()
+                    raise HsmsSsTimeoutT3Error("HsmsSs-Timeout-T3", msg)
 
-                        self._put_hsmsss_comm_state_to_connected()
+                else:
+                    self.shutdown()
+                    raise HsmsSsTimeoutT6Error("HsmsSs-Timeout-T6", msg)
 
-                        rsp = conn.send(self.build_select_req())
+            elif rsp.get_control_type() == HsmsSsControlType.REJECT_REQ:
 
-                        if rsp is not None:
+                raise HsmsSsRejectMessageError("HsmsSs-Reject-Message", msg)
 
-                            ss = rsp.get_select_status()
+            else:
+                return rsp
 
-                            if (ss == HsmsSsSelectStatus.SUCCESS
-                                    or ss == HsmsSsSelectStatus.ACTIVED):
+        finally:
+            if self.__reply_futures.get(key, None) is fut:
+                del self.__reply_futures[key]
+
+
+class AbstractAsyncHsmsSsCommunicator(AbstractSecsCommunicator):
+    """HSMS-SS communicator on asyncio.
+
+    Runs in one event loop without threads, so one loop drives many sessions.
+    open, close and open_and_wait_until_communicating are coroutines,
+    send, reply, send_sml and reply_sml return awaitables.
+    Received primary messages are put to listeners and to async iteration.
+    Listeners are called in event loop, and must not block.
+    GEM helpers are not available, these wait reply by blocking.
+    send_async and reply_async submit to event loop from other threads,
+    transactions of send_async queued beyond max_in_flight are sent by one sender thread.
+
+    Examples:
+        async with AsyncHsmsSsActiveCommunicator('127.0.0.1', 5000, 10, False) as comm:
+            await comm.open_and_wait_until_communicating()
+            reply = await comm.send(1, 1, True)
+            async for primary in comm:
+                await comm.reply(primary, primary.strm, primary.func + 1, False)
+    """
 
-                                self._set_hsmsss_connection(
-                                    conn,
-                                    self._put_hsmsss_comm_state_to_selected)
+    def __init__(self, session_id, is_equip, **kwargs):
+        super(AbstractAsyncHsmsSsCommunicator, self).__init__(session_id, is_equip, **kwargs)
 
-                                with self.__circuit_cdt:
-                                    self.__circuit_cdt.wait()
+        self._hsmsss_connection = None
 
-                    finally:
-                        self._unset_hsmsss_connection(
-                            self._put_hsmsss_comm_state_to_not_connected)
+        self._hsmsss_comm = HsmsSsCommunicateState.NOT_CONNECT
+        self._hsmsss_comm_lstnrs = list()
 
-                        self.__ths.remove(th)
+        self.__loop = None
+        self.__communicate_event = None
+        self.__recv_primary_msg_queue = None
+        self.__tasks = list()
 
-                        try:
-                            sock.shutdown(socket.SHUT_RDWR)
-                        except Exception as e:
-                            if not self.is_closed:
-                                self._put_error(e)
+        hsmsss_comm_lstnr = kwargs.get('hsmsss_communicate', None)
+        if hsmsss_comm_lstnr is not None:
+            self.add_hsmsss_communicate_listener(hsmsss_comm_lstnr)
 
-        except ConnectionError as e:
-            if not self.is_closed:
-                self._put_error(HsmsSsCommunicatorError(e))
-        except HsmsSsCommunicatorError as e:
-            if not self.is_closed:
-                self._put_error(e)
-        except HsmsSsSendMessageError as e:
-            if not self.is_closed:
-                self._put_error(e)
-        except HsmsSsWaitReplyMessageError as e:
-            if not self.is_closed:
-                self._put_error(e)
+    def __str__(self):
+        ipaddr = self._get_ipaddress()
+        return str({
+            'protocol': self._get_protocol(),
+            'ip_address': (ipaddr[0]) + ':' + str(ipaddr[1]),
+            'session_id': self.session_id,
+            'is_equip': self.is_equip,
+            'communicate_state': self.get_hsmsss_communicate_state(),
+            'name': self.name
+        })
 
-    def __receiving_msg(self, recv_msg, conn):
+    def __repr__(self):
+        return repr({
+            'protocol': self._get_protocol(),
+            'ip_address': self._get_ipaddress(),
+            'session_id': self.session_id,
+            'is_equip': self.is_equip,
+            'communicate_state': self.get_hsmsss_communicate_state(),
+            'name': self.name
+        })
 
-        def _f():
+    def _get_protocol(self):
+        # prototype
+        raise NotImplementedError()
 
-            if recv_msg is None:
-                with self.__circuit_cdt:
-                    self.__circuit_cdt.notify_all()
-                    return
+    def _get_ipaddress(self):
+        # prototype
+        raise NotImplementedError()
 
-            ctrl_type = recv_msg.get_control_type()
+    @property
+    def session_id(self):
+        pass
 
-            try:
-                if ctrl_type == HsmsSsControlType.DATA:
+    @session_id.setter
+    def session_id(self, val):
+        """SESSION-ID setter.
 
-                    if self.get_hsmsss_communicate_state() == HsmsSsCommunicateState.SELECTED:
+        Args:
+            val (int): SESSION_ID
+        """
+        self.device_id = val
 
-                        self.__recv_primary_msg_putter.put(recv_msg)
+    @session_id.getter
+    def session_id(self):
+        """SESSION-ID getter.
 
-                    else:
-                        conn.send(
-                            self.build_select_rsp(
-                                recv_msg,
-                                HsmsSsRejectReason.NOT_SELECTED))
+        Returns:
+            int: SESSION_ID
+        """
+        return self.device_id
 
-                elif ctrl_type == HsmsSsControlType.LINKTEST_REQ:
+    async def open(self):
+        """Open communicator, in running event loop.
+        """
+        self._open()
 
-                    conn.send(self.build_linktest_rsp(recv_msg))
+    def _open(self):
+        with self._open_close_rlock:
+            if self.is_closed:
+                raise RuntimeError("Already closed")
+            if self.is_open:
+                raise RuntimeError("Already opened")
 
-                elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
+            self.__loop = asyncio.get_running_loop()
+            self.__communicate_event = asyncio.Event()
+            self.__tasks.append(asyncio.ensure_future(self._loop()))
 
-                    with self.__circuit_cdt:
-                        self.__circuit_cdt.notify_all()
+            self._set_opened()
 
-                elif ctrl_type == HsmsSsControlType.SELECT_REQ:
+    async def _loop(self):
+        # prototype
+        raise NotImplementedError()
 
-                    conn.send(
-                        self.build_reject_req(
-                            recv_msg,
-                            HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
+    async def close(self):
+        """Close communicator, and wait until tasks finished.
+        """
+        self._close()
 
-                elif (ctrl_type == HsmsSsControlType.SELECT_RSP
-                      or ctrl_type == HsmsSsControlType.LINKTEST_RSP):
+        tasks = [t for t in self.__tasks if t is not asyncio.current_task()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-                    conn.send(
-                        self.build_reject_req(
-                            recv_msg,
-                            HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
+    def _close(self):
+        with self._open_close_rlock:
+            if self.is_closed:
+                return
 
-                elif ctrl_type == HsmsSsControlType.REJECT_REQ:
+            self._set_closed()
 
-                    # Nothing
-                    pass
+        try:
+            conn = self._hsmsss_connection
+            if conn is not None:
+                conn.shutdown()
 
-                else:
+            for t in self.__tasks:
+                t.cancel()
 
-                    if HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
+            if self.__communicate_event is not None:
+                self.__communicate_event.set()
 
-                        conn.send(
-                            self.build_reject_req(
-                                recv_msg,
-                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
+            if self.__recv_primary_msg_queue is not None:
+                self.__recv_primary_msg_queue.put_nowait(None)
 
-                    else:
+        except RuntimeError:
+            # event loop already closed
+            pass
 
-                        conn.send(
-                            self.build_reject_req(
-                                recv_msg,
-                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
+    async def __aenter__(self):
+        return self
 
-            except HsmsSsSendMessageError as e:
-                self._put_error(e)
-            except HsmsSsWaitReplyMessageError as e:
-                self._put_error(e)
-            except HsmsSsCommunicatorError as e:
-                self._put_error(e)
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
 
-        th = threading.Thread(target=_f, daemon=True)
-        try:
-            self.__ths.append(th)
-            th.start()
-        finally:
-            self.__ths.remove(th)
+    async def open_and_wait_until_communicating(self, timeout=None):
+        """Open communicator if not opened, and wait until selected.
 
-    def _close(self):
+        Args:
+            timeout (float): seconds, None if not timeout. Defaults to None.
+
+        Raises:
+            SecsCommunicatorError: if communicator closed.
+
+        Returns:
+            bool: True if communicating, False if timeout.
+        """
+        if not self.is_open:
+            self._open()
+
+        try:
+            await asyncio.wait_for(self.__communicate_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
 
         if self.is_closed:
-            return
+            raise SecsCommunicatorError("Communicator closed")
 
-        super()._close()
+        return True
 
-        self._set_closed()
+    def __aiter__(self):
+        if self.__recv_primary_msg_queue is None:
+            self.__recv_primary_msg_queue = asyncio.Queue()
+            if self.is_closed:
+                self.__recv_primary_msg_queue.put_nowait(None)
+        return self
 
-        self.__recv_primary_msg_putter.shutdown()
+    async def __anext__(self):
+        qq = self.__recv_primary_msg_queue
+        msg = await qq.get()
+        if msg is None:
+            # keep end mark for other iterators
+            qq.put_nowait(None)
+            raise StopAsyncIteration
+        return msg
 
-        for cdt in self.__cdts:
-            with cdt:
-                cdt.notify_all()
+    def _put_recv_primary_msg(self, recv_msg):
+        super()._put_recv_primary_msg(recv_msg)
+        if recv_msg is not None and self.__recv_primary_msg_queue is not None:
+            self.__recv_primary_msg_queue.put_nowait(recv_msg)
 
-        for th in self.__ths:
-            if th.is_alive():
-                th.join(0.1)
+    def _build_hsmsss_connection(self, reader, writer, recv_primary_msg_callback):
+        return AsyncHsmsSsConnection(
+            reader, writer,
+            self,
+            recv_primary_msg_callback,
+            self._put_recv_all_msg,
+            self._put_sended_msg,
+            self._put_error)
+
+    def _set_hsmsss_connection(self, conn):
+        if self._hsmsss_connection is None:
+            self._hsmsss_connection = conn
+            self._put_hsmsss_comm_state(HsmsSsCommunicateState.SELECTED)
+            return True
+        else:
+            return False
 
+    def _unset_hsmsss_connection(self, conn):
+        if self._hsmsss_connection is conn:
+            self._hsmsss_connection = None
+            self._put_hsmsss_comm_state(HsmsSsCommunicateState.NOT_CONNECT)
 
-class HsmsSsPassiveCommunicator(AbstractHsmsSsCommunicator):
+    async def _send(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        return await self.send_hsmsss_msg(
+            HsmsSsDataMessage(strm, func, wbit, secs2body, system_bytes, device_id))
 
-    __PROTOCOL = 'HSMS-SS-PASSIVE'
-    __TIMEOUT_REBIND = 5.0
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        # send_async, reply_async from other threads than event loop
+        return asyncio.run_coroutine_threadsafe(
+            self._send(strm, func, wbit, secs2body, system_bytes, device_id),
+            self.__loop)
 
-    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
-        super(HsmsSsPassiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
+    async def send_many(self, messages, max_in_flight=None):
+        """Send primary messages pipelined, and wait all replies.
 
-        self.__ipaddr = (ip_address, port)
+        Args:
+            messages (iterable): SecsMessage, or tuple of (strm, func, wbit) or (strm, func, wbit, secs2body).
+            max_in_flight (int): max in-flight transactions. Defaults to None, max_in_flight of communicator.
 
-        self.__cdts = list()
-        self.__ths = list()
+        Raises:
+            ValueError: if max_in_flight is less than 1.
 
-        self.__recv_primary_msg_putter = CallbackQueuing(self._put_recv_primary_msg)
+        Returns:
+            list: Reply-Message or None or exception of each message, in order of messages.
+        """
+        n = self.max_in_flight if max_in_flight is None else int(max_in_flight)
+        if n is not None and n < 1:
+            raise ValueError("max_in_flight require >= 1")
 
-        self.timeout_rebind = kwargs.get('timeout_rebind', self.__TIMEOUT_REBIND)
+        sem = None if n is None else asyncio.Semaphore(n)
 
-    def _get_protocol(self):
-        return self.__PROTOCOL
+        async def _send(m):
+            args = self._create_send_args(m)
+            if sem is None:
+                return await self._send(*args)
+            async with sem:
+                return await self._send(*args)
 
-    def _get_ipaddress(self):
-        return self.__ipaddr
+        return await asyncio.gather(*[_send(m) for m in messages], return_exceptions=True)
 
-    @property
-    def timeout_rebind(self):
-        pass
+    async def send_hsmsss_msg(self, msg):
+        conn = self._hsmsss_connection
+        if conn is None:
+            raise HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg)
+        return await conn.send(msg)
 
-    @timeout_rebind.setter
-    def timeout_rebind(self, val):
-        self.__timeout_rebind = self._try_gt_zero(val)
+    def build_select_req(self):
+        return HsmsSsControlMessage.build_select_request(
+            self._create_system_bytes())
 
-    @timeout_rebind.getter
-    def timeout_rebind(self):
-        return self.__timeout_rebind
+    def build_linktest_req(self):
+        return HsmsSsControlMessage.build_linktest_request(
+            self._create_system_bytes())
 
-    def _open(self):
+    def build_separate_req(self):
+        return HsmsSsControlMessage.build_separate_request(
+            self._create_system_bytes())
 
-        with self._open_close_rlock:
-            if self.is_closed:
-                raise RuntimeError("Already closed")
-            if self.is_open:
-                raise RuntimeError("Already opened")
+    async def send_linktest_req(self):
+        return await self.send_hsmsss_msg(self.build_linktest_req())
 
-            th = threading.Thread(target=self.__loop, daemon=True)
-            self.__ths.append(th)
-            th.start()
+    async def send_separate_req(self):
+        return await self.send_hsmsss_msg(self.build_separate_req())
 
-            super()._open()
+    def _receive_control_msg(self, recv_msg, conn):
+        # control messages except SELECT.req, SEPARATE.req, common to active and passive
 
-            self._set_opened()
+        ctrl_type = recv_msg.get_control_type()
 
-    def __loop(self):
-        cdt = threading.Condition()
-        try:
-            self.__cdts.append(cdt)
-            while not self.is_closed:
-                self.__open_server()
-                if self.is_closed:
-                    return
-                with cdt:
-                    cdt.wait(self.timeout_rebind)
-        finally:
-            self.__cdts.remove(cdt)
+        if ctrl_type == HsmsSsControlType.LINKTEST_REQ:
 
-    def __open_server(self):
-        cdt = threading.Condition()
-        try:
-            self.__cdts.append(cdt)
+            conn.send_nowait(
+                HsmsSsControlMessage.build_linktest_response(recv_msg))
 
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        elif (ctrl_type == HsmsSsControlType.SELECT_RSP
+              or ctrl_type == HsmsSsControlType.LINKTEST_RSP):
 
-                server.bind(self._get_ipaddress())
-                server.listen()
+            conn.send_nowait(
+                HsmsSsControlMessage.build_reject_request(
+                    recv_msg,
+                    HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
 
-                def _f():
+        elif ctrl_type == HsmsSsControlType.REJECT_REQ:
 
-                    def _f_sock(s):
-                        with s:
-                            try:
-                                self.__accept_socket(s)
-                            except Exception as e3:
-                                if not self.is_closed:
-                                    self._put_error(e3)
-                            finally:
-                                try:
-                                    s.shutdown(socket.SHUT_RDWR)
-                                except Exception as e4:
-                                    if not self.is_closed:
-                                        self._put_error(e4)
+            # Nothing
+            pass
 
-                    try:
-                        while not self.is_closed:
-                            sock = (server.accept())[0]
+        elif HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
 
-                            threading.Thread(
-                                target=_f_sock,
-                                args=(sock, ),
-                                daemon=True
-                                ).start()
+            conn.send_nowait(
+                HsmsSsControlMessage.build_reject_request(
+                    recv_msg,
+                    HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
 
-                    except Exception as e2:
-                        if not self.is_closed:
-                            self._put_error(HsmsSsCommunicatorError(e2))
+        else:
 
-                    finally:
-                        with cdt:
-                            cdt.notify_all()
+            conn.send_nowait(
+                HsmsSsControlMessage.build_reject_request(
+                    recv_msg,
+                    HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
 
-                th = threading.Thread(target=_f, daemon=True)
+    def get_hsmsss_communicate_state(self):
+        return self._hsmsss_comm
 
-                try:
-                    self.__ths.append(th)
-                    th.start()
+    def add_hsmsss_communicate_listener(self, listener):
+        """Add HSMS-SS-Communicate-state-change-listener.
 
-                    with cdt:
-                        cdt.wait()
+        If listener-arguments is 1, put HSMS-SS-Communicate-State.
+        If listener-arguments is 2, put HSMS-SS-Communicate-State and self-communicator-instance.
+        HSMS-SS-Communicate-State is instance of `HsmsSsCommunicateState`.
 
-                finally:
-                    self.__ths.remove(th)
+        Args:
+            listener (function): HSMS-SS-Communicate-state-change-listener
 
-                    try:
-                        server.shutdown(socket.SHUT_RDWR)
-                    except Exception as es:
-                        if not self.is_closed:
-                            self._put_error(es)
+        Returns:
+            None
+        """
+        self._hsmsss_comm_lstnrs.append(listener)
+        if self._is_single_args_listener(listener):
+            listener(self._hsmsss_comm)
+        else:
+            listener(self._hsmsss_comm, self)
 
-        except Exception as e:
-            if not self.is_closed:
-                self._put_error(HsmsSsCommunicatorError(e))
+    def remove_hsmsss_communicate_listener(self, listener):
+        """Remove HSMS-SS-Communicate-state-change-listener.
 
-        finally:
-            self.__cdts.remove(cdt)
+        Args:
+            listener (function): HSMS-SS-Communicate-state-change-listener
 
-    def __accept_socket(self, sock):
+        Returns:
+            None
+        """
+        self._hsmsss_comm_lstnrs.remove(listener)
 
-        qq = WaitingQueuing()
+    def _put_hsmsss_comm_state(self, state):
+        if state != self._hsmsss_comm:
+            self._hsmsss_comm = state
+            for ls in self._hsmsss_comm_lstnrs:
+                if self._is_single_args_listener(ls):
+                    ls(self._hsmsss_comm)
+                else:
+                    ls(self._hsmsss_comm, self)
 
-        cdt = threading.Condition()
+            selected = (state == HsmsSsCommunicateState.SELECTED)
+            self._put_communicated(selected)
 
-        try:
-            self.__cdts.append(cdt)
+            if self.__communicate_event is not None:
+                if selected or self.is_closed:
+                    self.__communicate_event.set()
+                else:
+                    self.__communicate_event.clear()
 
-            def _put_to_qq(recv_msg, c):
-                qq.put((recv_msg, c))
 
-            with self._build_hsmsss_connection(sock, _put_to_qq) as conn:
+class AsyncHsmsSsActiveCommunicator(AbstractAsyncHsmsSsCommunicator):
 
-                def _comm():
-                    conn.await_termination()
-                    with cdt:
-                        cdt.notify_all()
+    __PROTOCOL = 'HSMS-SS-ACTIVE'
 
-                def _receiving():
+    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
+        super(AsyncHsmsSsActiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
 
-                    if self.__receiving_msg_until_selected(qq):
+        self.__ipaddr = (ip_address, port)
 
-                        try:
-                            self.__receiving_msg(qq)
-                        finally:
-                            self._unset_hsmsss_connection(
-                                self._put_hsmsss_comm_state_to_not_connected)
+    def _get_protocol(self):
+        return self.__PROTOCOL
 
-                    with cdt:
-                        cdt.notify_all()
+    def _get_ipaddress(self):
+        return self.__ipaddr
 
-                threading.Thread(target=_comm, daemon=True).start()
-                threading.Thread(target=_receiving, daemon=True).start()
+    async def _loop(self):
+        while not self.is_closed:
+            await self.__connect()
+            if self.is_closed:
+                return
+            await asyncio.sleep(self.timeout_t5)
 
-                with cdt:
-                    cdt.wait()
+    async def __connect(self):
 
-        finally:
-            self.__cdts.remove(cdt)
-            qq.shutdown()
+        try:
+            reader, writer = await asyncio.open_connection(*self._get_ipaddress())
+        except OSError as e:
+            if not self.is_closed:
+                self._put_error(HsmsSsCommunicatorError(e))
+            return
 
-    def __receiving_msg_until_selected(self, qq):
+        conn = self._build_hsmsss_connection(reader, writer, self.__receiving_msg)
 
-        while not self.is_closed:
+        try:
+            self._put_hsmsss_comm_state(HsmsSsCommunicateState.CONNECTED)
 
-            tt = qq.poll(self.timeout_t7)
+            rsp = await conn.send(self.build_select_req())
 
-            if tt is None:
-                return False
+            if rsp is not None:
 
-            recv_msg = tt[0]
-            conn = tt[1]
+                ss = rsp.get_select_status()
 
-            ctrl_type = recv_msg.get_control_type()
+                if (ss == HsmsSsSelectStatus.SUCCESS
+                        or ss == HsmsSsSelectStatus.ACTIVED):
 
-            try:
-                if ctrl_type == HsmsSsControlType.DATA:
+                    if self._set_hsmsss_connection(conn):
+                        await conn.await_termination()
 
-                    conn.send(
-                        self.build_select_rsp(
-                            recv_msg,
-                            HsmsSsRejectReason.NOT_SELECTED))
+        except HsmsSsCommunicatorError as e:
+            if not self.is_closed:
+                self._put_error(e)
+        except HsmsSsSendMessageError as e:
+            if not self.is_closed:
+                self._put_error(e)
+        except HsmsSsWaitReplyMessageError as e:
+            if not self.is_closed:
+                self._put_error(e)
 
-                elif ctrl_type == HsmsSsControlType.LINKTEST_REQ:
+        finally:
+            conn.shutdown()
+            self._unset_hsmsss_connection(conn)
+            self._put_hsmsss_comm_state(HsmsSsCommunicateState.NOT_CONNECT)
 
-                    conn.send(self.build_linktest_rsp(recv_msg))
+    def __receiving_msg(self, recv_msg, conn):
 
-                elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
+        ctrl_type = recv_msg.get_control_type()
 
-                    return False
+        try:
+            if ctrl_type == HsmsSsControlType.DATA:
 
-                elif ctrl_type == HsmsSsControlType.SELECT_REQ:
+                if self._hsmsss_connection is conn:
 
-                    r = self._set_hsmsss_connection(
-                        conn,
-                        self._put_hsmsss_comm_state_to_selected)
+                    self._put_recv_primary_msg(recv_msg)
 
-                    if r:
+                else:
+                    conn.send_nowait(
+                        HsmsSsControlMessage.build_reject_request(
+                            recv_msg,
+                            HsmsSsRejectReason.NOT_SELECTED))
 
-                        conn.send(
-                            self.build_select_rsp(
-                                recv_msg,
-                                HsmsSsSelectStatus.SUCCESS))
+            elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
 
-                        return True
+                conn.shutdown()
 
-                    else:
+            elif ctrl_type == HsmsSsControlType.SELECT_REQ:
 
-                        conn.send(
-                            self.build_select_rsp(
-                                recv_msg,
-                                HsmsSsSelectStatus.ALREADY_USED))
+                conn.send_nowait(
+                    HsmsSsControlMessage.build_reject_request(
+                        recv_msg,
+                        HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
 
-                elif (ctrl_type == HsmsSsControlType.SELECT_RSP
-                      or ctrl_type == HsmsSsControlType.LINKTEST_RSP):
+            else:
+                self._receive_control_msg(recv_msg, conn)
 
-                    conn.send(
-                        self.build_reject_req(
-                            recv_msg,
-                            HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
+        except HsmsSsSendMessageError as e:
+            self._put_error(e)
 
-                elif ctrl_type == HsmsSsControlType.REJECT_REQ:
 
-                    # Nothing
-                    pass
+class AsyncHsmsSsPassiveCommunicator(AbstractAsyncHsmsSsCommunicator):
 
-                else:
+    __PROTOCOL = 'HSMS-SS-PASSIVE'
+    __TIMEOUT_REBIND = 5.0
 
-                    if HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
+    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
+        super(AsyncHsmsSsPassiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
 
-                        conn.send(
-                            self.build_reject_req(
-                                recv_msg,
-                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
+        self.__ipaddr = (ip_address, port)
 
-                    else:
+        self.__conns = set()
 
-                        conn.send(
-                            self.build_reject_req(
-                                recv_msg,
-                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
+        self.timeout_rebind = kwargs.get('timeout_rebind', self.__TIMEOUT_REBIND)
 
-            except HsmsSsSendMessageError as e:
-                self._put_error(e)
-            except HsmsSsWaitReplyMessageError as e:
-                self._put_error(e)
-            except HsmsSsCommunicatorError as e:
-                self._put_error(e)
+    def _get_protocol(self):
+        return self.__PROTOCOL
 
-        return False
+    def _get_ipaddress(self):
+        return self.__ipaddr
 
-    def __receiving_msg(self, qq):
+    @property
+    def timeout_rebind(self):
+        pass
 
-        while not self.is_closed:
+    @timeout_rebind.setter
+    def timeout_rebind(self, val):
+        self.__timeout_rebind = self._try_gt_zero(val)
 
-            tt = qq.poll()
+    @timeout_rebind.getter
+    def timeout_rebind(self):
+        return self.__timeout_rebind
 
-            if tt is None:
-                return False
+    async def _loop(self):
+        try:
+            while not self.is_closed:
 
-            recv_msg = tt[0]
-            conn = tt[1]
+                try:
+                    server = await asyncio.start_server(
+                        self.__accept,
+                        *self._get_ipaddress())
 
-            ctrl_type = recv_msg.get_control_type()
+                except OSError as e:
+                    if not self.is_closed:
+                        self._put_error(HsmsSsCommunicatorError(e))
 
-            try:
-                if ctrl_type == HsmsSsControlType.DATA:
+                else:
+                    try:
+                        await server.serve_forever()
+                    finally:
+                        server.close()
 
-                    self.__recv_primary_msg_putter.put(recv_msg)
+                if self.is_closed:
+                    return
 
-                elif ctrl_type == HsmsSsControlType.LINKTEST_REQ:
+                await asyncio.sleep(self.timeout_rebind)
 
-                    conn.send(self.build_linktest_rsp(recv_msg))
+        finally:
+            for conn in list(self.__conns):
+                conn.shutdown()
 
-                elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
+    async def __accept(self, reader, writer):
 
-                    return False
+        conn = self._build_hsmsss_connection(reader, writer, self.__receiving_msg)
 
-                elif ctrl_type == HsmsSsControlType.SELECT_REQ:
+        try:
+            self.__conns.add(conn)
 
-                    conn.send(
-                        self.build_select_rsp(
-                            recv_msg,
-                            HsmsSsSelectStatus.ACTIVED))
+            try:
+                await asyncio.wait_for(conn.await_termination(), self.timeout_t7)
+            except asyncio.TimeoutError:
+                if self._hsmsss_connection is not conn:
+                    # Timeout-T7, not selected
+                    return
 
-                elif (ctrl_type == HsmsSsControlType.SELECT_RSP
-                      or ctrl_type == HsmsSsControlType.LINKTEST_RSP):
+                await conn.await_termination()
 
-                    conn.send(
-                        self.build_reject_req(
-                            recv_msg,
-                            HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
+        finally:
+            conn.shutdown()
+            self.__conns.discard(conn)
+            self._unset_hsmsss_connection(conn)
 
-                elif ctrl_type == HsmsSsControlType.REJECT_REQ:
+    def __receiving_msg(self, recv_msg, conn):
 
-                    # Nothing
-                    pass
+        ctrl_type = recv_msg.get_control_type()
+
+        try:
+            if ctrl_type == HsmsSsControlType.DATA:
+
+                if self._hsmsss_connection is conn:
+
+                    self._put_recv_primary_msg(recv_msg)
 
                 else:
+                    conn.send_nowait(
+                        HsmsSsControlMessage.build_reject_request(
+                            recv_msg,
+                            HsmsSsRejectReason.NOT_SELECTED))
 
-                    if HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
+            elif ctrl_type == HsmsSsControlType.SEPARATE_REQ:
 
-                        conn.send(
-                            self.build_reject_req(
-                                recv_msg,
-                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
+                conn.shutdown()
 
-                    else:
+            elif ctrl_type == HsmsSsControlType.SELECT_REQ:
 
-                        conn.send(
-                            self.build_reject_req(
-                                recv_msg,
-                                HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
+                if self._hsmsss_connection is conn:
 
-            except HsmsSsSendMessageError as e:
-                self._put_error(e)
-            except HsmsSsWaitReplyMessageError as e:
-                self._put_error(e)
-            except HsmsSsCommunicatorError as e:
-                self._put_error(e)
+                    ss = HsmsSsSelectStatus.ACTIVED
 
-        return False
+                elif self._set_hsmsss_connection(conn):
 
-    def _close(self):
+                    ss = HsmsSsSelectStatus.SUCCESS
 
-        if self.is_closed:
-            return
+                else:
 
-        super()._close()
+                    ss = HsmsSsSelectStatus.ALREADY_USED
 
-        self._set_closed()
+                conn.send_nowait(
+                    HsmsSsControlMessage.build_select_response(recv_msg, ss))
 
-        for cdt in self.__cdts:
-            with cdt:
-                cdt.notify_all()
+            else:
+                self._receive_control_msg(recv_msg, conn)
 
-        for th in self.__ths:
-            if th.is_alive():
-                th.join(0.1)
+        except HsmsSsSendMessageError as e:
+            self._put_error(e)
 
 
 class Secs1CommunicatorError(SecsCommunicatorError):
@@ -3655,9 +7432,54 @@ class MsgAndRecvBytesWaitingQueuing(WaitingQueuing):
     def __init__(self):
         super(MsgAndRecvBytesWaitingQueuing, self).__init__()
         self.__msg_queue = list()
+        self.__recv_buffer = bytearray()
 
     def put_recv_bytes(self, bs):
-        self.puts(bs)
+        with self._v_cdt:
+            if bs and not self._is_terminated():
+                self.__recv_buffer += bs
+                self._v_cdt.notify_all()
+
+    def _poll_vv(self):
+        with self._v_cdt:
+            if self.__recv_buffer:
+                v = self.__recv_buffer[0]
+                del self.__recv_buffer[0]
+                return v
+            else:
+                return None
+
+    def _has_vv(self):
+        with self._v_cdt:
+            return bool(self.__recv_buffer)
+
+    def put_to_list(self, values, pos, size, timeout=None):
+
+        def _f(vv, p, m):
+            buf = self.__recv_buffer
+            if buf:
+                r = min(m - p, len(buf))
+                vv += buf[0:r]
+                del buf[0:r]
+                return r
+            else:
+                return -1
+
+        with self._v_cdt:
+
+            if self._is_terminated():
+                return -1
+
+            rr = _f(values, pos, size)
+            if rr > 0:
+                return rr
+
+            self._wait_vv(timeout)
+
+            if self._is_terminated():
+                return -1
+
+            return _f(values, pos, size)
 
     def entry_msg(self, msg):
         with self._v_cdt:
@@ -3692,7 +7514,7 @@ class MsgAndRecvBytesWaitingQueuing(WaitingQueuing):
     def recv_bytes_garbage(self, timeout):
 
         with self._v_cdt:
-            del self._vv[:]
+            del self.__recv_buffer[:]
 
             if self._is_terminated():
                 return
@@ -3714,6 +7536,7 @@ class SendSecs1MessagePack:
         self.__except = None
         self.__timer_resetted = True
         self.__reply_msg = None
+        self.__listener = None
 
     def secs1msg(self):
         return self.__msg
@@ -3746,12 +7569,14 @@ class SendSecs1MessagePack:
             self.__sended = True
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
 
     def notify_except(self, e):
         with self.__lock:
             self.__except = e
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
 
     def wait_until_reply(self, timeout):
 
@@ -3775,12 +7600,29 @@ class SendSecs1MessagePack:
             self.__reply_msg = msg
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
 
     def notify_timer_reset(self):
         with self.__lock:
             self.__timer_resetted = True
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
+
+    def set_listener(self, listener):
+        # listener is called without lock on each notify.
+        self.__listener = listener
+
+    def __notify_listener(self):
+        if self.__listener is not None:
+            self.__listener()
+
+    def poll_state(self):
+        # (sended, except, reply-msg, timer-resetted), timer-resetted is cleared.
+        with self.__lock:
+            r = self.__timer_resetted
+            self.__timer_resetted = False
+            return self.__sended, self.__except, self.__reply_msg, r
 
 
 class Secs1SendReplyPackPool:
@@ -3866,6 +7708,10 @@ class AbstractSecs1Communicator(AbstractSecsCommunicator):
 
         self.__circuit_th = None
 
+        self.__async_entries = list()
+        self.__async_cdt = threading.Condition()
+        self.__async_waiting = False
+
     @property
     def is_master(self):
         pass
@@ -3950,6 +7796,9 @@ class AbstractSecs1Communicator(AbstractSecsCommunicator):
         self.__secs1_circuit_error_msg_putter.shutdown()
         self.__msg_and_bytes_queue.shutdown()
 
+        with self.__async_cdt:
+            self.__async_cdt.notify_all()
+
         if self.__circuit_th is not None:
             if self.__circuit_th.is_alive():
                 self.__circuit_th.join(0.1)
@@ -3967,24 +7816,139 @@ class AbstractSecs1Communicator(AbstractSecsCommunicator):
 
             self.__msg_and_bytes_queue.entry_msg(pack)
 
-            timeout_tx = self.timeout_t3 if msg.wbit else -1.0
+            return self.__wait_pack(pack)
+
+        finally:
+            self.__send_reply_pack_pool.remove(pack)
+
+    def __wait_pack(self, pack):
 
-            pack.wait_until_sended()
+        msg = pack.secs1msg()
 
-            self.__sended_msg_putter.put(pack.secs1msg())
+        timeout_tx = self.timeout_t3 if msg.wbit else -1.0
 
-            if timeout_tx > 0.0:
+        pack.wait_until_sended()
 
-                r = pack.wait_until_reply(timeout_tx)
-                if r is None:
-                    raise Secs1TimeoutT3Error('Timeout-T3', pack.secs1msg())
-                else:
-                    return r
+        self.__sended_msg_putter.put(msg)
+
+        if timeout_tx > 0.0:
+
+            r = pack.wait_until_reply(timeout_tx)
+            if r is None:
+                raise Secs1TimeoutT3Error('Timeout-T3', msg)
             else:
-                return None
+                return r
+        else:
+            return None
 
-        finally:
-            self.__send_reply_pack_pool.remove(pack)
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        return self._send_many_async(
+            [(strm, func, wbit, secs2body, system_bytes, device_id)])[0]
+
+    def _send_many_async(self, args_list):
+
+        # entry all to circuit in order, and wait all on one waiter thread,
+        # Timeout-T3 of each message is counted from own sended.
+        futures = list()
+        entries = list()
+
+        for args in args_list:
+            fut = concurrent.futures.Future()
+            futures.append(fut)
+            try:
+                pack = SendSecs1MessagePack(
+                    Secs1Message(*args, self.is_equip))
+            except Exception as e:
+                fut.set_exception(e)
+            else:
+                pack.set_listener(self.__notify_async)
+                entries.append([pack, fut, None])
+
+        if not entries:
+            return futures
+
+        with self.__async_cdt:
+            for ent in entries:
+                self.__send_reply_pack_pool.append(ent[0])
+                self.__async_entries.append(ent)
+
+            if not self.__async_waiting:
+                self.__async_waiting = True
+                threading.Thread(target=self.__wait_async_entries, daemon=True).start()
+
+        for ent in entries:
+            self.__msg_and_bytes_queue.entry_msg(ent[0])
+
+        return futures
+
+    def __notify_async(self):
+        with self.__async_cdt:
+            self.__async_cdt.notify_all()
+
+    def __poll_async_entry(self, ent, now):
+
+        # return (is_done, result, except)
+        pack, _, deadline = ent
+        msg = pack.secs1msg()
+        sended, exc, reply, resetted = pack.poll_state()
+
+        if exc is not None:
+            return True, None, exc
+
+        if not sended:
+            if self.is_closed:
+                return True, None, Secs1SendMessageError("Communicator closed", msg)
+            return False, None, None
+
+        if deadline is None:
+            self.__sended_msg_putter.put(msg)
+            if not msg.wbit or self.timeout_t3 <= 0.0:
+                return True, None, None
+            deadline = ent[2] = now + self.timeout_t3
+
+        if reply is not None:
+            return True, reply, None
+
+        if resetted:
+            ent[2] = now + self.timeout_t3
+        elif now >= deadline:
+            return True, None, Secs1TimeoutT3Error('Timeout-T3', msg)
+
+        return False, None, None
+
+    def __wait_async_entries(self):
+
+        while True:
+
+            dones = list()
+
+            with self.__async_cdt:
+
+                if not self.__async_entries:
+                    self.__async_waiting = False
+                    return
+
+                now = time.monotonic()
+                timeout = None
+
+                for ent in list(self.__async_entries):
+                    is_done, r, e = self.__poll_async_entry(ent, now)
+                    if is_done:
+                        self.__async_entries.remove(ent)
+                        self.__send_reply_pack_pool.remove(ent[0])
+                        dones.append((ent[1], r, e))
+                    elif ent[2] is not None:
+                        t = max(ent[2] - now, 0.0)
+                        timeout = t if timeout is None else min(timeout, t)
+
+                if not dones:
+                    self.__async_cdt.wait(timeout)
+
+            for fut, r, e in dones:
+                if e is None:
+                    fut.set_result(r)
+                else:
+                    fut.set_exception(e)
 
     def _put_recv_bytes(self, bs):
         self.__msg_and_bytes_queue.put_recv_bytes(bs)
@@ -4243,7 +8207,7 @@ class AbstractSecs1Communicator(AbstractSecsCommunicator):
 
         self.__try_send_block_putter.put(block)
 
-        self._send_bytes(block.to_bytes())
+        self._send_bytes(block.to_memoryview())
 
         b = self.__msg_and_bytes_queue.poll(self.timeout_t2)
 
@@ -4274,151 +8238,154 @@ class AbstractSecs1Communicator(AbstractSecsCommunicator):
     def __circuit_receiving(self):
 
         try:
-            self._send_bytes(self.__BYTES_EOT)
-
-            bb = list()
-
-            r = self.__msg_and_bytes_queue.put_to_list(
-                bb, 0, 1,
-                self.timeout_t2)
-
-            if r <= 0:
-                self._send_bytes(self.__BYTES_NAK)
-
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Timeout-T2-Length-Byte'
-                })
+            while True:
 
-                return
+                self._send_bytes(self.__BYTES_EOT)
 
-            bb_len = bb[0]
-            if bb_len < 10 or bb_len > 254:
-                self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
-                self._send_bytes(self.__BYTES_NAK)
+                bb = bytearray()
 
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Length-Byte-Error',
-                    'length': bb_len
-                })
+                r = self.__msg_and_bytes_queue.put_to_list(
+                    bb, 0, 1,
+                    self.timeout_t2)
 
-                return
+                if r <= 0:
+                    self._send_bytes(self.__BYTES_NAK)
 
-            pos = 1
-            m = bb_len + 3
+                    self.__secs1_circuit_error_msg_putter.put({
+                        'msg': 'Timeout-T2-Length-Byte'
+                    })
 
-            while pos < m:
-                r = self.__msg_and_bytes_queue.put_to_list(
-                    bb, pos, m,
-                    self.timeout_t1)
+                    return
 
-                if r <= 0:
+                bb_len = bb[0]
+                if bb_len < 10 or bb_len > 254:
+                    self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
                     self._send_bytes(self.__BYTES_NAK)
 
                     self.__secs1_circuit_error_msg_putter.put({
-                        'msg': 'Timeout-T1',
-                        'pos': pos
+                        'msg': 'Length-Byte-Error',
+                        'length': bb_len
                     })
 
                     return
 
-                pos += r
+                pos = 1
+                m = bb_len + 3
 
-            if self.__sum_check(bb):
+                while pos < m:
+                    r = self.__msg_and_bytes_queue.put_to_list(
+                        bb, pos, m,
+                        self.timeout_t1)
 
-                self._send_bytes(self.__BYTES_ACK)
+                    if r <= 0:
+                        self._send_bytes(self.__BYTES_NAK)
 
-            else:
+                        self.__secs1_circuit_error_msg_putter.put({
+                            'msg': 'Timeout-T1',
+                            'pos': pos
+                        })
 
-                self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
-                self._send_bytes(self.__BYTES_NAK)
+                        return
 
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Sum-Check-Error',
-                    'bytes': bytes(bb)
-                })
+                    pos += r
 
-                return
+                if self.__sum_check(bb):
 
-            block = Secs1MessageBlock(bytes(bb))
+                    self._send_bytes(self.__BYTES_ACK)
 
-            self.__recv_block_putter.put(block)
+                else:
 
-            if block.device_id != self.device_id:
+                    self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
+                    self._send_bytes(self.__BYTES_NAK)
 
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Unmatch DEVICE-ID',
-                    'deviceId': block.device_id
-                })
+                    self.__secs1_circuit_error_msg_putter.put({
+                        'msg': 'Sum-Check-Error',
+                        'bytes': bytes(bb)
+                    })
 
-                return
+                    return
 
-            if self.__recv_blocks:
+                block = Secs1MessageBlock(bytes(bb))
 
-                prev_block = self.__recv_blocks[-1]
+                self.__recv_block_putter.put(block)
 
-                if prev_block.is_next_block(block):
+                if block.device_id != self.device_id:
 
-                    self.__recv_blocks.append(block)
+                    self.__secs1_circuit_error_msg_putter.put({
+                        'msg': 'Unmatch DEVICE-ID',
+                        'deviceId': block.device_id
+                    })
 
-                else:
+                    return
 
-                    if not prev_block.is_same_block(block):
+                if self.__recv_blocks:
+
+                    prev_block = self.__recv_blocks[-1]
+
+                    if prev_block.is_next_block(block):
 
-                        del self.__recv_blocks[:]
                         self.__recv_blocks.append(block)
 
-            else:
-                self.__recv_blocks.append(block)
+                    else:
 
-            if block.ebit:
+                        if not prev_block.is_same_block(block):
 
-                try:
-                    msg = Secs1Message.from_blocks(self.__recv_blocks)
+                            del self.__recv_blocks[:]
+                            self.__recv_blocks.append(block)
+
+                else:
+                    self.__recv_blocks.append(block)
 
-                    if not self.__send_reply_pack_pool.receive(msg):
+                if block.ebit:
 
-                        self.__recv_primary_msg_putter.put(msg)
+                    try:
+                        msg = Secs1Message.from_blocks(
+                            self.__recv_blocks, self.lazy_decode, self.cache_policy)
 
-                    self.__recv_all_msg_putter.put(msg)
+                        if not self.__send_reply_pack_pool.receive(msg):
 
-                except Secs1MessageParseError as e:
-                    self._put_error(e)
+                            self.__recv_primary_msg_putter.put(msg)
 
-                finally:
-                    del self.__recv_blocks[:]
+                        self.__recv_all_msg_putter.put(msg)
 
-            else:
+                    except Secs1MessageParseError as e:
+                        self._put_error(e)
 
-                self.__send_reply_pack_pool.timer_reset(block)
+                    finally:
+                        del self.__recv_blocks[:]
 
-                b = self.__msg_and_bytes_queue.poll(self.timeout_t4)
+                else:
 
-                if b is None:
+                    self.__send_reply_pack_pool.timer_reset(block)
 
-                    self.__secs1_circuit_error_msg_putter.put({
-                        'msg': 'Timeout-T4',
-                        'prevBlock': block
-                    })
+                    b = self.__msg_and_bytes_queue.poll(self.timeout_t4)
 
-                elif b == self.__ENQ:
+                    if b is None:
 
-                    self.__circuit_receiving()
+                        self.__secs1_circuit_error_msg_putter.put({
+                            'msg': 'Timeout-T4',
+                            'prevBlock': block
+                        })
 
-                else:
+                    elif b == self.__ENQ:
 
-                    self.__secs1_circuit_error_msg_putter.put({
-                        'msg': 'Receive-NOT-ENQ-of-Next-Block',
-                        'prevBlock': block
-                    })
+                        continue
+
+                    else:
+
+                        self.__secs1_circuit_error_msg_putter.put({
+                            'msg': 'Receive-NOT-ENQ-of-Next-Block',
+                            'prevBlock': block
+                        })
+
+                return
 
         except Secs1CommunicatorError as e:
             self._put_error(e)
 
     @staticmethod
     def __sum_check(bb):
-        a = sum(bb[1:-2]) & 0xFFFF
-        b = (bb[-2] << 8) | bb[-1]
-        return a == b
+        return Secs1MessageBlock._is_valid_sum(bb)
 
 
 class AbstractSecs1OnTcpIpCommunicator(AbstractSecs1Communicator):
@@ -4765,6 +8732,9 @@ class Secs1OnPySerialCommunicator(AbstractSecs1Communicator):
     __DEFAULT_REOPEN = 5.0
     __PROTOCOL = 'SECS-I-on-pySerial'
 
+    # max bytes per read, larger than one block (257 bytes)
+    __READ_SIZE = 4096
+
     def __init__(self, port, baudrate, device_id, is_equip, is_master, **kwargs):
         super(Secs1OnPySerialCommunicator, self).__init__(device_id, is_equip, is_master, **kwargs)
 
@@ -4820,7 +8790,7 @@ class Secs1OnPySerialCommunicator(AbstractSecs1Communicator):
 
     def __unset_serial(self):
         with self.__serial_lock:
-            self.__serial_lock = None
+            self.__serial = None
             self._put_communicated(self.__serial is not None)
 
     def _send_bytes(self, bs):
@@ -4836,8 +8806,11 @@ class Secs1OnPySerialCommunicator(AbstractSecs1Communicator):
     def _reading(self, ser):
         try:
             while not self.is_closed:
-                bs = ser.read()
+                bs = ser.read(1)
                 if bs:
+                    n = ser.in_waiting
+                    if n > 0:
+                        bs += ser.read(min(n, self.__READ_SIZE))
                     self._put_recv_bytes(bs)
                 else:
                     return
@@ -1,3 +1,15 @@
+import array
+import asyncio
+import importlib.util
+import io
+import os
+import pickle
+import select
+import socket
+import struct
+import sys
+import threading
+import time
 import unittest
 import secs
 
@@ -445,6 +457,682 @@ class Test(unittest.TestCase):
                 except Exception as e:
                     raise e
 
+    def test_secs2body_lazy(self):
+
+        body = secs.Secs2BodyBuilder.build('L', [
+            ('U4', [1001]),
+            ('L', [
+                ('L', [
+                    ('U2', [5, 6]),
+                    ('A', 'LOT-1')
+                ]),
+                ('B', [0x01, 0x02])
+            ]),
+            ('BOOLEAN', [True, False])
+        ])
+
+        bs = body.to_bytes()
+        lazy = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True)
+
+        self.assertEqual(3, len(lazy))
+        self.assertEqual('LOT-1', lazy.get_value(1, 0, 1))
+        self.assertEqual(6, lazy[1][0][0][1])
+        self.assertEqual((True, False), lazy[2].value)
+        self.assertEqual(bs, lazy.to_bytes())
+        self.assertEqual(body.to_sml(), lazy.to_sml())
+        self.assertEqual(repr(body), repr(lazy))
+
+        with self.assertRaises(secs.Secs2BodyParseError):
+            lazy[3]
+
+        # shared by listener threads
+        bs = secs.Secs2BodyBuilder.build('L', [('U4', [i]) for i in range(300)]).to_bytes()
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(20):
+                lazy = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True)
+                results = list()
+                ths = [
+                    threading.Thread(target=lambda i=i: results.append((i, lazy[i][0])))
+                    for i in (299, 150, 298)]
+                for th in ths:
+                    th.start()
+                for th in ths:
+                    th.join()
+                self.assertEqual([(i, i) for i, _ in results], results)
+        finally:
+            sys.setswitchinterval(interval)
+
+    def test_secs2body_lazy_index(self):
+
+        body = secs.Secs2BodyBuilder.build('L', [
+            ('L', [('U4', [i]), ('A', 'ALARM-' + str(i))]) for i in range(1000)
+        ])
+
+        bs = body.to_bytes()
+        lazy = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True, index=True)
+
+        self.assertEqual(1000, len(lazy))
+        self.assertEqual(999, lazy.get_value(-1, 0, 0))
+        self.assertEqual('ALARM-500', lazy.get_value(500, 1))
+        self.assertEqual(3, lazy.get_value(3, 0, 0))
+        self.assertEqual((10, 11), tuple([v.get_value(0, 0) for v in lazy[10:12]]))
+        self.assertEqual(body[500].to_bytes(), lazy[500].to_bytes())
+        self.assertEqual(bs, lazy.to_bytes())
+
+    def test_secs2body_array(self):
+
+        self.assertEqual(
+            secs.Secs2BodyBuilder.build('U4', [1, 2, 4000000000]).to_bytes(),
+            secs.Secs2BodyBuilder.build('U4', array.array('I', [1, 2, 4000000000])).to_bytes())
+
+        self.assertEqual((-1.5, 2.0), secs.Secs2BodyBuilder.build('F8', array.array('d', [-1.5, 2.0])).value)
+        self.assertEqual((1, 2), secs.Secs2BodyBuilder.build('U1', array.array('q', [1, 2])).value)
+
+        with self.assertRaises(ValueError):
+            secs.Secs2BodyBuilder.build('U1', array.array('q', [256]))
+
+        # F4 built from values keeps values as given, decoded is float32
+        f4 = secs.Secs2BodyBuilder.build('F4', 1.1)
+        self.assertEqual((1.1,), f4.value)
+        self.assertEqual(1.1, f4[0])
+        self.assertEqual('<F4 [1] 1.1 >', f4.to_sml())
+        self.assertEqual('<F4 [1] 1.1 >', secs.SmlWriter().to_sml(f4))
+        self.assertEqual(struct.pack('>f', 1.1), f4.to_bytes()[2:])
+        self.assertEqual(
+            (struct.unpack('>f', struct.pack('>f', 1.1))[0], ),
+            secs.Secs2BodyBuilder.from_body_bytes(f4.to_bytes()).value)
+
+    def test_secs2body_numpy(self):
+
+        import pytest
+        np = pytest.importorskip('numpy')
+
+        for t, vv, dtype in (
+                ('U1', [1, 255], '>u1'),
+                ('U4', [1, 4000000000], '>u4'),
+                ('I2', [-1, 2], '>i2'),
+                ('I4', [-1, 2], '>i4'),
+                ('I8', [-1, 2], '>i8'),
+                ('F8', [-1.5, 2.0], '>f8')):
+            a = secs.Secs2BodyBuilder.build(t, vv).to_numpy()
+            self.assertEqual(np.dtype(dtype), a.dtype)
+            self.assertEqual(vv, a.tolist())
+
+        a = secs.Secs2BodyBuilder.build('B', [0, 1, 255]).to_numpy()
+        self.assertEqual(np.dtype('u1'), a.dtype)
+        self.assertEqual([0, 1, 255], a.tolist())
+
+        a = secs.Secs2BodyBuilder.build('BOOLEAN', [True, False, True]).to_numpy()
+        self.assertEqual(np.dtype(bool), a.dtype)
+        self.assertEqual([True, False, True], a.tolist())
+
+        # number item is zero-copy read-only view over lazily decoded body bytes
+        bs = secs.Secs2BodyBuilder.build('L', [('U4', list(range(100))), ('F8', [1.5, 2.5])]).to_bytes()
+        body = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True)
+        for item in (body[0], body[1]):
+            a = item.to_numpy()
+            self.assertFalse(a.flags.writeable)
+            self.assertTrue(np.shares_memory(a, np.frombuffer(bs, dtype='u1')))
+        self.assertEqual(list(range(100)), body[0].to_numpy().tolist())
+        with self.assertRaises(ValueError):
+            body[0].to_numpy()[0] = 1
+
+        # F4 built from Python values is float32 array
+        a = secs.Secs2BodyBuilder.build('F4', [1.1, -2.5]).to_numpy()
+        self.assertEqual(np.dtype('>f4'), a.dtype)
+        self.assertEqual([np.float32(1.1), np.float32(-2.5)], a.tolist())
+
+    def test_secs2body_path_query(self):
+
+        body = secs.Secs2BodyBuilder.build('L', [
+            ('U4', [1]),
+            ('U4', [1001]),
+            ('L', [
+                ('L', [
+                    ('U4', [100]),
+                    ('L', [('A', 'LOT-1'), ('U2', [5, 6])])
+                ])
+            ])
+        ])
+
+        bs = body.to_bytes()
+
+        self.assertEqual(1001, secs.Secs2BodyBuilder.get_value_from_body_bytes(bs, 1, 0))
+        self.assertEqual((5, 6), secs.Secs2BodyBuilder.get_value_from_body_bytes(bs, 2, 0, 1, -1))
+        self.assertEqual('LOT', secs.Secs2BodyBuilder.get_value_from_body_bytes(bs, 2, 0, 1, 0, slice(0, 3)))
+
+        path = secs.Secs2BodyBuilder.get_offset_from_body_bytes(bs, 2, 0, 1, 1)
+        self.assertEqual(5, len(path))
+        self.assertEqual((0, len(bs)), path[0])
+        for (pos, size), x in zip(path[1:], (body[2], body[2][0], body[2][0][1], body[2][0][1][1])):
+            self.assertEqual(x.to_bytes(), bs[pos:(pos + size)])
+
+        with self.assertRaises(secs.Secs2BodyParseError):
+            secs.Secs2BodyBuilder.get_value_from_body_bytes(bs, 3)
+
+        with self.assertRaises(secs.Secs2BodyParseError):
+            secs.Secs2BodyBuilder.get_offset_from_body_bytes(bs, 1, 0)
+
+    def test_secs2body_max_depth(self):
+
+        depth = 2000
+        bs = b'\x01\x01' * depth + b'\xA5\x01\x07'
+        sml = '<L ' * depth + '<U1 7>' + '>' * depth
+
+        with self.assertRaises(secs.Secs2BodyBytesParseError):
+            secs.Secs2BodyBuilder.from_body_bytes(bs)
+
+        with self.assertRaises(secs.Secs2BodySmlParseError):
+            secs.SmlParser._parse_body(sml)
+
+        body = secs.Secs2BodyBuilder.from_body_bytes(bs, max_depth=(depth + 1))
+        self.assertEqual(bs, body.to_bytes())
+        self.assertEqual(bs, secs.SmlParser._parse_body(sml, max_depth=(depth + 1)).to_bytes())
+        self.assertEqual(body.to_sml(), secs.SmlParser._parse_body(body.to_sml(), max_depth=(depth + 1)).to_sml())
+
+    def test_secs2body_cache_policy(self):
+
+        body = secs.Secs2BodyBuilder.build('L', [
+            ('U4', [1]),
+            ('L', []),
+            ('L', [('A', 'TEXT'), ('L', [('B', [1, 2]), ('BOOLEAN', [True])])])
+        ])
+        bs = body.to_bytes()
+
+        lru = secs.Secs2BodyLruCachePolicy(1024)
+
+        for policy in (secs.Secs2BodyCachePolicy.ALL, secs.Secs2BodyCachePolicy.ROOT, lru):
+            for lazy in (False, True):
+                x = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=lazy, cache_policy=policy)
+                self.assertEqual(body.to_sml(), x.to_sml())
+                self.assertEqual(repr(body), repr(x))
+                self.assertEqual(bs, x.to_bytes())
+                self.assertEqual(policy.cache_children, x[0]._cache is not None)
+
+        self.assertGreater(lru.size, 0)
+        self.assertLessEqual(lru.size, 1024)
+
+    def test_message_deferred_decode(self):
+
+        frame = secs.HsmsSsDataMessage(
+            6, 11, True,
+            secs.Secs2BodyBuilder.build('L', [('U4', [1]), ('A', 'X')]),
+            b'\x00\x00\x00\x07', 10).to_bytes()
+
+        msg = secs.HsmsSsMessage.from_bytes(frame)
+        self.assertEqual((6, 11, True, b'\x00\x00\x00\x07', 10),
+                         (msg.strm, msg.func, msg.wbit, msg.system_bytes, msg.session_id))
+        self.assertIsNotNone(msg._secs2body_source)
+        self.assertEqual(frame, msg.to_bytes())
+        self.assertEqual('X', msg.secs2body.get_value(1))
+        self.assertIsNone(msg._secs2body_source)
+
+        msg = secs.HsmsSsMessage.from_bytes(frame[:14] + b'\xFF\x01')
+        self.assertEqual(11, msg.func)
+        with self.assertRaises(secs.Secs2BodyBytesParseError):
+            msg.secs2body
+
+        # picklable before and after decode, lazy body is stored as bytes
+        for lazy in (False, True):
+            msg = secs.HsmsSsMessage.from_bytes(frame, lazy)
+            self.assertEqual(repr(msg), repr(pickle.loads(pickle.dumps(msg))))
+            msg.secs2body
+            self.assertEqual(frame, pickle.loads(pickle.dumps(msg)).to_bytes())
+
+        # one body object, decoded by many listener threads
+        msg = secs.HsmsSsMessage.from_bytes(frame, True)
+        bodies = list()
+        ths = [threading.Thread(target=lambda: bodies.append(msg.secs2body)) for _ in range(8)]
+        for th in ths:
+            th.start()
+        for th in ths:
+            th.join()
+        self.assertEqual(1, len(set(map(id, bodies))))
+
+    def test_secs1_message_blocks(self):
+
+        # items across block body boundaries, encoded at each block position
+        body = secs.Secs2BodyBuilder.build('L', [
+            ('L', [('A', 'X' * n) for n in (100, 243, 244, 245, 300)]),
+            ('B', bytes(range(256)) * 4),
+            ('F4', [1.1] * 100),
+            ('U4', list(range(1000)))])
+        bs = body.to_bytes()
+
+        for b in (body, secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True), None):
+            msg = secs.Secs1Message(6, 11, True, b, b'\x00\x00\x00\x01', 10, False)
+            blocks = msg.to_blocks()
+            self.assertEqual(b'' if b is None else bs, b''.join([bytes(x._get_body_part()) for x in blocks]))
+            self.assertEqual([x.to_bytes()[0] - 10 for x in blocks[:-1]], [244] * (len(blocks) - 1))
+            for x in blocks:
+                self.assertTrue(secs.Secs1MessageBlock._is_valid_sum(x.to_bytes()))
+            if b is not None:
+                self.assertEqual(bs, secs.Secs1Message.from_blocks(blocks).secs2body.to_bytes())
+
+    def test_sml_compile(self):
+
+        tmpl = secs.SmlParser.compile('S1F3 W\n<L <U4 $svid> <A "X">>.')
+
+        self.assertIs(tmpl, secs.SmlParser.compile('S1F3 W <L <U4 $svid> <A "X">>.'))
+        self.assertEqual((1, 3, True), (tmpl.strm, tmpl.func, tmpl.wbit))
+        self.assertEqual(('svid',), tmpl.names)
+        self.assertEqual(
+            secs.SmlParser.parse('S1F3 W <L <U4 1001> <A "X">>.')[3].to_bytes(),
+            tmpl.to_bytes({'svid': 1001}))
+        self.assertEqual(tmpl.to_bytes([1001]), tmpl.build([1001])[3].to_bytes())
+
+        with self.assertRaises(ValueError):
+            tmpl.to_bytes(())
+
+        self.assertIsNone(secs.SmlParser.compile('S1F1 W.').to_bytes())
+
+        tmpl = secs.SmlParser.compile('S1F2 <L <A "MDLN"> <A 0x41> <F4 1.5> <B 0x01> <BOOLEAN T> <L> >.')
+        msg = secs.HsmsSsDataMessage(
+            1, 2, False,
+            secs.SmlParser.parse('S1F2 <L <A "MDLN"> <A 0x41> <F4 1.5> <B 0x01> <BOOLEAN T> <L> >.')[3],
+            b'\x00\x00\x00\x01', 10)
+        self.assertEqual(msg.to_bytes(), tmpl.to_hsmsss_bytes(b'\x00\x00\x00\x01', 10))
+        self.assertEqual(
+            [x.to_bytes() for x in secs.Secs1Message(1, 2, False, msg.secs2body, b'\x00\x00\x00\x01', 10, False).to_blocks()],
+            [x.to_bytes() for x in tmpl.to_secs1_blocks(b'\x00\x00\x00\x01', 10, False)])
+
+    def test_sml_iter_parse(self):
+
+        text = (
+            '// comment\n'
+            'S1F1 W.\n'
+            'S1F2 <L /* comment */ <A "MDLN.//"> <F4 1.5> >. S1F3 W\n'
+            '<L <U4 1> // comment\n'
+            '> .\n')
+
+        for stream in (io.StringIO(text), io.BytesIO(text.encode(encoding='utf-8'))):
+            vv = list(secs.SmlParser.iter_parse(stream, chunk_size=3))
+            self.assertEqual([(1, 1, True), (1, 2, False), (1, 3, True)], [v[0:3] for v in vv])
+            self.assertIsNone(vv[0][3])
+            self.assertEqual('MDLN.//', vv[1][3].get_value(0))
+            self.assertEqual(1, vv[2][3].get_value(0, 0))
+
+        with self.assertRaises(secs.Secs2BodySmlParseError) as cm:
+            list(secs.SmlParser.iter_parse(io.StringIO('S1F1 W.\n  S1F2 <U1 X>.')))
+
+        self.assertEqual((2, 12), (cm.exception.line, cm.exception.column))
+
+        # line and column of failed token, not of message start
+        for text, lc in (
+                ('S1F1 W.\nS1F2\n<L /* c\n */ <U4 1>\n  <BOOLEAN TRUE X>\n>.', (5, 17)),
+                ('S1F1 W\n  <L\n    <Z 1>\n  >.', (3, 6)),
+                ('S1F1 W\n  <L\n    <U1 1 256>\n  >.', (3, 11)),
+                ('S1F1 W\n  <L // c\n    <U1 1>\n  >\n  >.', (5, 3))):
+            for chunk_size in (3, 65536):
+                with self.assertRaises(secs.SmlParseError) as cm:
+                    list(secs.SmlParser.iter_parse(io.StringIO(text), chunk_size=chunk_size))
+                self.assertEqual(lc, (cm.exception.line, cm.exception.column))
+
+    def test_sml_writer(self):
+
+        body = secs.Secs2BodyBuilder.build('L', [
+            ('U4', [1, 2, 3]),
+            ('A', 'ABCD'),
+            ('L', []),
+            ('L', [('L', [('B', [0x01, 0xFF]), ('BOOLEAN', [True, False])])]),
+            ('F4', [])
+        ])
+
+        self.assertEqual(body.to_sml(), secs.SmlWriter().to_sml(body))
+
+        out = io.StringIO()
+        secs.SmlWriter(max_items=2, max_value_bytes=2, max_depth=1).write(body, out)
+        self.assertEqual(
+            ['<L [5]', '  <U4 [3] 1 2 ... >', '  <A [4] "AB" ... >', '  ...', '>'],
+            out.getvalue().splitlines())
+
+        self.assertEqual(
+            '    <L [2] ... >',
+            secs.SmlWriter(max_depth=2).to_sml(body).splitlines()[6])
+
+        # values in range without creating all values
+        self.assertEqual([2, 3], list(body[0].iter_values(1)))
+        self.assertEqual([0x01], list(body[3][0][0].iter_values(0, 1)))
+        self.assertEqual([False], list(body[3][0][1].iter_values(-1)))
+        self.assertEqual([1.1], list(secs.Secs2BodyBuilder.build('F4', [1.1, 2.2]).iter_values(0, 1)))
+        self.assertEqual(list(range(3, 10000)), list(secs.Secs2BodyBuilder.build('U2', list(range(10000))).iter_values(3)))
+
+    def test_secs2body_template(self):
+
+        tmpl = secs.Secs2BodyTemplate.from_sml(
+            '<L <U4 $DATAID> <U4 $CEID> <L <L <U4 100> <L <A $> <F4 $> <BOOLEAN $> > > > >')
+
+        self.assertEqual(('DATAID', 'CEID', None, None, None), tmpl.names)
+
+        body = secs.Secs2BodyBuilder.build('L', [
+            ('U4', [1]),
+            ('U4', [1001]),
+            ('L', [
+                ('L', [
+                    ('U4', [100]),
+                    ('L', [
+                        ('A', 'LOT-1'),
+                        ('F4', [0.5]),
+                        ('BOOLEAN', [True])
+                    ])
+                ])
+            ])
+        ])
+
+        values = (1, 1001, 'LOT-1', 0.5, True)
+        self.assertEqual(body.to_bytes(), tmpl.to_bytes(values))
+        self.assertEqual(repr(body), repr(tmpl.build(values)))
+
+        with self.assertRaises(ValueError):
+            tmpl.to_bytes((-1, 1001, 'LOT-1', 0.5, True))
+
+        with self.assertRaises(ValueError):
+            tmpl.to_bytes((1, 1001))
+
+        # value not scalar is ValueError
+        for vv in (([1], 1001, 'LOT-1', 0.5, True), (1, 1001, 'LOT-1', [0.5], True), (None, 1001, 'LOT-1', 0.5, True)):
+            with self.assertRaises(ValueError):
+                tmpl.to_bytes(vv)
+
+        # encoded body bytes are checked before sending
+        with secs.HsmsSsActiveCommunicator('127.0.0.1', 5009, 10, False) as comm:
+            for bs in (b'\xa5\x01\x01\xff\xff\xff', b'\x01\x02\xa9\x03\x00\x01\x00\xa5\x01\x01'):
+                with self.assertRaises(ValueError):
+                    comm.send(6, 11, False, bs)
+            with self.assertRaises(secs.HsmsSsSendMessageError):
+                comm.send(6, 11, False, tmpl.to_bytes(values))
+
+    def test_hsmsss_send_async(self):
+
+        passive = secs.HsmsSsPassiveCommunicator(
+            '127.0.0.1', 5002, 10, True, timeout_t3=1.0, name='equip-passive-comm')
+        active = secs.HsmsSsActiveCommunicator(
+            '127.0.0.1', 5002, 10, False, timeout_t3=1.0, timeout_t5=0.1, max_in_flight=4, name='host-active-comm')
+
+        held = list()
+        held_lock = threading.Lock()
+
+        def _recv(primary, comm):
+            if primary.strm == 2:
+                with held_lock:
+                    held.append(primary)
+            elif primary.strm == 6:
+                comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body)
+
+        passive.add_recv_primary_msg_listener(_recv)
+
+        with passive, active:
+            passive.open()
+            active.open_and_wait_until_communicating()
+            passive.open_and_wait_until_communicating()
+
+            # queued transactions are not sent by receiving thread
+            send_threads = set()
+            recv_threads = set()
+            send_async = active._send_async
+
+            def _send_async(*args):
+                send_threads.add(threading.get_ident())
+                f = send_async(*args)
+                f.add_done_callback(lambda x: recv_threads.add(threading.get_ident()))
+                return f
+
+            active._send_async = _send_async
+
+            futures = [active.send_async(6, 11, True, ('U4', [i])) for i in range(200)]
+            self.assertEqual(list(range(200)), [f.result(5.0).secs2body[0] for f in futures])
+
+            del active._send_async
+            recv_threads.discard(threading.get_ident())
+            self.assertTrue(recv_threads)
+            self.assertFalse(send_threads & recv_threads)
+
+            # not replied, transactions beyond max_in_flight are queued
+            futures = [active.send_async(2, 1, True, ('U4', [i])) for i in range(10)]
+            time.sleep(0.5)
+
+            with held_lock:
+                self.assertEqual(4, len(held))
+                for primary in held:
+                    passive.reply_async(primary, 2, 2, False, primary.secs2body)
+                held.clear()
+
+            self.assertEqual([0, 1, 2, 3], [f.result(5.0).secs2body[0] for f in futures[0:4]])
+
+            with self.assertRaises(secs.HsmsSsTimeoutT3Error):
+                futures[-1].result(5.0)
+
+    def test_send_many(self):
+
+        passive = secs.HsmsSsPassiveCommunicator(
+            '127.0.0.1', 5003, 10, True, timeout_t3=1.0, name='equip-passive-comm')
+        active = secs.HsmsSsActiveCommunicator(
+            '127.0.0.1', 5003, 10, False, timeout_t3=1.0, timeout_t5=0.1, name='host-active-comm')
+
+        def _recv(primary, comm):
+            if primary.strm == 6:
+                comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body)
+
+        passive.add_recv_primary_msg_listener(_recv)
+
+        with passive, active:
+            passive.open()
+            active.open_and_wait_until_communicating()
+            passive.open_and_wait_until_communicating()
+
+            msgs = [(6, 11, True, ('U4', [i])) for i in range(100)]
+            for n in (1, 8, None):
+                rr = active.send_many(msgs, n)
+                self.assertEqual(list(range(100)), [r.secs2body[0] for r in rr])
+
+            rr = active.send_many([(6, 11, True, ('U4', [1])), (2, 1, True), (6, 1, False)], 2)
+            self.assertEqual(1, rr[0].secs2body[0])
+            self.assertIsInstance(rr[1], secs.HsmsSsTimeoutT3Error)
+            self.assertIsNone(rr[2])
+
+            # bad item is own failed result, not failing others
+            rr = active.send_many([(200, 1, True), (6, 11, True, ('U4', [2])), (6, 11, True, ('U4', [3]))])
+            self.assertIsInstance(rr[0], secs.SecsMessageParseError)
+            self.assertEqual([2, 3], [r.secs2body[0] for r in rr[1:]])
+
+    def test_secs1_send_many(self):
+
+        equip = secs.Secs1OnTcpIpCommunicator(
+            '127.0.0.1', 23002, 10, True, True, timeout_t3=1.0, name='equip-master-comm')
+        host = secs.Secs1OnTcpIpReceiverCommunicator(
+            '127.0.0.1', 23002, 10, False, False, timeout_t3=1.0, name='host-slave-comm')
+
+        def _recv(primary, comm):
+            if primary.strm == 6:
+                comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body)
+
+        equip.add_recv_primary_msg_listener(_recv)
+
+        with host, equip:
+            host.open()
+            equip.open_and_wait_until_communicating()
+            host.open_and_wait_until_communicating()
+
+            # Timeout-T3 of each message is counted from own sended, not serially
+            start = time.perf_counter()
+            rr = host.send_many([(2, 1, True)] * 4 + [(6, 11, True, ('U4', [1]))])
+            elapsed = time.perf_counter() - start
+
+            rr2 = host.send_many([(200, 1, True), (6, 11, True, ('U4', [2])), (6, 11, True, ('U4', [3]))])
+
+            # outstanding transactions are waited by one thread, not thread per transaction
+            count = threading.active_count()
+            futures = [host.send_async(6, 11, True, ('U4', [i])) for i in range(20)]
+            peak = threading.active_count()
+            self.assertEqual(list(range(20)), [f.result(10.0).secs2body[0] for f in futures])
+            self.assertLessEqual(peak, count + 1)
+
+        for r in rr[0:4]:
+            self.assertIsInstance(r, secs.Secs1TimeoutT3Error)
+        self.assertEqual(1, rr[4].secs2body[0])
+        self.assertLess(elapsed, 3.0)
+
+        self.assertIsInstance(rr2[0], secs.SecsMessageParseError)
+        self.assertEqual([2, 3], [r.secs2body[0] for r in rr2[1:]])
+
+    def test_hsmsss_coalesce(self):
+
+        msg = secs.HsmsSsDataMessage(6, 11, True, secs.Secs2BodyBuilder.build('B', bytes(100000)), bytes(4), 10)
+        self.assertEqual(b''.join(msg.to_buffers()), secs.HsmsSsMessage.from_bytes(msg.to_bytes()).to_bytes())
+
+        passive = secs.HsmsSsPassiveCommunicator(
+            '127.0.0.1', 5004, 10, True, timeout_t3=5.0, name='equip-passive-comm')
+        active = secs.HsmsSsActiveCommunicator(
+            '127.0.0.1', 5004, 10, False, timeout_t3=5.0, timeout_t5=0.1, coalesce_window=0.0005, name='host-active-comm')
+
+        passive.add_recv_primary_msg_listener(
+            lambda primary, comm: comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body))
+
+        results = list()
+
+        def _send(n):
+            for i in range(20):
+                body = ('B', bytes(100000)) if i % 5 == 0 else ('U4', [n * 100 + i])
+                results.append((n, i, active.send(6, 11, True, body).secs2body))
+
+        with passive, active:
+            passive.open()
+            active.open_and_wait_until_communicating()
+            passive.open_and_wait_until_communicating()
+
+            ths = [threading.Thread(target=_send, args=(n, )) for n in range(8)]
+            for th in ths:
+                th.start()
+            for th in ths:
+                th.join()
+
+        self.assertEqual(160, len(results))
+        for n, i, body in results:
+            if i % 5 == 0:
+                self.assertEqual(100000, len(body.value))
+            else:
+                self.assertEqual(n * 100 + i, body[0])
+
+    def test_hsmsss_async(self):
+
+        async def _test():
+
+            count = threading.active_count()
+
+            passive = secs.AsyncHsmsSsPassiveCommunicator(
+                '127.0.0.1', 5001, 10, True, timeout_t3=2.0, name='equip-async-passive-comm')
+            active = secs.AsyncHsmsSsActiveCommunicator(
+                '127.0.0.1', 5001, 10, False, timeout_t3=2.0, timeout_t5=0.1, name='host-async-active-comm')
+
+            async def _echo():
+                async for primary in passive:
+                    if primary.wbit:
+                        await passive.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body)
+
+            async with passive, active:
+                await passive.open()
+                self.assertTrue(await active.open_and_wait_until_communicating(5.0))
+                self.assertTrue(await passive.open_and_wait_until_communicating(5.0))
+
+                echo = asyncio.ensure_future(_echo())
+
+                reply = await active.send(1, 1, True, ('L', [('A', 'MDLN-A'), ('A', '000001')]))
+                self.assertEqual((1, 2), (reply.strm, reply.func))
+                self.assertEqual('MDLN-A', reply.secs2body[0].value)
+
+                replies = await asyncio.gather(*[active.send(6, 11, True, ('U4', [i])) for i in range(100)])
+                self.assertEqual(list(range(100)), [r.secs2body[0] for r in replies])
+
+                rr = await active.send_many([(6, 11, True, ('U4', [i])) for i in range(50)] + [(6, 11, True, ('X', 1))], 8)
+                self.assertEqual(list(range(50)), [r.secs2body[0] for r in rr[0:50]])
+                self.assertIsInstance(rr[50], ValueError)
+
+                self.assertIsNotNone(await active.send_linktest_req())
+
+                # no threads to open and communicate
+                self.assertEqual(count, threading.active_count())
+
+                with self.assertRaises(secs.HsmsSsTimeoutT3Error):
+                    await passive.send(1, 1, True)
+
+            await asyncio.wait_for(echo, 5.0)
+
+        asyncio.run(_test())
+
+    @unittest.skipUnless(importlib.util.find_spec('resource') is not None, 'require resource')
+    def test_hsmsss_frame_reader_high_fd(self):
+
+        # descriptor beyond FD_SETSIZE, as hundreds of sessions
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard != resource.RLIM_INFINITY and hard <= 2000:
+            self.skipTest('require RLIMIT_NOFILE > 2000')
+        if soft != resource.RLIM_INFINITY and soft <= 2000:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (2048, hard))
+
+        a, b = socket.socketpair()
+        fd = os.dup2(a.fileno(), 2000)
+        a.close()
+
+        frame = secs.HsmsSsDataMessage(1, 1, True, secs.Secs2BodyBuilder.build('A', 'LOT-1'), bytes(4), 10).to_bytes()
+
+        with socket.socket(fileno=fd) as a, b:
+            reader = secs.HsmsSsFrameReader(a)
+            try:
+                b.sendall(frame + frame[0:5])
+                self.assertEqual(frame, reader.read(1.0))
+
+                with self.assertRaises(secs.HsmsSsCommunicatorError):
+                    reader.read(0.1)
+            finally:
+                reader.close()
+                resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+    @unittest.skipUnless(
+        hasattr(os, 'openpty') and importlib.util.find_spec('serial') is not None,
+        'require pty and pyserial')
+    def test_secs1_pyserial_pty(self):
+
+        # two pty pairs crossed by relay thread, as null-modem cable
+        m1, s1 = os.openpty()
+        m2, s2 = os.openpty()
+
+        def _relay():
+            try:
+                while True:
+                    rr, _, _ = select.select([m1, m2], [], [])
+                    for fd in rr:
+                        os.write((m2 if fd == m1 else m1), os.read(fd, 4096))
+            except OSError:
+                return
+
+        threading.Thread(target=_relay, daemon=True).start()
+
+        equip = secs.Secs1OnPySerialCommunicator(
+            os.ttyname(s1), 115200, 10, True, True, timeout_t3=15.0, name='equip-pty-comm')
+        host = secs.Secs1OnPySerialCommunicator(
+            os.ttyname(s2), 115200, 10, False, False, timeout_t3=15.0, name='host-pty-comm')
+
+        equip.add_recv_primary_msg_listener(
+            lambda primary, comm: comm.reply(primary, primary.strm, primary.func + 1, False, primary.secs2body))
+
+        # over 1000 blocks
+        value = bytes(range(256)) * 1000
+
+        try:
+            with equip, host:
+                equip.open_and_wait_until_communicating()
+                host.open_and_wait_until_communicating()
+
+                reply = host.send(6, 11, True, ('B', value))
+                self.assertEqual(value, reply.secs2body.value)
+
+        finally:
+            for fd in (s1, s2, m1, m2):
+                os.close(fd)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,6 +5,10 @@ To get HSMS-SS-PASSIVE-communicator, HsmsSsPassiveCommunicator()
 
 To get HSMS-SS-ACTIVE-communicator, HsmsSsActiveCommunicator()
 
+To get asyncio HSMS-SS-PASSIVE-communicator, AsyncHsmsSsPassiveCommunicator()
+
+To get asyncio HSMS-SS-ACTIVE-communicator, AsyncHsmsSsActiveCommunicator()
+
 To get SECS-I-on-PySerial-communicator, Secs1OnPySerialCommunicator()
 
 To get SECS-I-on-TCP/IP-communicator, Secs1OnTcpIpCommunicator()
@@ -15,10 +19,15 @@ To get SECS-I-on-TCP/IP-Receiver-communicator, Secs1OnTcpIpReceiverCommunicator(
 
 from secs.secs2body import Secs2BodyParseError, Secs2BodyBytesParseError
 from secs.secs2body import AbstractSecs2Body, Secs2BodyBuilder
+from secs.secs2body import Secs2BodyCachePolicy, Secs2BodyLruCachePolicy
 
 from secs.smlparser import SmlParseError, Secs2BodySmlParseError
 from secs.smlparser import SmlParser
 
+from secs.secs2template import Secs2BodyTemplate, SmlMessageTemplate
+
+from secs.smlwriter import SmlWriter
+
 from secs.secsmessage import *
 
 from secs.hsmsssmessage import *
@@ -33,6 +42,12 @@ from secs.hsmssspassivecommunicator import HsmsSsPassiveCommunicator
 
 from secs.hsmsssactivecommunicator import HsmsSsActiveCommunicator
 
+from secs.hsmsssasynccommunicator import AsyncHsmsSsConnection, AbstractAsyncHsmsSsCommunicator
+
+from secs.hsmsssasyncpassivecommunicator import AsyncHsmsSsPassiveCommunicator
+
+from secs.hsmsssasyncactivecommunicator import AsyncHsmsSsActiveCommunicator
+
 from secs.secs1communicator import *
 
 from secs.secs1ontcpipcommunicator import Secs1OnTcpIpCommunicator, Secs1OnTcpIpReceiverCommunicator
@@ -0,0 +1,100 @@
+import asyncio
+import secs
+
+
+class AsyncHsmsSsActiveCommunicator(secs.AbstractAsyncHsmsSsCommunicator):
+
+    __PROTOCOL = 'HSMS-SS-ACTIVE'
+
+    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
+        super(AsyncHsmsSsActiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
+
+        self.__ipaddr = (ip_address, port)
+
+    def _get_protocol(self):
+        return self.__PROTOCOL
+
+    def _get_ipaddress(self):
+        return self.__ipaddr
+
+    async def _loop(self):
+        while not self.is_closed:
+            await self.__connect()
+            if self.is_closed:
+                return
+            await asyncio.sleep(self.timeout_t5)
+
+    async def __connect(self):
+
+        try:
+            reader, writer = await asyncio.open_connection(*self._get_ipaddress())
+        except OSError as e:
+            if not self.is_closed:
+                self._put_error(secs.HsmsSsCommunicatorError(e))
+            return
+
+        conn = self._build_hsmsss_connection(reader, writer, self.__receiving_msg)
+
+        try:
+            self._put_hsmsss_comm_state(secs.HsmsSsCommunicateState.CONNECTED)
+
+            rsp = await conn.send(self.build_select_req())
+
+            if rsp is not None:
+
+                ss = rsp.get_select_status()
+
+                if (ss == secs.HsmsSsSelectStatus.SUCCESS
+                        or ss == secs.HsmsSsSelectStatus.ACTIVED):
+
+                    if self._set_hsmsss_connection(conn):
+                        await conn.await_termination()
+
+        except secs.HsmsSsCommunicatorError as e:
+            if not self.is_closed:
+                self._put_error(e)
+        except secs.HsmsSsSendMessageError as e:
+            if not self.is_closed:
+                self._put_error(e)
+        except secs.HsmsSsWaitReplyMessageError as e:
+            if not self.is_closed:
+                self._put_error(e)
+
+        finally:
+            conn.shutdown()
+            self._unset_hsmsss_connection(conn)
+            self._put_hsmsss_comm_state(secs.HsmsSsCommunicateState.NOT_CONNECT)
+
+    def __receiving_msg(self, recv_msg, conn):
+
+        ctrl_type = recv_msg.get_control_type()
+
+        try:
+            if ctrl_type == secs.HsmsSsControlType.DATA:
+
+                if self._hsmsss_connection is conn:
+
+                    self._put_recv_primary_msg(recv_msg)
+
+                else:
+                    conn.send_nowait(
+                        secs.HsmsSsControlMessage.build_reject_request(
+                            recv_msg,
+                            secs.HsmsSsRejectReason.NOT_SELECTED))
+
+            elif ctrl_type == secs.HsmsSsControlType.SEPARATE_REQ:
+
+                conn.shutdown()
+
+            elif ctrl_type == secs.HsmsSsControlType.SELECT_REQ:
+
+                conn.send_nowait(
+                    secs.HsmsSsControlMessage.build_reject_request(
+                        recv_msg,
+                        secs.HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
+
+            else:
+                self._receive_control_msg(recv_msg, conn)
+
+        except secs.HsmsSsSendMessageError as e:
+            self._put_error(e)
@@ -0,0 +1,593 @@
+import asyncio
+import secs
+
+
+class AsyncHsmsSsConnection:
+    """HSMS-SS connection on asyncio streams.
+
+    Reads frames by one task in running event loop, and waits reply messages by futures.
+    """
+
+    def __init__(
+            self, reader, writer, comm,
+            recv_primary_msg_put_callback,
+            recv_all_msg_put_callback,
+            sended_msg_put_callback,
+            error_put_callback):
+
+        self.__reader = reader
+        self.__writer = writer
+        self.__comm = comm
+        self.__put_recv_primary_msg = recv_primary_msg_put_callback
+        self.__put_recv_all_msg = recv_all_msg_put_callback
+        self.__put_sended_msg = sended_msg_put_callback
+        self.__put_error = error_put_callback
+
+        self.__terminated = False
+        self.__terminated_event = asyncio.Event()
+
+        self.__reply_futures = dict()
+
+        self.__drain_lock = asyncio.Lock()
+
+        self.__reading_task = asyncio.ensure_future(self.__reading_msg())
+
+    def shutdown(self):
+        if self.__terminated:
+            return
+
+        self.__terminated = True
+
+        for fut in self.__reply_futures.values():
+            if not fut.done():
+                fut.set_result(None)
+
+        self.__writer.close()
+
+        if self.__reading_task is not asyncio.current_task():
+            self.__reading_task.cancel()
+
+        self.__terminated_event.set()
+
+    def is_terminated(self):
+        return self.__terminated
+
+    async def await_termination(self):
+        await self.__terminated_event.wait()
+
+    async def __read_frame(self):
+
+        reader = self.__reader
+
+        head = await reader.readexactly(4)
+
+        size = (head[0] << 24 | head[1] << 16 | head[2] << 8 | head[3])
+
+        if size < 10:
+            raise secs.HsmsSsCommunicatorError("Receive message size < 10")
+
+        # Timeout-T8 is applied to each chunk while a frame is partially received
+        timeout_t8 = self.__comm.timeout_t8
+        parts = [head]
+
+        while size > 0:
+            try:
+                bs = await asyncio.wait_for(reader.read(size), timeout_t8)
+            except asyncio.TimeoutError:
+                raise secs.HsmsSsCommunicatorError("T8-Timeout")
+
+            if not bs:
+                raise secs.HsmsSsCommunicatorError("Terminate detect")
+
+            parts.append(bs)
+            size -= len(bs)
+
+        return b''.join(parts)
+
+    async def __reading_msg(self):
+        try:
+            while not self.__terminated:
+
+                msg = secs.HsmsSsMessage.from_bytes(
+                    await self.__read_frame(),
+                    self.__comm.lazy_decode,
+                    self.__comm.cache_policy)
+
+                self.__put_recv_all_msg(msg)
+
+                fut = self.__reply_futures.get(msg.system_bytes, None)
+                if fut is not None and not fut.done():
+                    fut.set_result(msg)
+                else:
+                    self.__put_recv_primary_msg(msg, self)
+
+        except asyncio.CancelledError:
+            pass
+        except asyncio.IncompleteReadError:
+            if not self.__terminated:
+                self.__put_error(secs.HsmsSsCommunicatorError("Terminate detect"))
+        except secs.HsmsSsCommunicatorError as e:
+            if not self.__terminated:
+                self.__put_error(e)
+        except OSError as e:
+            if not self.__terminated:
+                self.__put_error(secs.HsmsSsCommunicatorError(e))
+        except Exception as e:
+            if not self.__terminated:
+                self.__put_error(e)
+
+        finally:
+            self.shutdown()
+
+    def send_nowait(self, msg):
+        """Write message without waiting drain and reply.
+
+        For responses of control messages in receive callback.
+
+        Args:
+            msg (secs.HsmsSsMessage): message.
+
+        Raises:
+            HsmsSsSendMessageError: if connection terminated or write failed.
+        """
+        if self.__terminated:
+            raise secs.HsmsSsSendMessageError("HsmsSsConnection terminated", msg)
+
+        try:
+            self.__writer.writelines(msg.to_buffers())
+            self.__put_sended_msg(msg)
+        except Exception as e:
+            raise secs.HsmsSsSendMessageError(e, msg)
+
+    async def __send(self, msg):
+        if self.__terminated:
+            raise secs.HsmsSsSendMessageError("HsmsSsConnection terminated", msg)
+
+        try:
+            self.__writer.writelines(msg.to_buffers())
+            async with self.__drain_lock:
+                await self.__writer.drain()
+            self.__put_sended_msg(msg)
+        except Exception as e:
+            raise secs.HsmsSsSendMessageError(e, msg)
+
+    async def send(self, msg):
+        """Send message, and wait reply if W-Bit data message or select/linktest request.
+
+        Args:
+            msg (secs.HsmsSsMessage): message.
+
+        Raises:
+            HsmsSsCommunicatorError: if connection terminated while waiting reply.
+            HsmsSsSendMessageError: if send failed.
+            HsmsSsTimeoutT3Error: if Timeout-T3.
+            HsmsSsTimeoutT6Error: if Timeout-T6.
+            HsmsSsRejectMessageError: if reply is reject.
+
+        Returns:
+            secs.HsmsSsMessage: Reply-Message if exist, otherwise None.
+        """
+
+        timeout_tx = -1.0
+
+        ctrl_type = msg.get_control_type()
+
+        if ctrl_type == secs.HsmsSsControlType.DATA:
+            if msg.wbit:
+                timeout_tx = self.__comm.timeout_t3
+
+        elif (ctrl_type == secs.HsmsSsControlType.SELECT_REQ
+              or ctrl_type == secs.HsmsSsControlType.LINKTEST_REQ):
+
+            timeout_tx = self.__comm.timeout_t6
+
+        if timeout_tx < 0.0:
+            await self.__send(msg)
+            return None
+
+        key = msg.system_bytes
+        fut = asyncio.get_running_loop().create_future()
+
+        try:
+            self.__reply_futures[key] = fut
+
+            await self.__send(msg)
+
+            try:
+                rsp = await asyncio.wait_for(fut, timeout_tx)
+            except asyncio.TimeoutError:
+                rsp = None
+
+            if rsp is None:
+
+                if self.__terminated:
+
+                    raise secs.HsmsSsCommunicatorError("HsmsSsConnection terminated")
+
+                elif ctrl_type == secs.HsmsSsControlType.DATA:
+
+                    raise secs.HsmsSsTimeoutT3Error("HsmsSs-Timeout-T3", msg)
+
+                else:
+                    self.shutdown()
+                    raise secs.HsmsSsTimeoutT6Error("HsmsSs-Timeout-T6", msg)
+
+            elif rsp.get_control_type() == secs.HsmsSsControlType.REJECT_REQ:
+
+                raise secs.HsmsSsRejectMessageError("HsmsSs-Reject-Message", msg)
+
+            else:
+                return rsp
+
+        finally:
+            if self.__reply_futures.get(key, None) is fut:
+                del self.__reply_futures[key]
+
+
+class AbstractAsyncHsmsSsCommunicator(secs.AbstractSecsCommunicator):
+    """HSMS-SS communicator on asyncio.
+
+    Runs in one event loop without threads, so one loop drives many sessions.
+    open, close and open_and_wait_until_communicating are coroutines,
+    send, reply, send_sml and reply_sml return awaitables.
+    Received primary messages are put to listeners and to async iteration.
+    Listeners are called in event loop, and must not block.
+    GEM helpers are not available, these wait reply by blocking.
+    send_async and reply_async submit to event loop from other threads,
+    transactions of send_async queued beyond max_in_flight are sent by one sender thread.
+
+    Examples:
+        async with AsyncHsmsSsActiveCommunicator('127.0.0.1', 5000, 10, False) as comm:
+            await comm.open_and_wait_until_communicating()
+            reply = await comm.send(1, 1, True)
+            async for primary in comm:
+                await comm.reply(primary, primary.strm, primary.func + 1, False)
+    """
+
+    def __init__(self, session_id, is_equip, **kwargs):
+        super(AbstractAsyncHsmsSsCommunicator, self).__init__(session_id, is_equip, **kwargs)
+
+        self._hsmsss_connection = None
+
+        self._hsmsss_comm = secs.HsmsSsCommunicateState.NOT_CONNECT
+        self._hsmsss_comm_lstnrs = list()
+
+        self.__loop = None
+        self.__communicate_event = None
+        self.__recv_primary_msg_queue = None
+        self.__tasks = list()
+
+        hsmsss_comm_lstnr = kwargs.get('hsmsss_communicate', None)
+        if hsmsss_comm_lstnr is not None:
+            self.add_hsmsss_communicate_listener(hsmsss_comm_lstnr)
+
+    def __str__(self):
+        ipaddr = self._get_ipaddress()
+        return str({
+            'protocol': self._get_protocol(),
+            'ip_address': (ipaddr[0]) + ':' + str(ipaddr[1]),
+            'session_id': self.session_id,
+            'is_equip': self.is_equip,
+            'communicate_state': self.get_hsmsss_communicate_state(),
+            'name': self.name
+        })
+
+    def __repr__(self):
+        return repr({
+            'protocol': self._get_protocol(),
+            'ip_address': self._get_ipaddress(),
+            'session_id': self.session_id,
+            'is_equip': self.is_equip,
+            'communicate_state': self.get_hsmsss_communicate_state(),
+            'name': self.name
+        })
+
+    def _get_protocol(self):
+        # prototype
+        raise NotImplementedError()
+
+    def _get_ipaddress(self):
+        # prototype
+        raise NotImplementedError()
+
+    @property
+    def session_id(self):
+        pass
+
+    @session_id.setter
+    def session_id(self, val):
+        """SESSION-ID setter.
+
+        Args:
+            val (int): SESSION_ID
+        """
+        self.device_id = val
+
+    @session_id.getter
+    def session_id(self):
+        """SESSION-ID getter.
+
+        Returns:
+            int: SESSION_ID
+        """
+        return self.device_id
+
+    async def open(self):
+        """Open communicator, in running event loop.
+        """
+        self._open()
+
+    def _open(self):
+        with self._open_close_rlock:
+            if self.is_closed:
+                raise RuntimeError("Already closed")
+            if self.is_open:
+                raise RuntimeError("Already opened")
+
+            self.__loop = asyncio.get_running_loop()
+            self.__communicate_event = asyncio.Event()
+            self.__tasks.append(asyncio.ensure_future(self._loop()))
+
+            self._set_opened()
+
+    async def _loop(self):
+        # prototype
+        raise NotImplementedError()
+
+    async def close(self):
+        """Close communicator, and wait until tasks finished.
+        """
+        self._close()
+
+        tasks = [t for t in self.__tasks if t is not asyncio.current_task()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _close(self):
+        with self._open_close_rlock:
+            if self.is_closed:
+                return
+
+            self._set_closed()
+
+        try:
+            conn = self._hsmsss_connection
+            if conn is not None:
+                conn.shutdown()
+
+            for t in self.__tasks:
+                t.cancel()
+
+            if self.__communicate_event is not None:
+                self.__communicate_event.set()
+
+            if self.__recv_primary_msg_queue is not None:
+                self.__recv_primary_msg_queue.put_nowait(None)
+
+        except RuntimeError:
+            # event loop already closed
+            pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open_and_wait_until_communicating(self, timeout=None):
+        """Open communicator if not opened, and wait until selected.
+
+        Args:
+            timeout (float): seconds, None if not timeout. Defaults to None.
+
+        Raises:
+            SecsCommunicatorError: if communicator closed.
+
+        Returns:
+            bool: True if communicating, False if timeout.
+        """
+        if not self.is_open:
+            self._open()
+
+        try:
+            await asyncio.wait_for(self.__communicate_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        if self.is_closed:
+            raise secs.SecsCommunicatorError("Communicator closed")
+
+        return True
+
+    def __aiter__(self):
+        if self.__recv_primary_msg_queue is None:
+            self.__recv_primary_msg_queue = asyncio.Queue()
+            if self.is_closed:
+                self.__recv_primary_msg_queue.put_nowait(None)
+        return self
+
+    async def __anext__(self):
+        qq = self.__recv_primary_msg_queue
+        msg = await qq.get()
+        if msg is None:
+            # keep end mark for other iterators
+            qq.put_nowait(None)
+            raise StopAsyncIteration
+        return msg
+
+    def _put_recv_primary_msg(self, recv_msg):
+        super()._put_recv_primary_msg(recv_msg)
+        if recv_msg is not None and self.__recv_primary_msg_queue is not None:
+            self.__recv_primary_msg_queue.put_nowait(recv_msg)
+
+    def _build_hsmsss_connection(self, reader, writer, recv_primary_msg_callback):
+        return AsyncHsmsSsConnection(
+            reader, writer,
+            self,
+            recv_primary_msg_callback,
+            self._put_recv_all_msg,
+            self._put_sended_msg,
+            self._put_error)
+
+    def _set_hsmsss_connection(self, conn):
+        if self._hsmsss_connection is None:
+            self._hsmsss_connection = conn
+            self._put_hsmsss_comm_state(secs.HsmsSsCommunicateState.SELECTED)
+            return True
+        else:
+            return False
+
+    def _unset_hsmsss_connection(self, conn):
+        if self._hsmsss_connection is conn:
+            self._hsmsss_connection = None
+            self._put_hsmsss_comm_state(secs.HsmsSsCommunicateState.NOT_CONNECT)
+
+    async def _send(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        return await self.send_hsmsss_msg(
+            secs.HsmsSsDataMessage(strm, func, wbit, secs2body, system_bytes, device_id))
+
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        # send_async, reply_async from other threads than event loop
+        return asyncio.run_coroutine_threadsafe(
+            self._send(strm, func, wbit, secs2body, system_bytes, device_id),
+            self.__loop)
+
+    async def send_many(self, messages, max_in_flight=None):
+        """Send primary messages pipelined, and wait all replies.
+
+        Args:
+            messages (iterable): secs.SecsMessage, or tuple of (strm, func, wbit) or (strm, func, wbit, secs2body).
+            max_in_flight (int): max in-flight transactions. Defaults to None, max_in_flight of communicator.
+
+        Raises:
+            ValueError: if max_in_flight is less than 1.
+
+        Returns:
+            list: Reply-Message or None or exception of each message, in order of messages.
+        """
+        n = self.max_in_flight if max_in_flight is None else int(max_in_flight)
+        if n is not None and n < 1:
+            raise ValueError("max_in_flight require >= 1")
+
+        sem = None if n is None else asyncio.Semaphore(n)
+
+        async def _send(m):
+            args = self._create_send_args(m)
+            if sem is None:
+                return await self._send(*args)
+            async with sem:
+                return await self._send(*args)
+
+        return await asyncio.gather(*[_send(m) for m in messages], return_exceptions=True)
+
+    async def send_hsmsss_msg(self, msg):
+        conn = self._hsmsss_connection
+        if conn is None:
+            raise secs.HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg)
+        return await conn.send(msg)
+
+    def build_select_req(self):
+        return secs.HsmsSsControlMessage.build_select_request(
+            self._create_system_bytes())
+
+    def build_linktest_req(self):
+        return secs.HsmsSsControlMessage.build_linktest_request(
+            self._create_system_bytes())
+
+    def build_separate_req(self):
+        return secs.HsmsSsControlMessage.build_separate_request(
+            self._create_system_bytes())
+
+    async def send_linktest_req(self):
+        return await self.send_hsmsss_msg(self.build_linktest_req())
+
+    async def send_separate_req(self):
+        return await self.send_hsmsss_msg(self.build_separate_req())
+
+    def _receive_control_msg(self, recv_msg, conn):
+        # control messages except SELECT.req, SEPARATE.req, common to active and passive
+
+        ctrl_type = recv_msg.get_control_type()
+
+        if ctrl_type == secs.HsmsSsControlType.LINKTEST_REQ:
+
+            conn.send_nowait(
+                secs.HsmsSsControlMessage.build_linktest_response(recv_msg))
+
+        elif (ctrl_type == secs.HsmsSsControlType.SELECT_RSP
+              or ctrl_type == secs.HsmsSsControlType.LINKTEST_RSP):
+
+            conn.send_nowait(
+                secs.HsmsSsControlMessage.build_reject_request(
+                    recv_msg,
+                    secs.HsmsSsRejectReason.TRANSACTION_NOT_OPEN))
+
+        elif ctrl_type == secs.HsmsSsControlType.REJECT_REQ:
+
+            # Nothing
+            pass
+
+        elif secs.HsmsSsControlType.has_s_type(recv_msg.get_s_type()):
+
+            conn.send_nowait(
+                secs.HsmsSsControlMessage.build_reject_request(
+                    recv_msg,
+                    secs.HsmsSsRejectReason.NOT_SUPPORT_TYPE_P))
+
+        else:
+
+            conn.send_nowait(
+                secs.HsmsSsControlMessage.build_reject_request(
+                    recv_msg,
+                    secs.HsmsSsRejectReason.NOT_SUPPORT_TYPE_S))
+
+    def get_hsmsss_communicate_state(self):
+        return self._hsmsss_comm
+
+    def add_hsmsss_communicate_listener(self, listener):
+        """Add HSMS-SS-Communicate-state-change-listener.
+
+        If listener-arguments is 1, put HSMS-SS-Communicate-State.
+        If listener-arguments is 2, put HSMS-SS-Communicate-State and self-communicator-instance.
+        HSMS-SS-Communicate-State is instance of `secs.HsmsSsCommunicateState`.
+
+        Args:
+            listener (function): HSMS-SS-Communicate-state-change-listener
+
+        Returns:
+            None
+        """
+        self._hsmsss_comm_lstnrs.append(listener)
+        if self._is_single_args_listener(listener):
+            listener(self._hsmsss_comm)
+        else:
+            listener(self._hsmsss_comm, self)
+
+    def remove_hsmsss_communicate_listener(self, listener):
+        """Remove HSMS-SS-Communicate-state-change-listener.
+
+        Args:
+            listener (function): HSMS-SS-Communicate-state-change-listener
+
+        Returns:
+            None
+        """
+        self._hsmsss_comm_lstnrs.remove(listener)
+
+    def _put_hsmsss_comm_state(self, state):
+        if state != self._hsmsss_comm:
+            self._hsmsss_comm = state
+            for ls in self._hsmsss_comm_lstnrs:
+                if self._is_single_args_listener(ls):
+                    ls(self._hsmsss_comm)
+                else:
+                    ls(self._hsmsss_comm, self)
+
+            selected = (state == secs.HsmsSsCommunicateState.SELECTED)
+            self._put_communicated(selected)
+
+            if self.__communicate_event is not None:
+                if selected or self.is_closed:
+                    self.__communicate_event.set()
+                else:
+                    self.__communicate_event.clear()
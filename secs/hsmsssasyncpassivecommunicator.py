@@ -0,0 +1,128 @@
+import asyncio
+import secs
+
+
+class AsyncHsmsSsPassiveCommunicator(secs.AbstractAsyncHsmsSsCommunicator):
+
+    __PROTOCOL = 'HSMS-SS-PASSIVE'
+    __TIMEOUT_REBIND = 5.0
+
+    def __init__(self, ip_address, port, session_id, is_equip, **kwargs):
+        super(AsyncHsmsSsPassiveCommunicator, self).__init__(session_id, is_equip, **kwargs)
+
+        self.__ipaddr = (ip_address, port)
+
+        self.__conns = set()
+
+        self.timeout_rebind = kwargs.get('timeout_rebind', self.__TIMEOUT_REBIND)
+
+    def _get_protocol(self):
+        return self.__PROTOCOL
+
+    def _get_ipaddress(self):
+        return self.__ipaddr
+
+    @property
+    def timeout_rebind(self):
+        pass
+
+    @timeout_rebind.setter
+    def timeout_rebind(self, val):
+        self.__timeout_rebind = self._try_gt_zero(val)
+
+    @timeout_rebind.getter
+    def timeout_rebind(self):
+        return self.__timeout_rebind
+
+    async def _loop(self):
+        try:
+            while not self.is_closed:
+
+                try:
+                    server = await asyncio.start_server(
+                        self.__accept,
+                        *self._get_ipaddress())
+
+                except OSError as e:
+                    if not self.is_closed:
+                        self._put_error(secs.HsmsSsCommunicatorError(e))
+
+                else:
+                    try:
+                        await server.serve_forever()
+                    finally:
+                        server.close()
+
+                if self.is_closed:
+                    return
+
+                await asyncio.sleep(self.timeout_rebind)
+
+        finally:
+            for conn in list(self.__conns):
+                conn.shutdown()
+
+    async def __accept(self, reader, writer):
+
+        conn = self._build_hsmsss_connection(reader, writer, self.__receiving_msg)
+
+        try:
+            self.__conns.add(conn)
+
+            try:
+                await asyncio.wait_for(conn.await_termination(), self.timeout_t7)
+            except asyncio.TimeoutError:
+                if self._hsmsss_connection is not conn:
+                    # Timeout-T7, not selected
+                    return
+
+                await conn.await_termination()
+
+        finally:
+            conn.shutdown()
+            self.__conns.discard(conn)
+            self._unset_hsmsss_connection(conn)
+
+    def __receiving_msg(self, recv_msg, conn):
+
+        ctrl_type = recv_msg.get_control_type()
+
+        try:
+            if ctrl_type == secs.HsmsSsControlType.DATA:
+
+                if self._hsmsss_connection is conn:
+
+                    self._put_recv_primary_msg(recv_msg)
+
+                else:
+                    conn.send_nowait(
+                        secs.HsmsSsControlMessage.build_reject_request(
+                            recv_msg,
+                            secs.HsmsSsRejectReason.NOT_SELECTED))
+
+            elif ctrl_type == secs.HsmsSsControlType.SEPARATE_REQ:
+
+                conn.shutdown()
+
+            elif ctrl_type == secs.HsmsSsControlType.SELECT_REQ:
+
+                if self._hsmsss_connection is conn:
+
+                    ss = secs.HsmsSsSelectStatus.ACTIVED
+
+                elif self._set_hsmsss_connection(conn):
+
+                    ss = secs.HsmsSsSelectStatus.SUCCESS
+
+                else:
+
+                    ss = secs.HsmsSsSelectStatus.ALREADY_USED
+
+                conn.send_nowait(
+                    secs.HsmsSsControlMessage.build_select_response(recv_msg, ss))
+
+            else:
+                self._receive_control_msg(recv_msg, conn)
+
+        except secs.HsmsSsSendMessageError as e:
+            self._put_error(e)
@@ -1,4 +1,7 @@
+import concurrent.futures
+import selectors
 import threading
+import time
 import secs
 
 
@@ -85,6 +88,40 @@ class SendReplyHsmsSsMessagePack:
             return self.__reply_msg
 
 
+class SendReplyHsmsSsMessageFuturePack:
+    """Pack of sended message, resolves future by reply message, timeout or shutdown."""
+
+    def __init__(self, msg, future):
+        self.__msg = msg
+        self.__future = future
+        self.__lock = threading.Lock()
+
+    def __resolve(self, result=None, exception=None):
+        with self.__lock:
+            if self.__future.done():
+                return False
+            if exception is None:
+                self.__future.set_result(result)
+            else:
+                self.__future.set_exception(exception)
+            return True
+
+    def shutdown(self):
+        self.__resolve(exception=HsmsSsCommunicatorError("HsmsSsConnection terminated"))
+
+    def get_system_bytes(self):
+        return self.__msg.system_bytes
+
+    def put_reply_msg(self, reply_msg):
+        if reply_msg.get_control_type() == secs.HsmsSsControlType.REJECT_REQ:
+            self.__resolve(exception=HsmsSsRejectMessageError("HsmsSs-Reject-Message", self.__msg))
+        else:
+            self.__resolve(result=reply_msg)
+
+    def put_except(self, e):
+        return self.__resolve(exception=e)
+
+
 class SendReplyHsmsSsMessagePackPool:
 
     def __init__(self):
@@ -98,9 +135,11 @@ class SendReplyHsmsSsMessagePackPool:
         self.shutdown()
     
     def shutdown(self):
+        # packs are called out of lock, futures run callbacks on this thread
         with self.__lock:
-            for pack in self.__pool.values():
-                pack.shutdown()
+            packs = list(self.__pool.values())
+        for pack in packs:
+            pack.shutdown()
 
     def entry(self, pack):
         with self.__lock:
@@ -108,20 +147,130 @@ class SendReplyHsmsSsMessagePackPool:
 
     def remove(self, pack):
         with self.__lock:
-            del self.__pool[pack.get_system_bytes()]
+            key = pack.get_system_bytes()
+            if self.__pool.get(key, None) is pack:
+                del self.__pool[key]
 
     def put_reply_msg(self, reply_msg):
         with self.__lock:
-            key = reply_msg.system_bytes
-            if key in self.__pool:
-                self.__pool[key].put_reply_msg(reply_msg)
-                return True
+            pack = self.__pool.get(reply_msg.system_bytes, None)
+        if pack is None:
+            return False
+        else:
+            pack.put_reply_msg(reply_msg)
+            return True
+
+
+class HsmsSsFrameReader:
+    """HSMS-SS frame reader.
+
+    Receives socket bytes by recv_into to one growable buffer,
+    and cuts out each frame (4-bytes-length + 10-bytes-header + body) as one contiguous bytes.
+    """
+
+    __DEFAULT_BUFFER_SIZE = 65536
+
+    def __init__(self, sock, buffer_size=None):
+        self.__sock = sock
+        self.__buffer_size = self.__DEFAULT_BUFFER_SIZE if buffer_size is None else int(buffer_size)
+        self.__buf = bytearray(self.__buffer_size)
+        self.__view = memoryview(self.__buf)
+        self.__head = 0
+        self.__tail = 0
+        self.__selector = None
+
+    def close(self):
+        """Close selector of Timeout-T8, not close socket.
+        """
+        if self.__selector is not None:
+            self.__selector.close()
+            self.__selector = None
+
+    def read(self, timeout_t8=None):
+        """Read next frame.
+
+        Timeout-T8 is applied while a frame is partially received.
+
+        Args:
+            timeout_t8 (float or None): Timeout-T8 seconds, None if not timeout.
+
+        Raises:
+            HsmsSsCommunicatorError: if T8-Timeout, socket terminated, or size < 10.
+
+        Returns:
+            bytes: 4-bytes-length + 10-bytes-header + body
+        """
+        self.__fill(4, timeout_t8)
+
+        h = self.__head
+        bs = self.__buf
+        size = (bs[h] << 24 | bs[h + 1] << 16 | bs[h + 2] << 8 | bs[h + 3])
+
+        if size < 10:
+            raise HsmsSsCommunicatorError("Receive message size < 10")
+
+        size += 4
+
+        self.__fill(size, timeout_t8)
+
+        h = self.__head
+        frame = bytes(self.__view[h:(h + size)])
+        self.__consume(size)
+        return frame
+
+    def __fill(self, size, timeout):
+        while (self.__tail - self.__head) < size:
+
+            if (self.__head + size) > len(self.__buf):
+                self.__reserve(size)
+
+            if timeout is not None and self.__tail > self.__head:
+                if not self.__wait_readable(timeout):
+                    raise HsmsSsCommunicatorError("T8-Timeout")
+
+            n = self.__sock.recv_into(self.__view[self.__tail:])
+            if n:
+                self.__tail += n
             else:
-                return False
+                raise HsmsSsCommunicatorError("Terminate detect")
+
+    def __wait_readable(self, timeout):
+        # selectors, not limited by FD_SETSIZE like select.select
+        if self.__selector is None:
+            self.__selector = selectors.DefaultSelector()
+            self.__selector.register(self.__sock, selectors.EVENT_READ)
+        return bool(self.__selector.select(timeout))
+
+    def __reserve(self, size):
+        pending = self.__view[self.__head:self.__tail]
+        if size > len(self.__buf):
+            buf = bytearray(size)
+            buf[0:len(pending)] = pending
+            self.__replace(buf)
+        else:
+            self.__buf[0:len(pending)] = bytes(pending)
+        self.__tail -= self.__head
+        self.__head = 0
+
+    def __consume(self, size):
+        self.__head += size
+        if self.__head == self.__tail:
+            self.__head = 0
+            self.__tail = 0
+            if len(self.__buf) > self.__buffer_size:
+                self.__replace(bytearray(self.__buffer_size))
+
+    def __replace(self, buf):
+        self.__view.release()
+        self.__buf = buf
+        self.__view = memoryview(buf)
 
 
 class HsmsSsConnection:
-    
+
+    __IOV_MAX = 1024
+    __GATHER_MIN = 0x10000
+
     def __init__(
             self, sock, comm,
             recv_primary_msg_put_callback,
@@ -139,13 +288,17 @@ class HsmsSsConnection:
         self.__terminated_cdt = threading.Condition()
         self.__terminated = False
 
-        self.__bbqq = secs.WaitingQueuing()
+        self.__frame_reader = HsmsSsFrameReader(sock)
 
         self.__send_reply_pool = SendReplyHsmsSsMessagePackPool()
 
         self.__send_lock = threading.Lock()
+        self.__write_lock = threading.Lock()
+        self.__send_queue = list()
+        self.__writing = False
+
+        self.__timer = secs.TimeoutTimer()
 
-        threading.Thread(target=self.__receiving_socket_bytes, daemon=True).start()
         threading.Thread(target=self.__reading_msg, daemon=True).start()
     
     def __enter__(self):
@@ -161,11 +314,11 @@ class HsmsSsConnection:
 
                 self.__terminated = True
 
-                self.__bbqq.shutdown()
-                self.__send_reply_pool.shutdown()
-
                 self.__terminated_cdt.notify_all()
 
+        self.__timer.shutdown()
+        self.__send_reply_pool.shutdown()
+
     def __is_terminated(self):
         with self.__terminated_cdt:
             return self.__terminated
@@ -174,106 +327,241 @@ class HsmsSsConnection:
         with self.__terminated_cdt:
             self.__terminated_cdt.wait_for(self.__is_terminated, timeout)
 
-    def __receiving_socket_bytes(self):
+    def __reading_msg(self):
         try:
             while not self.__is_terminated():
-                bs = self.__sock.recv(4096)
-                if bs:
-                    self.__bbqq.puts(bs)
-                else:
-                    raise HsmsSsCommunicatorError("Terminate detect")
+
+                msg = secs.HsmsSsMessage.from_bytes(
+                    self.__frame_reader.read(self.__comm.timeout_t8),
+                    self.__comm.lazy_decode,
+                    self.__comm.cache_policy)
+
+                self.__put_recv_all_msg(msg)
+
+                if not self.__send_reply_pool.put_reply_msg(msg):
+                    self.__put_recv_primary_msg(msg, self)
 
         except HsmsSsCommunicatorError as e:
             if not self.__is_terminated():
                 self.__put_error(e)
-        except Exception as e:
+        except OSError as e:
             if not self.__is_terminated():
                 self.__put_error(HsmsSsCommunicatorError(e))
+        except Exception as e:
+            if not self.__is_terminated():
+                self.__put_error(e)
 
         finally:
+            self.__frame_reader.close()
             self.shutdown()
 
-    def __reading_msg(self):
+    def __get_timeout_tx(self, msg):
+        # timeout seconds of waiting reply, -1.0 if not wait
+        ctrl_type = msg.get_control_type()
+
+        if ctrl_type == secs.HsmsSsControlType.DATA:
+            if msg.wbit:
+                return self.__comm.timeout_t3
+
+        elif (ctrl_type == secs.HsmsSsControlType.SELECT_REQ
+              or ctrl_type == secs.HsmsSsControlType.LINKTEST_REQ):
+
+            return self.__comm.timeout_t6
+
+        return -1.0
+
+    def __send_bytes(self, msg):
+        e = self.__write([msg])
+        if e is not None:
+            raise HsmsSsSendMessageError(e, msg)
+
+    def __write(self, msgs):
+        # Write messages in order, and return exception if failed, otherwise None.
+        window = self.__comm.coalesce_window
+        if window <= 0.0:
+            entry = [msgs, None, None]
+            with self.__write_lock:
+                self.__write_batch([entry])
+            return entry[1]
+
+        # Coalescing, writer writes messages queued by other threads while writing too, at once.
+        # If queued after write, writer waits coalesce_window to batch more.
+        with self.__send_lock:
+            if self.__writing:
+                waiter = threading.Lock()
+                waiter.acquire()
+                entry = [msgs, None, waiter]
+                self.__send_queue.append(entry)
+            else:
+                self.__writing = True
+                entry = None
+
+        if entry is not None:
+            # released by writer
+            waiter.acquire()
+            return entry[1]
+
+        entry = [msgs, None, None]
+        batch = [entry]
+
         try:
-            while not self.__is_terminated():
+            while True:
+                with self.__write_lock:
+                    self.__write_batch(batch)
 
-                heads = list()
-                pos = 0
-                size = 14
+                with self.__send_lock:
+                    if not self.__send_queue:
+                        self.__writing = False
+                        return entry[1]
 
-                r = self.__bbqq.put_to_list(heads, pos, size)
-                if r < 0:
-                    return
+                time.sleep(window)
 
-                pos += r
+                with self.__send_lock:
+                    batch = self.__send_queue
+                    self.__send_queue = list()
 
-                while pos < size:
-                    r = self.__bbqq.put_to_list(
-                        heads, pos, size,
-                        self.__comm.timeout_t8)
-                    
-                    if r < 0:
-                        raise HsmsSsCommunicatorError("T8-Timeout")
-                    else:
-                        pos += r
-
-                bodys = list()
-                pos = 0
-                size = (heads[0] << 24
-                        | heads[1] << 16
-                        | heads[2] << 8
-                        | heads[3]) - 10
-
-                if size < 0:
-                    raise HsmsSsCommunicatorError("Receive message size < 10")
-
-                while pos < size:
-                    r = self.__bbqq.put_to_list(
-                        bodys, pos, size,
-                        self.__comm.timeout_t8)
-                    
-                    if r < 0:
-                        raise HsmsSsCommunicatorError("T8-Timeout")
-                    else:
-                        pos += r
+        except BaseException as e:
+            with self.__send_lock:
+                self.__writing = False
+                batch = self.__send_queue
+                self.__send_queue = list()
+            for ent in batch:
+                ent[1] = e
+                ent[2].release()
+            raise
+
+    def __write_batch(self, batch):
+        bufs = list()
+        sends = list()
+        for ent in batch:
+            try:
+                vv = list()
+                for msg in ent[0]:
+                    vv.extend(msg.to_buffers())
+            except Exception as e:
+                ent[1] = e
+            else:
+                bufs.extend(vv)
+                sends.append(ent)
 
-                msg = secs.HsmsSsMessage.from_bytes(bytes(heads) + bytes(bodys))
+        try:
+            self.__send_buffers(bufs)
+            e = None
+        except Exception as ex:
+            e = ex
+
+        for ent in sends:
+            if e is None:
+                for msg in ent[0]:
+                    self.__put_sended_msg(msg)
+            ent[1] = e
+
+        for ent in batch:
+            if ent[2] is not None:
+                ent[2].release()
+
+    def __send_buffers(self, bufs):
+        # join small buffers, scatter/gather large buffers not to copy
+        if len(bufs) == 1:
+            self.__sock.sendall(bufs[0])
+            return
+
+        if sum(map(len, bufs)) < self.__GATHER_MIN or not hasattr(self.__sock, 'sendmsg'):
+            self.__sock.sendall(b''.join(bufs))
+            return
+
+        vv = [memoryview(b).cast('B') for b in bufs]
+        i = 0
+        while i < len(vv):
+            n = self.__sock.sendmsg(vv[i:i + self.__IOV_MAX])
+            while n > 0:
+                m = len(vv[i])
+                if n >= m:
+                    n -= m
+                    i += 1
+                else:
+                    vv[i] = vv[i][n:]
+                    n = 0
 
-                self.__put_recv_all_msg(msg)
+    def send_async(self, msg):
+        """Send message, and not wait reply.
 
-                if not self.__send_reply_pool.put_reply_msg(msg):
-                    self.__put_recv_primary_msg(msg, self)
+        Future is resolved by reading thread when reply received,
+        or by timer thread when Timeout-T3/T6.
 
-        except Exception as e:
-            if not self.__is_terminated():
-                self.__put_error(e)
+        Args:
+            msg (secs.HsmsSsMessage): message.
 
-        finally:
-            self.shutdown()
+        Returns:
+            concurrent.futures.Future: result is Reply-Message if exist, otherwise None.
+        """
+        return self.send_many_async([msg])[0]
 
-    def send(self, msg):
+    def send_many_async(self, msgs):
+        """Send messages by one socket write, and not wait replies.
 
-        timeout_tx = -1.0
+        Args:
+            msgs (list): secs.HsmsSsMessage list.
 
-        ctrl_type = msg.get_control_type()
+        Returns:
+            list: concurrent.futures.Future of each message, result is Reply-Message if exist, otherwise None.
+        """
+        futures = list()
+        sends = list()
 
-        if ctrl_type == secs.HsmsSsControlType.DATA:
-            if msg.wbit:
-                timeout_tx = self.__comm.timeout_t3
+        for msg in msgs:
 
-        elif (ctrl_type == secs.HsmsSsControlType.SELECT_REQ
-              or ctrl_type == secs.HsmsSsControlType.LINKTEST_REQ):
+            fut = concurrent.futures.Future()
+            futures.append(fut)
+
+            timeout_tx = self.__get_timeout_tx(msg)
+
+            if timeout_tx < 0.0:
+                sends.append((msg, fut, None))
+                continue
+
+            pack = SendReplyHsmsSsMessageFuturePack(msg, fut)
+
+            def _timeout(msg=msg, pack=pack):
+                if msg.get_control_type() == secs.HsmsSsControlType.DATA:
+                    pack.put_except(HsmsSsTimeoutT3Error("HsmsSs-Timeout-T3", msg))
+                elif pack.put_except(HsmsSsTimeoutT6Error("HsmsSs-Timeout-T6", msg)):
+                    self.shutdown()
+
+            self.__send_reply_pool.entry(pack)
+            fut.add_done_callback(lambda f, pack=pack: self.__send_reply_pool.remove(pack))
+
+            if self.__is_terminated():
+                pack.shutdown()
+
+            else:
+                entry = self.__timer.schedule(timeout_tx, _timeout)
+                fut.add_done_callback(lambda f, entry=entry: self.__timer.cancel(entry))
+                sends.append((msg, fut, pack))
 
-            timeout_tx = self.__comm.timeout_t6
+        if sends:
+            e = self.__write([msg for msg, _, _ in sends])
+
+            for msg, fut, pack in sends:
+                if e is not None:
+                    if pack is None:
+                        fut.set_exception(HsmsSsSendMessageError(e, msg))
+                    else:
+                        pack.put_except(HsmsSsSendMessageError(e, msg))
+                elif pack is None:
+                    fut.set_result(None)
+
+        return futures
+
+    def send(self, msg):
+
+        ctrl_type = msg.get_control_type()
+
+        timeout_tx = self.__get_timeout_tx(msg)
 
         def _send():
-            with self.__send_lock:
-                try:
-                    self.__sock.sendall(msg.to_bytes())
-                    self.__put_sended_msg(msg)
-                except Exception as e:
-                    raise HsmsSsSendMessageError(e, msg)
-        
+            self.__send_bytes(msg)
+
         if timeout_tx >= 0.0:
 
             pack = SendReplyHsmsSsMessagePack(msg)
@@ -334,6 +622,8 @@ class AbstractHsmsSsCommunicator(secs.AbstractSecsCommunicator):
         self.__sended_msg_putter = secs.CallbackQueuing(self._put_sended_msg)
         self.__error_putter = secs.CallbackQueuing(super()._put_error)
 
+        self.coalesce_window = kwargs.get('coalesce_window', 0.0)
+
         hsmsss_comm_lstnr = kwargs.get('hsmsss_communicate', None)
         if hsmsss_comm_lstnr is not None:
             self.add_hsmsss_communicate_listener(hsmsss_comm_lstnr)
@@ -389,6 +679,40 @@ class AbstractHsmsSsCommunicator(secs.AbstractSecsCommunicator):
         """
         return self.device_id
 
+    @property
+    def coalesce_window(self):
+        pass
+
+    @coalesce_window.setter
+    def coalesce_window(self, val):
+        """Coalescing window seconds of sending setter.
+
+        If messages are queued while writing, writer waits window seconds
+        and writes all queued messages at once. Idle sending is not delayed.
+
+        Args:
+            val (int or float): seconds, 0.0 if not wait.
+
+        Raises:
+            TypeError: if value is None.
+            ValueError: if value is less than 0.0.
+        """
+        if val is None:
+            raise TypeError("coalesce_window require not None")
+        val = float(val)
+        if val < 0.0:
+            raise ValueError("coalesce_window require >= 0.0")
+        self.__coalesce_window = val
+
+    @coalesce_window.getter
+    def coalesce_window(self):
+        """Coalescing window seconds of sending getter.
+
+        Returns:
+            float: seconds
+        """
+        return self.__coalesce_window
+
     def _put_error(self, e):
         self.__error_putter.put(e)
 
@@ -452,6 +776,51 @@ class AbstractHsmsSsCommunicator(secs.AbstractSecsCommunicator):
         
         return _f().send(msg)
 
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        return self.send_hsmsss_msg_async(
+            secs.HsmsSsDataMessage(strm, func, wbit, secs2body, system_bytes, device_id))
+
+    def _send_many_async(self, args_list):
+
+        # build each message own, failed item is failed future.
+        futures = list()
+        msgs = list()
+
+        for args in args_list:
+            try:
+                msgs.append(secs.HsmsSsDataMessage(*args))
+                futures.append(None)
+            except Exception as e:
+                fut = concurrent.futures.Future()
+                fut.set_exception(e)
+                futures.append(fut)
+
+        with self._hsmsss_connection_lock:
+            conn = self._hsmsss_connection
+
+        if conn is None:
+            sended = list()
+            for msg in msgs:
+                fut = concurrent.futures.Future()
+                fut.set_exception(HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg))
+                sended.append(fut)
+        else:
+            sended = conn.send_many_async(msgs) if msgs else list()
+
+        it = iter(sended)
+        return [next(it) if fut is None else fut for fut in futures]
+
+    def send_hsmsss_msg_async(self, msg):
+        with self._hsmsss_connection_lock:
+            conn = self._hsmsss_connection
+
+        if conn is None:
+            fut = concurrent.futures.Future()
+            fut.set_exception(HsmsSsSendMessageError("HsmsSsCommunicator not connected", msg))
+            return fut
+
+        return conn.send_async(msg)
+
     def build_select_req(self):
         return secs.HsmsSsControlMessage.build_select_request(
             self._create_system_bytes())
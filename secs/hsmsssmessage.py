@@ -30,19 +30,18 @@ class HsmsSsControlType:
         SEPARATE_REQ
     )
 
+    # s-type -> control type of p-type 0x00, UNDEFINED if not exist
+    __BY_S_TYPE = tuple(map(dict([(x[1], x) for x in __ITEMS]).get, range(256), (UNDEFINED,) * 256))
+
     @classmethod
     def get(cls, v):
-        for x in cls.__ITEMS:
-            if x[0] == v[0] and x[1] == v[1]:
-                return x
+        if v[0] == 0x00 and 0x00 <= v[1] <= 0xFF:
+            return cls.__BY_S_TYPE[v[1]]
         return cls.UNDEFINED
 
     @classmethod
     def has_s_type(cls, b):
-        for x in cls.__ITEMS:
-            if x[1] == b:
-                return True
-        return False
+        return 0x00 <= b <= 0xFF and cls.__BY_S_TYPE[b] is not cls.UNDEFINED
 
 
 class HsmsSsSelectStatus:
@@ -61,12 +60,12 @@ class HsmsSsSelectStatus:
         ALREADY_USED
     )
 
+    # byte -> select status, UNKNOWN if not exist
+    __BY_BYTE = tuple(map(dict([(x, x) for x in __ITEMS]).get, range(256), (UNKNOWN,) * 256))
+
     @classmethod
     def get(cls, b):
-        for x in cls.__ITEMS:
-            if x == b:
-                return x
-        return cls.UNKNOWN
+        return cls.__BY_BYTE[b] if 0x00 <= b <= 0xFF else cls.UNKNOWN
 
 
 class HsmsSsRejectReason:
@@ -85,27 +84,26 @@ class HsmsSsRejectReason:
         NOT_SELECTED
     )
 
+    # byte -> reject reason, UNKNOWN if not exist
+    __BY_BYTE = tuple(map(dict([(x, x) for x in __ITEMS]).get, range(256), (UNKNOWN,) * 256))
+
     @classmethod
     def get(cls, b):
-        for x in cls.__ITEMS:
-            if x == b:
-                return x
-        return cls.UNKNOWN
+        return cls.__BY_BYTE[b] if 0x00 <= b <= 0xFF else cls.UNKNOWN
 
 
 class HsmsSsMessage(secs.SecsMessage):
 
+    __slots__ = ('_system_bytes', '_control_type')
+
     def __init__(self, strm, func, wbit, secs2body, system_bytes, control_type):
         super(HsmsSsMessage, self).__init__(strm, func, wbit, secs2body)
         self._system_bytes = system_bytes
         self._control_type = control_type
-        self._cache_msg_length = None
-        self._cache_str = None
-        self._cache_repr = None
-        self._cache_bytes = None
 
     def __str__(self):
-        if self._cache_str is None:
+        v = self._get_text_cache('str')
+        if v is None:
             vv = [self.get_header10bytes_str(), ' length:', str(self._msg_length())]
             if self._control_type == HsmsSsControlType.DATA:
                 vv.extend([
@@ -118,14 +116,15 @@ class HsmsSsMessage(secs.SecsMessage):
                 if self.secs2body is not None:
                     vv.extend([
                         self._STR_LINESEPARATOR,
-                        self.secs2body.to_sml()
+                        self._str_body()
                     ])
                 vv.append('.')
-            self._cache_str = ''.join(vv)
-        return self._cache_str
+            v = self._set_text_cache('str', ''.join(vv))
+        return v
 
     def __repr__(self):
-        if self._cache_repr is None:
+        v = self._get_text_cache('repr')
+        if v is None:
             vv = ["{'header':", str(self._header10bytes())]
             if self._control_type == HsmsSsControlType.DATA:
                 vv.extend([
@@ -136,17 +135,21 @@ class HsmsSsMessage(secs.SecsMessage):
                 if self.secs2body is not None:
                     vv.extend([",'secs2body':", repr(self.secs2body)])
             vv.append("}")
-            self._cache_repr = ''.join(vv)
-        return self._cache_repr
+            v = self._set_text_cache('repr', ''.join(vv))
+        return v
 
     def _msg_length(self):
-        if self._cache_msg_length is None:
+        i = self._get_cache('msg_length')
+        if i is None:
+            bs = self._get_cache('bytes')
+            if bs is not None:
+                return self._set_cache('msg_length', len(bs) - 4)
             i = len(self._header10bytes())
             if self.secs2body is not None:
-                i += len(self.secs2body.to_bytes())
-            self._cache_msg_length = i
+                i += self.secs2body.get_encoded_size()
+            self._set_cache('msg_length', i)
 
-        return self._cache_msg_length
+        return i
 
     def _device_id(self):
         # prototype
@@ -161,10 +164,10 @@ class HsmsSsMessage(secs.SecsMessage):
         return self._control_type
 
     def get_p_type(self):
-        return self._control_type[0]
+        return (self._header10bytes())[4]
 
     def get_s_type(self):
-        return self._control_type[1]
+        return (self._header10bytes())[5]
 
     def get_select_status(self):
         return HsmsSsSelectStatus.get((self._header10bytes())[3])
@@ -173,23 +176,53 @@ class HsmsSsMessage(secs.SecsMessage):
         return HsmsSsRejectReason.get((self._header10bytes())[3])
 
     def to_bytes(self):
-        if self._cache_bytes is None:
+        v = self._get_cache('bytes')
+        if v is None:
             msg_len = self._msg_length()
-            vv = [
-                bytes([
-                    (msg_len >> 24) & 0xFF,
-                    (msg_len >> 16) & 0xFF,
-                    (msg_len >> 8) & 0xFF,
-                    msg_len & 0xFF
-                ]),
-                self._header10bytes(),
-                b'' if self.secs2body is None else self.secs2body.to_bytes()
-            ]
-            self._cache_bytes = b''.join(vv)
-        return self._cache_bytes
-        
+            buf = bytearray(4 + msg_len)
+            buf[0:4] = bytes([
+                (msg_len >> 24) & 0xFF,
+                (msg_len >> 16) & 0xFF,
+                (msg_len >> 8) & 0xFF,
+                msg_len & 0xFF
+            ])
+            buf[4:14] = self._header10bytes()
+            if self.secs2body is not None:
+                self.secs2body.encode_into(buf, 14)
+            v = self._set_cache('bytes', bytes(buf))
+        return v
+
+    def to_buffers(self):
+        """Buffers of HSMS-SS message bytes, for scatter/gather write.
+
+        Body is not copied into frame, if frame bytes is not cached.
+
+        Returns:
+            list: buffers, 4-bytes-length + 10-bytes-header, and body if exist.
+        """
+        v = self._get_cache('bytes')
+        if v is not None:
+            return [v]
+        h10bs = self._header10bytes()
+        if self.secs2body is None:
+            return [self._msg_length().to_bytes(4, 'big') + h10bs]
+        bs = self.secs2body.to_bytes()
+        return [(len(h10bs) + len(bs)).to_bytes(4, 'big') + h10bs, bs]
+
     @classmethod
-    def from_bytes(cls, bs):
+    def from_bytes(cls, bs, lazy=False, cache_policy=None):
+        """Build from HSMS-SS message bytes.
+
+        Args:
+            bs (bytes): 4-bytes-length + 10-bytes-header + body
+            lazy (bool): True if decode L items of body lazily over bs. Defaults to False.
+            cache_policy (secs.Secs2BodyCachePolicy): cache policy of body. Defaults to Secs2BodyBuilder.cache_policy.
+
+        Body is decoded on first access to secs2body, header fields are available immediately.
+
+        Returns:
+            HsmsSsMessage: message
+        """
 
         h10bs = bs[4:14]
         sys_bs = h10bs[6:10]
@@ -203,47 +236,44 @@ class HsmsSsMessage(secs.SecsMessage):
             func = h10bs[3]
             wbit = (h10bs[2] & 0x80) == 0x80
 
-            if len(bs) > 14:
-                s2b = secs.Secs2BodyBuilder.from_body_bytes(bs[14:])
-                v = HsmsSsDataMessage(strm, func, wbit, s2b, sys_bs, dev_id)
-            else:
-                v = HsmsSsDataMessage(strm, func, wbit, None, sys_bs, dev_id)
+            v = HsmsSsDataMessage(strm, func, wbit, None, sys_bs, dev_id)
+            v._set_secs2body_source(memoryview(bs)[14:], lazy, cache_policy)
             
         else:
 
             v = HsmsSsControlMessage(sys_bs, ctrl_type)
-            v._p_type = h10bs[2]
-            v._s_type = h10bs[3]
 
-        v._cache_bytes = bs
-        v._cache_header10bytes = h10bs
-        
+        v._set_cache('bytes', bs)
+        v._set_cache('header10bytes', h10bs)
+
         return v
 
 
 class HsmsSsDataMessage(HsmsSsMessage):
 
+    __slots__ = ('__session_id', )
+
     def __init__(self, strm, func, wbit, secs2body, system_bytes, session_id):
         super(HsmsSsDataMessage, self).__init__(strm, func, wbit, secs2body, system_bytes, HsmsSsControlType.DATA)
         self.__session_id = session_id
-        self.__cache_header10bytes = None
 
     def _header10bytes(self):
-        if self.__cache_header10bytes is None:
+        v = self._get_cache('header10bytes')
+        if v is None:
             b2 = self.strm
             if self.wbit:
                 b2 |= 0x80
 
-            self.__cache_header10bytes = bytes([
+            v = self._set_cache('header10bytes', bytes([
                 (self.session_id >> 8) & 0x7F,
                 self.session_id & 0xFF,
                 b2, self.func,
                 self._control_type[0], self._control_type[1],
                 self._system_bytes[0], self._system_bytes[1],
                 self._system_bytes[2], self._system_bytes[3]
-                ])
-        
-        return self.__cache_header10bytes
+                ]))
+
+        return v
 
     @property
     def session_id(self):
@@ -259,9 +289,23 @@ class HsmsSsDataMessage(HsmsSsMessage):
 
 class HsmsSsControlMessage(HsmsSsMessage):
 
+    __slots__ = ()
+
+    # 4-bytes-length of control message frame
+    _FRAME_LENGTH_BYTES = bytes([0x00, 0x00, 0x00, 0x0A])
+
+    # control type -> pre-encoded header before system-bytes
+    _HEADER_PREFIXES = dict([
+        (x, bytes([0xFF, 0xFF, 0x00, 0x00, x[0], x[1]]))
+        for x in (
+            HsmsSsControlType.SELECT_REQ, HsmsSsControlType.SELECT_RSP,
+            HsmsSsControlType.DESELECT_REQ, HsmsSsControlType.DESELECT_RSP,
+            HsmsSsControlType.LINKTEST_REQ, HsmsSsControlType.LINKTEST_RSP,
+            HsmsSsControlType.REJECT_REQ,
+            HsmsSsControlType.SEPARATE_REQ)])
+
     def __init__(self, system_bytes, control_type):
         super(HsmsSsControlMessage, self).__init__(0, 0, False, None, system_bytes, control_type)
-        self.__cache_header10bytes = None
 
     CONTROL_DEVICE_ID = -1
 
@@ -269,16 +313,26 @@ class HsmsSsControlMessage(HsmsSsMessage):
         return self.CONTROL_DEVICE_ID
 
     def _header10bytes(self):
-        if self.__cache_header10bytes is None:
-            self.__cache_header10bytes = bytes([
-                0xFF, 0xFF,
-                0x00, 0x00,
-                self._control_type[0], self._control_type[1],
-                self._system_bytes[0], self._system_bytes[1],
-                self._system_bytes[2], self._system_bytes[3]
-                ])
-        
-        return self.__cache_header10bytes
+        v = self._get_cache('header10bytes')
+        if v is None:
+            prefix = self._HEADER_PREFIXES.get(self._control_type)
+            if prefix is None:
+                prefix = bytes([0xFF, 0xFF, 0x00, 0x00, self._control_type[0], self._control_type[1]])
+            v = self._set_cache('header10bytes', prefix + bytes(self._system_bytes))
+
+        return v
+
+    def _msg_length(self):
+        return 10
+
+    def to_bytes(self):
+        v = self._get_cache('bytes')
+        if v is None:
+            v = self._set_cache('bytes', self._FRAME_LENGTH_BYTES + self._header10bytes())
+        return v
+
+    def to_buffers(self):
+        return [self.to_bytes()]
 
     @classmethod
     def build_select_request(cls, system_bytes):
@@ -289,13 +343,13 @@ class HsmsSsControlMessage(HsmsSsMessage):
         ctrl_type = HsmsSsControlType.SELECT_RSP
         sys_bytes = primary_msg.system_bytes
         r = HsmsSsControlMessage(sys_bytes, ctrl_type)
-        r._cache_header10bytes = bytes([
+        r._set_cache('header10bytes', bytes([
             0xFF, 0xFF,
             0x00, select_status,
             ctrl_type[0], ctrl_type[1],
             sys_bytes[0], sys_bytes[1],
             sys_bytes[2], sys_bytes[3]
-            ])
+            ]))
         return r
 
     @classmethod
@@ -315,13 +369,13 @@ class HsmsSsControlMessage(HsmsSsMessage):
         b2 = h10bytes[4] if reject_reason == HsmsSsRejectReason.NOT_SUPPORT_TYPE_P else h10bytes[5]
         sys_bytes = h10bytes[6:10]
         r = HsmsSsControlMessage(sys_bytes, ctrl_type)
-        r._cache_header10bytes = bytes([
+        r._set_cache('header10bytes', bytes([
             0xFF, 0xFF,
             b2, reject_reason,
             ctrl_type[0], ctrl_type[1],
             sys_bytes[0], sys_bytes[1],
             sys_bytes[2], sys_bytes[3]
-            ])
+            ]))
         return r
     
     @classmethod
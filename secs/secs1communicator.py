@@ -1,5 +1,7 @@
+import concurrent.futures
 import secs
 import threading
+import time
 
 
 class Secs1CommunicatorError(secs.SecsCommunicatorError):
@@ -37,9 +39,54 @@ class MsgAndRecvBytesWaitingQueuing(secs.WaitingQueuing):
     def __init__(self):
         super(MsgAndRecvBytesWaitingQueuing, self).__init__()
         self.__msg_queue = list()
+        self.__recv_buffer = bytearray()
 
     def put_recv_bytes(self, bs):
-        self.puts(bs)
+        with self._v_cdt:
+            if bs and not self._is_terminated():
+                self.__recv_buffer += bs
+                self._v_cdt.notify_all()
+
+    def _poll_vv(self):
+        with self._v_cdt:
+            if self.__recv_buffer:
+                v = self.__recv_buffer[0]
+                del self.__recv_buffer[0]
+                return v
+            else:
+                return None
+
+    def _has_vv(self):
+        with self._v_cdt:
+            return bool(self.__recv_buffer)
+
+    def put_to_list(self, values, pos, size, timeout=None):
+
+        def _f(vv, p, m):
+            buf = self.__recv_buffer
+            if buf:
+                r = min(m - p, len(buf))
+                vv += buf[0:r]
+                del buf[0:r]
+                return r
+            else:
+                return -1
+
+        with self._v_cdt:
+
+            if self._is_terminated():
+                return -1
+
+            rr = _f(values, pos, size)
+            if rr > 0:
+                return rr
+
+            self._wait_vv(timeout)
+
+            if self._is_terminated():
+                return -1
+
+            return _f(values, pos, size)
 
     def entry_msg(self, msg):
         with self._v_cdt:
@@ -74,7 +121,7 @@ class MsgAndRecvBytesWaitingQueuing(secs.WaitingQueuing):
     def recv_bytes_garbage(self, timeout):
 
         with self._v_cdt:
-            del self._vv[:]
+            del self.__recv_buffer[:]
 
             if self._is_terminated():
                 return
@@ -96,6 +143,7 @@ class SendSecs1MessagePack:
         self.__except = None
         self.__timer_resetted = True
         self.__reply_msg = None
+        self.__listener = None
 
     def secs1msg(self):
         return self.__msg
@@ -128,12 +176,14 @@ class SendSecs1MessagePack:
             self.__sended = True
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
 
     def notify_except(self, e):
         with self.__lock:
             self.__except = e
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
 
     def wait_until_reply(self, timeout):
 
@@ -157,12 +207,29 @@ class SendSecs1MessagePack:
             self.__reply_msg = msg
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
 
     def notify_timer_reset(self):
         with self.__lock:
             self.__timer_resetted = True
             with self.__cdt:
                 self.__cdt.notify_all()
+        self.__notify_listener()
+
+    def set_listener(self, listener):
+        # listener is called without lock on each notify.
+        self.__listener = listener
+
+    def __notify_listener(self):
+        if self.__listener is not None:
+            self.__listener()
+
+    def poll_state(self):
+        # (sended, except, reply-msg, timer-resetted), timer-resetted is cleared.
+        with self.__lock:
+            r = self.__timer_resetted
+            self.__timer_resetted = False
+            return self.__sended, self.__except, self.__reply_msg, r
 
 
 class Secs1SendReplyPackPool:
@@ -248,6 +315,10 @@ class AbstractSecs1Communicator(secs.AbstractSecsCommunicator):
 
         self.__circuit_th = None
 
+        self.__async_entries = list()
+        self.__async_cdt = threading.Condition()
+        self.__async_waiting = False
+
     @property
     def is_master(self):
         pass
@@ -332,6 +403,9 @@ class AbstractSecs1Communicator(secs.AbstractSecsCommunicator):
         self.__secs1_circuit_error_msg_putter.shutdown()
         self.__msg_and_bytes_queue.shutdown()
 
+        with self.__async_cdt:
+            self.__async_cdt.notify_all()
+
         if self.__circuit_th is not None:
             if self.__circuit_th.is_alive():
                 self.__circuit_th.join(0.1)
@@ -349,24 +423,139 @@ class AbstractSecs1Communicator(secs.AbstractSecsCommunicator):
 
             self.__msg_and_bytes_queue.entry_msg(pack)
 
-            timeout_tx = self.timeout_t3 if msg.wbit else -1.0
+            return self.__wait_pack(pack)
 
-            pack.wait_until_sended()
+        finally:
+            self.__send_reply_pack_pool.remove(pack)
 
-            self.__sended_msg_putter.put(pack.secs1msg())
+    def __wait_pack(self, pack):
 
-            if timeout_tx > 0.0:
+        msg = pack.secs1msg()
 
-                r = pack.wait_until_reply(timeout_tx)
-                if r is None:
-                    raise Secs1TimeoutT3Error('Timeout-T3', pack.secs1msg())
-                else:
-                    return r
+        timeout_tx = self.timeout_t3 if msg.wbit else -1.0
+
+        pack.wait_until_sended()
+
+        self.__sended_msg_putter.put(msg)
+
+        if timeout_tx > 0.0:
+
+            r = pack.wait_until_reply(timeout_tx)
+            if r is None:
+                raise Secs1TimeoutT3Error('Timeout-T3', msg)
             else:
-                return None
+                return r
+        else:
+            return None
 
-        finally:
-            self.__send_reply_pack_pool.remove(pack)
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        return self._send_many_async(
+            [(strm, func, wbit, secs2body, system_bytes, device_id)])[0]
+
+    def _send_many_async(self, args_list):
+
+        # entry all to circuit in order, and wait all on one waiter thread,
+        # Timeout-T3 of each message is counted from own sended.
+        futures = list()
+        entries = list()
+
+        for args in args_list:
+            fut = concurrent.futures.Future()
+            futures.append(fut)
+            try:
+                pack = SendSecs1MessagePack(
+                    secs.Secs1Message(*args, self.is_equip))
+            except Exception as e:
+                fut.set_exception(e)
+            else:
+                pack.set_listener(self.__notify_async)
+                entries.append([pack, fut, None])
+
+        if not entries:
+            return futures
+
+        with self.__async_cdt:
+            for ent in entries:
+                self.__send_reply_pack_pool.append(ent[0])
+                self.__async_entries.append(ent)
+
+            if not self.__async_waiting:
+                self.__async_waiting = True
+                threading.Thread(target=self.__wait_async_entries, daemon=True).start()
+
+        for ent in entries:
+            self.__msg_and_bytes_queue.entry_msg(ent[0])
+
+        return futures
+
+    def __notify_async(self):
+        with self.__async_cdt:
+            self.__async_cdt.notify_all()
+
+    def __poll_async_entry(self, ent, now):
+
+        # return (is_done, result, except)
+        pack, _, deadline = ent
+        msg = pack.secs1msg()
+        sended, exc, reply, resetted = pack.poll_state()
+
+        if exc is not None:
+            return True, None, exc
+
+        if not sended:
+            if self.is_closed:
+                return True, None, Secs1SendMessageError("Communicator closed", msg)
+            return False, None, None
+
+        if deadline is None:
+            self.__sended_msg_putter.put(msg)
+            if not msg.wbit or self.timeout_t3 <= 0.0:
+                return True, None, None
+            deadline = ent[2] = now + self.timeout_t3
+
+        if reply is not None:
+            return True, reply, None
+
+        if resetted:
+            ent[2] = now + self.timeout_t3
+        elif now >= deadline:
+            return True, None, Secs1TimeoutT3Error('Timeout-T3', msg)
+
+        return False, None, None
+
+    def __wait_async_entries(self):
+
+        while True:
+
+            dones = list()
+
+            with self.__async_cdt:
+
+                if not self.__async_entries:
+                    self.__async_waiting = False
+                    return
+
+                now = time.monotonic()
+                timeout = None
+
+                for ent in list(self.__async_entries):
+                    is_done, r, e = self.__poll_async_entry(ent, now)
+                    if is_done:
+                        self.__async_entries.remove(ent)
+                        self.__send_reply_pack_pool.remove(ent[0])
+                        dones.append((ent[1], r, e))
+                    elif ent[2] is not None:
+                        t = max(ent[2] - now, 0.0)
+                        timeout = t if timeout is None else min(timeout, t)
+
+                if not dones:
+                    self.__async_cdt.wait(timeout)
+
+            for fut, r, e in dones:
+                if e is None:
+                    fut.set_result(r)
+                else:
+                    fut.set_exception(e)
 
     def _put_recv_bytes(self, bs):
         self.__msg_and_bytes_queue.put_recv_bytes(bs)
@@ -625,7 +814,7 @@ class AbstractSecs1Communicator(secs.AbstractSecsCommunicator):
 
         self.__try_send_block_putter.put(block)
 
-        self._send_bytes(block.to_bytes())
+        self._send_bytes(block.to_memoryview())
 
         b = self.__msg_and_bytes_queue.poll(self.timeout_t2)
 
@@ -656,148 +845,151 @@ class AbstractSecs1Communicator(secs.AbstractSecsCommunicator):
     def __circuit_receiving(self):
 
         try:
-            self._send_bytes(self.__BYTES_EOT)
-
-            bb = list()
-
-            r = self.__msg_and_bytes_queue.put_to_list(
-                bb, 0, 1,
-                self.timeout_t2)
-
-            if r <= 0:
-                self._send_bytes(self.__BYTES_NAK)
-
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Timeout-T2-Length-Byte'
-                })
+            while True:
 
-                return
+                self._send_bytes(self.__BYTES_EOT)
 
-            bb_len = bb[0]
-            if bb_len < 10 or bb_len > 254:
-                self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
-                self._send_bytes(self.__BYTES_NAK)
+                bb = bytearray()
 
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Length-Byte-Error',
-                    'length': bb_len
-                })
+                r = self.__msg_and_bytes_queue.put_to_list(
+                    bb, 0, 1,
+                    self.timeout_t2)
 
-                return
+                if r <= 0:
+                    self._send_bytes(self.__BYTES_NAK)
 
-            pos = 1
-            m = bb_len + 3
+                    self.__secs1_circuit_error_msg_putter.put({
+                        'msg': 'Timeout-T2-Length-Byte'
+                    })
 
-            while pos < m:
-                r = self.__msg_and_bytes_queue.put_to_list(
-                    bb, pos, m,
-                    self.timeout_t1)
+                    return
 
-                if r <= 0:
+                bb_len = bb[0]
+                if bb_len < 10 or bb_len > 254:
+                    self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
                     self._send_bytes(self.__BYTES_NAK)
 
                     self.__secs1_circuit_error_msg_putter.put({
-                        'msg': 'Timeout-T1',
-                        'pos': pos
+                        'msg': 'Length-Byte-Error',
+                        'length': bb_len
                     })
 
                     return
 
-                pos += r
+                pos = 1
+                m = bb_len + 3
 
-            if self.__sum_check(bb):
+                while pos < m:
+                    r = self.__msg_and_bytes_queue.put_to_list(
+                        bb, pos, m,
+                        self.timeout_t1)
 
-                self._send_bytes(self.__BYTES_ACK)
+                    if r <= 0:
+                        self._send_bytes(self.__BYTES_NAK)
 
-            else:
+                        self.__secs1_circuit_error_msg_putter.put({
+                            'msg': 'Timeout-T1',
+                            'pos': pos
+                        })
 
-                self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
-                self._send_bytes(self.__BYTES_NAK)
+                        return
 
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Sum-Check-Error',
-                    'bytes': bytes(bb)
-                })
+                    pos += r
 
-                return
+                if self.__sum_check(bb):
+
+                    self._send_bytes(self.__BYTES_ACK)
 
-            block = secs.Secs1MessageBlock(bytes(bb))
+                else:
+
+                    self.__msg_and_bytes_queue.recv_bytes_garbage(self.timeout_t1)
+                    self._send_bytes(self.__BYTES_NAK)
 
-            self.__recv_block_putter.put(block)
+                    self.__secs1_circuit_error_msg_putter.put({
+                        'msg': 'Sum-Check-Error',
+                        'bytes': bytes(bb)
+                    })
 
-            if block.device_id != self.device_id:
+                    return
 
-                self.__secs1_circuit_error_msg_putter.put({
-                    'msg': 'Unmatch DEVICE-ID',
-                    'deviceId': block.device_id
-                })
+                block = secs.Secs1MessageBlock(bytes(bb))
 
-                return
+                self.__recv_block_putter.put(block)
 
-            if self.__recv_blocks:
+                if block.device_id != self.device_id:
 
-                prev_block = self.__recv_blocks[-1]
+                    self.__secs1_circuit_error_msg_putter.put({
+                        'msg': 'Unmatch DEVICE-ID',
+                        'deviceId': block.device_id
+                    })
 
-                if prev_block.is_next_block(block):
+                    return
 
-                    self.__recv_blocks.append(block)
+                if self.__recv_blocks:
 
-                else:
+                    prev_block = self.__recv_blocks[-1]
 
-                    if not prev_block.is_same_block(block):
+                    if prev_block.is_next_block(block):
 
-                        del self.__recv_blocks[:]
                         self.__recv_blocks.append(block)
 
-            else:
-                self.__recv_blocks.append(block)
+                    else:
 
-            if block.ebit:
+                        if not prev_block.is_same_block(block):
 
-                try:
-                    msg = secs.Secs1Message.from_blocks(self.__recv_blocks)
+                            del self.__recv_blocks[:]
+                            self.__recv_blocks.append(block)
 
-                    if not self.__send_reply_pack_pool.receive(msg):
+                else:
+                    self.__recv_blocks.append(block)
 
-                        self.__recv_primary_msg_putter.put(msg)
+                if block.ebit:
 
-                    self.__recv_all_msg_putter.put(msg)
+                    try:
+                        msg = secs.Secs1Message.from_blocks(
+                            self.__recv_blocks, self.lazy_decode, self.cache_policy)
 
-                except secs.Secs1MessageParseError as e:
-                    self._put_error(e)
+                        if not self.__send_reply_pack_pool.receive(msg):
 
-                finally:
-                    del self.__recv_blocks[:]
+                            self.__recv_primary_msg_putter.put(msg)
 
-            else:
+                        self.__recv_all_msg_putter.put(msg)
 
-                self.__send_reply_pack_pool.timer_reset(block)
+                    except secs.Secs1MessageParseError as e:
+                        self._put_error(e)
 
-                b = self.__msg_and_bytes_queue.poll(self.timeout_t4)
+                    finally:
+                        del self.__recv_blocks[:]
 
-                if b is None:
+                else:
 
-                    self.__secs1_circuit_error_msg_putter.put({
-                        'msg': 'Timeout-T4',
-                        'prevBlock': block
-                    })
+                    self.__send_reply_pack_pool.timer_reset(block)
 
-                elif b == self.__ENQ:
+                    b = self.__msg_and_bytes_queue.poll(self.timeout_t4)
 
-                    self.__circuit_receiving()
+                    if b is None:
 
-                else:
+                        self.__secs1_circuit_error_msg_putter.put({
+                            'msg': 'Timeout-T4',
+                            'prevBlock': block
+                        })
 
-                    self.__secs1_circuit_error_msg_putter.put({
-                        'msg': 'Receive-NOT-ENQ-of-Next-Block',
-                        'prevBlock': block
-                    })
+                    elif b == self.__ENQ:
+
+                        continue
+
+                    else:
+
+                        self.__secs1_circuit_error_msg_putter.put({
+                            'msg': 'Receive-NOT-ENQ-of-Next-Block',
+                            'prevBlock': block
+                        })
+
+                return
 
         except Secs1CommunicatorError as e:
             self._put_error(e)
 
     @staticmethod
     def __sum_check(bb):
-        a = sum(bb[1:-2]) & 0xFFFF
-        b = (bb[-2] << 8) | bb[-1]
-        return a == b
+        return secs.Secs1MessageBlock._is_valid_sum(bb)
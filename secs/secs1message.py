@@ -9,18 +9,17 @@ class Secs1MessageParseError(secs.SecsMessageParseError):
 
 class Secs1Message(secs.SecsMessage):
 
+    __slots__ = ('_system_bytes', '__device_id', '__rbit')
+
     def __init__(self, strm, func, wbit, secs2body, system_bytes, device_id, rbit):
         super(Secs1Message, self).__init__(strm, func, wbit, secs2body)
         self._system_bytes = system_bytes
         self.__device_id = int(device_id)
         self.__rbit = bool(rbit)
-        self.__cache_header10bytes = None
-        self.__cache_str = None
-        self.__cache_repr = None
-        self.__cache_blocks = None
 
     def __str__(self):
-        if self.__cache_str is None:
+        v = self._get_text_cache('str')
+        if v is None:
             vv = [
                 self.get_header10bytes_str(),
                 self._STR_LINESEPARATOR,
@@ -31,13 +30,14 @@ class Secs1Message(secs.SecsMessage):
                 vv.append(' W')
             if self.secs2body is not None:
                 vv.append(self._STR_LINESEPARATOR)
-                vv.append(self.secs2body.to_sml())
+                vv.append(self._str_body())
             vv.append('.')
-            self.__cache_str = ''.join(vv)
-        return self.__cache_str
+            v = self._set_text_cache('str', ''.join(vv))
+        return v
 
     def __repr__(self):
-        if self.__cache_repr is None:
+        v = self._get_text_cache('repr')
+        if v is None:
             vv = [
                 "{'header':", str(self._header10bytes()),
                 ",'strm':", str(self.strm),
@@ -48,11 +48,12 @@ class Secs1Message(secs.SecsMessage):
                 vv.append(",'secs2body':")
                 vv.append(repr(self.secs2body))
             vv.append("}")
-            self.__cache_repr = ''.join(vv)
-        return self.__cache_repr
+            v = self._set_text_cache('repr', ''.join(vv))
+        return v
 
     def _header10bytes(self):
-        if self.__cache_header10bytes is None:
+        v = self._get_cache('header10bytes')
+        if v is None:
             b0 = (self.device_id >> 8) & 0x7F
             if self.rbit:
                 b0 |= 0x80
@@ -61,14 +62,14 @@ class Secs1Message(secs.SecsMessage):
             if self.wbit:
                 b2 |= 0x80
             b3 = self.func & 0xFF
-            self.__cache_header10bytes = bytes([
+            v = self._set_cache('header10bytes', bytes([
                 b0, b1,
                 b2, b3,
                 0x00, 0x00,
                 self._system_bytes[0], self._system_bytes[1],
                 self._system_bytes[2], self._system_bytes[3]
-            ])
-        return self.__cache_header10bytes
+            ]))
+        return v
 
     def _device_id(self):
         return self.__device_id
@@ -81,92 +82,172 @@ class Secs1Message(secs.SecsMessage):
     def rbit(self):
         return self.__rbit
 
+    # max body bytes per block
+    _BLOCK_BODY_SIZE = 244
+
+    def __getstate__(self):
+        # blocks are memoryviews of received buffer, built again from body
+        state = super(Secs1Message, self).__getstate__()
+        c = state.get('_cache')
+        if c is not None:
+            c.pop('blocks', None)
+        return state
+
     def to_blocks(self):
+        """SECS-I blocks getter.
 
-        def _bb(bs, from_pos):
-            m = len(bs)
-            x = m - from_pos
-            if x > 244:
-                return bs[from_pos:(from_pos + 244)], 244, False
-            else:
-                return bs[from_pos:m], x, True
-
-        def _hh(l_hh, num, l_ebit):
-            b4 = (num >> 8) & 0x7F
-            if l_ebit:
-                b4 |= 0x80
-            b5 = num & 0xFF
-            return bytes([
-                l_hh[0], l_hh[1], l_hh[2], l_hh[3],
-                b4, b5,
-                l_hh[6], l_hh[7], l_hh[8], l_hh[9]
-            ])
-
-        def _sum(l_hh, l_bb):
-            x = sum([i for i in l_hh]) + sum([i for i in l_bb])
-            return bytes([((x >> 8) & 0xFF), (x & 0xFF)])
-        
-        if self.__cache_blocks is None:
+        All blocks are encoded into one buffer, and each block is a read-only memoryview of it.
+        Body is encoded directly at each block body position, without intermediate body buffer.
+
+        Raises:
+            Secs1MessageParseError: if blocks overflow.
+
+        Returns:
+            tuple: Secs1MessageBlock
+        """
+        v = self._get_cache('blocks')
+
+        if v is None:
 
             h10bs = self._header10bytes()
-            if self.secs2body is None:
-                body_bs = bytes()
-            else:
-                body_bs = self.secs2body.to_bytes()
+            body_len = 0 if self.secs2body is None else self.secs2body.get_encoded_size()
+
+            size = self._BLOCK_BODY_SIZE
+            n = max(1, (body_len + size - 1) // size)
+
+            if n > 0x7FFF:
+                raise Secs1MessageParseError("blocks overflow")
+
+            # [length-byte, 10-bytes-header, body, 2-bytes-sum] * n
+            buf = bytearray(body_len + n * 13)
 
+            if body_len > 0:
+                self.secs2body.encode_into(_Secs1BlocksBodyWriter(buf), 0)
+
+            h_sum = sum(h10bs) - h10bs[4] - h10bs[5]
+            view = memoryview(buf).toreadonly()
             blocks = []
-            pos = 0
-            block_num = 0
+            p = 0
 
-            while True:
-                block_num += 1
+            for i in range(n):
+                pos = i * size
+                shift = min(size, body_len - pos)
+                num = i + 1
+                b4 = ((num >> 8) & 0x7F) | (0x80 if num == n else 0x00)
+                b5 = num & 0xFF
 
-                if block_num > 0x7FFF:
-                    raise Secs1MessageParseError("blocks overflow")
-                
-                bb, shift, ebit = _bb(body_bs, pos)
-                hh = _hh(h10bs, block_num, ebit)
-                ss = _sum(hh, bb)
+                buf[p] = shift + 10
+                buf[(p + 1):(p + 11)] = h10bs
+                buf[p + 5] = b4
+                buf[p + 6] = b5
 
-                v = Secs1MessageBlock(bytes([shift + 10]) + hh + bb + ss)
-                blocks.append(v)
+                x = h_sum + b4 + b5
+                q = p + 11
+                if shift > 0:
+                    x += sum(buf[q:(q + shift)])  # faster than sum of memoryview
+                    q += shift
 
-                if ebit:
-                    break
+                buf[q] = (x >> 8) & 0xFF
+                buf[q + 1] = x & 0xFF
+                q += 2
 
-                pos += shift
+                blocks.append(Secs1MessageBlock(view[p:q]))
+                p = q
 
-            self.__cache_blocks = tuple(blocks)
+            v = self._set_cache('blocks', tuple(blocks))
 
-        return self.__cache_blocks
+        return v
 
     @classmethod
-    def from_blocks(cls, blocks):
+    def from_blocks(cls, blocks, lazy=False, cache_policy=None):
+        """Build from SECS-I blocks.
+
+        Body is decoded on first access to secs2body, header fields are available immediately.
+
+        Args:
+            blocks (list): Secs1MessageBlock
+            lazy (bool): True if decode L items of body lazily. Defaults to False.
+            cache_policy (secs.Secs2BodyCachePolicy): cache policy of body. Defaults to Secs2BodyBuilder.cache_policy.
+
+        Raises:
+            Secs1MessageParseError: if blocks is empty.
+
+        Returns:
+            Secs1Message: message
+        """
 
         if blocks is None or len(blocks) == 0:
             raise Secs1MessageParseError("No blocks")
 
-        bs = b''.join([(x.to_bytes())[11:-2] for x in blocks])
+        bs = b''.join([x._get_body_part() for x in blocks])
 
-        try:
-            v = Secs1Message(
-                blocks[0].strm,
-                blocks[0].func,
-                blocks[0].wbit,
-                secs.Secs2BodyBuilder.from_body_bytes(bs) if bs else None,
-                blocks[0].get_system_bytes(),
-                blocks[0].device_id,
-                blocks[0].rbit
-            )
-            v.__cache_blocks = tuple(blocks)
-            return v
-
-        except secs.Secs2BodyParseError as e:
-            raise Secs1MessageParseError(e)
+        v = Secs1Message(
+            blocks[0].strm,
+            blocks[0].func,
+            blocks[0].wbit,
+            None,
+            blocks[0].get_system_bytes(),
+            blocks[0].device_id,
+            blocks[0].rbit
+        )
+        v._set_secs2body_source(bs, lazy, cache_policy)
+        v._set_cache('blocks', tuple(blocks))
+        return v
+
+
+class _Secs1BlocksBodyWriter:
+    """Writable buffer of body bytes, mapped to body position of each block in blocks buffer.
+
+    Supports index and slice assignment, as Secs2Body.encode_into writes.
+    """
+
+    # [length-byte, 10-bytes-header, 244-bytes-body, 2-bytes-sum]
+    _BLOCK_BODY_SIZE = 244
+    _BLOCK_SIZE = 257
+
+    # __lo, __hi is body range of present block, __d is shift to blocks buffer position
+    __slots__ = ('__buf', '__lo', '__hi', '__d')
+
+    def __init__(self, buf):
+        self.__buf = buf
+        self.__seek(0)
+
+    def __seek(self, pos):
+        q = pos // self._BLOCK_BODY_SIZE
+        self.__lo = q * self._BLOCK_BODY_SIZE
+        self.__hi = self.__lo + self._BLOCK_BODY_SIZE
+        self.__d = q * self._BLOCK_SIZE + 11 - self.__lo
+
+    def __setitem__(self, key, value):
+        if type(key) is slice:
+            start = key.start
+            end = key.stop
+            if start < self.__lo or start >= self.__hi:
+                self.__seek(start)
+            if end <= self.__hi:    # in one block
+                d = self.__d
+                self.__buf[(start + d):(end + d)] = value
+                return
+            v = memoryview(value).cast('B')
+            i = -start
+            while start < end:
+                if start >= self.__hi:
+                    self.__seek(start)
+                n = min(self.__hi, end)
+                d = self.__d
+                self.__buf[(start + d):(n + d)] = v[(start + i):(n + i)]
+                start = n
+        else:
+            if key < self.__lo or key >= self.__hi:
+                self.__seek(key)
+            self.__buf[key + self.__d] = value
 
 
 class Secs1MessageBlock:
 
+    # __bytes is bytes, or read-only memoryview of blocks buffer
+    __slots__ = ('__bytes', '__cache_str', '__cache_repr')
+
     def __init__(self, block_bytes):
         self.__bytes = block_bytes
         self.__cache_str = None
@@ -174,7 +255,7 @@ class Secs1MessageBlock:
 
     def __str__(self):
         if self.__cache_str is None:
-            self._cache_str = (
+            self.__cache_str = (
                 '[' + '{:02X}'.format(self.__bytes[1])
                 + ' ' + '{:02X}'.format(self.__bytes[2])
                 + '|' + '{:02X}'.format(self.__bytes[3])
@@ -187,15 +268,31 @@ class Secs1MessageBlock:
                 + ' ' + '{:02X}'.format(self.__bytes[10])
                 + '] length: ' + str(self.__bytes[0])
                 )
-        return self._cache_str
+        return self.__cache_str
 
     def __repr__(self):
         if self.__cache_repr is None:
-            self.__cache_repr = str(self.__bytes)
+            self.__cache_repr = str(self.to_bytes())
         return self.__cache_repr
 
     def to_bytes(self):
-        return self.__bytes
+        bs = self.__bytes
+        return bs if type(bs) is bytes else bytes(bs)
+
+    def to_memoryview(self):
+        """Block bytes getter without copy.
+
+        Returns:
+            memoryview: read-only block bytes.
+        """
+        return memoryview(self.__bytes)
+
+    def _get_body_part(self):   # body bytes-like of this block without copy
+        return self.__bytes[11:-2]
+
+    @staticmethod
+    def _is_valid_sum(bb):  # bb is block bytes or list of ints
+        return ((sum(bb) - bb[0] - bb[-2] - bb[-1]) & 0xFFFF) == ((bb[-2] << 8) | bb[-1])
 
     @property
     def device_id(self):
@@ -281,10 +378,10 @@ class Secs1MessageBlock:
         return ((bs[0] << 8) & 0x7F00) | bs[1]
 
     def get_system_bytes(self):
-        return self.__bytes[7:11]
+        return bytes(self.__bytes[7:11])
     
     def is_next_block(self, block):
-        bs = block.to_bytes()
+        bs = block.to_memoryview()
         return (
             bs[1] == self.__bytes[1]
             and bs[2] == self.__bytes[2]
@@ -298,7 +395,7 @@ class Secs1MessageBlock:
         )
 
     def is_same_block(self, block):
-        bs = block.to_bytes()
+        bs = block.to_memoryview()
         return (
             bs[1] == self.__bytes[1]
             and bs[2] == self.__bytes[2]
@@ -8,6 +8,9 @@ class Secs1OnPySerialCommunicator(secs.AbstractSecs1Communicator):
     __DEFAULT_REOPEN = 5.0
     __PROTOCOL = 'SECS-I-on-pySerial'
 
+    # max bytes per read, larger than one block (257 bytes)
+    __READ_SIZE = 4096
+
     def __init__(self, port, baudrate, device_id, is_equip, is_master, **kwargs):
         super(Secs1OnPySerialCommunicator, self).__init__(device_id, is_equip, is_master, **kwargs)
 
@@ -63,7 +66,7 @@ class Secs1OnPySerialCommunicator(secs.AbstractSecs1Communicator):
 
     def __unset_serial(self):
         with self.__serial_lock:
-            self.__serial_lock = None
+            self.__serial = None
             self._put_communicated(self.__serial is not None)
 
     def _send_bytes(self, bs):
@@ -79,8 +82,11 @@ class Secs1OnPySerialCommunicator(secs.AbstractSecs1Communicator):
     def _reading(self, ser):
         try:
             while not self.is_closed:
-                bs = ser.read()
+                bs = ser.read(1)
                 if bs:
+                    n = ser.in_waiting
+                    if n > 0:
+                        bs += ser.read(min(n, self.__READ_SIZE))
                     self._put_recv_bytes(bs)
                 else:
                     return
@@ -1,5 +1,12 @@
+import array
+import collections
+import importlib
+import itertools
 import os
 import struct
+import sys
+import threading
+import weakref
 
 
 class Secs2BodyParseError(Exception):
@@ -14,6 +21,115 @@ class Secs2BodyBytesParseError(Secs2BodyParseError):
         super(Secs2BodyBytesParseError, self).__init__(msg)
 
 
+class Secs2BodyCachePolicy:
+    """Cache policy of to_bytes(), to_sml() and repr() results.
+
+    Secs2BodyCachePolicy.ALL caches on each item, including child items rendered in L.
+    Secs2BodyCachePolicy.ROOT caches on the item called only, child items are rendered without cache.
+    Secs2BodyLruCachePolicy caches in bounded LRU instead of items.
+
+    Set globally by Secs2BodyBuilder.cache_policy, or per communicator by cache_policy.
+    """
+
+    def __init__(self, cache_children):
+        self.__cache_children = bool(cache_children)
+
+    @property
+    def cache_children(self):
+        pass
+
+    @cache_children.getter
+    def cache_children(self):
+        """True if cache child items while rendering L.
+
+        Returns:
+            bool: cache_children
+        """
+        return self.__cache_children
+
+    def _get(self, obj, key):
+        return obj._get_own_cache(key)
+
+    def _set(self, obj, key, v):
+        obj._set_own_cache(key, v)
+
+
+Secs2BodyCachePolicy.ALL = Secs2BodyCachePolicy(True)
+Secs2BodyCachePolicy.ROOT = Secs2BodyCachePolicy(False)
+
+
+class Secs2BodyLruCachePolicy(Secs2BodyCachePolicy):
+    """Cache in bounded LRU by total length of cached values.
+
+    Cached objects are weak referenced, and entries are dropped when objects are collected.
+    Child items are rendered without cache.
+    """
+
+    def __init__(self, max_size=16 * 1024 * 1024):
+        """Constructor.
+
+        Args:
+            max_size (int): max total length of cached bytes and str. Defaults to 16MiB.
+        """
+        super(Secs2BodyLruCachePolicy, self).__init__(False)
+        self.__max_size = int(max_size)
+        self.__size = 0
+        self.__items = collections.OrderedDict()    # (id(obj), key) -> (weakref, value, size)
+        self.__dead = list()                        # (key, weakref) of collected objects
+        self.__lock = threading.Lock()
+
+    @property
+    def size(self):
+        pass
+
+    @size.getter
+    def size(self):
+        """Total length of cached values.
+
+        Returns:
+            int: size
+        """
+        return self.__size
+
+    def _get(self, obj, key):
+        k = (id(obj), key)
+        with self.__lock:
+            x = self.__items.get(k)
+            if x is None or x[0]() is not obj:
+                return None
+            self.__items.move_to_end(k)
+            return x[1]
+
+    def _set(self, obj, key, v):
+        size = len(v)
+        if size > self.__max_size:
+            return
+
+        k = (id(obj), key)
+        dead = self.__dead
+        ref = weakref.ref(obj, (lambda r: dead.append((k, r))))
+
+        with self.__lock:
+
+            while dead:
+                dk, dr = dead.pop()
+                x = self.__items.get(dk)
+                if x is not None and x[0] is dr:
+                    del self.__items[dk]
+                    self.__size -= x[2]
+
+            x = self.__items.pop(k, None)
+            if x is not None:
+                self.__size -= x[2]
+
+            self.__items[k] = (ref, v, size)
+            self.__size += size
+
+            while self.__size > self.__max_size:
+                x = (self.__items.popitem(last=False))[1]
+                self.__size -= x[2]
+
+
 class AbstractSecs2Body:
 
     _BYTES_LEN_3 = 2**16
@@ -22,20 +138,28 @@ class AbstractSecs2Body:
     _SML_VALUESEPARATOR = ' '
     _SML_LINESEPARATOR = os.linesep
 
+    # _cache is None, or list of [sml, repr, bytes] created on first cached in item
+    # _cache_policy is None if Secs2BodyBuilder.cache_policy
+    __slots__ = ('_type', '_value', '_cache', '_cache_policy', '__weakref__')
+
+    _CACHE_SML = 0
+    _CACHE_REPR = 1
+    _CACHE_BYTES = 2
+
     def __init__(self, item_type, value):
         self._type = item_type
         self._value = value
-        self.__cache_sml = None
-        self.__cache_repr = None
-        self.__cache_bytes = None
+        self._cache = None
+        self._cache_policy = None
 
     def __str__(self):
         return self.to_sml()
 
     def __repr__(self):
-        if self.__cache_repr is None:
-            self.__cache_repr = str((self._type[0], self._value))
-        return self.__cache_repr
+        v = self._get_cache(self._CACHE_REPR)
+        if v is None:
+            v = self._set_cache(self._CACHE_REPR, self._create_repr())
+        return v
 
     def __len__(self):
         return len(self._value)
@@ -121,9 +245,21 @@ class AbstractSecs2Body:
             raise Secs2BodyParseError(e)
 
         if isinstance(v, AbstractSecs2Body):
-            return v._value
+            return v.value
         else:
             return v
+
+    def iter_values(self, start=0, stop=None):
+        """values iterator in range, without creating all values.
+
+        Args:
+            start (int): start index. Defaults to 0.
+            stop (int): stop index. Defaults to None, length.
+
+        Returns:
+            iterator: values of value[start:stop]
+        """
+        return iter(self.value[start:stop])
     
     def to_sml(self):
         """SML getter.
@@ -131,9 +267,10 @@ class AbstractSecs2Body:
         Returns:
             str: SML
         """
-        if self.__cache_sml is None:
-            self.__cache_sml = self._create_to_sml()
-        return self.__cache_sml
+        v = self._get_cache(self._CACHE_SML)
+        if v is None:
+            v = self._set_cache(self._CACHE_SML, self._create_to_sml())
+        return v
 
     def to_bytes(self):
         """bytes getter.
@@ -141,9 +278,103 @@ class AbstractSecs2Body:
         Returns:
             bytes: bytes
         """
-        if self.__cache_bytes is None:
-            self.__cache_bytes = self._create_to_bytes()
-        return self.__cache_bytes
+        v = self._get_cache(self._CACHE_BYTES)
+        if v is None:
+            v = self._set_cache(self._CACHE_BYTES, self._create_to_bytes())
+        return v
+
+    def get_encoded_size(self):
+        """Encoded bytes length getter.
+
+        Returns:
+            int: length of item-header and value bytes, including child items if L.
+        """
+        c = self._cache
+        if c is not None and c[self._CACHE_BYTES] is not None:
+            return len(c[self._CACHE_BYTES])
+        return self._get_encoded_size()
+
+    def encode_into(self, buf, offset=0):
+        """Write encoded bytes into buffer.
+
+        buf must have get_encoded_size() bytes from offset.
+
+        Args:
+            buf (bytearray or memoryview): writable buffer.
+            offset (int): start position. Defaults to 0.
+
+        Returns:
+            int: end position.
+        """
+        c = self._cache
+        if c is not None and c[self._CACHE_BYTES] is not None:
+            v = c[self._CACHE_BYTES]
+            end = offset + len(v)
+            buf[offset:end] = v
+            return end
+        return self._encode_into(buf, offset)
+
+    def set_cache_policy(self, cache_policy):
+        """Set cache policy of this item and child items.
+
+        Cached values are cleared.
+
+        Args:
+            cache_policy (Secs2BodyCachePolicy): cache policy, None if Secs2BodyBuilder.cache_policy.
+        """
+        stack = [self]
+        while stack:
+            x = stack.pop()
+            x._cache_policy = cache_policy
+            x._cache = None
+            vv = x._get_child_items()
+            if vv is not None:
+                stack.extend(vv)
+            elif isinstance(x, Secs2LazyListBody) and x._children is not None:
+                stack.extend([c for c in x._children if c is not None])
+
+    def _get_cache_policy(self):
+        p = self._cache_policy
+        return Secs2BodyBuilder.cache_policy if p is None else p
+
+    def _get_cache(self, index):
+        c = self._cache
+        if c is not None:
+            return c[index]
+        return self._get_cache_policy()._get(self, index)
+
+    def _set_cache(self, index, v):     # return v
+        self._get_cache_policy()._set(self, index, v)
+        return v
+
+    def _get_child_cache(self, child, index, create):   # cache of child item while rendering
+        if self._get_cache_policy().cache_children:
+            v = child._get_cache(index)
+            return child._set_cache(index, create()) if v is None else v
+        else:
+            v = child._get_cache(index)
+            return create() if v is None else v
+
+    def _get_own_cache(self, index):
+        c = self._cache
+        return None if c is None else c[index]
+
+    def _set_own_cache(self, index, v):
+        if self._cache is None:
+            self._cache = [None, None, None]
+        self._cache[index] = v
+
+    def _get_encode_items(self):    # return child items if encoded by walking them, None if encode itself
+        c = self._cache
+        if c is None or c[self._CACHE_BYTES] is None:
+            return self._get_child_items()
+        return None
+
+    def _get_child_items(self):
+        return None
+
+    def _create_repr(self):
+        return str((self._type[0], self.value))
 
     def _create_to_sml(self):
         l, v = self._create_to_sml_value()
@@ -153,15 +384,48 @@ class AbstractSecs2Body:
         return 0, ''
 
     def _create_to_bytes(self):
+        buf = bytearray(self._get_encoded_size())
+        self._encode_into(buf, 0)
+        return bytes(buf)
+
+    def _get_encoded_size(self):
+        v_len = self._get_value_bytes_length()
+        return self._get_header_size(v_len) + v_len
+
+    def _get_value_bytes_length(self):
+        return len(self._create_to_bytes_value())
+
+    def _encode_into(self, buf, offset):
         bs_vv = self._create_to_bytes_value()
-        v_len = len(bs_vv)
-        bs_len = struct.pack('>L', v_len)
+        p = self._encode_header_into(buf, offset, len(bs_vv))
+        end = p + len(bs_vv)
+        buf[p:end] = bs_vv
+        return end
+
+    def _get_header_size(self, v_len):
+        if v_len >= self._BYTES_LEN_3:
+            return 4
+        elif v_len >= self._BYTES_LEN_2:
+            return 3
+        else:
+            return 2
+
+    def _encode_header_into(self, buf, offset, v_len):
         if v_len >= self._BYTES_LEN_3:
-            return struct.pack('>B', (self._type[1] | 0x03)) + bs_len[1:4] + bs_vv
+            buf[offset] = self._type[1] | 0x03
+            buf[offset + 1] = (v_len >> 16) & 0xFF
+            buf[offset + 2] = (v_len >> 8) & 0xFF
+            buf[offset + 3] = v_len & 0xFF
+            return offset + 4
         elif v_len >= self._BYTES_LEN_2:
-            return struct.pack('>B', (self._type[1] | 0x02)) + bs_len[2:4] + bs_vv
+            buf[offset] = self._type[1] | 0x02
+            buf[offset + 1] = (v_len >> 8) & 0xFF
+            buf[offset + 2] = v_len & 0xFF
+            return offset + 3
         else:
-            return struct.pack('>B', (self._type[1] | 0x01)) + bs_len[3:4] + bs_vv
+            buf[offset] = self._type[1] | 0x01
+            buf[offset + 1] = v_len
+            return offset + 2
 
     def _create_to_bytes_value(self):
         return self._value
@@ -188,13 +452,58 @@ class AbstractSecs2Body:
             v_min = 0
         
         if v > v_max or v < v_min:
-            raise ValueError("value is from " + str(min) + " to " + str(max) + ", value is " + str(v))
+            raise ValueError("value is from " + str(v_min) + " to " + str(v_max) + ", value is " + str(v))
 
         return v
 
+    # array.array typecode -> numpy dtype kind
+    _ARRAY_KINDS = {
+        'b': 'i', 'h': 'i', 'i': 'i', 'l': 'i', 'q': 'i',
+        'B': 'u', 'H': 'u', 'I': 'u', 'L': 'u', 'Q': 'u',
+        'f': 'f', 'd': 'f'
+    }
+
+    @staticmethod
+    def _array_kind(item_type):    # return numpy dtype kind of number item_type
+        if item_type[4] is None:
+            return 'f'
+        elif item_type[4]:
+            return 'i'
+        else:
+            return 'u'
+
+    @classmethod
+    def _array_to_bytes(cls, item_type, value):
+        # return big-endian bytes if value is numpy array or array.array of same kind and size as item_type,
+        # otherwise None. numpy is not imported here, value is numpy only if numpy is already imported.
+
+        kind = cls._array_kind(item_type)
+
+        if isinstance(value, array.array):
+            if value.itemsize == item_type[2] and cls._ARRAY_KINDS.get(value.typecode) == kind:
+                if sys.byteorder == 'little' and value.itemsize > 1:
+                    value = array.array(value.typecode, value.tobytes())
+                    value.byteswap()
+                return value.tobytes()
+            return None
+
+        np = sys.modules.get('numpy')
+        if np is not None and isinstance(value, (np.ndarray, np.generic)):
+            dt = value.dtype
+            if dt.itemsize == item_type[2] and dt.kind == kind:
+                return np.ascontiguousarray(value, dtype=dt.newbyteorder('>')).tobytes()
+
+        return None
+
+    @staticmethod
+    def _import_numpy():
+        return importlib.import_module('numpy')
+
     
 class Secs2AsciiBody(AbstractSecs2Body):
 
+    __slots__ = ()
+
     def __init__(self, item_type, value):
         super(Secs2AsciiBody, self).__init__(item_type, str(value))
 
@@ -203,41 +512,100 @@ class Secs2AsciiBody(AbstractSecs2Body):
 
     def _create_to_bytes_value(self):
         return self._value.encode(encoding='ascii')
+
+    def _get_value_bytes_length(self):
+        return len(self._value)
     
     @staticmethod
     def build(item_type, value):
         return Secs2AsciiBody(item_type, value)
 
+    @staticmethod
+    def from_value_bytes(item_type, bs):
+        return Secs2AsciiBody(item_type, str(bs, encoding='ascii'))
+
 
 class Secs2BooleanBody(AbstractSecs2Body):
+    """BOOLEAN item.
+
+    value is held as bytes, 0x00 is False, 0xFF is True.
+    """
+
+    __slots__ = ()
+
+    __TO_BOOLEAN_BYTES = bytes([0x00] + [0xFF] * 255)
 
     def __init__(self, item_type, value):
         tv = type(value)
-        if tv is tuple or tv is list:
-            super(Secs2BooleanBody, self).__init__(
-                item_type,
-                tuple([bool(x) for x in value])
-                )
+        np = sys.modules.get('numpy')
+        if tv is tuple or tv is list or isinstance(value, array.array):
+            bs = bytes(map(bool, value))
+        elif np is not None and isinstance(value, (np.ndarray, np.generic)):
+            bs = np.ascontiguousarray(value, dtype=bool).tobytes()
         else:
-            super(Secs2BooleanBody, self).__init__(
-                item_type,
-                tuple([bool(value)])
-                )
+            bs = bytes([bool(value)])
+        super(Secs2BooleanBody, self).__init__(item_type, bs.translate(self.__TO_BOOLEAN_BYTES))
+
+    def __getitem__(self, item):
+        if type(item) is slice:
+            return self.value[item]
+        try:
+            return self._value[item] != 0x00
+        except IndexError as e:
+            raise Secs2BodyParseError(e)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Returns:
+            tuple: bool values
+        """
+        return tuple(map(bool, self._value))
+
+    def iter_values(self, start=0, stop=None):
+        return map(bool, self._value[start:stop])
 
     def _create_to_sml_value(self):
         vv = [("TRUE" if x else "FALSE") for x in self._value]
         return len(vv), self._SML_VALUESEPARATOR.join(vv)
 
-    def _create_to_bytes_value(self):
-        return bytes([(0xFF if v else 0x00) for v in self._value])
+    def to_numpy(self):
+        """NumPy array getter.
+
+        BOOLEAN bytes (0x00, 0xFF) are converted to bool, so array is a copy.
+
+        Raises:
+            ImportError: if numpy is not installed.
+
+        Returns:
+            numpy.ndarray: bool values
+        """
+        np = self._import_numpy()
+        return np.frombuffer(self._value, dtype='u1') != 0
 
     @staticmethod
     def build(item_type, value):
         return Secs2BooleanBody(item_type, value)
 
+    @classmethod
+    def from_value_bytes(cls, item_type, bs):
+        v = cls.__new__(cls)
+        AbstractSecs2Body.__init__(v, item_type, bytes(bs).translate(cls.__TO_BOOLEAN_BYTES))
+        return v
+
 
 class Secs2BinaryBody(AbstractSecs2Body):
 
+    __slots__ = ()
+
     def __init__(self, item_type, value):
         tv = type(value)
         if tv is bytes:
@@ -245,52 +613,168 @@ class Secs2BinaryBody(AbstractSecs2Body):
         elif tv is bytearray:
             super(Secs2BinaryBody, self).__init__(item_type, bytes(value))
         elif tv is tuple or tv is list:
-            super(Secs2BinaryBody, self).__init__(
-                item_type,
-                bytes([self._tiof(x, item_type[2], item_type[4]) for x in value])
-                )
+            try:
+                bs = bytes(value)
+            except (TypeError, ValueError):
+                bs = bytes([self._tiof(x, item_type[2], item_type[4]) for x in value])
+            super(Secs2BinaryBody, self).__init__(item_type, bs)
         else:
-            super(Secs2BinaryBody, self).__init__(
-                item_type,
-                bytes([self._tiof(value, item_type[2], item_type[4])])
-                )
+            bs = self._array_to_bytes(item_type, value)
+            if bs is None:
+                if hasattr(value, 'tolist'):     # numpy array or array.array
+                    bs = Secs2BinaryBody(item_type, value.tolist())._value
+                else:
+                    bs = bytes([self._tiof(value, item_type[2], item_type[4])])
+            super(Secs2BinaryBody, self).__init__(item_type, bs)
 
     def _create_to_sml_value(self):
         vv = [('0x' + '{:02X}'.format(x)) for x in self._value]
         return len(vv), self._SML_VALUESEPARATOR.join(vv)
 
+    def to_numpy(self):
+        """NumPy array getter.
+
+        Array is a read-only view over value bytes without copying.
+
+        Raises:
+            ImportError: if numpy is not installed.
+
+        Returns:
+            numpy.ndarray: uint8 values
+        """
+        np = self._import_numpy()
+        return np.frombuffer(self._value, dtype='u1')
+
     @staticmethod
     def build(item_type, value):
         return Secs2BinaryBody(item_type, value)
 
+    @staticmethod
+    def from_value_bytes(item_type, bs):
+        return Secs2BinaryBody(item_type, bytes(bs))
+
 
 class AbstractSecs2NumberBody(AbstractSecs2Body):
+    """Number item.
+
+    value is held as big-endian bytes (or memoryview), and packed/unpacked in bulk.
+    """
+
+    __slots__ = ()
+
+    # count of values unpacked at a time in iter_values
+    _ITER_CHUNK_ITEMS = 4096
 
     def __init__(self, item_type, value):
-        super(AbstractSecs2NumberBody, self).__init__(item_type, tuple(value))
+        super(AbstractSecs2NumberBody, self).__init__(item_type, value)
+
+    def __len__(self):
+        return len(self._value) // self._type[2]
+
+    def __getitem__(self, item):
+        if type(item) is slice:
+            return self.value[item]
+        n = len(self)
+        i = item + n if item < 0 else item
+        if i < 0 or i >= n:
+            raise Secs2BodyParseError(IndexError("tuple index out of range"))
+        return (struct.unpack_from(('>' + self._type[3]), self._value, (i * self._type[2])))[0]
+
+    def __iter__(self):
+        return iter(self.value)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Returns:
+            tuple: number values
+        """
+        return struct.unpack(('>' + str(len(self)) + self._type[3]), self._value)
+
+    def iter_values(self, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(len(self))
+        t = self._type
+
+        def _f():
+            for i in range(start, stop, self._ITER_CHUNK_ITEMS):
+                c = min(self._ITER_CHUNK_ITEMS, stop - i)
+                yield struct.unpack_from(('>' + str(c) + t[3]), self._value, (i * t[2]))
+
+        return itertools.chain.from_iterable(_f())
 
     def _create_to_sml_value(self):
-        vv = [str(x) for x in self._value]
+        vv = [str(x) for x in self.value]
         return len(vv), self._SML_VALUESEPARATOR.join(vv)
 
     def _create_to_bytes_value(self):
-        return b''.join([struct.pack(('>' + self._type[3]), x) for x in self._value])
+        return bytes(self._value)
 
+    def _get_value_bytes_length(self):
+        return len(self._value)
 
-class Secs2IntegerBody(AbstractSecs2NumberBody):
+    def to_numpy(self):
+        """NumPy array getter.
 
-    def __init__(self, item_type, value):
+        Array is a read-only view over value bytes without copying,
+        dtype is big-endian (e.g. '>u4', '>f8').
+
+        Raises:
+            ImportError: if numpy is not installed.
+
+        Returns:
+            numpy.ndarray: number values
+        """
+        np = self._import_numpy()
+        return np.frombuffer(
+            self._value,
+            dtype=('>' + self._array_kind(self._type) + str(self._type[2])))
+
+    def _encode_into(self, buf, offset):
+        v_len = len(self._value)
+        p = self._encode_header_into(buf, offset, v_len)
+        end = p + v_len
+        buf[p:end] = self._value
+        return end
+
+    @staticmethod
+    def _to_values(value):
         tv = type(value)
         if tv is tuple or tv is list:
-            super(Secs2IntegerBody, self).__init__(
-                item_type,
-                [self._tiof(x, item_type[2], item_type[4]) for x in value]
-                )
+            return value
+        elif hasattr(value, 'tolist'):     # numpy array or array.array
+            v = value.tolist()
+            return v if type(v) is list else (v, )
         else:
-            super(Secs2IntegerBody, self).__init__(
-                item_type,
-                [self._tiof(value, item_type[2], item_type[4])]
-                )
+            return (value, )
+
+    @classmethod
+    def from_value_bytes(cls, item_type, bs):
+        if len(bs) % item_type[2] != 0:
+            raise ValueError(item_type[0] + " value length " + str(len(bs)) + " is not multiple of " + str(item_type[2]))
+        v = cls.__new__(cls)
+        AbstractSecs2Body.__init__(v, item_type, bs)
+        return v
+
+
+class Secs2IntegerBody(AbstractSecs2NumberBody):
+
+    __slots__ = ()
+
+    def __init__(self, item_type, value):
+        bs = self._array_to_bytes(item_type, value)
+        if bs is None:
+            vv = self._to_values(value)
+            fmt = '>' + str(len(vv)) + item_type[3]
+            try:
+                bs = struct.pack(fmt, *vv)
+            except struct.error:
+                bs = struct.pack(fmt, *[self._tiof(x, item_type[2], item_type[4]) for x in vv])
+        super(Secs2IntegerBody, self).__init__(item_type, bs)
 
     @staticmethod
     def build(item_type, value):
@@ -298,21 +782,79 @@ class Secs2IntegerBody(AbstractSecs2NumberBody):
 
 
 class Secs2FloatBody(AbstractSecs2NumberBody):
+    """Float item.
+
+    F4 built from Python values keeps the values as given for value, SML and repr,
+    not rounded through float32. Encoded bytes are float32 as before.
+    """
+
+    # _values is tuple of float if F4 built from Python values, otherwise None
+    __slots__ = ('_values', )
 
     def __init__(self, item_type, value):
-        tv = type(value)
-        if tv is tuple or tv is list:
-            super(Secs2FloatBody, self).__init__(item_type, [float(x) for x in value])
-        else:
-            super(Secs2FloatBody, self).__init__(item_type, [float(value)])
+        self._values = None
+        bs = self._array_to_bytes(item_type, value)
+        if bs is None:
+            vv = self._to_values(value)
+            fmt = '>' + str(len(vv)) + item_type[3]
+            try:
+                try:
+                    bs = struct.pack(fmt, *vv)
+                except struct.error:
+                    vv = [float(x) for x in vv]
+                    bs = struct.pack(fmt, *vv)
+            except OverflowError as e:
+                raise ValueError(e)
+            if item_type[2] == 4:
+                self._values = tuple([float(x) for x in vv])
+        super(Secs2FloatBody, self).__init__(item_type, bs)
+
+    def __getitem__(self, item):
+        vv = self._values
+        if vv is None:
+            return super(Secs2FloatBody, self).__getitem__(item)
+        try:
+            return vv[item]
+        except IndexError as e:
+            raise Secs2BodyParseError(e)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Returns:
+            tuple: number values, F4 values as given if built from Python values
+        """
+        vv = self._values
+        if vv is None:
+            return struct.unpack(('>' + str(len(self)) + self._type[3]), self._value)
+        return vv
+
+    def iter_values(self, start=0, stop=None):
+        vv = self._values
+        if vv is None:
+            return super(Secs2FloatBody, self).iter_values(start, stop)
+        return iter(vv[start:stop])
 
     @staticmethod
     def build(item_type, value):
         return Secs2FloatBody(item_type, value)
 
+    @classmethod
+    def from_value_bytes(cls, item_type, bs):
+        v = super(Secs2FloatBody, cls).from_value_bytes(item_type, bs)
+        v._values = None
+        return v
+
 
 class Secs2ListBody(AbstractSecs2Body):
 
+    __slots__ = ()
+
     def __init__(self, item_type, value):
 
         tv = type(value)
@@ -335,56 +877,277 @@ class Secs2ListBody(AbstractSecs2Body):
             raise TypeError("L values require tuple or list")
             
     def _create_to_sml(self):
-
-        def _lsf(value, level=''):  # create_list_sml_string
+        vv = ['<L [' + str(len(self)) + ']']
+        stack = [(iter(self.value), '')]
+        while stack:
+            it, level = stack[-1]
             deep_level = level + self._SML_TAB
-            vv = list()
-            vv.append(level + '<L [' + str(len(value)) + ']')
-            for x in value:
+            for x in it:
                 if x.type == 'L':
-                    vv.append(_lsf(x.value, deep_level))
+                    vv.append(deep_level + '<L [' + str(len(x)) + ']')
+                    stack.append((iter(x.value), deep_level))
+                    break
+                else:
+                    vv.append(deep_level + self._get_child_cache(x, self._CACHE_SML, x._create_to_sml))
+            else:
+                stack.pop()
+                vv.append(level + '>')
+        return self._SML_LINESEPARATOR.join(vv)
+
+    def _create_repr(self):
+        vv = ["('L', ("]
+        stack = [(iter(self.value), len(self), [0])]
+        while stack:
+            it, size, n = stack[-1]
+            for x in it:
+                if n[0] > 0:
+                    vv.append(', ')
+                n[0] += 1
+                if x.type == 'L' and x._get_cache(self._CACHE_REPR) is None:
+                    vv.append("('L', (")
+                    stack.append((iter(x.value), len(x), [0]))
+                    break
                 else:
-                    vv.append(deep_level + x.to_sml())
-            vv.append(level + '>')
-            return self._SML_LINESEPARATOR.join(vv)
+                    vv.append(self._get_child_cache(x, self._CACHE_REPR, x._create_repr))
+            else:
+                stack.pop()
+                vv.append(',))' if size == 1 else '))')
+        return ''.join(vv)
 
-        return _lsf(self._value)
+    def _get_child_items(self):
+        return self._value
 
-    def _create_to_bytes(self):
-        v_len = len(self._value)
-        bs_len = struct.pack('>L', v_len)
-        bs_vv = b''.join([x.to_bytes() for x in self._value])
-        if v_len >= self._BYTES_LEN_3:
-            return struct.pack('>B', (self._type[1] | 0x03)) + bs_len[1:4] + bs_vv
-        elif v_len >= self._BYTES_LEN_2:
-            return struct.pack('>B', (self._type[1] | 0x02)) + bs_len[2:4] + bs_vv
-        else:
-            return struct.pack('>B', (self._type[1] | 0x01)) + bs_len[3:4] + bs_vv
+    def _get_encoded_size(self):
+        n = self._get_header_size(len(self._value))
+        stack = [self._value]
+        while stack:
+            for x in stack.pop():
+                vv = x._get_encode_items()
+                if vv is None:
+                    n += x.get_encoded_size()
+                else:
+                    n += x._get_header_size(len(vv))
+                    stack.append(vv)
+        return n
+
+    def _encode_into(self, buf, offset):
+        p = self._encode_header_into(buf, offset, len(self._value))
+        stack = [iter(self._value)]
+        while stack:
+            for x in stack[-1]:
+                vv = x._get_encode_items()
+                if vv is None:
+                    p = x.encode_into(buf, p)
+                else:
+                    p = x._encode_header_into(buf, p, len(vv))
+                    stack.append(iter(vv))
+                    break
+            else:
+                stack.pop()
+        return p
 
     @staticmethod
     def build(item_type, value):
         return Secs2ListBody(item_type, value)
 
+    @staticmethod
+    def _from_items(item_type, items):   # build from decoded Secs2Body items without checking
+        v = Secs2ListBody.__new__(Secs2ListBody)
+        AbstractSecs2Body.__init__(v, item_type, tuple(items))
+        return v
+
     
+class Secs2LazyListBody(Secs2ListBody):
+    """L item decoded lazily over memoryview of SECS-II body bytes.
+
+    Child items are decoded on first access, and cached.
+    If index, child item positions are indexed in one pass on first access,
+    and random access does not walk siblings.
+    """
+
+    __slots__ = (
+        '_body_view', '_max_depth', '_index', '_offsets', '_item_pos', '_value_pos', '_size',
+        '_children', '_seek_index', '_seek_pos', '_end_pos', '_lock'
+    )
+
+    def __init__(self, item_type, body_view, item_pos, value_pos, size, max_depth, index=False):
+        AbstractSecs2Body.__init__(self, item_type, None)
+        self._body_view = body_view
+        self._max_depth = max_depth     # max nesting depth of child items
+        self._index = index
+        self._offsets = None            # array('I') of child item positions if indexed
+        self._item_pos = item_pos
+        self._value_pos = value_pos
+        self._size = size
+        self._children = None
+        self._seek_index = 0
+        self._seek_pos = value_pos
+        self._end_pos = None
+        self._lock = threading.Lock()     # guards seek position and children cache
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return tuple([self._child(i) for i in range(*item.indices(self._size))])
+
+        i = item + self._size if item < 0 else item
+        if i < 0 or i >= self._size:
+            raise Secs2BodyParseError(IndexError("tuple index out of range"))
+
+        return self._child(i)
+
+    def __iter__(self):
+        if self._value is not None:
+            return iter(self._value)
+        return iter(self.value)
+
+    @property
+    def value(self):
+        pass
+
+    @value.getter
+    def value(self):
+        """value getter.
+
+        Decodes all child items.
+
+        Returns:
+            tuple: child items
+        """
+        if self._value is None:
+            self._value = tuple([self._child(i) for i in range(self._size)])
+        return self._value
+
+    def _child(self, index):
+
+        vv = self._children
+        if vv is not None:
+            v = vv[index]
+            if v is not None:
+                return v
+
+        with self._lock:
+            return self.__locked_child(index)
+
+    def __locked_child(self, index):
+
+        if self._children is None:
+            self._children = [None] * self._size
+
+        v = self._children[index]
+        if v is not None:
+            return v
+
+        try:
+            if self._index:
+                if self._offsets is None:
+                    self._build_offsets()
+                return self._child_from_offsets(index)
+
+            if index < self._seek_index:
+                self._seek_index = 0
+                self._seek_pos = self._value_pos
+
+            while self._seek_index < index:
+                self._seek_pos = self.__child_end(self._seek_index, self._seek_pos)
+                self._seek_index += 1
+
+            v = self._children[index]
+            if v is None:
+                v = Secs2BodyBuilder._decode_item(self._body_view, self._seek_pos, self._max_depth, self._index)
+                v._cache_policy = self._cache_policy
+                self._children[index] = v
+
+            return v
+
+        except Secs2BodyParseError as e:
+            raise e
+        except (ValueError, TypeError, IndexError, struct.error) as e:
+            raise Secs2BodyBytesParseError(e)
+
+    def _build_offsets(self):
+        vv = array.array('I')
+        pos = self._value_pos
+        for _ in range(self._size):
+            vv.append(pos)
+            pos = Secs2BodyBuilder._seek_item_end(self._body_view, pos)
+        self._offsets = vv
+        self._end_pos = pos
+
+    def _child_from_offsets(self, index):
+        v = Secs2BodyBuilder._decode_item(self._body_view, self._offsets[index], self._max_depth, True)
+        v._cache_policy = self._cache_policy
+        if isinstance(v, Secs2LazyListBody):
+            n = index + 1
+            v._end_pos = self._offsets[n] if n < self._size else self._end_pos
+        self._children[index] = v
+        return v
+
+    def __child_end(self, index, pos):
+        v = self._children[index]
+        if isinstance(v, Secs2LazyListBody):
+            return v._get_end_pos()
+        else:
+            return Secs2BodyBuilder._seek_item_end(self._body_view, pos)
+
+    def _get_child_items(self):
+        return None
+
+    def _get_end_pos(self):
+        if self._end_pos is None:
+            self._end_pos = Secs2BodyBuilder._seek_item_end(self._body_view, self._item_pos)
+        return self._end_pos
+
+    def _get_encoded_size(self):
+        try:
+            return self._get_end_pos() - self._item_pos
+        except (ValueError, TypeError, IndexError) as e:
+            raise Secs2BodyBytesParseError(e)
+
+    def _encode_into(self, buf, offset):
+        end = offset + self._get_encoded_size()
+        buf[offset:end] = self._body_view[self._item_pos:self._get_end_pos()]
+        return end
+
+    def _create_to_bytes(self):
+        return bytes(self._body_view[self._item_pos:(self._item_pos + self._get_encoded_size())])
+
+
 class Secs2BodyBuilder:
 
     _ITEMS = (
-        ('L',       0x00, -1, None, None,   Secs2ListBody.build),
-        ('B',       0x20,  1, 'c',  False,  Secs2BinaryBody.build),
-        ('BOOLEAN', 0x24,  1, '?',  None,   Secs2BooleanBody.build),
-        ('A',       0x40, -1, None, None,   Secs2AsciiBody.build),
-        ('I8',      0x60,  8, 'q',  True,   Secs2IntegerBody.build),
-        ('I1',      0x64,  1, 'b',  True,   Secs2IntegerBody.build),
-        ('I2',      0x68,  2, 'h',  True,   Secs2IntegerBody.build),
-        ('I4',      0x70,  4, 'l',  True,   Secs2IntegerBody.build),
-        ('F8',      0x80,  8, 'd',  None,   Secs2FloatBody.build),
-        ('F4',      0x90,  4, 'f',  None,   Secs2FloatBody.build),
-        ('U8',      0xA0,  8, 'Q',  False,  Secs2IntegerBody.build),
-        ('U1',      0xA4,  1, 'B',  False,  Secs2IntegerBody.build),
-        ('U2',      0xA8,  2, 'H',  False,  Secs2IntegerBody.build),
-        ('U4',      0xB0,  4, 'L',  False,  Secs2IntegerBody.build)
+        ('L',       0x00, -1, None, None,   Secs2ListBody.build,    None),
+        ('B',       0x20,  1, 'c',  False,  Secs2BinaryBody.build,  Secs2BinaryBody.from_value_bytes),
+        ('BOOLEAN', 0x24,  1, '?',  None,   Secs2BooleanBody.build, Secs2BooleanBody.from_value_bytes),
+        ('A',       0x40, -1, None, None,   Secs2AsciiBody.build,   Secs2AsciiBody.from_value_bytes),
+        ('I8',      0x60,  8, 'q',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('I1',      0x64,  1, 'b',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('I2',      0x68,  2, 'h',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('I4',      0x70,  4, 'l',  True,   Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('F8',      0x80,  8, 'd',  None,   Secs2FloatBody.build,   Secs2FloatBody.from_value_bytes),
+        ('F4',      0x90,  4, 'f',  None,   Secs2FloatBody.build,   Secs2FloatBody.from_value_bytes),
+        ('U8',      0xA0,  8, 'Q',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('U1',      0xA4,  1, 'B',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('U2',      0xA8,  2, 'H',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes),
+        ('U4',      0xB0,  4, 'L',  False,  Secs2IntegerBody.build, Secs2IntegerBody.from_value_bytes)
     )
 
+    # SML item name -> item_type
+    _ITEMS_BY_SML = dict([(i[0], i) for i in _ITEMS])
+
+    # format byte (format code | number of length bytes) -> item_type, None if not exist
+    _ITEMS_BY_FORMAT_BYTE = tuple(map(
+        dict([((i[1] | lb), i) for i in _ITEMS for lb in (0x01, 0x02, 0x03)]).get,
+        range(256)))
+
+    # max nesting depth of items on decode and SML parse, root item is depth 1
+    max_depth = 256
+
+    # default cache policy of items
+    cache_policy = Secs2BodyCachePolicy.ALL
+
     @classmethod
     def build(cls, item_type, value):
 
@@ -404,83 +1167,52 @@ class Secs2BodyBuilder:
 
     @classmethod
     def get_item_type_from_sml(cls, sml_item_type):
-        str_upper = sml_item_type.upper()
-        for i in cls._ITEMS:
-            if i[0] == str_upper:
-                return i
-        raise ValueError("'" + sml_item_type + "' not found")
+        v = cls._ITEMS_BY_SML.get(sml_item_type)
+        if v is None:
+            v = cls._ITEMS_BY_SML.get(sml_item_type.upper())
+            if v is None:
+                raise ValueError("'" + sml_item_type + "' not found")
+        return v
 
     @classmethod
-    def from_body_bytes(cls, body_bytes):
-
-        def _itr(b):    # get_item_type
-            x = b & 0xFC
-            for i in cls._ITEMS:
-                if i[1] == x:
-                    return i
-            raise ValueError('0x' + '{:02X}'.format(b) + " not found")
+    def from_body_bytes(cls, body_bytes, lazy=False, max_depth=None, index=False, cache_policy=None):
+        """Build from SECS-II body bytes.
 
-        def _xr(bs, pos):   # get (item_type, value_length, shift_position)
+        If lazy, L items are views over memoryview of body_bytes,
+        and child items are decoded on first access.
+        Malformed bytes in not-accessed items are not detected until accessed.
 
-            b = bs[pos]
-            t = _itr(b)
-            len_bit = b & 0x3
+        Args:
+            body_bytes (bytes): SECS-II body bytes.
+            lazy (bool): True if decode L items lazily. Defaults to False.
+            max_depth (int): max nesting depth of items. Defaults to Secs2BodyBuilder.max_depth.
+            index (bool): True if lazy L items index child item positions for random access. Defaults to False.
+            cache_policy (Secs2BodyCachePolicy): cache policy of items. Defaults to Secs2BodyBuilder.cache_policy.
 
-            if len_bit == 3:
-                len_bs = (bs[pos+1] << 16) | (bs[pos+2] << 8) | bs[pos+3]
-            elif len_bit == 2:
-                len_bs = (bs[pos+1] << 8) | bs[pos+2]
-            else:
-                len_bs = bs[pos+1]
-
-            return t, len_bs, (len_bit + 1)
-
-        def _f(bs, pos):
-
-            r = _xr(bs, pos)
-            tt, v_len, b_len = _xr(bs, pos)
-            start_index = pos + b_len
-            end_index = pos + b_len + v_len
-
-            if tt[0] == 'L':
-                vv = list()
-                p = start_index
-                for _ in range(r[1]):
-                    v, p = _f(bs, p)
-                    vv.append(v)
-                return tt[5](tt, vv), p
-
-            elif tt[0] == 'BOOLEAN':
-                vv = [(b != 0x00) for b in bs[start_index:end_index]]
-                return tt[5](tt, vv), end_index
-
-            elif tt[0] == 'A':
-                v = bs[start_index:end_index].decode(encoding='ascii')
-                return tt[5](tt, v), end_index
-
-            elif tt[0] == 'B':
-                vv = bs[start_index:end_index]
-                return tt[5](tt, vv), end_index
-
-            elif tt[0] in ('I1', 'I2', 'I4', 'I8', 'F8', 'F4', 'U1', 'U2', 'U4', 'U8'):
-                vv = list()
-                p = start_index
-                for _ in range(0, v_len, tt[2]):
-                    prev = p
-                    p += tt[2]
-                    v = struct.unpack(('>' + tt[3]), bs[prev:p])
-                    vv.append(v[0])
-                return tt[5](tt, vv), end_index
+        Raises:
+            Secs2BodyBytesParseError: if parse failed.
 
+        Returns:
+            AbstractSecs2Body: Secs2Body, None if body_bytes is empty.
+        """
         try:
             if len(body_bytes) == 0:
                 return None
-            
-            lr, lp = _f(body_bytes, 0)
+
+            if max_depth is None:
+                max_depth = cls.max_depth
+
+            if lazy:
+                lr = cls._decode_item(memoryview(body_bytes), 0, max_depth, index)
+                lr._cache_policy = cache_policy     # child items follow on decode
+                return lr
+
+            lr, lp = cls._decode_items(body_bytes, 0, max_depth)
             len_body = len(body_bytes)
 
             if lp == len_body:
-                lr._cache_bytes = bytes(body_bytes)
+                if cache_policy is not None:
+                    lr.set_cache_policy(cache_policy)
                 return lr
             else:
                 raise Secs2BodyBytesParseError("not reach bytes end, reach=" + str(lp) + ", length=" + str(len_body))
@@ -491,3 +1223,215 @@ class Secs2BodyBuilder:
             raise Secs2BodyBytesParseError(e)
         except IndexError as e:
             raise Secs2BodyBytesParseError(e)
+        except struct.error as e:
+            raise Secs2BodyBytesParseError(e)
+
+    @classmethod
+    def get_value_from_body_bytes(cls, body_bytes, *indices):
+        """value getter from SECS-II body bytes without building Secs2Body tree.
+
+        Skip sibling items by item header length bytes, and decode addressed item only.
+
+        Args:
+            body_bytes (bytes): SECS-II body bytes.
+            indices (int): index path, same as get_value(*indices).
+
+        Raises:
+            Secs2BodyBytesParseError: if parse failed.
+            Secs2BodyParseError: if IndexError or TypeError.
+
+        Returns:
+            Any: seek value.
+        """
+        try:
+            tt, v_len, pos, p, n = cls._seek_path(body_bytes, indices)
+            if tt[6] is None:   # L
+                v = (cls._decode_items(body_bytes, pos, cls.max_depth))[0]
+            else:
+                end = p + v_len
+                if end > len(body_bytes):
+                    raise ValueError("not reach bytes end, reach=" + str(end) + ", length=" + str(len(body_bytes)))
+                v = tt[6](tt, bytes(body_bytes[p:end]))
+
+        except (IndexError, TypeError) as e:
+            raise Secs2BodyParseError(e)
+        except (ValueError, struct.error) as e:
+            raise Secs2BodyBytesParseError(e)
+
+        return v.get_value(*indices[n:])
+
+    @classmethod
+    def get_offset_from_body_bytes(cls, body_bytes, *indices):
+        """Item positions getter from SECS-II body bytes without building Secs2Body tree.
+
+        Args:
+            body_bytes (bytes): SECS-II body bytes.
+            indices (int): index path of L items.
+
+        Raises:
+            Secs2BodyBytesParseError: if parse failed.
+            Secs2BodyParseError: if IndexError or TypeError, or index of not L item.
+
+        Returns:
+            tuple: (offset, length) of root item and each addressed item on index path,
+                length is item header and value bytes, including child items if L.
+                last is addressed item.
+
+        Examples:
+            offset, length = Secs2BodyBuilder.get_offset_from_body_bytes(bs, 2, 0, 1)[-1]
+            rptid_bytes = bs[offset:(offset + length)]
+        """
+        path = list()
+        try:
+            tt, v_len, pos, p, n = cls._seek_path(body_bytes, indices, path)
+
+            if n < len(indices):
+                raise Secs2BodyParseError(tt[0] + " is not L, index=" + str(indices[n]))
+
+            return tuple([(x, cls._seek_item_end(body_bytes, x) - x) for x in path])
+
+        except (IndexError, TypeError) as e:
+            raise Secs2BodyParseError(e)
+        except (ValueError, struct.error) as e:
+            raise Secs2BodyBytesParseError(e)
+
+    @classmethod
+    def _seek_path(cls, bs, indices, path=None):
+        # return (item_type, value_length, item_position, value_position, count of used indices)
+        # stop at not L item, remaining indices are for value.
+        # item positions of root and each indexed item are appended to path if not None.
+
+        pos = 0
+        tt, v_len, p = cls._read_item_header(bs, pos)
+        if path is not None:
+            path.append(pos)
+
+        for n, i in enumerate(indices):
+
+            if tt[6] is not None:   # not L
+                return tt, v_len, pos, p, n
+
+            x = i + v_len if i < 0 else i
+            if x < 0 or x >= v_len:
+                raise IndexError("list index out of range, index=" + str(i) + ", size=" + str(v_len))
+
+            pos = p
+            for _ in range(x):
+                pos = cls._seek_item_end(bs, pos)
+
+            tt, v_len, p = cls._read_item_header(bs, pos)
+            if path is not None:
+                path.append(pos)
+
+        return tt, v_len, pos, p, len(indices)
+
+    @classmethod
+    def _read_item_header(cls, bs, pos):    # return (item_type, value_length, value_position)
+
+        b = bs[pos]
+        t = cls._ITEMS_BY_FORMAT_BYTE[b]
+
+        if t is None:
+            if (b & 0x03) == 0:
+                raise ValueError('0x' + '{:02X}'.format(b) + " has no length bytes")
+            raise ValueError('0x' + '{:02X}'.format(b) + " not found")
+
+        len_bit = b & 0x03
+
+        if len_bit == 1:
+            return t, bs[pos+1], (pos + 2)
+        elif len_bit == 2:
+            return t, ((bs[pos+1] << 8) | bs[pos+2]), (pos + 3)
+        else:
+            return t, ((bs[pos+1] << 16) | (bs[pos+2] << 8) | bs[pos+3]), (pos + 4)
+
+    @classmethod
+    def _seek_item_end(cls, bs, pos):   # skip item headers, return item end position
+        # same as _read_item_header, inlined for skipping many siblings
+        items = cls._ITEMS_BY_FORMAT_BYTE
+        remaining = 1
+        while remaining > 0:
+            b = bs[pos]
+            tt = items[b]
+            if tt is None:
+                cls._read_item_header(bs, pos)  # raise ValueError
+            len_bit = b & 0x03
+            if len_bit == 1:
+                v_len = bs[pos + 1]
+            elif len_bit == 2:
+                v_len = (bs[pos + 1] << 8) | bs[pos + 2]
+            else:
+                v_len = (bs[pos + 1] << 16) | (bs[pos + 2] << 8) | bs[pos + 3]
+            pos += len_bit + 1
+            remaining -= 1
+            if tt[6] is None:   # L
+                remaining += v_len
+            else:
+                if tt[2] > 1 and v_len % tt[2] != 0:
+                    raise ValueError(tt[0] + " length is not multiple of " + str(tt[2]) + ", length=" + str(v_len))
+                pos += v_len
+        if pos > len(bs):
+            raise ValueError("not reach bytes end, reach=" + str(pos) + ", length=" + str(len(bs)))
+        return pos
+
+    @classmethod
+    def _decode_items(cls, bs, pos, max_depth):     # return (Secs2Body, end_position)
+
+        read_header = cls._read_item_header
+        from_items = Secs2ListBody._from_items
+        len_bs = len(bs)
+
+        stack = list()  # (item_type, remaining, items) of outer L items
+        ltt = None      # item_type of L item not reach end
+        remaining = 0   # count of remaining items of ltt
+        vv = None       # decoded items of ltt, None if root
+
+        while True:
+
+            tt, v_len, p = read_header(bs, pos)
+
+            if tt[6] is None:   # L
+                pos = p
+                if v_len > 0:
+                    stack.append((ltt, remaining, vv))
+                    if len(stack) >= max_depth:
+                        raise ValueError("depth exceeds max_depth " + str(max_depth))
+                    ltt = tt
+                    remaining = v_len
+                    vv = list()
+                    continue
+                v = from_items(tt, ())
+
+            else:
+                pos = p + v_len
+                if pos > len_bs:
+                    raise ValueError("not reach bytes end, reach=" + str(pos) + ", length=" + str(len_bs))
+                v = tt[6](tt, bytes(bs[p:pos]))
+
+            while True:
+                if vv is None:
+                    return v, pos
+                vv.append(v)
+                remaining -= 1
+                if remaining > 0:
+                    break
+                v = from_items(ltt, vv)
+                ltt, remaining, vv = stack.pop()
+
+    @classmethod
+    def _decode_item(cls, bs, pos, max_depth, index=False):     # return Secs2Body, L is decoded lazily
+
+        if max_depth < 1:
+            raise ValueError("depth exceeds max_depth")
+
+        tt, v_len, start_index = cls._read_item_header(bs, pos)
+
+        if tt[6] is None:   # L
+            return Secs2LazyListBody(tt, bs, pos, start_index, v_len, (max_depth - 1), index)
+
+        end_index = start_index + v_len
+
+        if end_index > len(bs):
+            raise ValueError("not reach bytes end, reach=" + str(end_index) + ", length=" + str(len(bs)))
+
+        return tt[6](tt, bs[start_index:end_index])
@@ -0,0 +1,441 @@
+import struct
+import secs
+
+
+class Secs2BodyTemplate:
+    """Compiled SECS-II body shape.
+
+    Fixed items are encoded once at compile, placeholder items are filled
+    from a flat sequence of values in document order.
+
+    Placeholders of number items (I1-I8, U1-U8, F4, F8) take one value,
+    and are packed with a precompiled struct format together with
+    the surrounding fixed bytes.
+    Placeholders of A, B and BOOLEAN take a value of build.
+
+    Examples:
+        tmpl = Secs2BodyTemplate.from_sml('<L <U4 $DATAID> <U4 $CEID> <L <A $TEXT> > >')
+        bs = tmpl.to_bytes((1, 1001, 'ON FIRE'))
+        communicator.send(6, 11, True, bs)
+    """
+
+    def __init__(self, spec, names=None):
+        """Compile from tuple spec.
+
+        Args:
+            spec (tuple or list): (item_type, value) as Secs2BodyBuilder.build, value None is placeholder.
+            names (list): names of placeholders. Defaults to None.
+
+        Raises:
+            TypeError: if spec is invalid.
+            ValueError: if fixed value is invalid or L is placeholder.
+        """
+        segs = list()
+        self.__compile(spec, segs)
+
+        ops = list()
+        cc = [b'']
+        tts = list()
+
+        def _flush():
+            fmt = '>' + ''.join([(str(len(c)) + 's' + (tts[i][3] if i < len(tts) else ''))
+                                 for i, c in enumerate(cc)])
+            ops.append((struct.Struct(fmt), tuple(cc), tuple(tts)))
+
+        for x in segs:
+            if type(x) is bytes:
+                cc[-1] += x
+            elif x[2] > 0 and x[3] not in ('?', 'c'):
+                tts.append(x)
+                cc.append(b'')
+            else:
+                _flush()
+                ops.append((None, None, x))
+                cc = [b'']
+                tts = list()
+
+        _flush()
+
+        self.__ops = tuple([op for op in ops if op[0] is None or op[0].size > 0])
+        self.__count = len([x for x in segs if type(x) is not bytes])
+        self.__names = tuple(names) if names is not None else tuple([None] * self.__count)
+
+        if len(self.__names) != self.__count:
+            raise ValueError("names length is not placeholders count")
+
+    @classmethod
+    def from_sml(cls, sml_str):
+        """Compile from SML-body with placeholders '<U4 $name>'.
+
+        Fixed items are encoded straight from SML, without building Secs2Body.
+
+        Args:
+            sml_str (str): SML-body-string.
+
+        Raises:
+            secs.Secs2BodySmlParseError: if parse failed.
+
+        Returns:
+            Secs2BodyTemplate: template.
+        """
+
+        def _build(tt, v):
+            if v is None:   # placeholder
+                return tt, v
+            if tt[6] is None:   # L
+                if all([type(x) is bytes for x in v]):
+                    return cls._header_bytes(tt, len(v)) + b''.join(v)
+                return tt, v
+            return cls._encode_sml_values(tt, v)
+
+        names = list()
+        spec = secs.SmlParser._parse_body(sml_str, build=_build, placeholders=names)
+        try:
+            return cls(spec, [(n if n else None) for n in names])
+        except (TypeError, ValueError) as e:
+            raise secs.Secs2BodySmlParseError(str(e))
+
+    @property
+    def names(self):
+        pass
+
+    @names.getter
+    def names(self):
+        """Placeholder names getter.
+
+        Returns:
+            tuple: names in document order, None if not named.
+        """
+        return self.__names
+
+    def __len__(self):
+        return self.__count
+
+    def to_bytes(self, values=()):
+        """Encode body bytes.
+
+        Args:
+            values (tuple or list): placeholder values in document order.
+
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
+
+        Returns:
+            bytes: SECS-II body bytes.
+        """
+        vv = tuple(values)
+        if len(vv) != self.__count:
+            raise ValueError("values count is " + str(self.__count) + ", value is " + str(len(vv)))
+
+        bb = list()
+        p = 0
+        for st, cc, tts in self.__ops:
+            if st is None:
+                try:
+                    bb.append(secs.Secs2BodyBuilder.build(tts, vv[p]).to_bytes())
+                except TypeError as e:
+                    raise ValueError(e)
+                p += 1
+            else:
+                n = len(tts)
+                args = [None] * (n * 2 + 1)
+                args[0::2] = cc
+                args[1::2] = vv[p:(p + n)]
+                try:
+                    bb.append(st.pack(*args))
+                except struct.error:
+                    args[1::2] = [self.__to_value(tt, v) for tt, v in zip(tts, vv[p:(p + n)])]
+                    try:
+                        bb.append(st.pack(*args))
+                    except struct.error as e:
+                        raise ValueError(e)
+                p += n
+
+        if len(bb) == 1:
+            return bb[0]
+        else:
+            return b''.join(bb)
+
+    def build(self, values=()):
+        """Build Secs2Body.
+
+        Args:
+            values (tuple or list): placeholder values in document order.
+
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
+
+        Returns:
+            secs.AbstractSecs2Body: Secs2Body decoding lazily from encoded bytes.
+        """
+        return secs.Secs2BodyBuilder.from_body_bytes(self.to_bytes(values), lazy=True)
+
+    @staticmethod
+    def __to_value(item_type, value):
+        # value not scalar is ValueError as other invalid values
+        try:
+            if item_type[4] is None:
+                return float(value)
+            else:
+                return secs.AbstractSecs2Body._tiof(value, item_type[2], item_type[4])
+        except (TypeError, OverflowError) as e:
+            raise ValueError(e)
+
+    @classmethod
+    def __compile(cls, spec, segs):
+
+        tt = type(spec)
+        if tt is bytes:     # encoded item
+            segs.append(spec)
+            return
+
+        if not ((tt is list or tt is tuple) and len(spec) == 2):
+            raise TypeError('Secs2Body is tuple or list, and length == 2')
+
+        item_type, value = spec
+        if type(item_type) is str:
+            item_type = secs.Secs2BodyBuilder.get_item_type_from_sml(item_type)
+        elif type(item_type) is not tuple:
+            raise TypeError("Require str or tuple")
+
+        if item_type[6] is None:
+            if value is None:
+                raise ValueError("L is not accept placeholder")
+            vv = list(value)
+            segs.append(cls._header_bytes(item_type, len(vv)))
+            for v in vv:
+                cls.__compile(v, segs)
+
+        elif value is None:
+            if item_type[2] > 0 and item_type[3] not in ('?', 'c'):
+                segs.append(cls._header_bytes(item_type, item_type[2]))
+            segs.append(item_type)
+
+        else:
+            segs.append(secs.Secs2BodyBuilder.build(item_type, value).to_bytes())
+
+    @classmethod
+    def _encode_sml_values(cls, item_type, values):  # encode not L item from SML values
+        name = item_type[0]
+        if name == 'A':
+            bs = values.encode(encoding='ascii')
+        elif name == 'BOOLEAN':
+            bs = bytes([(0xFF if v else 0x00) for v in values])
+        elif name == 'B':
+            bs = bytes([secs.AbstractSecs2Body._tiof(v, 1, False) for v in values])
+        else:
+            vv = [cls.__to_value(item_type, v) for v in values]
+            try:
+                bs = struct.pack(('>' + str(len(vv)) + item_type[3]), *vv)
+            except (struct.error, OverflowError) as e:
+                raise ValueError(e)
+        return cls._header_bytes(item_type, len(bs)) + bs
+
+    @staticmethod
+    def _header_bytes(item_type, v_len):
+        if v_len >= 0x10000:
+            return bytes([item_type[1] | 0x03, (v_len >> 16) & 0xFF, (v_len >> 8) & 0xFF, v_len & 0xFF])
+        elif v_len >= 0x100:
+            return bytes([item_type[1] | 0x02, (v_len >> 8) & 0xFF, v_len & 0xFF])
+        else:
+            return bytes([item_type[1] | 0x01, v_len])
+
+
+class SmlMessageTemplate:
+    """Compiled SML message, body is Secs2BodyTemplate.
+
+    Immutable, and safe to share across threads.
+    Body bytes without placeholders are encoded once.
+
+    Examples:
+        tmpl = SmlMessageTemplate.from_sml('S1F3 W <L <U4 $svid> >.')
+        communicator.send(tmpl.strm, tmpl.func, tmpl.wbit, tmpl.to_bytes({'svid': 1001}))
+
+        frame = SmlParser.compile('S1F2 <L <A "MDLN"> <A "REV"> >.').to_hsmsss_bytes(system_bytes, session_id)
+    """
+
+    __slots__ = ('__strm', '__func', '__wbit', '__body', '__body_bytes')
+
+    def __init__(self, strm, func, wbit, body=None):
+        """Constructor.
+
+        Args:
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            body (Secs2BodyTemplate): body template, None if no body. Defaults to None.
+        """
+        self.__strm = strm
+        self.__func = func
+        self.__wbit = wbit
+        self.__body = body
+        self.__body_bytes = body.to_bytes() if body is not None and len(body) == 0 else None
+
+    @classmethod
+    def from_sml(cls, sml_str):
+        """Compile from SML with placeholders '<U4 $name>'.
+
+        Args:
+            sml_str (str): SML-string.
+
+        Raises:
+            secs.Secs2BodySmlParseError: if Secs2body parse failed.
+            secs.SmlParseError: if SML parse failed.
+
+        Returns:
+            SmlMessageTemplate: template.
+        """
+        strm, func, wbit, body = secs.SmlParser._parse_header(sml_str)
+        return cls(strm, func, wbit, (Secs2BodyTemplate.from_sml(body) if len(body) > 0 else None))
+
+    @property
+    def strm(self):
+        pass
+
+    @strm.getter
+    def strm(self):
+        """Stream-Number getter.
+
+        Returns:
+            int: Stream-Number
+        """
+        return self.__strm
+
+    @property
+    def func(self):
+        pass
+
+    @func.getter
+    def func(self):
+        """Function-Number getter.
+
+        Returns:
+            int: Function-Number
+        """
+        return self.__func
+
+    @property
+    def wbit(self):
+        pass
+
+    @wbit.getter
+    def wbit(self):
+        """W-Bit getter.
+
+        Returns:
+            bool: W-Bit
+        """
+        return self.__wbit
+
+    @property
+    def names(self):
+        pass
+
+    @names.getter
+    def names(self):
+        """Placeholder names getter.
+
+        Returns:
+            tuple: names in document order, None if not named.
+        """
+        return () if self.__body is None else self.__body.names
+
+    def __len__(self):
+        return 0 if self.__body is None else len(self.__body)
+
+    def to_bytes(self, values=()):
+        """Encode body bytes.
+
+        Args:
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
+
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
+
+        Returns:
+            bytes: SECS-II body bytes, None if no body.
+        """
+        if values is None:
+            values = ()
+        elif isinstance(values, dict):
+            try:
+                values = [values[n] for n in self.names]
+            except KeyError as e:
+                raise ValueError("value of placeholder " + str(e) + " not found")
+
+        if self.__body is None or self.__body_bytes is not None:
+            if len(values) > 0:
+                raise ValueError("values count is 0, value is " + str(len(values)))
+            return self.__body_bytes
+
+        return self.__body.to_bytes(values)
+
+    def to_hsmsss_bytes(self, system_bytes, session_id, values=()):
+        """Encode HSMS-SS data message frame.
+
+        Args:
+            system_bytes (bytes): 4-bytes system-bytes.
+            session_id (int): Session-ID.
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
+
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
+
+        Returns:
+            bytes: 4-bytes-length + 10-bytes-header + body
+        """
+        bs = self.to_bytes(values)
+        n = 10 if bs is None else (10 + len(bs))
+        return b''.join((
+            bytes([
+                (n >> 24) & 0xFF, (n >> 16) & 0xFF, (n >> 8) & 0xFF, n & 0xFF,
+                (session_id >> 8) & 0x7F, session_id & 0xFF,
+                (self.__strm | 0x80) if self.__wbit else self.__strm, self.__func,
+                0x00, 0x00]),
+            bytes(system_bytes),
+            b'' if bs is None else bs))
+
+    def to_secs1_blocks(self, system_bytes, device_id, rbit, values=()):
+        """Encode SECS-I blocks.
+
+        Args:
+            system_bytes (bytes): 4-bytes system-bytes.
+            device_id (int): Device-ID.
+            rbit (bool): R-Bit.
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
+
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
+
+        Returns:
+            tuple: secs.Secs1MessageBlock
+        """
+        bs = self.to_bytes(values)
+        return secs.Secs1Message(
+            self.__strm, self.__func, self.__wbit,
+            secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True) if bs is not None else None,
+            system_bytes, device_id, rbit).to_blocks()
+
+    def build(self, values=()):
+        """Build message parts.
+
+        Args:
+            values (tuple or list or dict): placeholder values in document order, or dict by name.
+
+        Raises:
+            ValueError: if values count mismatch or value is invalid.
+
+        Returns:
+            tuple: (
+                int: Stream-Number,
+                int: Function-Number,
+                bool: W-Bit,
+                secs.AbstractSecs2Body: secs2body or None
+            )
+        """
+        bs = self.to_bytes(values)
+        return (
+            self.__strm,
+            self.__func,
+            self.__wbit,
+            secs.Secs2BodyBuilder.from_body_bytes(bs, lazy=True) if bs is not None else None)
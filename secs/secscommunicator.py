@@ -1,4 +1,8 @@
+import collections
+import concurrent.futures
+import heapq
 import threading
+import time
 import inspect
 import secs
 
@@ -92,6 +96,16 @@ class AbstractQueuing:
             else:
                 return None
 
+    def _has_vv(self):
+        with self._v_cdt:
+            return bool(self._vv)
+
+    def _wait_vv(self, timeout):
+        # wait until value or terminated, not return by notify of other reason
+        self._v_cdt.wait_for(
+            (lambda: self._is_terminated() or self._has_vv()),
+            timeout)
+
 
 class CallbackQueuing(AbstractQueuing):
 
@@ -100,18 +114,19 @@ class CallbackQueuing(AbstractQueuing):
         self._cb = callback
 
         def _f():
-            with self._v_cdt:
-                while True:
+            while True:
+                # callback out of lock, callback may wait for other putters
+                with self._v_cdt:
                     v = self._poll_vv()
-                    if v is None:
+                    while v is None and not self._is_terminated():
                         self._v_cdt.wait()
+                        v = self._poll_vv()
 
-                        if self._is_terminated():
-                            self._cb(None)
-                            return
+                if v is None:
+                    self._cb(None)
+                    return
 
-                    else:
-                        self._cb(v)
+                self._cb(v)
 
         threading.Thread(target=_f, daemon=True).start()
 
@@ -132,7 +147,7 @@ class WaitingQueuing(AbstractQueuing):
             if v is not None:
                 return v
         
-            self._v_cdt.wait(timeout)
+            self._wait_vv(timeout)
 
             if self._is_terminated():
                 return None
@@ -165,7 +180,7 @@ class WaitingQueuing(AbstractQueuing):
             if rr > 0:
                 return rr
 
-            self._v_cdt.wait(timeout)
+            self._wait_vv(timeout)
 
             if self._is_terminated():
                 return -1
@@ -173,6 +188,86 @@ class WaitingQueuing(AbstractQueuing):
             return _f(values, pos, size)
 
 
+class TimeoutTimer:
+    """Runs callbacks at deadlines on one thread.
+
+    Thread is started on first schedule. Used for timeouts of many transactions in flight.
+    """
+
+    def __init__(self):
+        self.__heap = list()
+        self.__seq = 0
+        self.__cancelled = 0
+        self.__cdt = threading.Condition()
+        self.__terminated = False
+        self.__th = None
+
+    def schedule(self, timeout, callback):
+        """Schedule callback.
+
+        Args:
+            timeout (float): seconds.
+            callback (function): called without arguments on timer thread.
+
+        Returns:
+            list: entry to cancel.
+        """
+        with self.__cdt:
+            self.__seq += 1
+            entry = [time.monotonic() + timeout, self.__seq, callback]
+            heapq.heappush(self.__heap, entry)
+
+            if self.__th is None:
+                self.__th = threading.Thread(target=self.__loop, daemon=True)
+                self.__th.start()
+
+            # wake timer thread only if earliest deadline changed
+            if self.__heap[0] is entry:
+                self.__cdt.notify_all()
+
+            return entry
+
+    def cancel(self, entry):
+        with self.__cdt:
+            if entry[2] is not None:
+                entry[2] = None
+                self.__cancelled += 1
+
+                # drop cancelled entries if majority
+                if self.__cancelled > 1024 and self.__cancelled * 2 > len(self.__heap):
+                    self.__heap = [x for x in self.__heap if x[2] is not None]
+                    heapq.heapify(self.__heap)
+                    self.__cancelled = 0
+
+    def shutdown(self):
+        with self.__cdt:
+            self.__terminated = True
+            del self.__heap[:]
+            self.__cdt.notify_all()
+
+    def __loop(self):
+        while True:
+            with self.__cdt:
+                while True:
+                    if self.__terminated:
+                        return
+
+                    if self.__heap:
+                        t = self.__heap[0][0] - time.monotonic()
+                        if t <= 0.0:
+                            cb = heapq.heappop(self.__heap)[2]
+                            if cb is not None:
+                                break
+                            self.__cancelled -= 1
+                            continue
+                    else:
+                        t = None
+
+                    self.__cdt.wait(t)
+
+            cb()
+
+
 class AbstractSecsCommunicator:
 
     __DEFAULT_TIMEOUT_T1 = 1.0
@@ -201,6 +296,16 @@ class AbstractSecsCommunicator:
         self.timeout_t7 = kwargs.get('timeout_t7', self.__DEFAULT_TIMEOUT_T7)
         self.timeout_t8 = kwargs.get('timeout_t8', self.__DEFAULT_TIMEOUT_T8)
 
+        self.lazy_decode = kwargs.get('lazy_decode', False)
+        self.cache_policy = kwargs.get('cache_policy', None)
+
+        self.__in_flight = 0
+        self.__in_flight_queue = collections.deque()
+        self.__in_flight_lock = threading.Lock()
+        self.__in_flight_closed = False
+        self.__in_flight_sender = None
+        self.max_in_flight = kwargs.get('max_in_flight', None)
+
         gem_mdln = kwargs.get('gem_mdln', None)
         if gem_mdln is not None:
             self.gem.mdln = gem_mdln
@@ -319,6 +424,87 @@ class AbstractSecsCommunicator:
         """
         return self.__name
 
+    @property
+    def lazy_decode(self):
+        pass
+
+    @lazy_decode.setter
+    def lazy_decode(self, val):
+        """lazy-decode setter.
+
+        If True, L items of received message are decoded on first access.
+
+        Args:
+            val (bool): lazy-decode
+        """
+        self.__lazy_decode = bool(val)
+
+    @lazy_decode.getter
+    def lazy_decode(self):
+        """lazy-decode getter.
+
+        Returns:
+            bool: True if decode received message lazily
+        """
+        return self.__lazy_decode
+
+    @property
+    def cache_policy(self):
+        pass
+
+    @cache_policy.setter
+    def cache_policy(self, val):
+        """Cache policy setter.
+
+        Applied to bodies of received messages, and bodies built from tuple or bytes on send.
+
+        Args:
+            val (secs.Secs2BodyCachePolicy): cache policy, None if Secs2BodyBuilder.cache_policy
+        """
+        if val is not None and not isinstance(val, secs.Secs2BodyCachePolicy):
+            raise TypeError("Require Secs2BodyCachePolicy")
+        self.__cache_policy = val
+
+    @cache_policy.getter
+    def cache_policy(self):
+        """Cache policy getter.
+
+        Returns:
+            secs.Secs2BodyCachePolicy: cache policy, None if Secs2BodyBuilder.cache_policy
+        """
+        return self.__cache_policy
+
+    @property
+    def max_in_flight(self):
+        pass
+
+    @max_in_flight.setter
+    def max_in_flight(self, val):
+        """Max in-flight transactions of send_async setter.
+
+        Transactions beyond max are queued, and sent when in-flight transaction is done.
+
+        Args:
+            val (int): max in-flight transactions, None if not limit
+
+        Raises:
+            ValueError: if value is less than 1.
+        """
+        if val is not None:
+            val = int(val)
+            if val < 1:
+                raise ValueError("max_in_flight require >= 1")
+        self.__max_in_flight = val
+
+    @max_in_flight.getter
+    def max_in_flight(self):
+        """Max in-flight transactions of send_async getter.
+
+        Returns:
+            int: max in-flight transactions, None if not limit
+        """
+        return self.__max_in_flight
+
     @staticmethod
     def _try_gt_zero(v):
         """test-set-timeout-tx
@@ -610,6 +796,11 @@ class AbstractSecsCommunicator:
             with self.__comm_cdt:
                 self.__comm_cdt.notify_all()
 
+        with self.__in_flight_lock:
+            self.__in_flight_closed = True
+            if self.__in_flight_sender is not None:
+                self.__in_flight_sender.shutdown()
+
     def __enter__(self):
         return self
 
@@ -626,7 +817,7 @@ class AbstractSecsCommunicator:
             strm (int): Stream-Number.
             func (int): Function-Number.
             wbit (bool): W-Bit.
-            secs2body (tuple or list or secs.AbstractSecs2Body): SECS-II-body. Defaults to None.
+            secs2body (tuple or list or secs.AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
 
         Raises:
             SecsCommunicatorError: if communicator not opened.
@@ -662,11 +853,14 @@ class AbstractSecsCommunicator:
             self._create_system_bytes(),
             self.device_id)
 
-    def send_sml(self, sml_str):
+    def send_sml(self, sml_str, values=None):
         """Send primary message by SML
 
+        Parsed SML is cached by SmlParser.compile.
+
         Args:
-            sml_str (str): SML-string.
+            sml_str (str): SML-string, accept placeholders '<U4 $name>'.
+            values (tuple or list or dict): placeholder values in document order, or dict by name. Defaults to None.
 
         Raises:
             SecsCommunicatorError: if communicator not opened.
@@ -674,12 +868,227 @@ class AbstractSecsCommunicator:
             SecsWaitReplyError: if reply not received.
             secs.Secs2BodySmlParseError: if Secs2body parse failed.
             secs.SmlParseError: if SML parse failed.
+            ValueError: if values is invalid.
 
         Returns:
             secs.SecsMessage: Reply-Message if exist, otherwise None.
+
+        Examples:
+            send_sml('S1F3 W <L <U4 $svid> >.', {'svid': 1001})
         """
-        strm, func, wbit, s2b = secs.SmlParser.parse(sml_str)
-        return self.send(strm, func, wbit, s2b)
+        tmpl = secs.SmlParser.compile(sml_str)
+        return self.send(tmpl.strm, tmpl.func, tmpl.wbit, tmpl.to_bytes(values))
+
+    def send_async(self, strm, func, wbit, secs2body=None):
+        """Send primary message without blocking.
+
+        Sent at once if in-flight transactions are less than max_in_flight, otherwise queued.
+        Future is resolved by receiving thread when reply received.
+
+        Args:
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            secs2body (tuple or list or secs.AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
+
+        Returns:
+            concurrent.futures.Future: result is Reply-Message if exist, otherwise None.
+                exception is same as send.
+
+        Examples:
+            futures = [comm.send_async(1, 3, True, ('L', [('U4', [svid])])) for svid in svids]
+            replies = [f.result() for f in futures]
+        """
+        secs2body = self._create_secs2body(secs2body)
+
+        def _f():
+            return self._send_async(
+                strm, func, wbit,
+                secs2body,
+                self._create_system_bytes(),
+                self.device_id)
+
+        fut = concurrent.futures.Future()
+
+        with self.__in_flight_lock:
+            if self.__max_in_flight is None or self.__in_flight < self.__max_in_flight:
+                self.__in_flight += 1
+            else:
+                self.__in_flight_queue.append((_f, fut))
+                return fut
+
+        self.__run_in_flight(_f, fut)
+        return fut
+
+    def __run_in_flight(self, f, fut):
+        while f is not None:
+
+            if fut.set_running_or_notify_cancel():
+                try:
+                    inner = f()
+                except Exception as e:
+                    inner = concurrent.futures.Future()
+                    inner.set_exception(e)
+
+                if not inner.done():
+                    inner.add_done_callback(lambda x, outer=fut: self.__done_in_flight(x, outer))
+                    return
+
+                self.__set_future_result(inner, fut)
+
+            f, fut = self.__next_in_flight()
+
+    def __done_in_flight(self, inner, outer):
+        # called by thread resolving inner (receiving thread),
+        # queued transaction is sent by sender thread, not to block receiving.
+        # sender thread is created at first queued transaction sent.
+        self.__set_future_result(inner, outer)
+
+        f, fut = self.__next_in_flight()
+        if f is not None:
+            with self.__in_flight_lock:
+                if not self.__in_flight_closed:
+                    if self.__in_flight_sender is None:
+                        self.__in_flight_sender = CallbackQueuing(self.__send_queued_in_flight)
+                    self.__in_flight_sender.put((f, fut))
+                    return
+
+            # closed, fails without blocking
+            self.__run_in_flight(f, fut)
+
+    def __send_queued_in_flight(self, item):
+        if item is not None:
+            self.__run_in_flight(*item)
+
+    @staticmethod
+    def __set_future_result(inner, outer):
+        try:
+            outer.set_result(inner.result())
+        except Exception as e:
+            outer.set_exception(e)
+
+    def __next_in_flight(self):
+        with self.__in_flight_lock:
+            if self.__in_flight_queue and (
+                    self.__max_in_flight is None or self.__in_flight <= self.__max_in_flight):
+                return self.__in_flight_queue.popleft()
+            else:
+                self.__in_flight -= 1
+                return None, None
+
+    def send_many(self, messages, max_in_flight=None):
+        """Send primary messages pipelined, and wait all replies.
+
+        Args:
+            messages (iterable): secs.SecsMessage, or tuple of (strm, func, wbit) or (strm, func, wbit, secs2body).
+            max_in_flight (int): max in-flight transactions. Defaults to None, max_in_flight of communicator.
+
+        Blocks calling thread, awaitable on asyncio communicators.
+
+        Raises:
+            ValueError: if max_in_flight is less than 1.
+
+        Returns:
+            list: Reply-Message or None or exception of each message, in order of messages.
+
+        Examples:
+            replies = comm.send_many(
+                [(1, 3, True, ('L', [('U4', [svid])])) for svid in svids],
+                max_in_flight=16)
+        """
+        n = self.max_in_flight if max_in_flight is None else int(max_in_flight)
+        if n is not None and n < 1:
+            raise ValueError("max_in_flight require >= 1")
+
+        it = iter(messages)
+        results = list()
+        pending = dict()
+        done_qq = WaitingQueuing()
+
+        while True:
+
+            batch = list()
+
+            while n is None or (len(pending) + len(batch)) < n:
+                try:
+                    m = next(it)
+                except StopIteration:
+                    break
+
+                results.append(None)
+
+                try:
+                    batch.append((len(results) - 1, self._create_send_args(m)))
+                except Exception as e:
+                    results[-1] = e
+
+            if batch:
+                futures = self._send_many_async([args for _, args in batch])
+                for (i, _), f in zip(batch, futures):
+                    pending[i] = f
+                    f.add_done_callback(lambda x, i=i: done_qq.put(i))
+
+            if not pending:
+                return results
+
+            # take all done, and refill by one batch
+            i = None
+            while i is None:
+                i = done_qq.poll()
+
+            while i is not None:
+                f = pending.pop(i)
+                try:
+                    results[i] = f.result()
+                except Exception as e:
+                    results[i] = e
+                i = done_qq.poll(0.0)
+
+    def _create_send_args(self, m):
+        if isinstance(m, secs.SecsMessage):
+            strm, func, wbit, secs2body = m.strm, m.func, m.wbit, m.secs2body
+        else:
+            strm, func, wbit = m[0], m[1], m[2]
+            secs2body = self._create_secs2body(m[3] if len(m) > 3 else None)
+
+        return (
+            strm, func, wbit,
+            secs2body,
+            self._create_system_bytes(),
+            self.device_id)
+
+    def _send_many_async(self, args_list):
+        """prototype-pattern send messages without blocking
+
+        Default sends each by _send_async.
+
+        Args:
+            args_list (list): tuples of _send arguments.
+
+        Returns:
+            list: concurrent.futures.Future of each message.
+        """
+        return [self._send_async(*args) for args in args_list]
+
+    def _send_async(self, strm, func, wbit, secs2body, system_bytes, device_id):
+        """prototype-pattern send without blocking
+
+        Default runs _send on new thread, one thread per outstanding transaction.
+        Subclasses override this to pipeline without threads.
+
+        Returns:
+            concurrent.futures.Future: result is Reply-Message if exist, otherwise None.
+        """
+        fut = concurrent.futures.Future()
+
+        def _f():
+            try:
+                fut.set_result(self._send(strm, func, wbit, secs2body, system_bytes, device_id))
+            except Exception as e:
+                fut.set_exception(e)
+
+        threading.Thread(target=_f, daemon=True).start()
+        return fut
 
     def reply(self, primary, strm, func, wbit, secs2body=None):
         """Send reply message
@@ -689,7 +1098,7 @@ class AbstractSecsCommunicator:
             strm (int): Stream-Number.
             func (int): Function-Number.
             wbit (bool: W-Bit.
-            secs2body (tuple or list or secs.AbstractSecs2Body): SECS-II-body. Defaults to None.
+            secs2body (tuple or list or secs.AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
 
         Raises:
             SecsCommunicatorError: if communicator not opened.
@@ -708,27 +1117,52 @@ class AbstractSecsCommunicator:
             primary.system_bytes,
             self.device_id)
 
-    def reply_sml(self, primary, sml_str):
+    def reply_async(self, primary, strm, func, wbit, secs2body=None):
+        """Send reply message without blocking.
+
+        Not limited by max_in_flight.
+
+        Args:
+            primary (secs.SecsMessage): Primary-Message.
+            strm (int): Stream-Number.
+            func (int): Function-Number.
+            wbit (bool): W-Bit.
+            secs2body (tuple or list or secs.AbstractSecs2Body or bytes): SECS-II-body or encoded body bytes. Defaults to None.
+
+        Returns:
+            concurrent.futures.Future: result is None when sent.
+        """
+        return self._send_async(
+            strm, func, wbit,
+            self._create_secs2body(secs2body),
+            primary.system_bytes,
+            self.device_id)
+
+    def reply_sml(self, primary, sml_str, values=None):
         """Send reply message by SML
 
+        Parsed SML is cached by SmlParser.compile.
+
         Args:
             primary (secs.SecsMessage): Primary-Message
-            sml_str (str): SML-String
-            
+            sml_str (str): SML-String, accept placeholders '<U4 $name>'.
+            values (tuple or list or dict): placeholder values in document order, or dict by name. Defaults to None.
+
         Raises:
             SecsCommunicatorError: if communicator not opened.
             SecsSendMessageError: if send failed.
             secs.Secs2BodySmlParseError: if Secs2body parse failed.
             secs.SmlParseError: if SML parse failed.
+            ValueError: if values is invalid.
 
         Returns:
             None: None
         """
-        strm, func, wbit, s2b = secs.SmlParser.parse(sml_str)
+        tmpl = secs.SmlParser.compile(sml_str)
         return self.reply(
             primary,
-            strm, func, wbit,
-            self._create_secs2body(s2b))
+            tmpl.strm, tmpl.func, tmpl.wbit,
+            tmpl.to_bytes(values))
 
     def _create_system_bytes(self):
         self._sys_num = (self._sys_num + 1) & 0xFFFF
@@ -741,16 +1175,32 @@ class AbstractSecsCommunicator:
             n & 0xFF
         ])
 
-    @staticmethod
-    def _create_secs2body(v):
+    def _create_secs2body(self, v):
         if v is None:
             return None
         elif isinstance(v, secs.AbstractSecs2Body):
             return v
+        elif isinstance(v, (bytes, bytearray, memoryview)):
+            bs = bytes(v)
+            try:
+                r = secs.Secs2BodyBuilder.from_body_bytes(
+                    bs, lazy=True, cache_policy=self.cache_policy)
+
+                # lazy root is not decoded, item headers are checked to reach end
+                if r is not None and r.get_encoded_size() != len(bs):
+                    raise ValueError(
+                        "not reach bytes end, reach=" + str(r.get_encoded_size()) + ", length=" + str(len(bs)))
+
+                return r
+            except secs.Secs2BodyParseError as e:
+                raise ValueError(e)
         else:
             tt = type(v)
             if (tt is list or tt is tuple) and len(v) == 2:
-                return secs.Secs2BodyBuilder.build(v[0], v[1])
+                r = secs.Secs2BodyBuilder.build(v[0], v[1])
+                if self.cache_policy is not None:
+                    r.set_cache_policy(self.cache_policy)
+                return r
             else:
                 raise TypeError('Secs2Body is tuple or list, and length == 2')
 
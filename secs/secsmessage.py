@@ -1,4 +1,6 @@
 import os
+import threading
+import secs
 
 
 class SecsMessageParseError(Exception):
@@ -10,7 +12,17 @@ class SecsMessageParseError(Exception):
 class SecsMessage:
 
     _STR_LINESEPARATOR = os.linesep
-    
+
+    # writes body of __str__, truncates large body for logging
+    str_sml_writer = secs.SmlWriter(max_items=1000, max_value_bytes=4096, max_depth=64)
+
+    # _cache is None, or dict of cached values created on first cached
+    # _secs2body_source is (body_bytes, lazy, cache_policy) not decoded yet, or None
+    __slots__ = ('__strm', '__func', '__wbit', '__secs2body', '_secs2body_source', '_cache', '__weakref__')
+
+    # sets decoded body, decode itself is out of lock
+    __decode_lock = threading.Lock()
+
     def __init__(self, strm, func, wbit, secs2body):
 
         if strm < 0 or strm > 127:
@@ -23,7 +35,8 @@ class SecsMessage:
         self.__func = int(func)
         self.__wbit = bool(wbit)
         self.__secs2body = secs2body
-        self.__cache_header10bytes_str = None
+        self._secs2body_source = None
+        self._cache = None
 
     @property
     def strm(self):
@@ -102,10 +115,70 @@ class SecsMessage:
     def secs2body(self):
         """Secs2Body getter.
 
+        If received, body bytes are decoded on first access.
+
+        Raises:
+            secs.Secs2BodyBytesParseError: if decode failed.
+
         Returns:
             secs.AbstractSecs2Body: Secs2Body
         """
-        return self.__secs2body
+        v = self.__secs2body
+        if v is None and self._secs2body_source is not None:
+            return self._decode_secs2body()
+        return v
+
+    def _set_secs2body_source(self, body_bytes, lazy=False, cache_policy=None):
+        # decode body_bytes on first access to secs2body
+        if len(body_bytes) > 0:
+            self._secs2body_source = (body_bytes, lazy, cache_policy)
+
+    def _decode_secs2body(self):
+        src = self._secs2body_source
+        if src is None:     # decoded by other thread
+            return self.__secs2body
+        bs, lazy, cache_policy = src
+        if not lazy and type(bs) is memoryview:
+            bs = bytes(bs)  # eager decode is faster on bytes
+        v = secs.Secs2BodyBuilder.from_body_bytes(bs, lazy, cache_policy=cache_policy)
+        with self.__decode_lock:
+            if self._secs2body_source is None:  # decoded by other thread while decoding
+                return self.__secs2body
+            self.__secs2body = v
+            self._secs2body_source = None
+        return v
+
+    def __getstate__(self):
+        # slots of all classes, body bytes of received is memoryview of frame,
+        # and lazy L item is over memoryview, so stored as bytes.
+        state = dict()
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name == '__weakref__':
+                    continue
+                if name.startswith('__'):
+                    name = '_' + cls.__name__.lstrip('_') + name
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+
+        src = self._secs2body_source
+        v = self.__secs2body
+        if src is not None:
+            state['_secs2body_source'] = (bytes(src[0]), src[1], src[2])
+        elif isinstance(v, secs.Secs2LazyListBody):
+            state['_SecsMessage__secs2body'] = None
+            state['_secs2body_source'] = (v.to_bytes(), True, v._cache_policy)
+
+        c = self._cache
+        if c is not None:
+            state['_cache'] = dict([
+                (k, (bytes(x) if type(x) is memoryview else x)) for k, x in c.items()])
+
+        return state
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            object.__setattr__(self, k, v)
 
     def get_secs2body(self):
         """Secs2Body getter.
@@ -165,12 +238,49 @@ class SecsMessage:
         # return bytes(10)
         raise NotImplementedError()
 
+    def _get_cache(self, key):
+        c = self._cache
+        return None if c is None else c.get(key)
+
+    def _set_cache(self, key, v):   # return v
+        if self._cache is None:
+            self._cache = dict()
+        self._cache[key] = v
+        return v
+
+    def _str_body(self):    # SML of body for __str__, not cache full SML of body
+        return self.str_sml_writer.to_sml(self.secs2body)
+
+    def _get_cache_policy(self):
+        s2b = self.__secs2body
+        if s2b is None:
+            src = self._secs2body_source
+            if src is not None and src[2] is not None:
+                return src[2]
+            return secs.Secs2BodyBuilder.cache_policy
+        return s2b._get_cache_policy()
+
+    def _get_text_cache(self, key):     # str and repr, cached by cache policy of body
+        return self._get_cache_policy()._get(self, key)
+
+    def _set_text_cache(self, key, v):  # return v
+        self._get_cache_policy()._set(self, key, v)
+        return v
+
+    def _get_own_cache(self, key):
+        return self._get_cache(key)
+
+    def _set_own_cache(self, key, v):
+        self._set_cache(key, v)
+
     def get_header10bytes_str(self):
 
-        if self.__cache_header10bytes_str is None:
+        v = self._get_cache('header10bytes_str')
+
+        if v is None:
 
             x = self._header10bytes()
-            self.__cache_header10bytes_str = (
+            v = self._set_cache('header10bytes_str', (
                 '[' + '{:02X}'.format(x[0])
                 + ' ' + '{:02X}'.format(x[1])
                 + '|' + '{:02X}'.format(x[2])
@@ -181,6 +291,6 @@ class SecsMessage:
                 + ' ' + '{:02X}'.format(x[7])
                 + ' ' + '{:02X}'.format(x[8])
                 + ' ' + '{:02X}'.format(x[9])
-                + ']')
+                + ']'))
 
-        return self.__cache_header10bytes_str
+        return v
@@ -1,17 +1,27 @@
+import bisect
+import codecs
+import collections
 import re
+import threading
 import secs
 
 
 class SmlParseError(Exception):
 
-    def __init__(self, msg):
+    # offset is position of failed token in parsed SML string, or None
+    def __init__(self, msg, line=None, column=None, offset=None):
+        if line is not None:
+            msg = 'line ' + str(line) + ', column ' + str(column) + ': ' + str(msg)
         super(SmlParseError, self).__init__(msg)
+        self.line = line
+        self.column = column
+        self.offset = offset
 
 
 class Secs2BodySmlParseError(SmlParseError):
 
-    def __init__(self, msg):
-        super(Secs2BodySmlParseError, self).__init__(msg)
+    def __init__(self, msg, line=None, column=None, offset=None):
+        super(Secs2BodySmlParseError, self).__init__(msg, line, column, offset)
 
 
 class SmlParser:
@@ -19,6 +29,30 @@ class SmlParser:
     _SML_PATTERN = '[Ss]([0-9]{1,3})[Ff]([0-9]{1,3})\\s*([Ww]?)\\s*((<.*>)?)\\s*\\.$'
     _SML_PROG = re.compile(_SML_PATTERN)
 
+    # whitespace is 0x00-0x20
+    _WS = '[\\x00-\\x20]*'
+
+    # '<' item-type optional-size, or '>' of L end
+    _SML_ITEM_PROG = re.compile(_WS + '(?:<' + _WS + '([^\\x00-\\x20\\[\\]"<>]+)' + _WS + '(?:\\[[^\\]]*\\])?|(>))')
+
+    # '"string"', '0xNN' or '>' in A item
+    _SML_ASCII_PROG = re.compile(_WS + '(?:"([^"]*)"|0[Xx]([^\\x00-\\x20"<>]*)|(>))')
+
+    # '$name>' placeholder
+    _SML_PLACEHOLDER_PROG = re.compile(_WS + '\\$([^>]*)>')
+
+    _SML_BOOLEANS = {'TRUE': True, 'T': True, 'FALSE': False, 'F': False}
+
+    # '"', '.' and '/' of comment start in stream, depth of '<' '>' counted between
+    _SML_STREAM_PROG = re.compile('["./]')
+    _SML_NOT_WS_PROG = re.compile('[^\\x00-\\x20]')
+
+    # max count of compiled SML in LRU cache, 0 if not cache
+    cache_size = 256
+
+    _compiled = collections.OrderedDict()
+    _compiled_lock = threading.Lock()
+
     @classmethod
     def parse(cls, sml_str):
         """parse from SML to Tuple
@@ -38,143 +72,426 @@ class SmlParser:
                 secs.AbstractSecs2Body: secs2body or None
             )
         """
-        s = sml_str.replace('\n', ' ').strip()
-        if not s.endswith("."):
-            raise SmlParseError("SML not endswith '.'")
+        strm, func, wbit, body = cls._parse_header(sml_str)
+        if len(body) == 0:
+            return strm, func, wbit, None
 
-        x = cls._SML_PROG.match(s)
-        if x is None:
-            raise SmlParseError("SML not match")
+        try:
+            return strm, func, wbit, cls._parse_body(body)
+        except Secs2BodySmlParseError as e:
+            if e.offset is None:
+                raise
+            # body starts at first '<', header has no '<'
+            raise Secs2BodySmlParseError(str(e), offset=(e.offset + str(sml_str).find('<')))
 
-        body = x.group(4)
+    @classmethod
+    def iter_parse(cls, stream, chunk_size=65536):
+        """parse messages from stream of SML, generator.
 
-        return (
-            int(x.group(1)),
-            int(x.group(2)),
-            len(x.group(3)) > 0,
-            cls._parse_body(body) if len(body) > 0 else None
-        )
+        Reads chunk_size at a time, and holds one message at most.
+        Messages are separated by period(.) out of items.
+        '// line comment' and '/* block comment */' out of strings are skipped.
 
-    @classmethod
-    def _parse_body(cls, sml_str):
-
-        def _is_ws(v):  # is_white_space
-            return (v.encode(encoding='ascii'))[0] <= 0x20
-
-        def _seek_next(s, from_pos, *args):
-            p = from_pos
-            if len(args) > 0:
-                while True:
-                    v = s[p]
-                    for a in args:
-                        if type(a) is str:
-                            if v == a:
-                                return v, p
-                        else:
-                            if a(v):
-                                return v, p
-                    p += 1
+        Args:
+            stream (io.TextIOBase or io.BufferedIOBase or mmap.mmap): read(n) returns str, or bytes decoded as UTF-8.
+            chunk_size (int): read size. Defaults to 65536.
+
+        Raises:
+            Secs2BodySmlParseError: raise if Secs2body parse failed, with line and column of failed token.
+            SmlParseError: raise if SML parse failed, with line and column.
+
+        Yields:
+            tuple: (
+                int: Stream-Number,
+                int: Function-Number,
+                bool: W-Bit,
+                secs.AbstractSecs2Body: secs2body or None
+            )
+
+        Examples:
+            with open('messages.sml') as f:
+                for strm, func, wbit, body in SmlParser.iter_parse(f):
+                    ...
+        """
+        search = cls._SML_STREAM_PROG.search
+        search_not_ws = cls._SML_NOT_WS_PROG.search
+        decoder = None
+
+        NORMAL, QUOTE, LINE_COMMENT, BLOCK_COMMENT = 0, 1, 2, 3
+
+        state = NORMAL
+        depth = 0
+        pieces = list()     # current message without comments
+        marks = list()      # (offset in message, line, column) of each piece start
+        m_len = 0           # length of current message
+        start = None        # (line, column) of current message start
+        state_start = None  # (line, column) of current quote or comment start
+
+        buf = ''
+        line, column = 1, 1     # of buf[lc_pos]
+        lc_pos = 0
+        eof = False
+
+        def _lc(i):     # advance line and column to buf[i]
+            nonlocal line, column, lc_pos
+            n = buf.count('\n', lc_pos, i)
+            if n > 0:
+                line += n
+                column = i - buf.rfind('\n', lc_pos, i)
             else:
-                while True:
-                    v = s[p]
-                    if _is_ws(v):
-                        p += 1
+                column += i - lc_pos
+            lc_pos = i
+            return line, column
+
+        def _piece(v, lc):
+            nonlocal m_len
+            marks.append((m_len, lc[0], lc[1]))
+            pieces.append(v)
+            m_len += len(v)
+
+        def _append(a, b, items=True):
+            nonlocal start, depth
+            if a < b:
+                lc = _lc(a)
+                if items:
+                    d = depth
+                    depth += buf.count('<', a, b) - buf.count('>', a, b)
+                    if depth < 0:
+                        for i in range(a, b):   # seek unmatched '>'
+                            d += (buf[i] == '<') - (buf[i] == '>')
+                            if d < 0:
+                                raise SmlParseError("Not start < bracket", *_lc(i))
+
+                if start is None:
+                    m = search_not_ws(buf, a, b)
+                    if m is None:
+                        return
+                    start = _lc(m.start())
+                _piece(buf[a:b], lc)
+
+        while not eof:
+
+            v = stream.read(chunk_size)
+
+            if type(v) is not str:
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                v = decoder.decode(bytes(v), final=(len(v) == 0))
+
+            if len(v) == 0:
+                eof = True
+
+            buf += v
+            pos = 0
+            len_buf = len(buf)
+
+            while pos < len_buf:
+
+                if state == QUOTE:
+                    i = buf.find('"', pos)
+                    if i < 0:
+                        _append(pos, len_buf, False)
+                        pos = len_buf
+                    else:
+                        _append(pos, i + 1, False)
+                        pos = i + 1
+                        state = NORMAL
+
+                elif state == LINE_COMMENT:
+                    i = buf.find('\n', pos)
+                    if i < 0:
+                        pos = len_buf
                     else:
-                        return v, p
+                        pos = i
+                        state = NORMAL
+
+                elif state == BLOCK_COMMENT:
+                    i = buf.find('*/', pos)
+                    if i < 0:
+                        pos = max(pos, len_buf - 1)     # keep '*' of chunk end
+                        break
+                    _piece(' ', _lc(i))
+                    pos = i + 2
+                    state = NORMAL
+
+                else:
+                    m = search(buf, pos)
+                    if m is None:
+                        _append(pos, len_buf)
+                        pos = len_buf
+                        break
+
+                    i = m.start()
+                    c = buf[i]
+
+                    if c == '/':
+                        if i + 1 >= len_buf and not eof:
+                            _append(pos, i)
+                            pos = i     # wait next chunk
+                            break
+                        n = buf[(i + 1):(i + 2)]
+                        if n == '/' or n == '*':
+                            _append(pos, i)
+                            state_start = _lc(i)
+                            state = LINE_COMMENT if n == '/' else BLOCK_COMMENT
+                            pos = i + 2
+                        else:
+                            _append(pos, i + 1)
+                            pos = i + 1
+
+                    elif c == '"':
+                        _append(pos, i + 1)
+                        state_start = _lc(i)
+                        state = QUOTE
+                        pos = i + 1
+
+                    else:   # '.'
+                        _append(pos, i + 1)
+                        pos = i + 1
+                        if depth == 0:
+                            yield cls.__parse_message(''.join(pieces), start, marks)
+                            pieces = list()
+                            marks = list()
+                            m_len = 0
+                            start = None
+
+            _lc(pos)
+            buf = buf[pos:]
+            lc_pos = 0
+
+        if state == QUOTE:
+            raise SmlParseError("Not reach string end", *state_start)
+        if state == BLOCK_COMMENT:
+            raise SmlParseError("Not reach comment end", *state_start)
+        if start is not None:
+            raise SmlParseError("SML not endswith '.'", *start)
 
-        def _ssbkt(s, from_pos):    # seek size_start_bracket'[' position, return position, -1 if not exist
-            v, p = _seek_next(s, from_pos)
-            return p if v == '[' else -1
+    @classmethod
+    def __parse_message(cls, sml_str, start, marks):
+        try:
+            return cls.parse(sml_str)
+        except SmlParseError as e:
+            lc = start if e.offset is None else cls.__offset_to_lc(sml_str, marks, e.offset)
+            if isinstance(e, Secs2BodySmlParseError):
+                raise Secs2BodySmlParseError(str(e), *lc)
+            raise SmlParseError(str(e), *lc)
+
+    @staticmethod
+    def __offset_to_lc(sml_str, marks, offset):   # return (line, column) of offset in message
+        i = bisect.bisect_right(marks, (offset, float('inf'))) - 1
+        p, line, column = marks[max(i, 0)]
+        n = sml_str.count('\n', p, offset)
+        if n > 0:
+            return line + n, offset - sml_str.rfind('\n', p, offset)
+        return line, column + offset - p
 
-        def _sebkt(s, from_pos):    # seek size_end_bracket']' position, return position
-            return (_seek_next(s, from_pos, ']'))[1]
+    @classmethod
+    def compile(cls, sml_str):
+        """Compile SML to SmlMessageTemplate, cached in LRU.
 
-        def _isbkt(s, from_pos):    # seek item_start_bracket'<' position, return position, -1 if not exist
-            v, p = _seek_next(s, from_pos)
-            return p if v == '<' else -1
+        Placeholders '<U4 $name>' are bound by SmlMessageTemplate.to_bytes(values).
 
-        def _iebkt(s, from_pos):    # seek item_end_bracket'>' position, return position
-            return (_seek_next(s, from_pos, '>'))[1]
+        Args:
+            sml_str (str): SML string.
 
-        def _seek_item(s, from_pos):  # seek item_type, return (item_type, shifted_position)
-            p_start = (_seek_next(s, from_pos))[1]
-            p_end = (_seek_next(s, (p_start + 1), '[', '"', '<', '>', _is_ws))[1]
-            return secs.Secs2BodyBuilder.get_item_type_from_sml(s[p_start:p_end]), p_end
+        Raises:
+            Secs2BodySmlParseError: raise if Secs2body parse failed.
+            SmlParseError: raise if SML parse failed.
 
-        def _f(s, from_pos):
+        Returns:
+            secs.SmlMessageTemplate: compiled SML
+        """
+        if sml_str is None:
+            raise SmlParseError("Not accept None")
 
-            p = _isbkt(s, from_pos)
+        key = cls._normalize(sml_str)
 
-            if p < 0:
-                raise Secs2BodySmlParseError("Not start < bracket")
+        with cls._compiled_lock:
+            v = cls._compiled.get(key)
+            if v is not None:
+                cls._compiled.move_to_end(key)
+                return v
 
-            tt, p = _seek_item(s, (p + 1))
+        v = secs.SmlMessageTemplate.from_sml(key)
 
-            r = _ssbkt(s, p)
-            if r >= 0:
-                p = _sebkt(s, (r + 1)) + 1
-            
-            if tt[0] == 'L':
-                vv = list()
-                while True:
-                    v, p = _seek_next(s, p)
-                    if v == '>':
-                        return tt[5](tt, vv), (p + 1)
+        with cls._compiled_lock:
+            if cls.cache_size > 0:
+                cls._compiled[key] = v
+                while len(cls._compiled) > cls.cache_size:
+                    cls._compiled.popitem(last=False)
 
-                    elif v == '<':
-                        r, p = _f(s, p)
-                        vv.append(r)
+        return v
 
-                    else:
-                        raise Secs2BodySmlParseError("Not reach LIST end")
-
-            elif tt[0] == 'BOOLEAN':
-                r = _iebkt(s, p)
-                vv = list()
-                for x in s[p:r].strip().split():
-                    ux = x.upper()
-                    if ux == 'TRUE' or ux == 'T':
-                        vv.append(True)
-                    elif ux == 'FALSE' or ux == 'F':
-                        vv.append(False)
-                    else:
-                        raise Secs2BodySmlParseError("Not accept, BOOLEAN require TRUE or FALSE")
-                return tt[5](tt, vv), (r + 1)
-
-            elif tt[0] == 'A':
-                vv = list()
-                while True:
-                    v, p_start = _seek_next(s, p)
-                    if v == '>':
-                        return tt[5](tt, ''.join(vv)), (p_start + 1)
- 
-                    elif v == '"':
-                        v, p_end = _seek_next(s, (p_start + 1), '"')
-                        vv.append(s[(p_start+1):p_end])
-                        p = p_end + 1
-
-                    elif v == '0':
-                        if s[p_start + 1] not in ('X', 'x'):
-                            raise Secs2BodySmlParseError("Ascii not accept 0xNN")
-                        v, p = _seek_next(s, (p_start+2), '"', '>', _is_ws)
-                        vv.append(bytes([int(s[(p_start+2):p], 16)]).decode(encoding='ascii'))
+    @staticmethod
+    def _normalize(sml_str):
+        return str(sml_str).replace('\n', ' ').strip()
 
-                    else:
-                        raise Secs2BodySmlParseError("Ascii not reach end")
+    @classmethod
+    def _parse_header(cls, sml_str):    # return (strm, func, wbit, SML-body-string)
+        s = cls._normalize(sml_str)
+        lead = len(str(sml_str)) - len(str(sml_str).lstrip())
+        if not s.endswith("."):
+            raise SmlParseError("SML not endswith '.'", offset=(lead + max(len(s) - 1, 0)))
 
-            elif tt[0] in ('B', 'I1', 'I2', 'I4', 'I8', 'F4', 'F8', 'U1', 'U2', 'U4', 'U8'):
-                r = _iebkt(s, p)
-                return tt[5](tt, s[p:r].strip().split()), (r + 1)
+        x = cls._SML_PROG.match(s)
+        if x is None:
+            raise SmlParseError("SML not match", offset=lead)
+
+        return (
+            int(x.group(1)),
+            int(x.group(2)),
+            len(x.group(3)) > 0,
+            x.group(4)
+        )
+
+    @classmethod
+    def _parse_body(cls, sml_str, build=None, placeholders=None, max_depth=None):
+        # build(item_type, value) creates each item, defaults to item_type build.
+        # If placeholders is list, accept '<U4 $name>' item and append name, value is None.
+        # max_depth defaults to Secs2BodyBuilder.max_depth.
+
+        if max_depth is None:
+            max_depth = secs.Secs2BodyBuilder.max_depth
+
+        if build is None:
+            def build(tt, v):
+                return tt[5](tt, v)
+
+        item_match = cls._SML_ITEM_PROG.match
+        ascii_match = cls._SML_ASCII_PROG.match
+        placeholder_match = cls._SML_PLACEHOLDER_PROG.match
+        booleans = cls._SML_BOOLEANS
+        get_item_type = secs.Secs2BodyBuilder.get_item_type_from_sml
+        not_ws_search = cls._SML_NOT_WS_PROG.search
+
+        def _not_ws(s, p):  # position of first not whitespace from p
+            m = not_ws_search(s, p)
+            return len(s) if m is None else m.start()
+
+        def _iebkt(s, p):   # seek item_end_bracket'>' position
+            r = s.find('>', p)
+            if r < 0:
+                raise Secs2BodySmlParseError("Not reach item end", offset=_not_ws(s, p))
+            return r
+
+        def _tokens(s, p, r):   # (token, position) of values between p and r
+            for x in s[p:r].split():
+                p = s.find(x, p)
+                yield x, p
+                p += len(x)
+
+        def _ascii(s, p, tt):
+            vv = list()
+            while True:
+                m = ascii_match(s, p)
+                if m is None:
+                    raise Secs2BodySmlParseError("Ascii not reach end", offset=_not_ws(s, p))
+                p = m.end()
+                if m.lastindex == 1:
+                    vv.append(m.group(1))
+                elif m.lastindex == 2:
+                    vv.append(bytes([int(m.group(2), 16)]).decode(encoding='ascii'))
+                else:
+                    return build(tt, ''.join(vv)), p
+
+        def _boolean(s, p, tt):
+            r = _iebkt(s, p)
+            vv = list()
+            for x, q in _tokens(s, p, r):
+                v = booleans.get(x.upper())
+                if v is None:
+                    raise Secs2BodySmlParseError("Not accept, BOOLEAN require TRUE or FALSE", offset=q)
+                vv.append(v)
+            return build(tt, vv), (r + 1)
+
+        def _values(s, p, tt):  # B and numbers
+            r = _iebkt(s, p)
+            try:
+                return build(tt, s[p:r].split()), (r + 1)
+            except (TypeError, ValueError) as e:
+                # locate failed value, only when failed
+                for x, q in _tokens(s, p, r):
+                    try:
+                        build(tt, [x])
+                    except (TypeError, ValueError):
+                        raise Secs2BodySmlParseError(str(e), offset=q)
+                raise
+
+        leafs = {'A': _ascii, 'BOOLEAN': _boolean}
+
+        def _f(s):
+
+            stack = list()  # (item_type, items) of L items not reach end
+            p = 0
+
+            while True:
+
+                m = item_match(s, p)
+
+                if m is None:
+                    if stack:
+                        raise Secs2BodySmlParseError("Not reach LIST end", offset=_not_ws(s, p))
+                    raise Secs2BodySmlParseError("Not start < bracket", offset=_not_ws(s, p))
+
+                q = m.start()   # failed item is from first not whitespace of q
+                p = m.end()
+
+                if m.lastindex == 1:    # item start
+
+                    if len(stack) >= max_depth:
+                        raise Secs2BodySmlParseError("depth exceeds max_depth " + str(max_depth), offset=_not_ws(s, q))
+
+                    try:
+                        tt = get_item_type(m.group(1))
+                    except ValueError as e:
+                        raise Secs2BodySmlParseError(str(e), offset=m.start(1))
+
+                    if tt[0] == 'L':
+                        stack.append((tt, list()))
+                        continue
+
+                    x = None if placeholders is None else placeholder_match(s, p)
+                    try:
+                        if x is None:
+                            r, p = leafs.get(tt[0], _values)(s, p, tt)
+                        else:
+                            placeholders.append(x.group(1).strip())
+                            r, p = build(tt, None), x.end()
+                    except (TypeError, ValueError, IndexError) as e:
+                        raise Secs2BodySmlParseError(str(e), offset=_not_ws(s, q))
+
+                else:   # L end
+
+                    if not stack:
+                        raise Secs2BodySmlParseError("Not start < bracket", offset=_not_ws(s, q))
+
+                    tt, vv = stack.pop()
+                    try:
+                        r = build(tt, vv)
+                    except (TypeError, ValueError, IndexError) as e:
+                        raise Secs2BodySmlParseError(str(e), offset=_not_ws(s, q))
+
+                if not stack:
+                    return r, p
+
+                stack[-1][1].append(r)
 
         try:
             if sml_str is None:
                 raise Secs2BodySmlParseError("Not accept None")
-            
+
             ss = str(sml_str).strip()
-            lr, lp = _f(ss, 0)
-            if len(ss[lp:]) > 0:
-                raise Secs2BodySmlParseError("Not reach end, end=" + str(lp) + ", length=" + str(len(ss)))
-            return lr
+            lead = len(str(sml_str)) - len(str(sml_str).lstrip())
+            try:
+                lr, lp = _f(ss)
+                if len(ss[lp:]) > 0:
+                    raise Secs2BodySmlParseError(
+                        "Not reach end, end=" + str(lp) + ", length=" + str(len(ss)), offset=_not_ws(ss, lp))
+                return lr
+            except SmlParseError as e:
+                if e.offset is None:
+                    raise
+                raise Secs2BodySmlParseError(str(e), offset=(e.offset + lead))
 
         except TypeError as e:
             raise Secs2BodySmlParseError(str(e))
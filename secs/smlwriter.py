@@ -0,0 +1,192 @@
+import io
+import itertools
+import os
+
+
+class SmlWriter:
+    """Streaming SML writer of Secs2Body, with truncation for logging.
+
+    Writes line by line into write() target, without building or caching full SML.
+    Truncated parts are replaced with ellipsis, size [n] shows not truncated size.
+    If no limits, writes same SML as to_sml().
+
+    Examples:
+        writer = SmlWriter(max_items=100, max_value_bytes=256, max_depth=8)
+        writer.write(msg.secs2body, sys.stdout)
+    """
+
+    ELLIPSIS = '...'
+
+    _SML_TAB = '  '
+    _SML_VALUESEPARATOR = ' '
+    _SML_LINESEPARATOR = os.linesep
+
+    # count of number values formatted at once
+    _CHUNK_ITEMS = 4096
+
+    def __init__(self, max_items=None, max_value_bytes=None, max_depth=None):
+        """Constructor.
+
+        Args:
+            max_items (int): max items per L, and max values per number and BOOLEAN item. Defaults to None, not limit.
+            max_value_bytes (int): max bytes per A and B item. Defaults to None, not limit.
+            max_depth (int): max depth of written L items, root item is depth 1. Defaults to None, not limit.
+        """
+        self.__max_items = self.__limit(max_items)
+        self.__max_value_bytes = self.__limit(max_value_bytes)
+        self.__max_depth = self.__limit(max_depth)
+
+    @staticmethod
+    def __limit(v):
+        if v is None:
+            return None
+        v = int(v)
+        if v < 0:
+            raise ValueError("limit require >= 0")
+        return v
+
+    @property
+    def max_items(self):
+        pass
+
+    @max_items.getter
+    def max_items(self):
+        """Max items per L, and max values per number and BOOLEAN item getter.
+
+        Returns:
+            int: max items, None if not limit
+        """
+        return self.__max_items
+
+    @property
+    def max_value_bytes(self):
+        pass
+
+    @max_value_bytes.getter
+    def max_value_bytes(self):
+        """Max bytes per A and B item getter.
+
+        Returns:
+            int: max bytes, None if not limit
+        """
+        return self.__max_value_bytes
+
+    @property
+    def max_depth(self):
+        pass
+
+    @max_depth.getter
+    def max_depth(self):
+        """Max depth of written L items getter.
+
+        Returns:
+            int: max depth, None if not limit
+        """
+        return self.__max_depth
+
+    def to_sml(self, secs2body):
+        """SML-body-string getter.
+
+        Args:
+            secs2body (secs.AbstractSecs2Body): Secs2Body.
+
+        Returns:
+            str: SML-body-string.
+        """
+        out = io.StringIO()
+        self.write(secs2body, out)
+        return out.getvalue()
+
+    def write_message(self, msg, out):
+        """Write SML-message, 'SxFy W' line, body and period(.)
+
+        Args:
+            msg (secs.SecsMessage): message.
+            out: target has write(str).
+        """
+        out.write('S' + str(msg.strm) + 'F' + str(msg.func) + (' W' if msg.wbit else ''))
+        if msg.secs2body is not None:
+            out.write(self._SML_LINESEPARATOR)
+            self.write(msg.secs2body, out)
+        out.write('.')
+
+    def write(self, secs2body, out):
+        """Write SML-body.
+
+        Args:
+            secs2body (secs.AbstractSecs2Body): Secs2Body.
+            out: target has write(str).
+        """
+        write = out.write
+        max_items = self.__max_items
+        max_depth = self.__max_depth
+
+        if secs2body.type != 'L':
+            self._write_item(secs2body, write)
+            return
+
+        stack = list()  # (iterator, level, truncated) of L items not reach end
+        x, level = secs2body, ''
+
+        while True:
+
+            if x is not None:
+                n = len(x)
+                if max_depth is not None and len(stack) >= max_depth:
+                    write(level + '<L [' + str(n) + '] ' + self.ELLIPSIS + ' >')
+                else:
+                    write(level + '<L [' + str(n) + ']')
+                    m = n if max_items is None else min(n, max_items)
+                    stack.append((iter(x[0:m] if m < n else x), level, m < n))
+
+            while stack:
+                it, l, truncated = stack[-1]
+                deep_level = l + self._SML_TAB
+                x = next(it, None)
+                if x is None:
+                    stack.pop()
+                    if truncated:
+                        write(self._SML_LINESEPARATOR + deep_level + self.ELLIPSIS)
+                    write(self._SML_LINESEPARATOR + l + '>')
+                    continue
+                write(self._SML_LINESEPARATOR)
+                if x.type == 'L':
+                    level = deep_level
+                    break
+                write(deep_level)
+                self._write_item(x, write)
+            else:
+                return
+
+    def _write_item(self, x, write):     # not L item
+        tt = x.type
+        n = len(x)
+        write('<' + tt + ' [' + str(n) + '] ')
+
+        if tt == 'A':
+            m = n if self.__max_value_bytes is None else min(n, self.__max_value_bytes)
+            write('"' + x.value[0:m] + '"')
+
+        elif tt == 'B':
+            m = n if self.__max_value_bytes is None else min(n, self.__max_value_bytes)
+            self.__write_values(write, [('0x' + '{:02X}'.format(v)) for v in x.iter_values(0, m)])
+
+        elif tt == 'BOOLEAN':
+            m = n if self.__max_items is None else min(n, self.__max_items)
+            self.__write_values(write, [("TRUE" if v else "FALSE") for v in x.iter_values(0, m)])
+
+        else:
+            m = n if self.__max_items is None else min(n, self.__max_items)
+            it = x.iter_values(0, m)
+            for i in range(0, m, self._CHUNK_ITEMS):
+                if i > 0:
+                    write(self._SML_VALUESEPARATOR)
+                self.__write_values(write, [str(v) for v in itertools.islice(it, self._CHUNK_ITEMS)])
+
+        if m < n:
+            write(' ' + self.ELLIPSIS)
+
+        write(' >')
+
+    def __write_values(self, write, vv):
+        write(self._SML_VALUESEPARATOR.join(vv))
@@ -12,5 +12,8 @@ setuptools.setup(
     url="https://github.com/kenta-shimizu/pysemisecs",
     packages=setuptools.find_packages(),
     zip_safe=False,
-    install_requires=_install_requires('./requirements.txt')
+    install_requires=_install_requires('./requirements.txt'),
+    extras_require={
+        'numpy': ['numpy']
+    }
 )
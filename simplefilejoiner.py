@@ -12,6 +12,8 @@ if __name__ == '__main__':
     files = [
         'secs2body.py',
         'smlparser.py',
+        'secs2template.py',
+        'smlwriter.py',
         'secsmessage.py',
         'hsmsssmessage.py',
         'secs1message.py',
@@ -19,6 +21,9 @@ if __name__ == '__main__':
         'hsmssscommunicator.py',
         'hsmsssactivecommunicator.py',
         'hsmssspassivecommunicator.py',
+        'hsmsssasynccommunicator.py',
+        'hsmsssasyncactivecommunicator.py',
+        'hsmsssasyncpassivecommunicator.py',
         'secs1communicator.py',
         'secs1ontcpipcommunicator.py',
         'secs1onpyserialcommunicator.py',